@@ -0,0 +1,126 @@
+"""Benchmarks for backend service.
+
+Usage:
+    python -m src.benchmark encryption --size-mb 1024 --workers 1 2 4 8 --chunk-mb 1 4 16
+
+Runs locally against the service code without starting the API or
+connecting to storage.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+def _run_encryption(
+    data: bytes,
+    key: bytes,
+    segment_size: int,
+    workers: int,
+    chunk_size: int,
+    window: int
+) -> dict:
+    """Encrypt and decrypt data once with the given pool and chunk size."""
+    from .services.encryption import EncryptingReader, SegmentedStreamDecryptor, decrypt_chunks
+    from .utils.segmented_encryption import SegmentCipher, new_header
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        start_time = time.perf_counter()
+        reader = EncryptingReader(
+            io.BytesIO(data),
+            SegmentCipher(key, new_header(segment_size)),
+            executor,
+            chunk_size,
+            window
+        )
+        encrypted = b"".join(iter(lambda: reader.read(chunk_size), b""))
+        encrypt_seconds = time.perf_counter() - start_time
+
+        async def decrypt() -> int:
+            async def chunks():
+                for i in range(0, len(encrypted), chunk_size):
+                    yield encrypted[i:i + chunk_size]
+
+            size = 0
+            stream = decrypt_chunks(SegmentedStreamDecryptor(key), chunks(), executor, window)
+            async for block in stream:
+                size += len(block)
+            return size
+
+        start_time = time.perf_counter()
+        decrypted_size = asyncio.run(decrypt())
+        decrypt_seconds = time.perf_counter() - start_time
+
+    if decrypted_size != len(data):
+        raise RuntimeError("Decrypted size differs from input")
+    gigabytes = len(data) / 1e9
+    return {
+        'workers': workers,
+        'chunk_mb': chunk_size // (1024 * 1024),
+        'window': window,
+        'size_mb': len(data) // (1024 * 1024),
+        'encrypt_gbps': round(gigabytes / encrypt_seconds, 3),
+        'decrypt_gbps': round(gigabytes / decrypt_seconds, 3)
+    }
+
+def benchmark_encryption(args: argparse.Namespace) -> None:
+    """Measure encryption throughput against worker count and chunk size."""
+    from .utils.segmented_encryption import DEFAULT_SEGMENT_SIZE
+
+    data = os.urandom(args.size_mb * 1024 * 1024)
+    key = os.urandom(32)
+    for workers in args.workers:
+        for chunk_mb in args.chunk_mb:
+            best = None
+            for _ in range(args.repeat):
+                result = _run_encryption(
+                    data,
+                    key,
+                    DEFAULT_SEGMENT_SIZE,
+                    workers,
+                    chunk_mb * 1024 * 1024,
+                    args.window or workers
+                )
+                if not best or result['encrypt_gbps'] + result['decrypt_gbps'] > (
+                    best['encrypt_gbps'] + best['decrypt_gbps']
+                ):
+                    best = result
+            print(json.dumps(best))
+
+def main():
+    """Run a benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Backend benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    encryption = subparsers.add_parser(
+        'encryption',
+        help="Encrypt and decrypt throughput in GB/s by worker count and chunk size"
+    )
+    encryption.add_argument(
+        '--size-mb', type=int, default=512, help="Size of the test data in MB"
+    )
+    encryption.add_argument(
+        '--workers', type=int, nargs='+', default=[1, 2, 4, 8], help="Thread pool sizes"
+    )
+    encryption.add_argument(
+        '--chunk-mb', type=int, nargs='+', default=[1, 4, 16], help="Chunk sizes in MB"
+    )
+    encryption.add_argument(
+        '--window',
+        type=int,
+        default=0,
+        help="Chunks in flight (0: one per worker)"
+    )
+    encryption.add_argument(
+        '--repeat', type=int, default=3, help="Runs per setting; the fastest is reported"
+    )
+    encryption.set_defaults(func=benchmark_encryption)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
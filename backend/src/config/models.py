@@ -21,6 +21,8 @@ class EncryptionConfig(BaseModel):
     algorithm: str = Field(default="AES-256-GCM", description="Encryption algorithm")
     key_rotation_days: int = Field(default=30, description="Key rotation interval in days")
     chunk_size_mb: int = Field(default=5, description="Chunk size for streaming encryption in MB")
+    workers: int = Field(default=0, description="Threads encrypting and decrypting chunks (0 for one per CPU)")
+    max_inflight_chunks: int = Field(default=4, description="Chunks of a file being encrypted or decrypted at once")
 
 class StorageConfig(BaseModel):
     """Storage configuration."""
@@ -31,6 +33,8 @@ class StorageConfig(BaseModel):
     bucket_name: str = Field(default="transcribo", description="Storage bucket name")
     region: str = Field(default="us-east-1", description="Storage region")
     secure: bool = Field(default=True, description="Whether to use HTTPS")
+    upload_part_size_mb: int = Field(default=16, description="Part size of multipart uploads in MB (at least 5)")
+    upload_parallel_parts: int = Field(default=3, description="Parts of an upload sent at once")
     encryption: EncryptionConfig = Field(default_factory=EncryptionConfig)
     key_vault: KeyVaultConfig = Field(default_factory=KeyVaultConfig)
 
@@ -82,6 +82,11 @@ class ConfigurationService:
             "MAX_FILE_SIZE": "storage.max_file_size",
             "ALLOWED_EXTENSIONS": "storage.allowed_extensions",
             "STORAGE_PATH": "storage.local_storage_path",
+            "STORAGE_UPLOAD_PART_SIZE_MB": "storage.upload_part_size_mb",
+            "STORAGE_UPLOAD_PARALLEL_PARTS": "storage.upload_parallel_parts",
+            "ENCRYPTION_CHUNK_SIZE_MB": "storage.encryption.chunk_size_mb",
+            "ENCRYPTION_WORKERS": "storage.encryption.workers",
+            "ENCRYPTION_MAX_INFLIGHT_CHUNKS": "storage.encryption.max_inflight_chunks",
             
             # Transcriber
             "DEVICE": "transcriber.device",
@@ -16,6 +16,7 @@ from .routes import (
     files,
     jobs,
     keys,
+    media,
     tags,
     transcriber,
     verify,
@@ -63,6 +64,7 @@ app.include_router(editor.router, tags=["editor"])
 app.include_router(files.router, tags=["files"])
 app.include_router(jobs.router, tags=["jobs"])
 app.include_router(keys.router, tags=["keys"])
+app.include_router(media.router, tags=["files"])
 app.include_router(tags.router, tags=["tags"])
 app.include_router(transcriber.router, tags=["transcriber"])
 app.include_router(verify.router, tags=["verify"])
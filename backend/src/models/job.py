@@ -18,6 +18,7 @@ class JobStatus(str, Enum):
     FAILED = "failed"
     CANCELLED = "cancelled"
     EXTRACTING = "extracting"  # For ZIP files
+    WAITING = "waiting"  # For jobs split into chunk jobs
 
 class JobPriority(int, Enum):
     """Job priority enumeration."""
@@ -88,6 +89,11 @@ class JobOptions(BaseModel):
         le=10,
         description="Maximum number of retry attempts"
     )
+    asr_mode: str = Field(
+        default="chunked",
+        regex="^(chunked|vad)$",
+        description="ASR mode: fixed-size chunks or VAD-batched speech regions"
+    )
 
     class Config:
         """Pydantic model configuration."""
@@ -98,10 +104,97 @@ class JobOptions(BaseModel):
                 "generate_srt": True,
                 "language": "de",
                 "priority": 1,
-                "max_retries": 3
+                "max_retries": 3,
+                "asr_mode": "chunked"
             }
         }
 
+class JobClaimRequest(BaseModel):
+    """Worker request to claim pending jobs."""
+    worker_id: str = Field(
+        ...,
+        min_length=1,
+        description="ID of the claiming worker"
+    )
+    limit: int = Field(
+        default=1,
+        ge=1,
+        le=100,
+        description="Maximum number of jobs to claim"
+    )
+    wait: float = Field(
+        default=30.0,
+        ge=0.0,
+        le=60.0,
+        description="Seconds to wait for a job if none is pending"
+    )
+
+class JobLeaseRequest(BaseModel):
+    """Worker request to renew or release a job lease."""
+    worker_id: str = Field(
+        ...,
+        min_length=1,
+        description="ID of the worker holding the lease"
+    )
+
+class JobCompletionRequest(BaseModel):
+    """Worker report of how a job it holds ended."""
+    worker_id: str = Field(
+        ...,
+        min_length=1,
+        description="ID of the worker holding the lease"
+    )
+    status: JobStatus = Field(
+        ...,
+        description="Outcome, completed or failed"
+    )
+    error: Optional[str] = Field(
+        None,
+        max_length=2000,
+        description="Error message if the job failed"
+    )
+
+    @validator('status')
+    def validate_status(cls, v: JobStatus) -> JobStatus:
+        """Validate the status is an outcome."""
+        if v not in (JobStatus.COMPLETED, JobStatus.FAILED):
+            raise ValueError("Status must be completed or failed")
+        return v
+
+class JobChunk(BaseModel):
+    """Time window of a job's audio processed as a separate chunk job."""
+    start: float = Field(
+        ...,
+        ge=0.0,
+        description="Window start in seconds"
+    )
+    end: float = Field(
+        ...,
+        gt=0.0,
+        description="Window end in seconds"
+    )
+
+    @validator('end')
+    def validate_end(cls, v: float, values: Dict[str, Any]) -> float:
+        """Validate the window is not empty."""
+        if 'start' in values and v <= values['start']:
+            raise ValueError("Chunk end must be after its start")
+        return v
+
+class JobFanOutRequest(BaseModel):
+    """Worker request to split a job it holds into chunk jobs."""
+    worker_id: str = Field(
+        ...,
+        min_length=1,
+        description="ID of the worker holding the job's lease"
+    )
+    chunks: List[JobChunk] = Field(
+        ...,
+        min_items=2,
+        max_items=1000,
+        description="Chunk windows in order; neighbouring windows may overlap"
+    )
+
 class JobProgress(BaseModel):
     """Job progress information."""
     stage: str = Field(
@@ -1,12 +1,22 @@
 """Job management routes."""
 
-from fastapi import Depends, status
-from typing import Optional, cast
+from fastapi import Depends, HTTPException, Request, status
+from typing import Dict, List, Optional, cast
 from datetime import datetime
 
-from ..models.job import JobResponse, JobUpdate, TranscriptionOptions
+from ..models.job import (
+    JobResponse,
+    JobUpdate,
+    TranscriptionOptions,
+    JobClaimRequest,
+    JobLeaseRequest,
+    JobCompletionRequest,
+    JobFanOutRequest
+)
 from ..models.api import ApiResponse, ApiListResponse
 from ..services.job_manager import JobManager
+from ..services.job_distribution import JobDistributionService
+from ..services.transcription import TranscriptionService
 from ..utils.exceptions import (
     ResourceNotFoundError,
     AuthorizationError,
@@ -25,7 +35,16 @@ from ..utils.route_utils import (
     create_response,
     create_list_response
 )
-from ..utils.dependencies import JobManagerDep
+from ..utils.dependencies import (
+    JobManagerDep,
+    JobDistributionDep,
+    TranscriptionServiceDep
+)
+from ..utils.result_encoding import (
+    ResultDecodingError,
+    UnsupportedEncodingError,
+    decode_results
+)
 
 router = create_api_router("/jobs", ["jobs"])
 
@@ -174,14 +193,21 @@ async def list_jobs(
 async def cancel_job(
     job_id: JobID,
     user_id: Optional[UserID] = None,  # Set by auth middleware
-    job_manager: JobManager = Depends(JobManagerDep)
+    job_manager: JobManager = Depends(JobManagerDep),
+    job_distribution: JobDistributionService = Depends(JobDistributionDep)
 ) -> ApiResponse[JobResponse]:
     """Cancel a job.
     
+    Chunk jobs of a split job are cancelled with it. Workers processing
+    the job are told when they next renew its lease and stop it; this
+    only reaches pulling workers, as transcribers that had the job pushed
+    to them hold no lease and finish it.
+    
     Args:
         job_id: Job ID to cancel
         user_id: Optional user ID for authorization
         job_manager: Job manager service
+        job_distribution: Job distribution service
         
     Returns:
         Updated job response
@@ -205,7 +231,7 @@ async def cancel_job(
             raise AuthorizationError("Not authorized to cancel this job", details=error_context)
             
         # Cancel job
-        await job_manager.update_job_status(job_id, "cancelled")
+        await job_distribution.cancel_job(job_id)
         updated_job = await job_manager.get_job_status(job_id)
         return create_response(updated_job, JobResponse)
         
@@ -291,3 +317,381 @@ async def retry_job(
             "details": {"error": str(e)}
         }
         raise TranscriboError("Failed to retry job", details=error_context)
+
+@router.post(
+    "/claim",
+    response_model=ApiResponse[List[Dict]],
+    summary="Claim Jobs",
+    description="Lease pending jobs to a worker, waiting briefly if none are pending"
+)
+async def claim_jobs(
+    claim: JobClaimRequest,
+    job_distribution: JobDistributionService = Depends(JobDistributionDep)
+) -> ApiResponse[List[Dict]]:
+    """Claim jobs for a worker.
+    
+    Args:
+        claim: Worker ID, maximum number of jobs and wait time
+        job_distribution: Job distribution service
+        
+    Returns:
+        Claimed jobs, empty if none became available within the wait time
+        
+    Raises:
+        TranscriboError: If operation fails
+    """
+    try:
+        jobs = await job_distribution.claim_jobs(
+            claim.worker_id,
+            limit=claim.limit,
+            wait=claim.wait
+        )
+        return ApiResponse(data=jobs)
+        
+    except Exception as e:
+        error_context: ErrorContext = {
+            "operation": "claim_jobs",
+            "timestamp": datetime.utcnow(),
+            "details": {
+                "error": str(e),
+                "worker_id": claim.worker_id
+            }
+        }
+        raise TranscriboError("Failed to claim jobs", details=error_context)
+
+@router.post(
+    "/{job_id}/lease",
+    response_model=ApiResponse[Dict],
+    summary="Renew Job Lease",
+    description="Extend a worker's lease on a job it is processing"
+)
+async def renew_job_lease(
+    job_id: JobID,
+    lease: JobLeaseRequest,
+    job_distribution: JobDistributionService = Depends(JobDistributionDep)
+) -> ApiResponse[Dict]:
+    """Renew a job lease.
+    
+    Args:
+        job_id: Job ID
+        lease: ID of the worker holding the lease
+        job_distribution: Job distribution service
+        
+    Returns:
+        New lease expiry
+        
+    Raises:
+        HTTPException: 410 if the job was cancelled, 409 if the worker no
+            longer holds the job; either way the worker should stop it
+        TranscriboError: If operation fails
+    """
+    try:
+        expires_at = await job_distribution.renew_lease(job_id, lease.worker_id)
+        cancelled = expires_at is None and await job_distribution.is_cancelled(job_id)
+    except Exception as e:
+        error_context: ErrorContext = {
+            "operation": "renew_job_lease",
+            "resource_id": job_id,
+            "timestamp": datetime.utcnow(),
+            "details": {
+                "error": str(e),
+                "worker_id": lease.worker_id
+            }
+        }
+        raise TranscriboError("Failed to renew job lease", details=error_context)
+
+    if cancelled:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=f"Job {job_id} was cancelled"
+        )
+    if expires_at is None:
+        # Lease expired and the job was requeued or finished elsewhere
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Worker {lease.worker_id} does not hold job {job_id}"
+        )
+    return ApiResponse(data={"job_id": job_id, "lease_expires_at": expires_at.isoformat()})
+
+@router.post(
+    "/{job_id}/complete",
+    response_model=ApiResponse[Dict],
+    summary="Finish Job",
+    description="Record whether a job a worker holds completed or failed and release its lease"
+)
+async def finish_job(
+    job_id: JobID,
+    completion: JobCompletionRequest,
+    job_distribution: JobDistributionService = Depends(JobDistributionDep)
+) -> ApiResponse[Dict]:
+    """Finish a job.
+    
+    A failed job is queued again with backoff until it runs out of
+    retries. Completing the last chunk job of a split job queues the job
+    for merging.
+    
+    Args:
+        job_id: Job ID
+        completion: ID of the worker holding the lease, outcome and error
+        job_distribution: Job distribution service
+        
+    Returns:
+        The job's new status
+        
+    Raises:
+        HTTPException: 409 if the worker no longer holds the job
+        TranscriboError: If operation fails
+    """
+    try:
+        new_status = await job_distribution.finish_job(
+            job_id,
+            completion.worker_id,
+            completion.status.value,
+            completion.error
+        )
+    except Exception as e:
+        error_context: ErrorContext = {
+            "operation": "finish_job",
+            "resource_id": job_id,
+            "timestamp": datetime.utcnow(),
+            "details": {
+                "error": str(e),
+                "worker_id": completion.worker_id,
+                "status": completion.status.value
+            }
+        }
+        raise TranscriboError("Failed to finish job", details=error_context)
+
+    if new_status is None:
+        # Lease expired, or the job was cancelled while it ran
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Worker {completion.worker_id} does not hold job {job_id}"
+        )
+    return ApiResponse(data={"job_id": job_id, "status": new_status})
+
+@router.delete(
+    "/{job_id}/lease",
+    response_model=ApiResponse[Dict],
+    summary="Release Job Lease",
+    description="Release a worker's lease, requeuing the job if it has not been finished"
+)
+async def release_job_lease(
+    job_id: JobID,
+    worker_id: str,
+    job_distribution: JobDistributionService = Depends(JobDistributionDep)
+) -> ApiResponse[Dict]:
+    """Release a job lease.
+    
+    A job still processing is queued again without counting a retry, so
+    workers finish jobs that ended with POST /jobs/{job_id}/complete
+    first.
+    
+    Args:
+        job_id: Job ID
+        worker_id: ID of the worker holding the lease
+        job_distribution: Job distribution service
+        
+    Returns:
+        Released job ID
+        
+    Raises:
+        TranscriboError: If operation fails
+    """
+    try:
+        await job_distribution.release_job(job_id, worker_id)
+        return ApiResponse(data={"job_id": job_id})
+        
+    except Exception as e:
+        error_context: ErrorContext = {
+            "operation": "release_job_lease",
+            "resource_id": job_id,
+            "timestamp": datetime.utcnow(),
+            "details": {
+                "error": str(e),
+                "worker_id": worker_id
+            }
+        }
+        raise TranscriboError("Failed to release job lease", details=error_context)
+
+@router.post(
+    "/{job_id}/chunks",
+    response_model=ApiResponse[Dict],
+    summary="Split Job Into Chunks",
+    description="Split a job a worker holds into chunk jobs any worker can process"
+)
+async def fan_out_job(
+    job_id: JobID,
+    fan_out: JobFanOutRequest,
+    job_distribution: JobDistributionService = Depends(JobDistributionDep)
+) -> ApiResponse[Dict]:
+    """Split a job into chunk jobs.
+    
+    The job waits until all chunk jobs have completed, then is queued
+    again with stage "reduce" so a worker merges the chunk results.
+    
+    Args:
+        job_id: Job ID
+        fan_out: ID of the worker holding the job and the chunk windows
+        job_distribution: Job distribution service
+        
+    Returns:
+        Chunk job IDs in order
+        
+    Raises:
+        HTTPException: 409 if the worker no longer holds the job
+        TranscriboError: If operation fails
+    """
+    try:
+        child_jobs = await job_distribution.fan_out_job(
+            job_id,
+            fan_out.worker_id,
+            [chunk.dict() for chunk in fan_out.chunks]
+        )
+    except Exception as e:
+        error_context: ErrorContext = {
+            "operation": "fan_out_job",
+            "resource_id": job_id,
+            "timestamp": datetime.utcnow(),
+            "details": {
+                "error": str(e),
+                "worker_id": fan_out.worker_id,
+                "chunks": len(fan_out.chunks)
+            }
+        }
+        raise TranscriboError("Failed to split job into chunks", details=error_context)
+
+    if child_jobs is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Worker {fan_out.worker_id} does not hold job {job_id}"
+        )
+    return ApiResponse(data={"job_id": job_id, "child_jobs": child_jobs})
+
+@router.get(
+    "/{job_id}/chunks/results",
+    response_model=ApiResponse[List[Dict]],
+    summary="Get Chunk Results",
+    description="Get the results of a split job's chunk jobs for merging"
+)
+async def get_chunk_results(
+    job_id: JobID,
+    job_distribution: JobDistributionService = Depends(JobDistributionDep),
+    transcription: TranscriptionService = Depends(TranscriptionServiceDep)
+) -> ApiResponse[List[Dict]]:
+    """Get chunk job results.
+    
+    Args:
+        job_id: ID of the split job
+        job_distribution: Job distribution service
+        transcription: Transcription service
+        
+    Returns:
+        Chunk windows and results in order
+        
+    Raises:
+        HTTPException: 409 if a chunk job has not completed
+        ResourceNotFoundError: If the job has no chunk jobs
+        TranscriboError: If operation fails
+    """
+    try:
+        chunk_jobs = await job_distribution.get_chunk_jobs(job_id)
+        if not chunk_jobs:
+            raise ResourceNotFoundError(f"Job {job_id} has no chunk jobs")
+
+        unfinished = [job["id"] for job in chunk_jobs if job["status"] != "completed"]
+        if unfinished:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"{len(unfinished)} chunk jobs of job {job_id} have not completed"
+            )
+
+        results = []
+        for chunk_job in chunk_jobs:
+            results.append({
+                "job_id": chunk_job["id"],
+                "chunk": chunk_job["chunk"],
+                "results": await transcription.get_chunk_results(chunk_job["id"])
+            })
+        return ApiResponse(data=results)
+        
+    except (HTTPException, ResourceNotFoundError):
+        raise
+    except Exception as e:
+        error_context: ErrorContext = {
+            "operation": "get_chunk_results",
+            "resource_id": job_id,
+            "timestamp": datetime.utcnow(),
+            "details": {"error": str(e)}
+        }
+        raise TranscriboError("Failed to get chunk results", details=error_context)
+
+@router.post(
+    "/{job_id}/results",
+    response_model=ApiResponse[Dict],
+    summary="Upload Job Results",
+    description="Store a job's transcription result, as JSON or in the compact encoding"
+)
+async def upload_job_results(
+    job_id: JobID,
+    request: Request,
+    job_manager: JobManager = Depends(JobManagerDep),
+    transcription: TranscriptionService = Depends(TranscriptionServiceDep)
+) -> ApiResponse[Dict]:
+    """Upload job results.
+    
+    The body is decompressed as it is received, so the compressed upload
+    is never buffered alongside the decoded result. Results of chunk jobs
+    are kept until their parent job is merged; once the merged result of
+    a split job is stored, its chunk results are deleted.
+    
+    Args:
+        job_id: Job ID
+        request: Request carrying the result body
+        job_manager: Job manager service
+        transcription: Transcription service
+        
+    Returns:
+        Job ID
+        
+    Raises:
+        HTTPException: 415 for an unknown content type or encoding, 400 for
+            a malformed body
+        ResourceNotFoundError: If job not found
+        TranscriboError: If operation fails
+    """
+    try:
+        results = await decode_results(
+            request.stream(),
+            request.headers.get("Content-Type"),
+            request.headers.get("Content-Encoding")
+        )
+    except UnsupportedEncodingError as e:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=str(e)
+        )
+    except ResultDecodingError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    try:
+        job = await job_manager.get_job_status(job_id)
+        metadata = job.get("metadata") or {}
+        if "chunk" in metadata:
+            await transcription.save_chunk_results(job_id, results)
+        else:
+            await transcription.save_transcription(str(job["file_id"]), results)
+            if metadata.get("stage") == "reduce":
+                await transcription.delete_chunk_results(metadata.get("child_jobs", []))
+        return ApiResponse(data={"job_id": job_id})
+        
+    except ResourceNotFoundError:
+        raise
+    except Exception as e:
+        error_context: ErrorContext = {
+            "operation": "upload_job_results",
+            "resource_id": job_id,
+            "timestamp": datetime.utcnow(),
+            "details": {"error": str(e)}
+        }
+        raise TranscriboError("Failed to store job results", details=error_context)
@@ -0,0 +1,324 @@
+"""File content routes."""
+
+import hmac
+import os
+from fastapi import Depends, Header, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from datetime import datetime
+from ..services.job_manager import JobManager
+from ..services.storage import StorageService
+from ..utils.api import create_api_router
+from ..utils.dependencies import JobManagerDep, StorageServiceDep
+from ..utils.exceptions import (
+    AuthenticationError,
+    AuthorizationError,
+    ResourceNotFoundError,
+    TranscriboError
+)
+from ..utils.http_range import (
+    RangeNotSatisfiableError,
+    parse_range_header,
+    content_range
+)
+from ..types import ErrorContext, FileID, UserID
+
+router = create_api_router("/files", ["files"])
+
+# Most bytes sent for one range of the media endpoint. Players ask for
+# open-ended ranges ("bytes=123-") and follow up for the rest, so each
+# seek reads and decrypts only this much.
+MEDIA_MAX_RANGE_SIZE = 4 * 1024 * 1024
+
+# Media content is revalidated with its ETag; private, since it may hold
+# confidential recordings
+MEDIA_CACHE_CONTROL = "private, max-age=3600"
+
+# Header carrying the transcriber's credential, TRANSCRIBER_SERVICE_TOKEN
+SERVICE_TOKEN_HEADER = "X-Service-Token"
+
+def _is_service(request: Request) -> bool:
+    """Check a request carries the transcriber's service credential."""
+    token = os.getenv("TRANSCRIBER_SERVICE_TOKEN", "")
+    presented = request.headers.get(SERVICE_TOKEN_HEADER, "")
+    return bool(token) and hmac.compare_digest(presented.encode(), token.encode())
+
+def _user_id(request: Request) -> Optional[UserID]:
+    """Get the ID of the user the auth middleware authenticated, if any."""
+    auth_context = getattr(request.state, "auth", None)
+    if not auth_context:
+        return None
+    return auth_context["user"].get("id")
+
+async def _check_access(
+    file_id: FileID,
+    request: Request,
+    job_manager: JobManager,
+    operation: str
+) -> None:
+    """Check the caller may read a file's content.
+
+    The transcriber, identified by its service credential, may read any
+    file; users only the files of their own jobs.
+
+    Raises:
+        AuthenticationError: If the caller is neither a user nor the transcriber
+        ResourceNotFoundError: If file not found
+        AuthorizationError: If user not authorized
+    """
+    if _is_service(request):
+        return
+    user_id = _user_id(request)
+    if not user_id:
+        error_context: ErrorContext = {
+            "operation": operation,
+            "resource_id": file_id,
+            "timestamp": datetime.utcnow(),
+            "details": {"error": "Authentication required"}
+        }
+        raise AuthenticationError("Authentication required", details=error_context)
+    job = await job_manager.get_job_status(file_id)
+    if job.get('owner_id') != user_id:
+        error_context = {
+            "operation": operation,
+            "resource_id": file_id,
+            "user_id": user_id,
+            "timestamp": datetime.utcnow(),
+            "details": {"error": "Not authorized"}
+        }
+        raise AuthorizationError("Not authorized to access this file", details=error_context)
+
+async def _file_response(
+    file_id: FileID,
+    storage: StorageService,
+    operation: str,
+    range_header: Optional[str],
+    if_range: Optional[str],
+    if_none_match: Optional[str] = None,
+    max_range_size: Optional[int] = None,
+    cache_control: Optional[str] = None
+) -> Response:
+    """Build the response to a download or media request.
+
+    Args:
+        file_id: File ID
+        storage: Storage service
+        operation: Operation name for error context
+        range_header: Optional Range header
+        if_range: Optional If-Range header
+        if_none_match: Optional If-None-Match header
+        max_range_size: Most bytes sent for one range; ranges of files that
+            cannot be read in part are then ignored and the whole file sent
+        cache_control: Optional Cache-Control header
+
+    Raises:
+        ResourceNotFoundError: If file not found
+    """
+    info = await storage.get_file_info(file_id)
+    if not info:
+        error_context: ErrorContext = {
+            "operation": operation,
+            "resource_id": file_id,
+            "timestamp": datetime.utcnow(),
+            "details": {"error": "File not found"}
+        }
+        raise ResourceNotFoundError(f"File {file_id} not found", details=error_context)
+
+    size = storage.content_size(info)
+    etag = f'"{info["hash"]}"' if info.get('hash') else None
+    supports_ranges = storage.supports_ranges(info.get('metadata', {}))
+    headers = {}
+    if etag:
+        headers["ETag"] = etag
+    if supports_ranges:
+        headers["Accept-Ranges"] = "bytes"
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+
+    if etag and if_none_match and etag in [t.strip() for t in if_none_match.split(',')]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # A stale If-Range means the client's partial copy is outdated
+    byte_range = None
+    use_range = range_header and (not if_range or if_range == etag)
+    if use_range and (max_range_size is None or supports_ranges):
+        try:
+            byte_range = parse_range_header(range_header, size)
+        except RangeNotSatisfiableError:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers=headers
+            )
+
+    if size == 0:
+        return Response(content=b"", headers=headers)
+
+    if not byte_range:
+        # Sent as it is read and decrypted, so the first byte goes out
+        # without waiting for the rest of the file
+        chunks, metadata = await storage.stream_file(file_id)
+        if chunks is None:
+            error_context = {
+                "operation": operation,
+                "resource_id": file_id,
+                "timestamp": datetime.utcnow(),
+                "details": {"error": "File not found"}
+            }
+            raise ResourceNotFoundError(f"File {file_id} not found", details=error_context)
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(
+            chunks,
+            media_type=metadata.get('content_type', 'application/octet-stream'),
+            headers=headers
+        )
+
+    start, end = byte_range
+    if max_range_size is not None:
+        end = min(end, start + max_range_size - 1)
+    # Streamed as well, so a large range is never held in memory
+    chunks, _, metadata = await storage.stream_file_range(file_id, start, end)
+    headers["Content-Range"] = content_range(start, end, size)
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        chunks,
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=metadata.get('content_type', 'application/octet-stream'),
+        headers=headers
+    )
+
+@router.get(
+    "/{file_id}/download",
+    summary="Download File",
+    description="Download file content, optionally a single byte range",
+    responses={
+        206: {"description": "Partial content"},
+        416: {"description": "Range not satisfiable"}
+    }
+)
+async def download_file(
+    request: Request,
+    file_id: FileID,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None, alias="If-Range"),
+    storage: StorageService = Depends(StorageServiceDep),
+    job_manager: JobManager = Depends(JobManagerDep)
+) -> Response:
+    """Download file content.
+
+    Whole files are streamed as they are read from storage. Honours a
+    single-range Range header, so interrupted transfers can resume from
+    the last received byte. Accept-Ranges is only sent for
+    files whose ranges are read without reading the whole object, which
+    tells clients whether fetching ranges in parallel pays off.
+
+    Args:
+        request: Request, authenticated as a user or the transcriber
+        file_id: File ID to download
+        range_header: Optional Range header
+        if_range: Optional If-Range header; the range is ignored unless it
+            matches the current ETag
+        storage: Storage service
+        job_manager: Job manager service
+
+    Returns:
+        Full (200) or partial (206) file content
+
+    Raises:
+        AuthenticationError: If the caller is not authenticated
+        ResourceNotFoundError: If file not found
+        AuthorizationError: If user not authorized
+        TranscriboError: If operation fails
+    """
+    try:
+        await _check_access(file_id, request, job_manager, "download_file")
+        return await _file_response(
+            file_id, storage, "download_file", range_header, if_range
+        )
+
+    except (AuthenticationError, ResourceNotFoundError, AuthorizationError):
+        raise
+    except Exception as e:
+        error_context = {
+            "operation": "download_file",
+            "resource_id": file_id,
+            "timestamp": datetime.utcnow(),
+            "details": {
+                "error": str(e),
+                "range": range_header
+            }
+        }
+        raise TranscriboError("Failed to download file", details=error_context)
+
+@router.get(
+    "/{file_id}/media",
+    summary="Stream Media",
+    description="Serve file content to audio and video players, with seeking by byte range",
+    responses={
+        206: {"description": "Partial content"},
+        304: {"description": "Not modified"},
+        416: {"description": "Range not satisfiable"}
+    }
+)
+async def stream_media(
+    request: Request,
+    file_id: FileID,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None, alias="If-Range"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    storage: StorageService = Depends(StorageServiceDep),
+    job_manager: JobManager = Depends(JobManagerDep)
+) -> Response:
+    """Serve file content to a media player.
+
+    A seek reads only the requested bytes: for encrypted files, just the
+    segments holding them are fetched from storage and decrypted. Ranges
+    are capped at MEDIA_MAX_RANGE_SIZE and the player requests the rest
+    as it plays. Files whose ranges cannot be read in part, such as legacy
+    encrypted files, are streamed whole without Accept-Ranges.
+
+    Args:
+        request: Request, authenticated as a user or the transcriber
+        file_id: File ID to play
+        range_header: Optional Range header
+        if_range: Optional If-Range header; the range is ignored unless it
+            matches the current ETag
+        if_none_match: Optional If-None-Match header
+        storage: Storage service
+        job_manager: Job manager service
+
+    Returns:
+        Full (200), partial (206) or unchanged (304) file content
+
+    Raises:
+        AuthenticationError: If the caller is not authenticated
+        ResourceNotFoundError: If file not found
+        AuthorizationError: If user not authorized
+        TranscriboError: If operation fails
+    """
+    try:
+        await _check_access(file_id, request, job_manager, "stream_media")
+        return await _file_response(
+            file_id,
+            storage,
+            "stream_media",
+            range_header,
+            if_range,
+            if_none_match=if_none_match,
+            max_range_size=MEDIA_MAX_RANGE_SIZE,
+            cache_control=MEDIA_CACHE_CONTROL
+        )
+
+    except (AuthenticationError, ResourceNotFoundError, AuthorizationError):
+        raise
+    except Exception as e:
+        error_context = {
+            "operation": "stream_media",
+            "resource_id": file_id,
+            "timestamp": datetime.utcnow(),
+            "details": {
+                "error": str(e),
+                "range": range_header
+            }
+        }
+        raise TranscriboError("Failed to stream media", details=error_context)
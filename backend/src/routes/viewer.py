@@ -58,7 +58,9 @@ async def get_viewer(
                 media_url = f"data:video/mp4;base64,{base64.b64encode(media_data).decode()}"
         
         if not media_url:
-            media_url = f"/api/v1/files/{job.file_id}/media"
+            # Served with range requests, so the player seeks without
+            # loading the whole file
+            media_url = await services["storage"].get_file_url(job.file_id)
 
         # Create viewer
         html_content = services["viewer"].create_viewer(
@@ -2,12 +2,16 @@
 
 import os
 import io
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from uuid import UUID
 from datetime import datetime
-from typing import Dict, Optional, Any, BinaryIO, Tuple
+from typing import AsyncIterator, Deque, Dict, Optional, Any, BinaryIO, Tuple, Union
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.backends import default_backend
+from cryptography.exceptions import InvalidTag
 from ..utils.logging import log_info, log_error, log_warning
 from ..utils.metrics import (
     track_encryption_operation,
@@ -17,10 +21,293 @@ from ..utils.metrics import (
 )
 from ..types import ErrorContext
 from ..utils.exceptions import EncryptionError
+from ..utils.segmented_encryption import (
+    DEFAULT_SEGMENT_SIZE,
+    HEADER_SIZE,
+    LEGACY_FORMAT,
+    SEGMENTED_FORMAT,
+    TAG_SIZE,
+    SegmentCipher,
+    SegmentError,
+    decrypt_segments,
+    encrypt_segments,
+    new_header,
+    segment_count
+)
 from .base import BaseService
 from .file_key_service import FileKeyService
 from ..config import config
 
+class EncryptingReader:
+    """Readable file object returning the encrypted form of a source.
+
+    Reads the source one chunk of whole segments at a time as the caller
+    reads, so a file of any size can be encrypted while it is being
+    uploaded. Chunks are sealed on a thread pool, up to window of them at
+    once, and returned in order. The output is in the segmented format:
+    header, then sealed segments. One chunk is read ahead to know which
+    segment is last.
+    """
+
+    def __init__(
+        self,
+        source: BinaryIO,
+        cipher: SegmentCipher,
+        executor: Executor,
+        chunk_size: int,
+        window: int = 1
+    ):
+        """Initialize reader.
+        
+        Args:
+            source: Plaintext file object
+            cipher: Segment cipher of the file
+            executor: Thread pool sealing chunks
+            chunk_size: Plaintext bytes per chunk, rounded down to whole
+                segments
+            window: Most chunks read but not yet returned
+        """
+        self.source = source
+        self.cipher = cipher
+        self.executor = executor
+        self.chunk_size = max(1, chunk_size // cipher.segment_size) * cipher.segment_size
+        self.window = max(1, window)
+        self.size = 0  # Plaintext bytes read so far
+        self._buffer = bytearray(cipher.header)
+        self._index = 0
+        self._chunk: Optional[bytes] = None
+        self._pending: Deque[Future] = deque()
+        self._finished = False
+
+    def _read_chunk(self) -> bytes:
+        """Read a chunk of plaintext, short only at the end of the source."""
+        data = self.source.read(self.chunk_size)
+        while data and len(data) < self.chunk_size:
+            more = self.source.read(self.chunk_size - len(data))
+            if not more:
+                break
+            data += more
+        return data
+
+    def _submit(self):
+        """Read the next chunk and start sealing it."""
+        if self._chunk is None:
+            self._chunk = self._read_chunk()
+        following = self._read_chunk() if len(self._chunk) == self.chunk_size else b""
+        last = not following
+        self._pending.append(self.executor.submit(
+            encrypt_segments, self.cipher, self._index, self._chunk, last
+        ))
+        self.size += len(self._chunk)
+        self._index += segment_count(len(self._chunk), self.cipher.segment_size)
+        self._chunk = following
+        self._finished = last
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes of encrypted output, or all of it if negative."""
+        while size < 0 or len(self._buffer) < size:
+            while not self._finished and len(self._pending) < self.window:
+                self._submit()
+            if not self._pending:
+                break
+            self._buffer += self._pending.popleft().result()
+
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        return data
+
+class SegmentedStreamDecryptor:
+    """Decrypts a file in the segmented format as its bytes arrive.
+
+    Bytes fed in are cut into runs of whole sealed segments that can be
+    decrypted on any thread and in any order. Each segment is
+    authenticated before it is returned. Whether a segment is the last one
+    is only known once more bytes follow it, so the last segment is held
+    back until finish(), which also detects a file cut short at a segment
+    boundary.
+    """
+
+    def __init__(self, key: bytes):
+        """Initialize decryptor.
+        
+        Args:
+            key: File encryption key
+        """
+        self._key = key
+        self._cipher: Optional[SegmentCipher] = None
+        self._pending = bytearray()
+        self._index = 0
+
+    def feed(self, data: bytes) -> Optional[Tuple[int, bytes]]:
+        """Take the next bytes of the file.
+        
+        Returns:
+            Tuple of (index of the first segment, sealed segments) that can
+            now be decrypted, or None
+            
+        Raises:
+            EncryptionError: If the header is malformed
+        """
+        self._pending += data
+        if self._cipher is None:
+            if len(self._pending) < HEADER_SIZE:
+                return None
+            try:
+                self._cipher = SegmentCipher(self._key, bytes(self._pending[:HEADER_SIZE]))
+            except SegmentError as e:
+                raise EncryptionError(str(e))
+            del self._pending[:HEADER_SIZE]
+
+        sealed_size = self._cipher.segment_size + TAG_SIZE
+        count = (len(self._pending) - 1) // sealed_size
+        if count <= 0:
+            return None
+        segments = bytes(self._pending[:count * sealed_size])
+        del self._pending[:count * sealed_size]
+        first_index, self._index = self._index, self._index + count
+        return first_index, segments
+
+    def finish(self) -> Tuple[int, bytes]:
+        """Take the last segment once the whole file was fed in.
+        
+        Raises:
+            EncryptionError: If the file ended within its header
+        """
+        if self._cipher is None:
+            raise EncryptionError("Invalid encrypted file format")
+        segments = bytes(self._pending)
+        self._pending.clear()
+        return self._index, segments
+
+    def decrypt(self, first_index: int, segments: bytes, last: bool = False) -> bytes:
+        """Decrypt segments taken by feed() or, with last set, finish().
+        
+        Raises:
+            EncryptionError: If a segment fails authentication
+        """
+        try:
+            return decrypt_segments(self._cipher, first_index, segments, last)
+        except SegmentError as e:
+            raise EncryptionError(str(e))
+
+    def update(self, data: bytes) -> bytes:
+        """Decrypt the next bytes of the file, returning what can be decrypted."""
+        segments = self.feed(data)
+        return self.decrypt(*segments) if segments else b""
+
+    def finalize(self) -> bytes:
+        """Decrypt the last segment once the whole file was fed in.
+        
+        Raises:
+            EncryptionError: If the file is truncated or fails authentication
+        """
+        return self.decrypt(*self.finish(), last=True)
+
+class GcmStreamDecryptor:
+    """Decrypts a file stored as a single AES-GCM stream as its bytes arrive.
+
+    Files encrypted before the segmented format have an IV, the
+    ciphertext, and one authentication tag at the end, so the last 16
+    bytes fed in are held back until finalize(). Plaintext returned before
+    then is not yet authenticated; if finalize() raises, everything
+    returned must be discarded.
+    """
+
+    def __init__(self, key: bytes):
+        """Initialize decryptor.
+        
+        Args:
+            key: File encryption key
+        """
+        self._key = key
+        self._decryptor: Any = None
+        self._pending = b""
+
+    def update(self, data: bytes) -> bytes:
+        """Decrypt the next bytes of the file, returning what can be decrypted."""
+        self._pending += data
+        if self._decryptor is None:
+            if len(self._pending) < 12:
+                return b""
+            iv, self._pending = self._pending[:12], self._pending[12:]
+            self._decryptor = Cipher(
+                algorithms.AES(self._key),
+                modes.GCM(iv),
+                backend=default_backend()
+            ).decryptor()
+        if len(self._pending) <= 16:
+            return b""
+        ciphertext, self._pending = self._pending[:-16], self._pending[-16:]
+        return self._decryptor.update(ciphertext)
+
+    def finalize(self) -> bytes:
+        """Check the authentication tag once the whole file was fed in.
+        
+        Raises:
+            EncryptionError: If the file is truncated or fails authentication
+        """
+        if self._decryptor is None or len(self._pending) != 16:
+            raise EncryptionError("Invalid encrypted file format")
+        try:
+            return self._decryptor.finalize_with_tag(self._pending)
+        except InvalidTag:
+            raise EncryptionError("File authentication failed")
+
+StreamDecryptor = Union[SegmentedStreamDecryptor, GcmStreamDecryptor]
+
+async def decrypt_chunks(
+    decryptor: StreamDecryptor,
+    chunks: AsyncIterator[bytes],
+    executor: Executor,
+    window: int = 1
+) -> AsyncIterator[bytes]:
+    """Decrypt a file arriving in chunks, yielding its content in order.
+    
+    Segmented files are decrypted on a thread pool, up to window chunks at
+    once; AES-GCM releases the GIL, so they use as many cores as the pool
+    has threads. A legacy single-stream file can only be decrypted in
+    order, one chunk at a time, but still off the event loop.
+    
+    Args:
+        decryptor: Decryptor of the file
+        chunks: Encrypted file in chunks
+        executor: Thread pool decrypting chunks
+        window: Most chunks decrypted but not yet yielded
+        
+    Raises:
+        EncryptionError: If the file is malformed or fails authentication
+    """
+    loop = asyncio.get_running_loop()
+    if not isinstance(decryptor, SegmentedStreamDecryptor):
+        async for data in chunks:
+            yield await loop.run_in_executor(executor, decryptor.update, data)
+        yield decryptor.finalize()
+        return
+
+    pending: Deque[asyncio.Future] = deque()
+    try:
+        async for data in chunks:
+            segments = decryptor.feed(data)
+            if segments:
+                pending.append(loop.run_in_executor(executor, decryptor.decrypt, *segments))
+            # Pass on finished chunks early, so the first bytes go out
+            # without waiting for the window to fill
+            while pending and (len(pending) >= window or pending[0].done()):
+                yield await pending.popleft()
+
+        pending.append(loop.run_in_executor(
+            executor, decryptor.decrypt, *decryptor.finish(), True
+        ))
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
 class EncryptionService(BaseService):
     """Service for file encryption operations."""
 
@@ -34,6 +321,15 @@ class EncryptionService(BaseService):
         self.config = config.storage.encryption
         self.key_service: Optional[FileKeyService] = None
         self.chunk_size = self.config.chunk_size_mb * 1024 * 1024  # Convert MB to bytes
+        self.segment_size = DEFAULT_SEGMENT_SIZE
+        self.workers = self.config.workers or os.cpu_count() or 1
+        self.window = max(1, self.config.max_inflight_chunks)
+        # Shared by all files, so concurrent transfers together use at
+        # most this many cores
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="encryption"
+        )
 
     async def _initialize_impl(self) -> None:
         """Initialize service implementation."""
@@ -54,6 +350,9 @@ class EncryptionService(BaseService):
 
             log_info("Encryption service initialized", {
                 "chunk_size": f"{self.config.chunk_size_mb}MB",
+                "segment_size": self.segment_size,
+                "workers": self.workers,
+                "max_inflight_chunks": self.window,
                 "algorithm": self.config.algorithm
             })
 
@@ -69,6 +368,10 @@ class EncryptionService(BaseService):
                 details=error_context
             )
 
+    async def _cleanup_impl(self) -> None:
+        """Clean up service implementation."""
+        self.executor.shutdown(wait=False)
+
     async def encrypt_file(
         self,
         file_id: UUID,
@@ -77,6 +380,9 @@ class EncryptionService(BaseService):
     ) -> None:
         """Encrypt a file using authenticated encryption.
         
+        The output is in the segmented format, whose segments can be
+        authenticated and decrypted independently.
+        
         Args:
             file_id: File ID for key lookup
             input_file: Input file object
@@ -92,45 +398,15 @@ class EncryptionService(BaseService):
             # Track operation
             track_encryption_operation('encrypt_file')
 
-            # Generate IV
-            iv = os.urandom(12)  # 96 bits for GCM
-
-            # Get encryption key
-            key = await self.key_service.get_key(file_id)
-            if not key:
-                key = await self.key_service.generate_key(file_id)
-
-            # Create cipher
-            cipher = Cipher(
-                algorithms.AES(key),
-                modes.GCM(iv),  # Use GCM for authenticated encryption
-                backend=default_backend()
-            )
-            encryptor = cipher.encryptor()
-
-            # Write IV
-            output_file.write(iv)
-
-            # Encrypt in chunks
-            file_size = 0
-            while True:
-                chunk = input_file.read(self.chunk_size)
-                if not chunk:
-                    break
-
-                file_size += len(chunk)
+            reader = await self.encrypt_stream(file_id, input_file)
 
-                # Encrypt chunk
-                encrypted_chunk = encryptor.update(chunk)
-                output_file.write(encrypted_chunk)
+            def copy():
+                for block in iter(lambda: reader.read(self.chunk_size), b''):
+                    output_file.write(block)
 
-            # Write final block and authentication tag
-            final_chunk = encryptor.finalize()
-            if final_chunk:
-                output_file.write(final_chunk)
-            
-            # Write authentication tag
-            output_file.write(encryptor.tag)
+            # Off the event loop; chunks are sealed on the thread pool
+            await asyncio.to_thread(copy)
+            file_size = reader.size
 
             # Track file size
             track_encryption_file_size(file_size)
@@ -163,11 +439,55 @@ class EncryptionService(BaseService):
             duration = (datetime.utcnow() - start_time).total_seconds()
             track_encryption_latency(duration, 'encrypt_file')
 
+    async def encrypt_stream(self, file_id: UUID, input_file: BinaryIO) -> EncryptingReader:
+        """Open a reader that encrypts a file while it is read.
+        
+        Args:
+            file_id: File ID for key lookup
+            input_file: Input file object
+            
+        Returns:
+            Reader returning the encrypted file
+            
+        Raises:
+            EncryptionError: If the file key cannot be obtained
+        """
+        self._check_initialized()
+
+        try:
+            # Get encryption key
+            key = await self.key_service.get_key(file_id)
+            if not key:
+                key = await self.key_service.generate_key(file_id)
+
+            cipher = SegmentCipher(key, new_header(self.segment_size))
+            return EncryptingReader(
+                input_file, cipher, self.executor, self.chunk_size, self.window
+            )
+
+        except Exception as e:
+            track_encryption_error('encrypt_stream')
+
+            error_context: ErrorContext = {
+                "operation": "encrypt_stream",
+                "timestamp": datetime.utcnow(),
+                "details": {
+                    "error": str(e),
+                    "file_id": str(file_id)
+                }
+            }
+            log_error(f"Failed to open encrypted stream for file {file_id}: {str(e)}")
+            raise EncryptionError(
+                f"Failed to open encrypted stream: {str(e)}",
+                details=error_context
+            )
+
     async def decrypt_file(
         self,
         file_id: UUID,
         input_file: BinaryIO,
-        output_file: BinaryIO
+        output_file: BinaryIO,
+        encryption_format: str = SEGMENTED_FORMAT
     ) -> None:
         """Decrypt a file using authenticated encryption.
         
@@ -175,6 +495,8 @@ class EncryptionService(BaseService):
             file_id: File ID for key lookup
             input_file: Input file object
             output_file: Output file object
+            encryption_format: SEGMENTED_FORMAT, or LEGACY_FORMAT for files
+                stored as a single AES-GCM stream
             
         Raises:
             EncryptionError: If decryption fails
@@ -186,57 +508,29 @@ class EncryptionService(BaseService):
             # Track operation
             track_encryption_operation('decrypt_file')
 
-            # Read IV
-            iv = input_file.read(12)  # 96 bits for GCM
-            if len(iv) != 12:
-                raise EncryptionError("Invalid encrypted file format")
-
-            # Get decryption key
-            key = await self.key_service.get_key(file_id)
-            if not key:
-                raise EncryptionError(f"No key found for file {file_id}")
-
-            # Create cipher
-            cipher = Cipher(
-                algorithms.AES(key),
-                modes.GCM(iv),
-                backend=default_backend()
-            )
-            decryptor = cipher.decryptor()
+            decryptor = await self.decrypt_stream(file_id, encryption_format)
 
-            # Read file into memory to get tag
-            data = input_file.read()
-            if len(data) < 16:  # At least 16 bytes for tag
-                raise EncryptionError("Invalid encrypted file format")
-
-            # Split data and tag
-            ciphertext = data[:-16]
-            tag = data[-16:]
+            # Decrypt in chunks
+            file_size = 0
 
-            # Set tag
-            decryptor.authenticate_additional_data(b"")
+            async def read_chunks():
+                nonlocal file_size
+                while True:
+                    chunk = await asyncio.to_thread(input_file.read, self.chunk_size)
+                    if not chunk:
+                        return
+                    file_size += len(chunk)
+                    yield chunk
 
-            # Decrypt in chunks
-            file_size = len(ciphertext)
-            pos = 0
-            while pos < file_size:
-                chunk = ciphertext[pos:pos + self.chunk_size]
-                decrypted_chunk = decryptor.update(chunk)
-                output_file.write(decrypted_chunk)
-                pos += len(chunk)
-
-            # Verify tag and finalize
-            decryptor.authenticate_additional_data(b"")
-            decryptor.tag = tag
-            final_chunk = decryptor.finalize()
-            if final_chunk:
-                output_file.write(final_chunk)
+            async for data in self.decrypt_chunks(decryptor, read_chunks()):
+                output_file.write(data)
 
             # Track file size
             track_encryption_file_size(file_size)
 
             log_info(f"Decrypted file {file_id}", {
                 "size": file_size,
+                "format": encryption_format,
                 "chunks": (file_size + self.chunk_size - 1) // self.chunk_size
             })
 
@@ -263,20 +557,122 @@ class EncryptionService(BaseService):
             duration = (datetime.utcnow() - start_time).total_seconds()
             track_encryption_latency(duration, 'decrypt_file')
 
+    async def decrypt_stream(
+        self,
+        file_id: UUID,
+        encryption_format: str = SEGMENTED_FORMAT
+    ) -> StreamDecryptor:
+        """Open a decryptor for a file that is read in pieces.
+        
+        Args:
+            file_id: File ID for key lookup
+            encryption_format: SEGMENTED_FORMAT, or LEGACY_FORMAT for files
+                stored as a single AES-GCM stream
+            
+        Returns:
+            Decryptor to feed the encrypted file through
+            
+        Raises:
+            EncryptionError: If no key is found for the file or the format
+                is unknown
+        """
+        self._check_initialized()
+
+        if encryption_format not in (SEGMENTED_FORMAT, LEGACY_FORMAT):
+            raise EncryptionError(f"Unknown encryption format: {encryption_format}")
+
+        key = await self._get_key(file_id, 'decrypt_stream')
+        if encryption_format == LEGACY_FORMAT:
+            return GcmStreamDecryptor(key)
+        return SegmentedStreamDecryptor(key)
+
+    async def decrypt_range(
+        self,
+        file_id: UUID,
+        header: bytes,
+        first_index: int,
+        segments: bytes,
+        last: bool
+    ) -> bytes:
+        """Decrypt consecutive segments read from anywhere in a file.
+        
+        Args:
+            file_id: File ID for key lookup
+            header: Header of the file
+            first_index: Index of the first segment
+            segments: Sealed segments
+            last: Whether the final segment is the last of the file
+            
+        Returns:
+            Plaintext of the segments
+            
+        Raises:
+            EncryptionError: If no key is found for the file, the header is
+                malformed or a segment fails authentication
+        """
+        self._check_initialized()
+
+        key = await self._get_key(file_id, 'decrypt_range')
+        try:
+            cipher = SegmentCipher(key, header)
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, decrypt_segments, cipher, first_index, segments, last
+            )
+        except SegmentError as e:
+            raise EncryptionError(str(e))
+
+    async def _get_key(self, file_id: UUID, operation: str) -> bytes:
+        """Get the key of a file that is to be decrypted.
+        
+        Raises:
+            EncryptionError: If no key is found for the file
+        """
+        key = await self.key_service.get_key(file_id)
+        if not key:
+            error_context: ErrorContext = {
+                "operation": operation,
+                "timestamp": datetime.utcnow(),
+                "details": {
+                    "error": "No key found",
+                    "file_id": str(file_id)
+                }
+            }
+            log_error(f"No key found for file {file_id}")
+            raise EncryptionError(f"No key found for file {file_id}", details=error_context)
+        return key
+
+    def decrypt_chunks(
+        self,
+        decryptor: StreamDecryptor,
+        chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        """Decrypt a file arriving in chunks on the service's thread pool.
+        
+        Args:
+            decryptor: Decryptor from decrypt_stream
+            chunks: Encrypted file in chunks
+            
+        Returns:
+            Iterator over the file content, in order
+        """
+        return decrypt_chunks(decryptor, chunks, self.executor, self.window)
+
     async def rotate_file_key(
         self,
         file_id: UUID,
         input_file: BinaryIO,
-        output_file: BinaryIO
+        output_file: BinaryIO,
+        encryption_format: str = SEGMENTED_FORMAT
     ) -> None:
         """Rotate encryption key for a file.
         
-        This re-encrypts the file with a new key.
+        This re-encrypts the file with a new key, in the segmented format.
         
         Args:
             file_id: File ID to rotate key for
             input_file: Input file object
             output_file: Output file object
+            encryption_format: Format the input file is in
             
         Raises:
             EncryptionError: If key rotation fails
@@ -292,7 +688,7 @@ class EncryptionService(BaseService):
             temp_buffer = io.BytesIO()
 
             # Decrypt with old key
-            await self.decrypt_file(file_id, input_file, temp_buffer)
+            await self.decrypt_file(file_id, input_file, temp_buffer, encryption_format)
 
             # Rotate key
             await self.key_service.rotate_key(file_id)
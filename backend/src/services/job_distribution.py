@@ -1,22 +1,202 @@
 """Job distribution service."""
 
-import logging
-from datetime import datetime
-from typing import Optional, List
+import asyncio
+import asyncpg
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, List
 from ..utils.logging import log_info, log_error, log_warning
 from ..utils.metrics import (
-    QUEUE_SIZE,
-    QUEUE_WAIT_TIME,
-    WORKER_COUNT,
-    track_queue_metrics
+    track_queue_size,
+    track_queue_latency,
+    track_job_lease
 )
 
+# Channel the jobs table notifies when a job becomes pending
+JOB_AVAILABLE_CHANNEL = 'job_available'
+
+# Queue label for metrics
+QUEUE_NAME = 'transcription'
+
+# JSONB columns of claimed jobs, decoded for the worker
+JSON_COLUMNS = ('metadata', 'options')
+
+CLAIM_JOBS_QUERY = """
+    WITH next_jobs AS (
+        SELECT id FROM jobs
+        WHERE status = 'pending'
+        AND (next_retry_at IS NULL OR next_retry_at <= NOW())
+        ORDER BY priority DESC, created_at
+        LIMIT $2
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE jobs
+    SET
+        status = 'processing',
+        locked_by = $1,
+        locked_at = NOW(),
+        lease_expires_at = NOW() + make_interval(secs => $3)
+    FROM next_jobs
+    WHERE jobs.id = next_jobs.id
+    RETURNING
+        jobs.*,
+        COALESCE(
+            (SELECT options FROM job_options WHERE job_options.job_id = jobs.id),
+            '{}'::jsonb
+        ) AS options
+"""
+
+CLAIM_JOB_QUERY = """
+    WITH next_job AS (
+        SELECT id FROM jobs
+        WHERE id = $1 AND status = 'pending'
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE jobs
+    SET
+        status = 'processing',
+        locked_by = $2,
+        locked_at = NOW(),
+        lease_expires_at = NOW() + make_interval(secs => $3)
+    FROM next_job
+    WHERE jobs.id = next_job.id
+    RETURNING jobs.id
+"""
+
+RENEW_LEASE_QUERY = """
+    UPDATE jobs
+    SET lease_expires_at = NOW() + make_interval(secs => $3)
+    WHERE id = $1 AND locked_by = $2 AND status = 'processing'
+    RETURNING lease_expires_at
+"""
+
+RELEASE_JOB_QUERY = """
+    UPDATE jobs
+    SET
+        status = CASE WHEN status = 'processing' THEN 'pending' ELSE status END,
+        locked_by = NULL,
+        locked_at = NULL,
+        lease_expires_at = NULL
+    WHERE id = $1 AND locked_by = $2
+    RETURNING status
+"""
+
+COMPLETE_JOB_QUERY = """
+    UPDATE jobs
+    SET
+        status = 'completed',
+        progress = 100.0,
+        error_message = NULL,
+        completed_at = NOW(),
+        locked_by = NULL,
+        locked_at = NULL,
+        lease_expires_at = NULL,
+        updated_at = NOW()
+    WHERE id = $1 AND locked_by = $2 AND status = 'processing'
+    RETURNING status
+"""
+
+# A failed attempt counts as a retry, with the same backoff as an
+# expired lease, so a job that always fails is not requeued forever
+FAIL_JOB_QUERY = """
+    UPDATE jobs
+    SET
+        status = CASE
+            WHEN retry_count + 1 < max_retries THEN 'pending'
+            ELSE 'failed'
+        END,
+        error_message = $3,
+        retry_count = retry_count + 1,
+        next_retry_at = CASE
+            WHEN retry_count + 1 < max_retries THEN NOW() + (INTERVAL '1 minute' * POWER(2, retry_count))
+            ELSE NULL
+        END,
+        locked_by = NULL,
+        locked_at = NULL,
+        lease_expires_at = NULL,
+        updated_at = NOW()
+    WHERE id = $1 AND locked_by = $2 AND status = 'processing'
+    RETURNING status
+"""
+
+# Park a job while its chunks are processed, if the worker still holds it
+FAN_OUT_PARENT_QUERY = """
+    UPDATE jobs
+    SET
+        status = 'waiting',
+        metadata = COALESCE(metadata, '{}'::jsonb)
+            || jsonb_build_object('stage', 'map', 'child_jobs', $3::jsonb),
+        locked_by = NULL,
+        locked_at = NULL,
+        lease_expires_at = NULL,
+        updated_at = NOW()
+    WHERE id = $1 AND locked_by = $2 AND status = 'processing'
+    RETURNING id
+"""
+
+# Chunk jobs inherit the parent's file, owner, priority and options
+INSERT_CHUNK_JOB_QUERY = """
+    INSERT INTO jobs (id, file_id, user_id, status, priority, max_retries, metadata)
+    SELECT
+        $1, file_id, user_id, 'pending', priority, max_retries,
+        (COALESCE(metadata, '{}'::jsonb) - 'child_jobs' - 'stage')
+            || jsonb_build_object('parent_job_id', id::text, 'chunk', $3::jsonb)
+    FROM jobs
+    WHERE id = $2
+"""
+
+CHUNK_JOBS_QUERY = """
+    SELECT id, status, metadata->'chunk' AS chunk
+    FROM jobs
+    WHERE metadata->>'parent_job_id' = $1::text
+    AND metadata ? 'chunk'
+    ORDER BY (metadata->'chunk'->>'index')::int
+"""
+
+# Cancel an unfinished job and the chunk jobs it was split into; the
+# workers holding them learn of it when renewing their leases
+CANCEL_JOB_QUERY = """
+    UPDATE jobs
+    SET
+        status = 'cancelled',
+        cancelled_at = NOW(),
+        updated_at = NOW()
+    WHERE (id = $1 OR (metadata->>'parent_job_id' = $1::text AND metadata ? 'chunk'))
+    AND status NOT IN ('completed', 'failed', 'cancelled')
+    RETURNING id
+"""
+
 class JobDistributionService:
-    """Service for distributing jobs to workers."""
+    """Service for distributing jobs to workers.
+
+    Workers pull jobs rather than having them pushed. A claim locks the
+    next pending rows with FOR UPDATE SKIP LOCKED, so concurrent workers
+    never receive the same job, and grants a lease the worker renews with
+    heartbeats. Leases that are not renewed expire and their jobs are
+    requeued. Idle workers long-poll claim_jobs(), which wakes on the
+    job_available notification instead of polling the table. A worker
+    reports each job it finishes as completed or failed; failures are
+    retried with backoff up to the job's max_retries.
+
+    A worker holding a long job can split it into chunk jobs that any
+    worker claims. The job waits until all chunks have completed and is
+    then requeued for its reduce stage, which merges the chunk results.
+    """
 
-    def __init__(self, settings):
-        """Initialize job distribution service."""
+    def __init__(self, settings, pool: Optional[asyncpg.Pool] = None):
+        """Initialize job distribution service.
+
+        Args:
+            settings: Service settings
+            pool: Optional existing connection pool to share
+        """
         self.settings = settings
+        self.pool = pool
+        self._owns_pool = pool is None
+        self._listener: Optional[asyncpg.Connection] = None
+        self._job_available = asyncio.Event()
+        self._reaper_task: Optional[asyncio.Task] = None
         self.initialized = False
 
     async def initialize(self):
@@ -29,6 +209,23 @@ class JobDistributionService:
             self.poll_interval = float(self.settings.get('poll_interval', 5.0))
             self.batch_size = int(self.settings.get('batch_size', 10))
             self.retry_limit = int(self.settings.get('retry_limit', 3))
+            self.lease_seconds = float(self.settings.get('lease_seconds', 120.0))
+            self.reaper_interval = float(self.settings.get('lease_reaper_interval', 30.0))
+
+            if self.pool is None:
+                database_url = self.settings.get('database_url')
+                if not database_url:
+                    raise ValueError("Database URL not configured")
+                self.pool = await asyncpg.create_pool(dsn=database_url)
+
+            # Dedicated connection so notifications are not lost when
+            # pooled connections are recycled
+            self._listener = await self.pool.acquire()
+            await self._listener.add_listener(
+                JOB_AVAILABLE_CHANNEL, self._on_job_available
+            )
+
+            self._reaper_task = asyncio.create_task(self._reap_expired_leases())
 
             self.initialized = True
             log_info("Job distribution service initialized")
@@ -40,6 +237,25 @@ class JobDistributionService:
     async def cleanup(self):
         """Clean up the service."""
         try:
+            if self._reaper_task:
+                self._reaper_task.cancel()
+                try:
+                    await self._reaper_task
+                except asyncio.CancelledError:
+                    pass
+                self._reaper_task = None
+
+            if self._listener:
+                await self._listener.remove_listener(
+                    JOB_AVAILABLE_CHANNEL, self._on_job_available
+                )
+                await self.pool.release(self._listener)
+                self._listener = None
+
+            if self.pool and self._owns_pool:
+                await self.pool.close()
+                self.pool = None
+
             self.initialized = False
             log_info("Job distribution service cleaned up")
 
@@ -47,26 +263,133 @@ class JobDistributionService:
             log_error(f"Error during job distribution service cleanup: {str(e)}")
             raise
 
+    async def claim_jobs(
+        self,
+        worker_id: str,
+        limit: int = 1,
+        wait: float = 0.0
+    ) -> List[dict]:
+        """Claim pending jobs for a worker, waiting up to wait seconds for one.
+
+        Args:
+            worker_id: ID of the claiming worker
+            limit: Maximum number of jobs to claim
+            wait: Seconds to wait for a job if none is pending
+
+        Returns:
+            Claimed jobs, each leased to the worker for lease_seconds
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + wait
+            limit = max(1, min(limit, self.batch_size))
+
+            while True:
+                # Clear before querying so a notification arriving after
+                # the query still wakes the wait below
+                self._job_available.clear()
+                jobs = await self._fetch_jobs(worker_id, limit)
+                if jobs:
+                    break
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+
+                # Poll interval bounds the wait in case a notification is
+                # missed, e.g. for retries whose backoff has elapsed
+                try:
+                    await asyncio.wait_for(
+                        self._job_available.wait(),
+                        min(remaining, self.poll_interval)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+            now = datetime.now(timezone.utc)
+            for job in jobs:
+                track_queue_latency(QUEUE_NAME, (now - job['created_at']).total_seconds())
+                track_job_lease('claimed')
+
+            if jobs:
+                log_info(f"Worker {worker_id} claimed {len(jobs)} jobs")
+            return [self._serialize(job) for job in jobs]
+
+        except Exception as e:
+            log_error(f"Error claiming jobs for worker {worker_id}: {str(e)}")
+            raise
+
+    async def renew_lease(self, job_id: str, worker_id: str) -> Optional[datetime]:
+        """Extend a worker's lease on a job.
+
+        Returns:
+            New lease expiry, or None if the worker no longer holds the job
+        """
+        try:
+            async with self.pool.acquire() as conn:
+                expires_at = await conn.fetchval(
+                    RENEW_LEASE_QUERY, job_id, worker_id, self.lease_seconds
+                )
+
+            if expires_at is None:
+                track_job_lease('lost')
+                log_warning(f"Worker {worker_id} no longer holds job {job_id}")
+            else:
+                track_job_lease('renewed')
+            return expires_at
+
+        except Exception as e:
+            log_error(f"Error renewing lease on job {job_id} for worker {worker_id}: {str(e)}")
+            raise
+
+    async def cancel_job(self, job_id: str) -> int:
+        """Cancel a job and its chunk jobs unless they have finished.
+
+        Workers keep their leases on cancelled jobs until they stop
+        processing; renewing such a lease reports the cancellation.
+
+        Returns:
+            Number of jobs cancelled
+        """
+        try:
+            async with self.pool.acquire() as conn:
+                cancelled = await conn.fetch(CANCEL_JOB_QUERY, job_id)
+
+            if cancelled:
+                log_info(f"Cancelled job {job_id}", {"jobs": len(cancelled)})
+            return len(cancelled)
+
+        except Exception as e:
+            log_error(f"Error cancelling job {job_id}: {str(e)}")
+            raise
+
+    async def is_cancelled(self, job_id: str) -> bool:
+        """Check whether a job has been cancelled."""
+        async with self.pool.acquire() as conn:
+            status = await conn.fetchval("SELECT status FROM jobs WHERE id = $1", job_id)
+        return status == 'cancelled'
+
     async def get_available_jobs(self, worker_id: str, limit: int = 10) -> List[dict]:
-        """Get available jobs for a worker."""
+        """Get available jobs for a worker without claiming them."""
         try:
             # Track queue metrics
             queue_size = await self._get_queue_size()
-            QUEUE_SIZE.set(queue_size)
-            WORKER_COUNT.inc()
+            track_queue_size(QUEUE_NAME, queue_size)
 
-            # Get jobs
-            jobs = await self._fetch_jobs(limit)
-            
-            # Track wait time for jobs
-            for job in jobs:
-                created_at = datetime.fromisoformat(job['created_at'])
-                wait_time = (datetime.utcnow() - created_at).total_seconds()
-                QUEUE_WAIT_TIME.observe(wait_time)
-                track_queue_metrics(wait_time, len(jobs))
+            async with self.pool.acquire() as conn:
+                jobs = await conn.fetch(
+                    """
+                    SELECT * FROM jobs
+                    WHERE status = 'pending'
+                    AND (next_retry_at IS NULL OR next_retry_at <= NOW())
+                    ORDER BY priority DESC, created_at
+                    LIMIT $1
+                    """,
+                    limit
+                )
 
             log_info(f"Retrieved {len(jobs)} jobs for worker {worker_id}")
-            return jobs
+            return [self._serialize(job) for job in jobs]
 
         except Exception as e:
             log_error(f"Error getting available jobs: {str(e)}")
@@ -77,12 +400,13 @@ class JobDistributionService:
         try:
             # Attempt to assign job
             assigned = await self._try_assign_job(job_id, worker_id)
-            
+
             if assigned:
+                track_job_lease('claimed')
                 log_info(f"Job {job_id} assigned to worker {worker_id}")
             else:
                 log_warning(f"Failed to assign job {job_id} to worker {worker_id}")
-            
+
             return assigned
 
         except Exception as e:
@@ -90,7 +414,12 @@ class JobDistributionService:
             raise
 
     async def release_job(self, job_id: str, worker_id: str):
-        """Release a job from a worker."""
+        """Release a job from a worker.
+
+        A job still processing is returned to the queue without counting
+        a retry, e.g. when the worker shuts down. Workers report jobs that
+        ended with finish_job(), which also releases the lease.
+        """
         try:
             await self._release_job(job_id, worker_id)
             log_info(f"Job {job_id} released from worker {worker_id}")
@@ -99,22 +428,191 @@ class JobDistributionService:
             log_error(f"Error releasing job {job_id} from worker {worker_id}: {str(e)}")
             raise
 
+    async def finish_job(
+        self,
+        job_id: str,
+        worker_id: str,
+        status: str,
+        error: Optional[str] = None
+    ) -> Optional[str]:
+        """Record how a job held by a worker ended and release its lease.
+
+        A completed job is finished. A failed job is requeued with backoff
+        until it runs out of retries, then failed for good.
+
+        Args:
+            job_id: ID of the job
+            worker_id: ID of the worker holding the job
+            status: Outcome, "completed" or "failed"
+            error: Error message of a failed job
+
+        Returns:
+            The job's new status, or None if the worker no longer holds the job
+        """
+        if status not in ('completed', 'failed'):
+            raise ValueError(f"Invalid job outcome: {status}")
+
+        try:
+            async with self.pool.acquire() as conn:
+                if status == 'completed':
+                    new_status = await conn.fetchval(COMPLETE_JOB_QUERY, job_id, worker_id)
+                else:
+                    new_status = await conn.fetchval(
+                        FAIL_JOB_QUERY, job_id, worker_id, error
+                    )
+
+            if new_status is None:
+                track_job_lease('lost')
+                log_warning(f"Worker {worker_id} no longer holds job {job_id}")
+            else:
+                track_job_lease('released')
+                log_info(
+                    f"Job {job_id} {status} on worker {worker_id}",
+                    {"status": new_status}
+                )
+            return new_status
+
+        except Exception as e:
+            log_error(f"Error finishing job {job_id} for worker {worker_id}: {str(e)}")
+            raise
+
+    async def fan_out_job(
+        self,
+        job_id: str,
+        worker_id: str,
+        chunks: List[Dict[str, float]]
+    ) -> Optional[List[str]]:
+        """Split a job held by a worker into pending chunk jobs.
+
+        The job's lease is released and it waits with stage "map" until
+        every chunk job has completed; the database then requeues it with
+        stage "reduce". A chunk job that fails for good fails the job.
+
+        Args:
+            job_id: ID of the job to split
+            worker_id: ID of the worker holding the job
+            chunks: Chunk windows in order, each with start and end seconds
+
+        Returns:
+            Chunk job IDs in order, or None if the worker no longer holds the job
+        """
+        try:
+            child_ids = [str(uuid.uuid4()) for _ in chunks]
+
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    parked = await conn.fetchval(
+                        FAN_OUT_PARENT_QUERY, job_id, worker_id, json.dumps(child_ids)
+                    )
+                    if parked is None:
+                        track_job_lease('lost')
+                        log_warning(f"Worker {worker_id} no longer holds job {job_id}")
+                        return None
+
+                    await conn.executemany(
+                        INSERT_CHUNK_JOB_QUERY,
+                        [
+                            (child_id, job_id, json.dumps({"index": i, **chunk}))
+                            for i, (child_id, chunk) in enumerate(zip(child_ids, chunks))
+                        ]
+                    )
+
+            track_job_lease('released')
+            log_info(
+                f"Job {job_id} split into {len(child_ids)} chunk jobs by worker {worker_id}"
+            )
+            return child_ids
+
+        except Exception as e:
+            log_error(f"Error splitting job {job_id} into chunks: {str(e)}")
+            raise
+
+    async def get_chunk_jobs(self, job_id: str) -> List[Dict[str, Any]]:
+        """Get the chunk jobs of a split job in order.
+
+        Returns:
+            Chunk jobs with their ID, status and chunk window
+        """
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(CHUNK_JOBS_QUERY, job_id)
+
+            return [
+                {
+                    "id": str(row["id"]),
+                    "status": row["status"],
+                    "chunk": json.loads(row["chunk"])
+                }
+                for row in rows
+            ]
+
+        except Exception as e:
+            log_error(f"Error getting chunk jobs of job {job_id}: {str(e)}")
+            raise
+
+    async def requeue_expired_leases(self) -> int:
+        """Requeue jobs whose lease expired, failing those out of retries."""
+        async with self.pool.acquire() as conn:
+            requeued = await conn.fetchval("SELECT requeue_expired_job_leases()")
+
+        if requeued:
+            for _ in range(requeued):
+                track_job_lease('expired')
+            log_warning(f"Requeued {requeued} jobs with expired leases")
+        return requeued
+
+    async def _reap_expired_leases(self):
+        """Periodically requeue jobs of workers that stopped heartbeating."""
+        while True:
+            await asyncio.sleep(self.reaper_interval)
+            try:
+                await self.requeue_expired_leases()
+                track_queue_size(QUEUE_NAME, await self._get_queue_size())
+            except Exception as e:
+                log_error(f"Error requeuing expired leases: {str(e)}")
+
+    def _on_job_available(self, connection, pid, channel, payload):
+        """Wake workers waiting for a job."""
+        self._job_available.set()
+
     async def _get_queue_size(self) -> int:
         """Get current queue size."""
-        # Implementation would query database for pending jobs
-        return 0
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'pending'"
+            )
 
-    async def _fetch_jobs(self, limit: int) -> List[dict]:
-        """Fetch available jobs from queue."""
-        # Implementation would fetch jobs from database
-        return []
+    async def _fetch_jobs(self, worker_id: str, limit: int) -> List[asyncpg.Record]:
+        """Claim up to limit pending jobs in priority order."""
+        async with self.pool.acquire() as conn:
+            return await conn.fetch(
+                CLAIM_JOBS_QUERY, worker_id, limit, self.lease_seconds
+            )
 
     async def _try_assign_job(self, job_id: str, worker_id: str) -> bool:
         """Try to assign a job to a worker."""
-        # Implementation would update job assignment in database
-        return True
+        async with self.pool.acquire() as conn:
+            claimed = await conn.fetchval(
+                CLAIM_JOB_QUERY, job_id, worker_id, self.lease_seconds
+            )
+        return claimed is not None
 
     async def _release_job(self, job_id: str, worker_id: str):
         """Release a job assignment."""
-        # Implementation would update job status in database
-        pass
+        async with self.pool.acquire() as conn:
+            status = await conn.fetchval(RELEASE_JOB_QUERY, job_id, worker_id)
+        if status is not None:
+            track_job_lease('released')
+
+    def _serialize(self, record: asyncpg.Record) -> Dict[str, Any]:
+        """Convert a job row into JSON-compatible values."""
+        job = dict(record)
+        for key, value in job.items():
+            if key in JSON_COLUMNS and isinstance(value, str):
+                # JSONB comes back as text without a codec on the pool
+                job[key] = json.loads(value)
+            elif isinstance(value, datetime):
+                job[key] = value.isoformat()
+            elif value is not None and not isinstance(value, (str, int, float, bool, dict, list)):
+                job[key] = str(value)
+        return job
@@ -2,18 +2,30 @@
 
 import io
 import os
+import time
 import asyncio
+import hashlib
 from datetime import datetime
-from typing import Dict, Optional, BinaryIO, List, Tuple
+from typing import AsyncIterator, Dict, Optional, BinaryIO, List, Tuple
 from uuid import UUID
 from minio import Minio
 from minio.error import S3Error
-from minio.commonconfig import ENABLED, Filter
+from minio.commonconfig import ENABLED, Filter, Tags
 from minio.lifecycleconfig import LifecycleConfig, Rule, Expiration
 from minio.sseconfig import SseConfig, Rule as SseRule
 from minio.versioningconfig import VersioningConfig
 from urllib3.exceptions import MaxRetryError
 from ..utils.logging import log_info, log_error, log_warning
+from ..utils.segmented_encryption import (
+    DEFAULT_SEGMENT_SIZE,
+    HEADER_SIZE,
+    LEGACY_FORMAT,
+    SEGMENTED_FORMAT,
+    TAG_SIZE,
+    content_size as segmented_content_size,
+    segment_count,
+    segment_offset
+)
 from ..utils.hash_verification import calculate_data_hash, verify_file_hash, HashVerificationError
 from ..utils.metrics import (
     STORAGE_OPERATIONS,
@@ -23,7 +35,8 @@ from ..utils.metrics import (
     track_storage_operation,
     track_storage_error,
     track_storage_size,
-    track_storage_latency
+    track_storage_latency,
+    track_storage_upload_part
 )
 from ..utils.exceptions import (
     StorageError,
@@ -35,12 +48,98 @@ from ..utils.exceptions import (
     StorageFileNotFoundError,
     StorageFileCorruptedError,
     StorageMetadataError,
+    EncryptionError,
     ConfigurationError
 )
 from .base import BaseService
-from .encryption import EncryptionService
+from .encryption import EncryptionService, StreamDecryptor
 from .provider import service_provider
 from ..config import config
+from ..constants import API_V1_PREFIX
+
+# Bytes added by legacy whole-file AES-GCM encryption: 12 byte IV and 16 byte tag
+GCM_OVERHEAD = 12 + 16
+
+# Bytes read from MinIO at a time when streaming a file
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Smallest part S3 accepts in a multipart upload, except for the last
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+class UploadStream:
+    """Readable file object passing a source through to an upload.
+
+    The MinIO client reads one part at a time from it, so the bytes are
+    hashed and counted on their way through rather than afterwards. Each
+    time a part's worth has been read, the rate since the previous part is
+    tracked; the client reads the next part only once an upload slot is
+    free, so this follows the upload throughput.
+    """
+
+    def __init__(self, source: BinaryIO, part_size: int):
+        """Initialize upload stream.
+        
+        Args:
+            source: File object to upload
+            part_size: Bytes per part of the upload
+        """
+        self.source = source
+        self.part_size = part_size
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._part_bytes = 0
+        self._part_started: Optional[float] = None
+
+    @property
+    def hash(self) -> str:
+        """Get the SHA-256 of the bytes read so far."""
+        return self._hash.hexdigest()
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes from the source."""
+        if self._part_started is None:
+            self._part_started = time.monotonic()
+
+        data = self.source.read(size)
+        self._hash.update(data)
+        self.size += len(data)
+        self._part_bytes += len(data)
+
+        if self._part_bytes >= self.part_size or (not data and self._part_bytes):
+            now = time.monotonic()
+            track_storage_upload_part(self._part_bytes, now - self._part_started)
+            self._part_started, self._part_bytes = now, 0
+        return data
+
+def _read_exact(response, size: int) -> bytes:
+    """Read size bytes of an object, fewer only at its end."""
+    data = response.read(size)
+    while data and len(data) < size:
+        more = response.read(size - len(data))
+        if not more:
+            break
+        data += more
+    return data
+
+async def _response_chunks(response) -> AsyncIterator[bytes]:
+    """Yield the body of an open object response, closing it afterwards."""
+    if response is None:
+        return
+    try:
+        while True:
+            data = await asyncio.to_thread(response.read, STREAM_CHUNK_SIZE)
+            if not data:
+                break
+            yield data
+    finally:
+        response.close()
+        response.release_conn()
+
+def _read_chunk(response, digest) -> bytes:
+    """Read and hash the next chunk of an object, empty at its end."""
+    data = response.read(STREAM_CHUNK_SIZE)
+    digest.update(data)
+    return data
 
 class StorageService(BaseService):
     """Service for managing file storage using MinIO."""
@@ -55,6 +154,8 @@ class StorageService(BaseService):
         self.config = config.storage
         self.minio_client: Optional[Minio] = None
         self.encryption_service: Optional[EncryptionService] = None
+        self.part_size = max(self.config.upload_part_size_mb * 1024 * 1024, MIN_PART_SIZE)
+        self.parallel_parts = max(1, self.config.upload_parallel_parts)
 
     async def _initialize_impl(self) -> None:
         """Initialize service implementation."""
@@ -201,6 +302,52 @@ class StorageService(BaseService):
             else:
                 raise StorageOperationError(str(e), details=error_context)
 
+    async def _stored_hash(self, object_name: str, metadata: Dict) -> Optional[str]:
+        """Get the hash of a stored object's content.
+        
+        Objects stored whole carry it in their metadata; streamed uploads
+        record it in an object tag once the upload is complete.
+        """
+        if 'hash' in metadata:
+            return metadata['hash']
+        tags = await asyncio.to_thread(
+            self.minio_client.get_object_tags,
+            self.config.bucket_name,
+            object_name
+        )
+        return tags.get('hash') if tags else None
+
+    async def _expected_hash(
+        self,
+        object_name: str,
+        metadata: Dict,
+        decrypt: bool
+    ) -> Optional[str]:
+        """Get the hash a read of a stored object is verified against.
+        
+        A missing hash never counts as verified. Segmented objects read
+        with decryption are authenticated by the AEAD tag of each segment,
+        which also detects segments cut off, reordered or moved between
+        files, so they are read without a hash, e.g. before their hash tag
+        has been set; the hash is still checked when present. Any other
+        object without a hash cannot be verified and is refused.
+        
+        Returns:
+            Hash to verify the object against, or None for segmented
+            objects authenticated by their segment tags
+            
+        Raises:
+            HashVerificationError: If the object has no hash and is not
+                authenticated otherwise
+        """
+        expected_hash = await self._stored_hash(object_name, metadata)
+        if expected_hash:
+            return expected_hash
+        encrypted = metadata.get('encrypted', 'false').lower() == 'true'
+        if decrypt and encrypted and self.encryption_format(metadata) == SEGMENTED_FORMAT:
+            return None
+        raise HashVerificationError(f"Object {object_name} has no hash to verify it against")
+
     async def store_file(
         self,
         file_id: UUID,
@@ -239,40 +386,54 @@ class StorageService(BaseService):
                 'encrypted': str(encrypt).lower()
             })
 
-            # Create temporary buffer
-            temp_buffer = io.BytesIO()
-
-            # Encrypt if needed
+            # Encrypt while uploading if needed
             if encrypt:
-                await self.encryption_service.encrypt_file(
-                    file_id=file_id,
-                    input_file=file,
-                    output_file=temp_buffer
-                )
-                temp_buffer.seek(0)
-                data = temp_buffer.read()
+                source = await self.encryption_service.encrypt_stream(file_id, file)
+                meta['encryption_format'] = SEGMENTED_FORMAT
+                meta['segment_size'] = str(source.cipher.segment_size)
             else:
-                data = file.read()
-
-            # Calculate hash
-            file_hash = calculate_data_hash(data)
-            meta['hash'] = file_hash
-            meta['hash_algorithm'] = 'sha256'
+                source = file
+            stream = UploadStream(source, self.part_size)
 
-            # Store in MinIO
+            # Stream to MinIO; of unknown length, so uploaded in parts and
+            # holding at most a few parts in memory
             object_name = f"files/{file_id}"
-            data_size = len(data)
-            data_stream = io.BytesIO(data)
-
-            await asyncio.to_thread(
+            meta['hash_algorithm'] = 'sha256'
+            written = await asyncio.to_thread(
                 self.minio_client.put_object,
                 self.config.bucket_name,
                 object_name,
-                data_stream,
-                data_size,
-                metadata=meta
+                stream,
+                -1,
+                metadata=meta,
+                part_size=self.part_size,
+                num_parallel_uploads=self.parallel_parts
             )
 
+            # The hash is only known once the upload is complete, and
+            # metadata cannot be changed without copying the object, so it
+            # is recorded in a tag on the version just written. Until the
+            # tag is set, reads of the object find no hash: segmented
+            # objects are still authenticated by their segment tags, and
+            # other objects are refused (see _expected_hash). A version
+            # that cannot be tagged is removed rather than left behind.
+            file_hash = stream.hash
+            data_size = stream.size
+            version_id = getattr(written, 'version_id', None)
+            tags = Tags.new_object_tags()
+            tags['hash'] = file_hash
+            try:
+                await asyncio.to_thread(
+                    self.minio_client.set_object_tags,
+                    self.config.bucket_name,
+                    object_name,
+                    tags,
+                    version_id=version_id
+                )
+            except Exception:
+                await self._remove_untagged(file_id, object_name, version_id)
+                raise
+
             # Track metrics
             track_storage_size(data_size)
 
@@ -289,7 +450,7 @@ class StorageService(BaseService):
                 'hash': file_hash,
                 'hash_algorithm': 'sha256',
                 'encrypted': encrypt,
-                'metadata': meta
+                'metadata': {**meta, 'hash': file_hash}
             }
 
         except Exception as e:
@@ -317,6 +478,27 @@ class StorageService(BaseService):
             else:
                 raise StorageError(str(e), details=error_context)
 
+    async def _remove_untagged(
+        self,
+        file_id: UUID,
+        object_name: str,
+        version_id: Optional[str]
+    ) -> None:
+        """Remove an uploaded object version whose hash could not be recorded.
+        
+        The bucket is versioned, so the version itself is deleted; removing
+        the object by name would only hide it behind a delete marker.
+        """
+        try:
+            await asyncio.to_thread(
+                self.minio_client.remove_object,
+                self.config.bucket_name,
+                object_name,
+                version_id=version_id
+            )
+        except Exception as e:
+            log_error(f"Failed to remove untagged upload of file {file_id}: {str(e)}")
+
     async def get_file(
         self,
         file_id: UUID,
@@ -324,6 +506,10 @@ class StorageService(BaseService):
     ) -> Tuple[BinaryIO, Dict]:
         """Get a file and its metadata.
         
+        The content is verified against its stored hash; a file without
+        one is refused unless it is in the segmented format and decrypted,
+        see _expected_hash.
+        
         Args:
             file_id: File ID
             decrypt: Whether to decrypt the file (defaults to True if encrypted)
@@ -360,10 +546,13 @@ class StorageService(BaseService):
             data = await asyncio.to_thread(response.read)
             data_stream = io.BytesIO(data)
 
-            # Verify hash if present
-            if 'hash' in metadata:
+            # Verify hash
+            expected_hash = await self._expected_hash(
+                object_name, metadata, encrypted and (decrypt is None or decrypt)
+            )
+            if expected_hash:
                 file_hash = calculate_data_hash(data)
-                if file_hash != metadata['hash']:
+                if file_hash != expected_hash:
                     raise HashVerificationError("File hash verification failed")
 
             # Decrypt if needed
@@ -373,7 +562,8 @@ class StorageService(BaseService):
                 await self.encryption_service.decrypt_file(
                     file_id=file_id,
                     input_file=data_stream,
-                    output_file=decrypted_buffer
+                    output_file=decrypted_buffer,
+                    encryption_format=self.encryption_format(metadata)
                 )
                 decrypted_buffer.seek(0)
                 result = decrypted_buffer
@@ -415,6 +605,450 @@ class StorageService(BaseService):
             else:
                 raise StorageError(str(e), details=error_context)
 
+    async def stream_file(
+        self,
+        file_id: UUID,
+        decrypt: Optional[bool] = None
+    ) -> Tuple[Optional[AsyncIterator[bytes]], Dict]:
+        """Open a file to read its content chunk by chunk.
+        
+        Only the response headers are awaited before returning, so the
+        first chunk is available as soon as MinIO sends it, whatever the
+        file size. Chunks are hashed and decrypted as they arrive; the hash
+        and authentication tag can only be checked after the last one, so a
+        mismatch raises from the iterator and everything received must be
+        discarded. Files that cannot be verified are refused, see
+        _expected_hash.
+        
+        Args:
+            file_id: File ID
+            decrypt: Whether to decrypt the file (defaults to True if encrypted)
+            
+        Returns:
+            Tuple of (chunk iterator, metadata), or (None, {}) if not found
+            
+        Raises:
+            StorageError: If the file cannot be opened
+        """
+        try:
+            # Track operation
+            track_storage_operation('stream')
+
+            object_name = f"files/{file_id}"
+            try:
+                response = await asyncio.to_thread(
+                    self.minio_client.get_object,
+                    self.config.bucket_name,
+                    object_name
+                )
+            except S3Error as e:
+                if e.code == 'NoSuchKey':
+                    return None, {}
+                raise
+
+            try:
+                metadata = response.metadata or {}
+                encrypted = metadata.get('encrypted', 'false').lower() == 'true'
+                decrypting = encrypted and (decrypt is None or decrypt)
+                expected_hash = await self._expected_hash(object_name, metadata, decrypting)
+                decryptor = None
+                if decrypting:
+                    decryptor = await self.encryption_service.decrypt_stream(
+                        file_id, self.encryption_format(metadata)
+                    )
+            except Exception:
+                response.close()
+                response.release_conn()
+                raise
+
+            chunks = self._stream_chunks(file_id, response, expected_hash, decryptor)
+            return chunks, metadata
+
+        except Exception as e:
+            track_storage_error()
+            error_context = {
+                "operation": "stream_file",
+                "timestamp": datetime.utcnow(),
+                "details": {
+                    "error": str(e),
+                    "file_id": str(file_id)
+                }
+            }
+            log_error(f"Failed to open file {file_id}: {str(e)}")
+            if isinstance(e, S3Error):
+                if 'AccessDenied' in str(e):
+                    raise StorageAuthenticationError(str(e), details=error_context)
+                else:
+                    raise StorageOperationError(str(e), details=error_context)
+            elif isinstance(e, HashVerificationError):
+                raise StorageFileCorruptedError(str(e), details=error_context)
+            else:
+                raise StorageError(str(e), details=error_context)
+
+    async def _stream_chunks(
+        self,
+        file_id: UUID,
+        response,
+        expected_hash: Optional[str],
+        decryptor: Optional[StreamDecryptor]
+    ) -> AsyncIterator[bytes]:
+        """Yield the content of an open object, verifying it at the end."""
+        start_time = datetime.utcnow()
+        digest = hashlib.sha256()
+        size = 0
+
+        async def stored_chunks():
+            while True:
+                data = await asyncio.to_thread(_read_chunk, response, digest)
+                if not data:
+                    break
+                yield data
+            # Checked before a decryptor gives out the last segment
+            if expected_hash and digest.hexdigest() != expected_hash:
+                raise HashVerificationError("File hash verification failed")
+
+        try:
+            chunks = stored_chunks()
+            if decryptor:
+                chunks = self.encryption_service.decrypt_chunks(decryptor, chunks)
+            async for data in chunks:
+                size += len(data)
+                if data:
+                    yield data
+
+            # Track metrics
+            track_storage_size(size)
+            duration = (datetime.utcnow() - start_time).total_seconds()
+            track_storage_latency(duration)
+
+            log_info(f"Streamed file {file_id} ({size} bytes)")
+
+        except Exception as e:
+            track_storage_error()
+            error_context = {
+                "operation": "stream_file",
+                "timestamp": datetime.utcnow(),
+                "details": {
+                    "error": str(e),
+                    "file_id": str(file_id),
+                    "bytes_streamed": size
+                }
+            }
+            log_error(f"Failed to stream file {file_id}: {str(e)}")
+            if isinstance(e, (HashVerificationError, EncryptionError)):
+                raise StorageFileCorruptedError(str(e), details=error_context)
+            raise StorageError(str(e), details=error_context)
+
+        finally:
+            response.close()
+            response.release_conn()
+
+    async def get_file_range(
+        self,
+        file_id: UUID,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> Tuple[bytes, int, Dict]:
+        """Get a byte range of a file's content.
+        
+        Reads the range as stream_file_range does, into memory; use that
+        for ranges that may be large.
+        
+        Args:
+            file_id: File ID
+            start: First byte of the range
+            end: Last byte of the range (inclusive), or None for the rest
+            
+        Returns:
+            Tuple of (range data, total content size, metadata)
+            
+        Raises:
+            StorageError: If retrieval fails
+        """
+        chunks, total_size, metadata = await self.stream_file_range(file_id, start, end)
+        data = b"".join([chunk async for chunk in chunks])
+        return data, total_size, metadata
+
+    async def stream_file_range(
+        self,
+        file_id: UUID,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> Tuple[AsyncIterator[bytes], int, Dict]:
+        """Open a byte range of a file to read it chunk by chunk.
+        
+        Unencrypted objects are read with a ranged request, so only the
+        range is transferred. For objects in the segmented format only the
+        header and the segments overlapping the range are read, then
+        authenticated and decrypted a chunk at a time. Legacy encrypted
+        objects are decrypted from the start and read to the end, so their
+        hash and tag are checked; the last chunk of the range is held back
+        until then. Segments of the other formats are authenticated on
+        their own, without the whole-file hash. Ranges of unencrypted
+        objects are not verified at all; a whole-file hash cannot be
+        checked on part of the file.
+        
+        Args:
+            file_id: File ID
+            start: First byte of the range
+            end: Last byte of the range (inclusive), or None for the rest
+            
+        Returns:
+            Tuple of (chunk iterator, total content size, metadata)
+            
+        Raises:
+            StorageError: If the file cannot be opened
+        """
+        try:
+            # Track operation
+            track_storage_operation('get_range')
+
+            object_name = f"files/{file_id}"
+            stat = await asyncio.to_thread(
+                self.minio_client.stat_object,
+                self.config.bucket_name,
+                object_name
+            )
+            metadata = stat.metadata or {}
+            encrypted = metadata.get('encrypted', 'false').lower() == 'true'
+            skip = 0
+            drain = False
+
+            if encrypted and self.encryption_format(metadata) == SEGMENTED_FORMAT:
+                segment_size = int(metadata.get('segment_size', DEFAULT_SEGMENT_SIZE))
+                total_size = segmented_content_size(stat.size, segment_size)
+                last = total_size - 1 if end is None else min(end, total_size - 1)
+                chunks = await self._open_segments(
+                    file_id, object_name, stat.size, segment_size, start, last
+                )
+                skip = start - (start // segment_size) * segment_size
+            elif encrypted:
+                total_size = max(0, stat.size - GCM_OVERHEAD)
+                last = total_size - 1 if end is None else min(end, total_size - 1)
+                chunks, metadata = await self.stream_file(file_id, decrypt=True)
+                if chunks is None:
+                    raise StorageFileNotFoundError(f"File {file_id} not found")
+                skip = start
+                drain = True
+            else:
+                total_size = stat.size
+                last = total_size - 1 if end is None else min(end, total_size - 1)
+                response = await self._open_object_range(
+                    object_name, start, max(0, last - start + 1)
+                )
+                chunks = _response_chunks(response)
+
+            size = max(0, last - start + 1)
+            return self._range_chunks(file_id, chunks, skip, size, drain), total_size, metadata
+
+        except StorageError:
+            raise
+        except Exception as e:
+            track_storage_error()
+            error_context = {
+                "operation": "stream_file_range",
+                "timestamp": datetime.utcnow(),
+                "details": {
+                    "error": str(e),
+                    "file_id": str(file_id),
+                    "start": start,
+                    "end": end
+                }
+            }
+            log_error(f"Failed to open range of file {file_id}: {str(e)}")
+            if isinstance(e, S3Error):
+                if e.code == 'NoSuchKey':
+                    raise StorageFileNotFoundError(str(e), details=error_context)
+                elif 'AccessDenied' in str(e):
+                    raise StorageAuthenticationError(str(e), details=error_context)
+                else:
+                    raise StorageOperationError(str(e), details=error_context)
+            else:
+                raise StorageError(str(e), details=error_context)
+
+    async def _range_chunks(
+        self,
+        file_id: UUID,
+        chunks: AsyncIterator[bytes],
+        skip: int,
+        size: int,
+        drain: bool = False
+    ) -> AsyncIterator[bytes]:
+        """Yield size bytes of content chunks after skipping skip bytes.
+        
+        With drain set, the chunks are read to the end and the last bytes
+        of the range are held back until then, so they only go out once
+        the file has been verified.
+        """
+        start_time = datetime.utcnow()
+        remaining = size
+        held = b""
+        try:
+            async for data in chunks:
+                if skip >= len(data):
+                    skip -= len(data)
+                    continue
+                data = data[skip:skip + remaining]
+                skip = 0
+                if data:
+                    remaining -= len(data)
+                    if drain:
+                        if held:
+                            yield held
+                        held = data
+                    else:
+                        yield data
+                if not remaining and not drain:
+                    break
+            if held:
+                yield held
+
+            # Track metrics
+            track_storage_size(size - remaining)
+            duration = (datetime.utcnow() - start_time).total_seconds()
+            track_storage_latency(duration)
+
+        except StorageError:
+            raise
+        except Exception as e:
+            track_storage_error()
+            error_context = {
+                "operation": "stream_file_range",
+                "timestamp": datetime.utcnow(),
+                "details": {
+                    "error": str(e),
+                    "file_id": str(file_id),
+                    "bytes_streamed": size - remaining
+                }
+            }
+            log_error(f"Failed to stream range of file {file_id}: {str(e)}")
+            if isinstance(e, EncryptionError):
+                # Segments failing authentication were altered or cut short
+                raise StorageFileCorruptedError(str(e), details=error_context)
+            raise StorageError(str(e), details=error_context)
+
+        finally:
+            await chunks.aclose()
+
+    async def _open_object_range(self, object_name: str, offset: int, length: int):
+        """Open a ranged read of length bytes of a stored object from offset."""
+        if length <= 0:
+            return None
+        return await asyncio.to_thread(
+            self.minio_client.get_object,
+            self.config.bucket_name,
+            object_name,
+            offset=offset,
+            length=length
+        )
+
+    async def _open_segments(
+        self,
+        file_id: UUID,
+        object_name: str,
+        object_size: int,
+        segment_size: int,
+        start: int,
+        last: int
+    ) -> AsyncIterator[bytes]:
+        """Open the segments of a segmented object holding bytes start to last.
+        
+        Only those segments are fetched, with one ranged request. The header
+        is needed to open them; unless the range begins in the first
+        segment, it is read first with a request of its own.
+        
+        Returns:
+            Iterator over the content of the segments
+        """
+        if last < start:
+            return _response_chunks(None)
+        first_index = start // segment_size
+        last_index = last // segment_size
+        offset = segment_offset(first_index, segment_size)
+        length = min(segment_offset(last_index + 1, segment_size), object_size) - offset
+
+        if first_index == 0:
+            response = await self._open_object_range(object_name, 0, offset + length)
+            try:
+                header = await asyncio.to_thread(_read_exact, response, HEADER_SIZE)
+            except Exception:
+                response.close()
+                response.release_conn()
+                raise
+        else:
+            header_response = await self._open_object_range(object_name, 0, HEADER_SIZE)
+            try:
+                header = await asyncio.to_thread(_read_exact, header_response, HEADER_SIZE)
+            finally:
+                header_response.close()
+                header_response.release_conn()
+            response = await self._open_object_range(object_name, offset, length)
+
+        final_index = segment_count(
+            segmented_content_size(object_size, segment_size), segment_size
+        ) - 1
+        return self._decrypt_segments(
+            file_id, response, header, segment_size, first_index, last_index, final_index
+        )
+
+    async def _decrypt_segments(
+        self,
+        file_id: UUID,
+        response,
+        header: bytes,
+        segment_size: int,
+        first_index: int,
+        last_index: int,
+        final_index: int
+    ) -> AsyncIterator[bytes]:
+        """Yield the content of segments read from an open response."""
+        sealed_size = segment_size + TAG_SIZE
+        batch = max(1, STREAM_CHUNK_SIZE // segment_size)
+        index = first_index
+        try:
+            while index <= last_index:
+                count = min(batch, last_index - index + 1)
+                data = await asyncio.to_thread(_read_exact, response, count * sealed_size)
+                yield await self.encryption_service.decrypt_range(
+                    file_id, header, index, data, index + count - 1 == final_index
+                )
+                index += count
+        finally:
+            response.close()
+            response.release_conn()
+
+    def encryption_format(self, metadata: Dict) -> str:
+        """Get the encryption format of a stored object from its metadata.
+        
+        Objects stored before the segmented format carry no marker.
+        """
+        return metadata.get('encryption_format', LEGACY_FORMAT)
+
+    def content_size(self, info: Dict) -> int:
+        """Get the size of a file's content from its stored object info."""
+        if not info.get('encrypted'):
+            return info['size']
+        metadata = info.get('metadata', {})
+        if self.encryption_format(metadata) == SEGMENTED_FORMAT:
+            return segmented_content_size(
+                info['size'], int(metadata.get('segment_size', DEFAULT_SEGMENT_SIZE))
+            )
+        return max(0, info['size'] - GCM_OVERHEAD)
+
+    def supports_ranges(self, metadata: Dict) -> bool:
+        """Check whether ranges of a stored file are read without reading it whole."""
+        if metadata.get('encrypted', 'false').lower() != 'true':
+            return True
+        return self.encryption_format(metadata) == SEGMENTED_FORMAT
+
+    async def get_file_url(self, file_id: UUID) -> str:
+        """Get the URL media players load a file's content from.
+        
+        Files are served by the API rather than from MinIO directly, since
+        stored objects may be encrypted.
+        """
+        return f"{API_V1_PREFIX}/files/{file_id}/media"
+
     async def delete_file(self, file_id: UUID) -> bool:
         """Delete a file.
         
@@ -513,7 +1147,7 @@ class StorageService(BaseService):
                 'file_id': str(file_id),
                 'path': f"minio://{self.config.bucket_name}/{object_name}",
                 'size': stat.size,
-                'hash': metadata.get('hash'),
+                'hash': await self._stored_hash(object_name, metadata),
                 'hash_algorithm': metadata.get('hash_algorithm'),
                 'encrypted': metadata.get('encrypted', 'false').lower() == 'true',
                 'created_at': metadata.get('created_at'),
@@ -183,9 +183,12 @@ class TranscriptionService(BaseService):
             # Get transcription file path
             file_path = self._get_transcription_path(file_id)
             
-            # Convert transcription to JSON
+            # Convert transcription to compact JSON; results with word
+            # timings are large and only read by machines
             try:
-                data = json.dumps(transcription, ensure_ascii=False, indent=2).encode('utf-8')
+                data = json.dumps(
+                    transcription, ensure_ascii=False, separators=(',', ':')
+                ).encode('utf-8')
             except Exception as e:
                 raise TranscriptionError(f"Invalid transcription data: {str(e)}")
             
@@ -225,6 +228,56 @@ class TranscriptionService(BaseService):
             log_error(f"Error saving transcription for file {file_id}: {str(e)}")
             raise TranscriptionError("Failed to save transcription", details=error_context)
 
+    async def save_chunk_results(
+        self,
+        job_id: JobID,
+        transcription: TranscriptionData
+    ) -> None:
+        """Save the result of a chunk job until its parent job is merged.
+        
+        Args:
+            job_id: Chunk job ID
+            transcription: Chunk result with window, turns and raw segments
+            
+        Raises:
+            TranscriptionError: If the result cannot be saved
+        """
+        await self.save_transcription(self._chunk_key(job_id), transcription)
+
+    async def get_chunk_results(self, job_id: JobID) -> TranscriptionData:
+        """Get the result of a chunk job.
+        
+        Args:
+            job_id: Chunk job ID
+            
+        Returns:
+            Chunk result
+            
+        Raises:
+            TranscriptionError: If the result cannot be read
+        """
+        return await self.get_transcription(self._chunk_key(job_id))
+
+    async def delete_chunk_results(self, job_ids: List[JobID]) -> None:
+        """Delete chunk results once their parent job has been merged.
+        
+        Failures are logged; leftover results do not affect the merged job.
+        
+        Args:
+            job_ids: Chunk job IDs
+        """
+        for job_id in job_ids:
+            try:
+                await self.storage.delete_file(
+                    str(self._get_transcription_path(self._chunk_key(job_id)))
+                )
+            except Exception as e:
+                log_warning(f"Failed to delete result of chunk job {job_id}: {str(e)}")
+
+    def _chunk_key(self, job_id: JobID) -> str:
+        """Get the key chunk job results are stored under."""
+        return f"chunk-{job_id}"
+
     def _get_transcription_path(self, file_id: FileID) -> Path:
         """Get path for transcription file.
         
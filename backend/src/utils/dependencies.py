@@ -84,6 +84,7 @@ def get_service(service_type: Type[ServiceType]) -> ServiceType:
 from ..services.database import DatabaseService
 from ..services.storage import StorageService
 from ..services.job_manager import JobManager
+from ..services.job_distribution import JobDistributionService
 from ..services.transcription import TranscriptionService
 from ..services.tag_service import TagService
 from ..services.vocabulary import VocabularyService
@@ -106,6 +107,11 @@ JobManagerDep = Annotated[
     Depends(get_service(JobManager))
 ]
 
+JobDistributionDep = Annotated[
+    JobDistributionService,
+    Depends(get_service(JobDistributionService))
+]
+
 TranscriptionServiceDep = Annotated[
     TranscriptionService,
     Depends(get_service(TranscriptionService))
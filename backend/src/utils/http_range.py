@@ -0,0 +1,55 @@
+"""HTTP Range header utilities."""
+
+from typing import Optional, Tuple
+
+class RangeNotSatisfiableError(ValueError):
+    """Requested range lies outside the content."""
+
+def parse_range_header(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single-range Range header against a content size.
+
+    Args:
+        header: Range header value, e.g. "bytes=0-1023", "bytes=1024-" or "bytes=-512"
+        size: Total content size in bytes
+
+    Returns:
+        Tuple of (first byte, last byte) inclusive, or None to serve the
+        whole content (no header, unsupported unit or multiple ranges)
+
+    Raises:
+        RangeNotSatisfiableError: If the range starts beyond the content
+    """
+    if not header:
+        return None
+
+    unit, _, spec = header.strip().partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+
+    first, sep, last = spec.strip().partition('-')
+    if not sep:
+        return None
+
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        return None
+
+    if start is None:
+        # Suffix range: the last N bytes
+        if end is None:
+            return None
+        if end <= 0:
+            raise RangeNotSatisfiableError(header)
+        return max(0, size - end), size - 1
+
+    if end is not None and start > end:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(header)
+    return start, size - 1 if end is None else min(end, size - 1)
+
+def content_range(start: int, end: int, size: int) -> str:
+    """Format a Content-Range header value."""
+    return f"bytes {start}-{end}/{size}"
@@ -48,6 +48,12 @@ STORAGE_USAGE = Gauge(
     ["type"]
 )
 
+STORAGE_UPLOAD_PART_THROUGHPUT = Histogram(
+    "transcribo_storage_upload_part_bytes_per_second",
+    "Rate at which parts of streamed uploads were handed to storage",
+    buckets=[1e6, 5e6, 10e6, 25e6, 50e6, 100e6, 250e6, 500e6, 1e9]
+)
+
 # Operation metrics
 OPERATION_DURATION = Histogram(
     "transcribo_operation_duration_seconds",
@@ -96,6 +102,12 @@ JOB_STATUS = Counter(
     ["type", "status"]
 )
 
+JOB_LEASES = Counter(
+    "transcribo_job_leases_total",
+    "Worker job lease events",
+    ["event"]  # claimed, renewed, lost, released or expired
+)
+
 def track_error(error_type: str, severity: str):
     """Track error occurrence.
     
@@ -153,6 +165,16 @@ def track_storage_usage(storage_type: str, bytes_used: int):
     """
     STORAGE_USAGE.labels(type=storage_type).set(bytes_used)
 
+def track_storage_upload_part(size: int, duration: float):
+    """Track throughput of one part of a streamed upload.
+    
+    Args:
+        size: Part size in bytes
+        duration: Seconds the part took
+    """
+    if duration > 0:
+        STORAGE_UPLOAD_PART_THROUGHPUT.observe(size / duration)
+
 def track_operation_duration(operation: str, duration: float):
     """Track operation duration.
     
@@ -213,6 +235,14 @@ def track_job_status(job_type: str, status: str):
         status=status
     ).inc()
 
+def track_job_lease(event: str):
+    """Track worker job lease event.
+    
+    Args:
+        event: Lease event (claimed, renewed, lost, released or expired)
+    """
+    JOB_LEASES.labels(event=event).inc()
+
 def get_resource_metrics() -> Dict[str, Any]:
     """Get current resource metrics.
     
@@ -0,0 +1,166 @@
+"""Transcription result decoding utilities.
+
+The transcriber uploads results either as plain JSON or in a compact
+encoding: gzip-compressed JSON with one array per segment (and word)
+field, timestamps in integer milliseconds and the full text omitted when
+it is the segment texts joined by spaces. The word column "count" gives
+the number of words of each segment, null for segments without a words
+list.
+"""
+
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+COMPACT_RESULTS_MEDIA_TYPE = "application/vnd.transcribo.results+json"
+COMPACT_RESULTS_VERSION = 1
+JSON_MEDIA_TYPE = "application/json"
+
+# Fields holding times in seconds, stored as integer milliseconds
+TIME_FIELDS = ("start", "end")
+
+# Upper bound on a decoded result, so a small compressed body cannot
+# expand without limit
+MAX_RESULT_BYTES = 256 * 1024 * 1024
+
+class ResultDecodingError(ValueError):
+    """Result body is malformed or too large."""
+
+class UnsupportedEncodingError(ResultDecodingError):
+    """Result body uses an unknown content type or encoding."""
+
+async def read_body(
+    chunks: AsyncIterator[bytes],
+    content_encoding: Optional[str] = None,
+    max_size: int = MAX_RESULT_BYTES
+) -> bytes:
+    """Read a request body, decompressing it as it arrives.
+
+    Args:
+        chunks: Body chunks
+        content_encoding: Content-Encoding header value (gzip or identity)
+        max_size: Maximum decoded size in bytes
+
+    Returns:
+        Decoded body
+
+    Raises:
+        UnsupportedEncodingError: If the encoding is not supported
+        ResultDecodingError: If the body is malformed or too large
+    """
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding not in ("gzip", "identity"):
+        raise UnsupportedEncodingError(f"Unsupported content encoding: {encoding}")
+
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding == "gzip" else None
+    body = bytearray()
+    try:
+        async for chunk in chunks:
+            if decompressor:
+                # Bound each step so a small compressed chunk cannot
+                # expand past the limit in memory
+                body += decompressor.decompress(chunk, max_size + 1 - len(body))
+                while decompressor.unconsumed_tail and len(body) <= max_size:
+                    body += decompressor.decompress(
+                        decompressor.unconsumed_tail, max_size + 1 - len(body)
+                    )
+            else:
+                body += chunk
+            if len(body) > max_size:
+                raise ResultDecodingError(f"Result exceeds {max_size} bytes")
+        if decompressor:
+            body += decompressor.flush()
+            if not decompressor.eof:
+                raise ResultDecodingError("Truncated gzip body")
+    except zlib.error as e:
+        raise ResultDecodingError(f"Invalid gzip body: {str(e)}")
+    return bytes(body)
+
+def _from_columns(columns: Dict[str, Any]) -> List[Dict]:
+    """Turn one list per field back into a list of objects."""
+    columns = dict(columns)
+    words = columns.pop("words", None)
+    if words is not None:
+        words = dict(words)
+        word_counts = words.pop("count")
+        size = len(word_counts)
+    else:
+        size = len(next(iter(columns.values()), []))
+
+    rows: List[Dict] = [{} for _ in range(size)]
+    for field, values in columns.items():
+        scale = field in TIME_FIELDS
+        for row, value in zip(rows, values):
+            if value is not None:
+                row[field] = value / 1000 if scale else value
+
+    if words is not None:
+        # A null count marks a row that had no words list
+        word_rows = iter(_from_columns(words))
+        for row, count in zip(rows, word_counts):
+            if count is not None:
+                row["words"] = [next(word_rows) for _ in range(count)]
+    return rows
+
+def from_compact(compact: Dict) -> Dict:
+    """Convert a compact result to the plain layout.
+
+    Raises:
+        ResultDecodingError: If the result is not in a known compact layout
+    """
+    if compact.get("version") != COMPACT_RESULTS_VERSION:
+        raise ResultDecodingError(
+            f"Unsupported result encoding version: {compact.get('version')}"
+        )
+
+    try:
+        results = {
+            key: value for key, value in compact.items()
+            if key not in ("version", "segments", "text_from_segments")
+        }
+        results["segments"] = _from_columns(compact["segments"])
+    except (KeyError, TypeError, AttributeError, StopIteration) as e:
+        raise ResultDecodingError(f"Malformed compact result: {str(e)}")
+
+    if compact.get("text_from_segments"):
+        results["text"] = " ".join(
+            segment.get("text", "") for segment in results["segments"]
+        )
+    return results
+
+async def decode_results(
+    chunks: AsyncIterator[bytes],
+    content_type: Optional[str],
+    content_encoding: Optional[str] = None,
+    max_size: int = MAX_RESULT_BYTES
+) -> Dict:
+    """Decode an uploaded transcription result.
+
+    Args:
+        chunks: Body chunks
+        content_type: Content-Type header value
+        content_encoding: Content-Encoding header value
+        max_size: Maximum decoded size in bytes
+
+    Returns:
+        Result in the plain layout
+
+    Raises:
+        UnsupportedEncodingError: If the content type or encoding is not supported
+        ResultDecodingError: If the body is malformed or too large
+    """
+    media_type = (content_type or JSON_MEDIA_TYPE).split(";")[0].strip().lower()
+    if media_type not in (JSON_MEDIA_TYPE, COMPACT_RESULTS_MEDIA_TYPE):
+        raise UnsupportedEncodingError(f"Unsupported content type: {media_type}")
+
+    body = await read_body(chunks, content_encoding, max_size)
+    try:
+        results = json.loads(body)
+    except ValueError as e:
+        raise ResultDecodingError(f"Invalid JSON: {str(e)}")
+    if not isinstance(results, dict):
+        raise ResultDecodingError("Result must be a JSON object")
+
+    if media_type == COMPACT_RESULTS_MEDIA_TYPE:
+        return from_compact(results)
+    return results
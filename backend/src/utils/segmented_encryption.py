@@ -0,0 +1,193 @@
+"""Segmented authenticated encryption format for stored files.
+
+A file is encrypted as a header followed by fixed-size segments, each
+sealed with AES-GCM on its own, so any segment can be authenticated and
+decrypted without reading the rest of the file:
+
+    header   magic "TSEG", version (1 byte), segment size (4 bytes,
+             big endian), random nonce prefix (7 bytes)
+    segment  ciphertext of up to segment-size plaintext bytes, then its
+             16 byte tag
+
+The nonce of segment i is the prefix, i as 4 bytes big endian and a byte
+that is 1 for the last segment and 0 otherwise. The header is the
+additional data of every segment, so it cannot be altered, segments
+cannot be reordered, and a file cut short at a segment boundary fails
+because its last segment was not sealed as last. An empty file is one
+empty last segment.
+"""
+
+import os
+import struct
+from typing import Tuple
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# Object metadata value marking files in this format; objects without
+# the marker hold a single AES-GCM stream (IV, ciphertext, tag)
+SEGMENTED_FORMAT = "aes-gcm-segmented-v1"
+LEGACY_FORMAT = "aes-gcm"
+
+MAGIC = b"TSEG"
+VERSION = 1
+NONCE_PREFIX_SIZE = 7
+HEADER_SIZE = len(MAGIC) + 1 + 4 + NONCE_PREFIX_SIZE
+TAG_SIZE = 16
+
+# Plaintext bytes per segment; small enough that a range read fetches
+# little more than it needs
+DEFAULT_SEGMENT_SIZE = 64 * 1024
+
+# Segment indexes are 4 bytes in the nonce
+MAX_SEGMENTS = 2 ** 32
+
+class SegmentError(ValueError):
+    """Encrypted data is malformed or fails authentication."""
+
+def new_header(segment_size: int = DEFAULT_SEGMENT_SIZE) -> bytes:
+    """Create the header of a new file with a fresh nonce prefix."""
+    return (
+        MAGIC
+        + struct.pack(">BI", VERSION, segment_size)
+        + os.urandom(NONCE_PREFIX_SIZE)
+    )
+
+def parse_header(header: bytes) -> Tuple[int, bytes]:
+    """Parse a file header.
+
+    Returns:
+        Tuple of (segment size, nonce prefix)
+
+    Raises:
+        SegmentError: If the header is malformed
+    """
+    if len(header) != HEADER_SIZE or not header.startswith(MAGIC):
+        raise SegmentError("Invalid encrypted file header")
+    version, segment_size = struct.unpack(">BI", header[len(MAGIC):len(MAGIC) + 5])
+    if version != VERSION:
+        raise SegmentError(f"Unsupported encrypted file version: {version}")
+    if segment_size <= 0:
+        raise SegmentError("Invalid segment size")
+    return segment_size, header[len(MAGIC) + 5:]
+
+def segment_nonce(prefix: bytes, index: int, last: bool) -> bytes:
+    """Get the nonce of a segment."""
+    if index >= MAX_SEGMENTS:
+        raise SegmentError("Too many segments")
+    return prefix + struct.pack(">IB", index, 1 if last else 0)
+
+def segment_count(content_size: int, segment_size: int) -> int:
+    """Get the number of segments of a file of the given plaintext size."""
+    return max(1, -(-content_size // segment_size))
+
+def encrypted_size(content_size: int, segment_size: int) -> int:
+    """Get the encrypted size of a file of the given plaintext size."""
+    return HEADER_SIZE + content_size + TAG_SIZE * segment_count(content_size, segment_size)
+
+def content_size(size: int, segment_size: int) -> int:
+    """Get the plaintext size of an encrypted file of the given size."""
+    sealed = max(0, size - HEADER_SIZE)
+    segments = max(1, -(-sealed // (segment_size + TAG_SIZE)))
+    return max(0, sealed - TAG_SIZE * segments)
+
+def segment_offset(index: int, segment_size: int) -> int:
+    """Get the offset of a segment in the encrypted file."""
+    return HEADER_SIZE + index * (segment_size + TAG_SIZE)
+
+class SegmentCipher:
+    """Seals and opens the segments of one encrypted file."""
+
+    def __init__(self, key: bytes, header: bytes):
+        """Initialize segment cipher.
+
+        Args:
+            key: AES key of the file
+            header: File header
+
+        Raises:
+            SegmentError: If the header is malformed
+        """
+        self.segment_size, self._prefix = parse_header(header)
+        self.header = header
+        self._aead = AESGCM(key)
+
+    def encrypt(self, index: int, plaintext: bytes, last: bool) -> bytes:
+        """Seal a segment of at most segment_size bytes."""
+        return self._aead.encrypt(
+            segment_nonce(self._prefix, index, last), plaintext, self.header
+        )
+
+    def decrypt(self, index: int, segment: bytes, last: bool) -> bytes:
+        """Open a segment.
+
+        Raises:
+            SegmentError: If the segment is not the given one of this file
+        """
+        if len(segment) < TAG_SIZE or len(segment) > self.segment_size + TAG_SIZE:
+            raise SegmentError(f"Invalid size of segment {index}")
+        try:
+            return self._aead.decrypt(
+                segment_nonce(self._prefix, index, last), segment, self.header
+            )
+        except InvalidTag:
+            raise SegmentError(f"Segment {index} failed authentication")
+
+def encrypt_segments(cipher: SegmentCipher, first_index: int, data: bytes, last: bool) -> bytes:
+    """Seal consecutive segments of data.
+
+    Args:
+        cipher: Segment cipher of the file
+        first_index: Index of the first segment
+        data: Plaintext of whole segments, except that the last may be short
+        last: Whether the final segment is the last of the file
+
+    Returns:
+        Sealed segments
+
+    Raises:
+        SegmentError: If data ends in a short segment and last is false
+    """
+    size = cipher.segment_size
+    if not last and len(data) % size:
+        raise SegmentError("Only the last segment of a file may be short")
+    count = segment_count(len(data), size) if last else len(data) // size
+    view = memoryview(data)
+    return b"".join(
+        cipher.encrypt(
+            first_index + i,
+            bytes(view[i * size:(i + 1) * size]),
+            last and i == count - 1
+        )
+        for i in range(count)
+    )
+
+def decrypt_segments(cipher: SegmentCipher, first_index: int, data: bytes, last: bool) -> bytes:
+    """Open consecutive sealed segments.
+
+    Args:
+        cipher: Segment cipher of the file
+        first_index: Index of the first segment
+        data: Whole sealed segments, except that the last may be short
+        last: Whether the final segment is the last of the file
+
+    Returns:
+        Plaintext
+
+    Raises:
+        SegmentError: If a segment fails authentication, or data ends in a
+            short segment and last is false
+    """
+    size = cipher.segment_size + TAG_SIZE
+    if not last and len(data) % size:
+        # A short segment in the middle of a file means it was truncated
+        raise SegmentError("Only the last segment of a file may be short")
+    count = max(1, -(-len(data) // size)) if last else len(data) // size
+    view = memoryview(data)
+    return b"".join(
+        cipher.decrypt(
+            first_index + i,
+            bytes(view[i * size:(i + 1) * size]),
+            last and i == count - 1
+        )
+        for i in range(count)
+    )
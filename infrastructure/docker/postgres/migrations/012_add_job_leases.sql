@@ -0,0 +1,64 @@
+-- Add renewable leases for workers pulling jobs from the queue
+ALTER TABLE jobs
+ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
+
+-- Index for finding expired leases
+CREATE INDEX IF NOT EXISTS idx_jobs_lease_expires_at ON jobs (lease_expires_at)
+WHERE status = 'processing';
+
+-- Index for claiming the next job in priority order
+CREATE INDEX IF NOT EXISTS idx_jobs_claim_order ON jobs (priority DESC, created_at)
+WHERE status = 'pending';
+
+-- Requeue jobs whose worker stopped renewing its lease
+CREATE OR REPLACE FUNCTION requeue_expired_job_leases()
+RETURNS INTEGER AS $$
+DECLARE
+    requeued_count INTEGER;
+BEGIN
+    UPDATE jobs
+    SET
+        status = CASE
+            WHEN retry_count + 1 < max_retries THEN 'pending'
+            ELSE 'failed'
+        END,
+        error_message = CASE
+            WHEN retry_count + 1 < max_retries THEN error_message
+            ELSE 'Worker lease expired after maximum retries'
+        END,
+        retry_count = retry_count + 1,
+        next_retry_at = CASE
+            WHEN retry_count + 1 < max_retries THEN NOW() + (INTERVAL '1 minute' * POWER(2, retry_count))
+            ELSE NULL
+        END,
+        locked_by = NULL,
+        locked_at = NULL,
+        lease_expires_at = NULL
+    WHERE
+        status = 'processing'
+        AND lease_expires_at < NOW();
+
+    GET DIAGNOSTICS requeued_count = ROW_COUNT;
+    RETURN requeued_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Wake idle workers when a job becomes available
+CREATE OR REPLACE FUNCTION notify_job_available()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.status = 'pending' AND (TG_OP = 'INSERT' OR OLD.status != 'pending') THEN
+        PERFORM pg_notify('job_available', NEW.id::text);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER job_available_notify
+    AFTER INSERT OR UPDATE OF status ON jobs
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_job_available();
+
+-- Add comments
+COMMENT ON COLUMN jobs.lease_expires_at IS 'Time after which an unrenewed worker lease is requeued';
+COMMENT ON FUNCTION requeue_expired_job_leases() IS 'Returns expired processing jobs to the queue with backoff';
@@ -0,0 +1,82 @@
+-- Split long jobs into chunk jobs that any worker can process.
+-- A fanned-out job waits while its chunk jobs (metadata parent_job_id and
+-- chunk) are processed, and is requeued for the reduce stage once all of
+-- them have completed.
+
+-- Index for finding a job's chunks in order
+CREATE INDEX IF NOT EXISTS idx_jobs_chunk_order ON jobs (
+    (metadata->>'parent_job_id'),
+    ((metadata->'chunk'->>'index')::int)
+) WHERE metadata ? 'chunk';
+
+CREATE OR REPLACE FUNCTION advance_fanned_out_job()
+RETURNS TRIGGER AS $$
+DECLARE
+    parent_id UUID := (NEW.metadata->>'parent_job_id')::uuid;
+    unfinished INTEGER;
+BEGIN
+    -- Lock the parent so that when the last two chunks finish at once,
+    -- the second sees the first as completed
+    PERFORM 1 FROM jobs WHERE id = parent_id AND status = 'waiting' FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN NEW;
+    END IF;
+
+    IF NEW.status = 'completed' THEN
+        SELECT COUNT(*) INTO unfinished
+        FROM jobs
+        WHERE metadata->>'parent_job_id' = parent_id::text
+        AND metadata ? 'chunk'
+        AND status != 'completed';
+
+        IF unfinished = 0 THEN
+            UPDATE jobs
+            SET
+                status = 'pending',
+                metadata = metadata || '{"stage": "reduce"}'::jsonb,
+                next_retry_at = NULL,
+                updated_at = NOW()
+            WHERE id = parent_id;
+        END IF;
+    ELSE
+        -- A chunk that failed for good or was cancelled fails the job,
+        -- and chunks not yet started are not processed
+        UPDATE jobs
+        SET
+            status = 'failed',
+            error_message = format(
+                'Chunk %s %s: %s',
+                NEW.metadata->'chunk'->>'index',
+                NEW.status,
+                COALESCE(NEW.error_message, 'no error message')
+            ),
+            updated_at = NOW()
+        WHERE id = parent_id;
+
+        UPDATE jobs
+        SET
+            status = 'cancelled',
+            cancelled_at = NOW(),
+            updated_at = NOW()
+        WHERE metadata->>'parent_job_id' = parent_id::text
+        AND metadata ? 'chunk'
+        AND status = 'pending';
+    END IF;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER fanned_out_job_advance
+    AFTER UPDATE OF status ON jobs
+    FOR EACH ROW
+    WHEN (
+        NEW.status IN ('completed', 'failed', 'cancelled')
+        AND OLD.status IS DISTINCT FROM NEW.status
+        AND NEW.metadata ? 'chunk'
+    )
+    EXECUTE FUNCTION advance_fanned_out_job();
+
+-- Add comments
+COMMENT ON INDEX idx_jobs_chunk_order IS 'Enables listing the chunk jobs of a fanned-out job in order';
+COMMENT ON FUNCTION advance_fanned_out_job() IS 'Requeues a fanned-out job for its reduce stage once all chunks completed, or fails it';
@@ -6,10 +6,12 @@ import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime
 from uuid import UUID
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from backend.src.services.encryption import EncryptionService
 from backend.src.services.file_key_service import FileKeyService
 from backend.src.utils.exceptions import EncryptionError
+from backend.src.utils.segmented_encryption import LEGACY_FORMAT, encrypted_size
 
 @pytest.fixture
 def mock_config():
@@ -20,7 +22,9 @@ def mock_config():
                 "enabled": True,
                 "algorithm": "AES-256-GCM",
                 "key_rotation_days": 30,
-                "chunk_size_mb": 1  # Small chunk size for testing
+                "chunk_size_mb": 1,  # Small chunk size for testing
+                "workers": 4,
+                "max_inflight_chunks": 3
             }
         }
     }
@@ -88,6 +92,26 @@ async def test_encrypt_file(service, mock_key_service, file_id):
         assert encrypted_data[:12]  # Should have IV
         assert encrypted_data[-16:]  # Should have authentication tag
 
+@pytest.mark.asyncio
+async def test_encrypt_stream(service, mock_key_service, file_id):
+    """Test encrypting a file while it is read."""
+    with patch("backend.src.services.encryption.service_provider") as mock_provider:
+        mock_provider.get.return_value = mock_key_service
+        await service.initialize()
+        
+        # More than two chunks, read in pieces not aligned to them
+        data = os.urandom(2 * service.chunk_size + 1000)
+        reader = await service.encrypt_stream(file_id, io.BytesIO(data))
+        encrypted_data = b"".join(iter(lambda: reader.read(300 * 1024), b""))
+        
+        # Verify same format as encrypt_file
+        output_file = io.BytesIO()
+        await service.decrypt_file(file_id, io.BytesIO(encrypted_data), output_file)
+        assert output_file.getvalue() == data
+        assert len(encrypted_data) == encrypted_size(len(data), service.segment_size)
+        assert reader.size == len(data)
+        assert reader.read(10) == b""
+
 @pytest.mark.asyncio
 async def test_decrypt_file(service, mock_key_service, file_id):
     """Test file decryption."""
@@ -110,6 +134,26 @@ async def test_decrypt_file(service, mock_key_service, file_id):
         decrypted_data = output_file.getvalue()
         assert decrypted_data == data
 
+@pytest.mark.asyncio
+async def test_decrypt_legacy_file(service, mock_key_service, file_id):
+    """Test decrypting a file stored as a single AES-GCM stream."""
+    with patch("backend.src.services.encryption.service_provider") as mock_provider:
+        mock_provider.get.return_value = mock_key_service
+        await service.initialize()
+        
+        # IV, ciphertext and tag, as written before the segmented format
+        data = b"test data" * 1000
+        key = await mock_key_service.get_key(file_id)
+        iv = os.urandom(12)
+        encrypted_file = io.BytesIO(iv + AESGCM(key).encrypt(iv, data, None))
+        
+        # Decrypt
+        output_file = io.BytesIO()
+        await service.decrypt_file(file_id, encrypted_file, output_file, LEGACY_FORMAT)
+        
+        # Verify
+        assert output_file.getvalue() == data
+
 @pytest.mark.asyncio
 async def test_decrypt_invalid_format(service, mock_key_service, file_id):
     """Test decryption with invalid format."""
@@ -195,6 +239,29 @@ async def test_large_file_handling(service, mock_key_service, file_id):
         # Verify
         assert output_file.getvalue() == data
 
+@pytest.mark.asyncio
+async def test_parallel_chunks_in_order(service, mock_key_service, file_id):
+    """Test chunks sealed on the thread pool come back in order."""
+    with patch("backend.src.services.encryption.service_provider") as mock_provider:
+        mock_provider.get.return_value = mock_key_service
+        await service.initialize()
+        
+        # More chunks than the in-flight window, last one short
+        data = os.urandom(7 * service.chunk_size + 12345)
+        reader = await service.encrypt_stream(file_id, io.BytesIO(data))
+        encrypted = b"".join(iter(lambda: reader.read(100000), b""))
+        assert reader.size == len(data)
+        
+        # Fed in pieces that do not line up with segments
+        decryptor = await service.decrypt_stream(file_id)
+        
+        async def chunks():
+            for i in range(0, len(encrypted), 300001):
+                yield encrypted[i:i + 300001]
+        
+        output = b"".join([block async for block in service.decrypt_chunks(decryptor, chunks())])
+        assert output == data
+
 @pytest.mark.asyncio
 async def test_error_handling(service, mock_key_service, file_id):
     """Test error handling."""
@@ -0,0 +1,251 @@
+"""Unit tests for job distribution service."""
+
+import asyncio
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import Mock, AsyncMock
+from backend.src.services.job_distribution import (
+    JobDistributionService,
+    JOB_AVAILABLE_CHANNEL
+)
+
+class _Acquire:
+    """Pool.acquire() result usable with await and async with."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __await__(self):
+        async def _connection():
+            return self.connection
+        return _connection().__await__()
+
+    async def __aenter__(self):
+        return self.connection
+
+    async def __aexit__(self, *args):
+        return False
+
+@pytest.fixture
+def mock_connection():
+    """Mock database connection."""
+    connection = Mock()
+    connection.fetch = AsyncMock(return_value=[])
+    connection.fetchval = AsyncMock(return_value=None)
+    connection.executemany = AsyncMock()
+    connection.transaction = Mock(side_effect=lambda: _Acquire(None))
+    connection.add_listener = AsyncMock()
+    connection.remove_listener = AsyncMock()
+    return connection
+
+@pytest.fixture
+def mock_pool(mock_connection):
+    """Mock connection pool."""
+    pool = Mock()
+    pool.acquire = Mock(side_effect=lambda: _Acquire(mock_connection))
+    pool.release = AsyncMock()
+    return pool
+
+@pytest.fixture
+async def job_distribution(mock_pool):
+    """Create job distribution service with mocked pool."""
+    service = JobDistributionService(
+        {'poll_interval': 5.0, 'lease_seconds': 60, 'lease_reaper_interval': 3600},
+        pool=mock_pool
+    )
+    await service.initialize()
+    yield service
+    await service.cleanup()
+
+def _job(job_id: str) -> dict:
+    return {
+        'id': job_id,
+        'status': 'processing',
+        'locked_by': 'worker-1',
+        'created_at': datetime.now(timezone.utc)
+    }
+
+@pytest.mark.asyncio
+async def test_initialize_listens_for_jobs(job_distribution, mock_connection):
+    """Test the service listens for job notifications."""
+    mock_connection.add_listener.assert_called_once_with(
+        JOB_AVAILABLE_CHANNEL, job_distribution._on_job_available
+    )
+
+@pytest.mark.asyncio
+async def test_claim_jobs_returns_pending(job_distribution, mock_connection):
+    """Test claiming returns jobs without waiting when some are pending."""
+    mock_connection.fetch.return_value = [_job('job-1'), _job('job-2')]
+
+    jobs = await job_distribution.claim_jobs('worker-1', limit=2, wait=30)
+
+    assert [job['id'] for job in jobs] == ['job-1', 'job-2']
+    assert isinstance(jobs[0]['created_at'], str)
+    query, worker_id, limit, lease_seconds = mock_connection.fetch.call_args[0]
+    assert 'FOR UPDATE SKIP LOCKED' in query
+    assert (worker_id, limit, lease_seconds) == ('worker-1', 2, 60)
+
+@pytest.mark.asyncio
+async def test_claim_jobs_includes_options(job_distribution, mock_connection):
+    """Test claimed jobs carry their options, decoded."""
+    job = _job('job-1')
+    job['options'] = json.dumps({'language': 'fr', 'asr_mode': 'vad'})
+    mock_connection.fetch.return_value = [job]
+
+    jobs = await job_distribution.claim_jobs('worker-1')
+
+    assert jobs[0]['options'] == {'language': 'fr', 'asr_mode': 'vad'}
+    assert 'job_options' in mock_connection.fetch.call_args[0][0]
+
+@pytest.mark.asyncio
+async def test_claim_jobs_wakes_on_notification(job_distribution, mock_connection):
+    """Test an idle claim returns once a job is announced."""
+    mock_connection.fetch.side_effect = [[], [_job('job-1')]]
+
+    claim = asyncio.create_task(
+        job_distribution.claim_jobs('worker-1', wait=30)
+    )
+    await asyncio.sleep(0.01)
+    assert not claim.done()
+
+    job_distribution._on_job_available(mock_connection, 1, JOB_AVAILABLE_CHANNEL, 'job-1')
+    jobs = await asyncio.wait_for(claim, 1.0)
+
+    assert [job['id'] for job in jobs] == ['job-1']
+    assert mock_connection.fetch.call_count == 2
+
+@pytest.mark.asyncio
+async def test_claim_jobs_times_out(job_distribution, mock_connection):
+    """Test claiming returns no jobs once the wait elapses."""
+    jobs = await job_distribution.claim_jobs('worker-1', wait=0.05)
+    assert jobs == []
+
+@pytest.mark.asyncio
+async def test_renew_lease(job_distribution, mock_connection):
+    """Test renewing a held lease returns its new expiry."""
+    expires_at = datetime.now(timezone.utc)
+    mock_connection.fetchval.return_value = expires_at
+
+    assert await job_distribution.renew_lease('job-1', 'worker-1') == expires_at
+
+@pytest.mark.asyncio
+async def test_renew_lost_lease(job_distribution, mock_connection):
+    """Test renewing a lease the worker no longer holds."""
+    mock_connection.fetchval.return_value = None
+
+    assert await job_distribution.renew_lease('job-1', 'worker-1') is None
+
+@pytest.mark.asyncio
+async def test_finish_completed_job(job_distribution, mock_connection):
+    """Test a completed job is finished and its lease released."""
+    mock_connection.fetchval.return_value = 'completed'
+
+    assert await job_distribution.finish_job('job-1', 'worker-1', 'completed') == 'completed'
+    query, job_id, worker_id = mock_connection.fetchval.call_args[0]
+    assert "status = 'completed'" in query and "locked_by = NULL" in query
+    assert (job_id, worker_id) == ('job-1', 'worker-1')
+
+@pytest.mark.asyncio
+async def test_finish_failed_job(job_distribution, mock_connection):
+    """Test a failed job counts a retry and keeps its error."""
+    mock_connection.fetchval.return_value = 'pending'
+
+    status = await job_distribution.finish_job('job-1', 'worker-1', 'failed', 'Out of memory')
+
+    assert status == 'pending'
+    query, job_id, worker_id, error = mock_connection.fetchval.call_args[0]
+    assert "retry_count = retry_count + 1" in query
+    assert (job_id, worker_id, error) == ('job-1', 'worker-1', 'Out of memory')
+
+@pytest.mark.asyncio
+async def test_finish_lost_job(job_distribution, mock_connection):
+    """Test finishing a job the worker no longer holds."""
+    mock_connection.fetchval.return_value = None
+
+    assert await job_distribution.finish_job('job-1', 'worker-1', 'completed') is None
+
+@pytest.mark.asyncio
+async def test_finish_job_invalid_status(job_distribution, mock_connection):
+    """Test only completed and failed are accepted as outcomes."""
+    with pytest.raises(ValueError):
+        await job_distribution.finish_job('job-1', 'worker-1', 'pending')
+    mock_connection.fetchval.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_requeue_expired_leases(job_distribution, mock_connection):
+    """Test expired leases are requeued."""
+    mock_connection.fetchval.return_value = 3
+
+    assert await job_distribution.requeue_expired_leases() == 3
+    mock_connection.fetchval.assert_called_once_with(
+        "SELECT requeue_expired_job_leases()"
+    )
+
+@pytest.mark.asyncio
+async def test_fan_out_job(job_distribution, mock_connection):
+    """Test splitting a job creates chunk jobs in order."""
+    mock_connection.fetchval.return_value = 'job-1'
+    chunks = [{'start': 0.0, 'end': 615.0}, {'start': 585.0, 'end': 1200.0}]
+
+    child_jobs = await job_distribution.fan_out_job('job-1', 'worker-1', chunks)
+
+    assert len(child_jobs) == 2
+    query, job_id, worker_id, children = mock_connection.fetchval.call_args[0]
+    assert "status = 'waiting'" in query
+    assert (job_id, worker_id, json.loads(children)) == ('job-1', 'worker-1', child_jobs)
+
+    query, rows = mock_connection.executemany.call_args[0]
+    assert [row[0] for row in rows] == child_jobs
+    assert [json.loads(row[2]) for row in rows] == [
+        {'index': 0, 'start': 0.0, 'end': 615.0},
+        {'index': 1, 'start': 585.0, 'end': 1200.0}
+    ]
+
+@pytest.mark.asyncio
+async def test_fan_out_lost_job(job_distribution, mock_connection):
+    """Test a job the worker no longer holds is not split."""
+    mock_connection.fetchval.return_value = None
+
+    chunks = [{'start': 0.0, 'end': 10.0}, {'start': 5.0, 'end': 20.0}]
+    assert await job_distribution.fan_out_job('job-1', 'worker-1', chunks) is None
+    mock_connection.executemany.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_chunk_jobs(job_distribution, mock_connection):
+    """Test chunk jobs are returned with their windows."""
+    mock_connection.fetch.return_value = [
+        {'id': 'chunk-1', 'status': 'completed', 'chunk': '{"index": 0, "start": 0, "end": 615}'}
+    ]
+
+    assert await job_distribution.get_chunk_jobs('job-1') == [
+        {'id': 'chunk-1', 'status': 'completed', 'chunk': {'index': 0, 'start': 0, 'end': 615}}
+    ]
+
+@pytest.mark.asyncio
+async def test_cancel_job(job_distribution, mock_connection):
+    """Test cancelling a split job cancels its unfinished chunk jobs too."""
+    mock_connection.fetch.return_value = [{'id': 'job-1'}, {'id': 'chunk-1'}]
+
+    assert await job_distribution.cancel_job('job-1') == 2
+    query, job_id = mock_connection.fetch.call_args[0]
+    assert "parent_job_id" in query and "status NOT IN" in query
+    assert job_id == 'job-1'
+
+@pytest.mark.asyncio
+async def test_is_cancelled(job_distribution, mock_connection):
+    """Test a cancelled job is reported so its worker stops it."""
+    mock_connection.fetchval.return_value = 'cancelled'
+    assert await job_distribution.is_cancelled('job-1')
+
+    mock_connection.fetchval.return_value = 'processing'
+    assert not await job_distribution.is_cancelled('job-1')
+
+@pytest.mark.asyncio
+async def test_cleanup_keeps_shared_pool(job_distribution, mock_pool, mock_connection):
+    """Test cleanup releases the listener but not a shared pool."""
+    await job_distribution.cleanup()
+
+    mock_connection.remove_listener.assert_called_once()
+    mock_pool.release.assert_called_once_with(mock_connection)
+    mock_pool.close.assert_not_called()
@@ -1,12 +1,21 @@
 """Unit tests for storage service."""
 
 import io
+import os
+import hashlib
 import pytest
 from uuid import UUID
 from unittest.mock import Mock, AsyncMock, patch
 from minio.error import S3Error
-from src.services.storage import StorageService
-from src.utils.exceptions import StorageError, HashVerificationError
+from src.services.storage import StorageService, MIN_PART_SIZE, STREAM_CHUNK_SIZE
+from src.utils.exceptions import StorageError, StorageFileCorruptedError, HashVerificationError
+from src.utils.segmented_encryption import (
+    SEGMENTED_FORMAT,
+    SegmentCipher,
+    decrypt_segments,
+    encrypt_segments,
+    new_header
+)
 
 @pytest.fixture
 def mock_minio():
@@ -43,7 +52,7 @@ async def test_store_file(storage_service, mock_minio):
     file_id = UUID('12345678-1234-5678-1234-567812345678')
     test_data = b'test data'
     file = io.BytesIO(test_data)
-    mock_minio.put_object = AsyncMock()
+    mock_minio.put_object = Mock(side_effect=lambda *args, **kwargs: args[2].read())
 
     # Test
     result = await storage_service.store_file(file_id, file, encrypt=False)
@@ -63,13 +72,10 @@ async def test_store_encrypted_file(storage_service, mock_minio, mock_encryption
     test_data = b'test data'
     file = io.BytesIO(test_data)
     encrypted_data = b'encrypted data'
-    mock_encryption_service.encrypt_file = AsyncMock()
-    mock_minio.put_object = AsyncMock()
-
-    # Configure mock encryption
-    async def mock_encrypt(file_id, input_file, output_file):
-        output_file.write(encrypted_data)
-    mock_encryption_service.encrypt_file.side_effect = mock_encrypt
+    mock_encryption_service.encrypt_stream = AsyncMock(
+        return_value=io.BytesIO(encrypted_data)
+    )
+    mock_minio.put_object = Mock(side_effect=lambda *args, **kwargs: args[2].read())
 
     # Test
     result = await storage_service.store_file(file_id, file, encrypt=True)
@@ -79,9 +85,56 @@ async def test_store_encrypted_file(storage_service, mock_minio, mock_encryption
     assert result['size'] == len(encrypted_data)
     assert 'hash' in result
     assert result['encrypted'] is True
-    mock_encryption_service.encrypt_file.assert_called_once()
+    mock_encryption_service.encrypt_stream.assert_called_once()
     mock_minio.put_object.assert_called_once()
 
+@pytest.mark.asyncio
+async def test_store_file_streams_upload(storage_service, mock_minio):
+    """Test storing a file as a multipart upload of unknown length."""
+    # Setup
+    file_id = UUID('12345678-1234-5678-1234-567812345678')
+    test_data = os.urandom(2 * MIN_PART_SIZE + 100)
+    storage_service.part_size = MIN_PART_SIZE
+    received = []
+
+    def put_object(bucket, name, data, length, **kwargs):
+        # Read part by part like the MinIO client
+        assert length == -1
+        assert kwargs['part_size'] == MIN_PART_SIZE
+        received.extend(iter(lambda: data.read(kwargs['part_size']), b''))
+    mock_minio.put_object = Mock(side_effect=put_object)
+    mock_minio.set_object_tags = Mock()
+
+    # Test
+    result = await storage_service.store_file(file_id, io.BytesIO(test_data), encrypt=False)
+
+    # Verify
+    assert b''.join(received) == test_data
+    assert [len(part) for part in received] == [MIN_PART_SIZE, MIN_PART_SIZE, 100]
+    assert result['size'] == len(test_data)
+    assert result['hash'] == hashlib.sha256(test_data).hexdigest()
+    tags = mock_minio.set_object_tags.call_args[0][2]
+    assert tags['hash'] == result['hash']
+
+@pytest.mark.asyncio
+async def test_store_file_removes_untagged_upload(storage_service, mock_minio):
+    """Test an upload whose hash cannot be recorded is removed."""
+    # Setup
+    file_id = UUID('12345678-1234-5678-1234-567812345678')
+    mock_minio.put_object = Mock(return_value=Mock(version_id='version-1'))
+    mock_minio.set_object_tags = Mock(side_effect=Exception("Tagging failed"))
+    mock_minio.remove_object = Mock()
+
+    # Test
+    with pytest.raises(StorageError):
+        await storage_service.store_file(file_id, io.BytesIO(b'test data'), encrypt=False)
+
+    # Verify the version itself is removed, not hidden behind a delete marker
+    assert mock_minio.set_object_tags.call_args.kwargs == {'version_id': 'version-1'}
+    mock_minio.remove_object.assert_called_once()
+    assert mock_minio.remove_object.call_args[0][1] == f'files/{file_id}'
+    assert mock_minio.remove_object.call_args.kwargs == {'version_id': 'version-1'}
+
 @pytest.mark.asyncio
 async def test_get_file(storage_service, mock_minio):
     """Test retrieving a file."""
@@ -127,6 +180,148 @@ async def test_get_encrypted_file(storage_service, mock_minio, mock_encryption_s
     mock_encryption_service.decrypt_file.assert_called_once()
     mock_minio.get_object.assert_called_once()
 
+@pytest.mark.asyncio
+async def test_stream_file(storage_service, mock_minio):
+    """Test streaming a file in chunks."""
+    # Setup
+    file_id = UUID('12345678-1234-5678-1234-567812345678')
+    test_data = os.urandom(STREAM_CHUNK_SIZE + 100)
+    mock_response = Mock()
+    mock_response.read = io.BytesIO(test_data).read
+    mock_response.metadata = {
+        'encrypted': 'false',
+        'hash': hashlib.sha256(test_data).hexdigest()
+    }
+    mock_minio.get_object = Mock(return_value=mock_response)
+
+    # Test
+    chunks, metadata = await storage_service.stream_file(file_id)
+    received = [chunk async for chunk in chunks]
+
+    # Verify
+    assert [len(chunk) for chunk in received] == [STREAM_CHUNK_SIZE, 100]
+    assert b''.join(received) == test_data
+    assert metadata['encrypted'] == 'false'
+    mock_response.release_conn.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_stream_file_hash_mismatch(storage_service, mock_minio):
+    """Test streaming a file that does not match its hash."""
+    # Setup
+    file_id = UUID('12345678-1234-5678-1234-567812345678')
+    mock_response = Mock()
+    mock_response.read = io.BytesIO(b'test data').read
+    mock_response.metadata = {'hash': 'invalid_hash'}
+    mock_minio.get_object = Mock(return_value=mock_response)
+
+    # Test
+    chunks, _ = await storage_service.stream_file(file_id)
+    with pytest.raises(StorageFileCorruptedError):
+        async for _ in chunks:
+            pass
+
+@pytest.mark.asyncio
+async def test_stream_file_without_hash(storage_service, mock_minio):
+    """Test a plain file without a hash is refused rather than streamed unverified."""
+    # Setup
+    file_id = UUID('12345678-1234-5678-1234-567812345678')
+    mock_response = Mock()
+    mock_response.metadata = {'encrypted': 'false'}
+    mock_minio.get_object = Mock(return_value=mock_response)
+    mock_minio.get_object_tags = Mock(return_value=None)
+
+    # Test
+    with pytest.raises(StorageFileCorruptedError):
+        await storage_service.stream_file(file_id)
+
+    # Verify
+    mock_response.release_conn.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_get_segmented_file_without_hash(storage_service, mock_minio, mock_encryption_service):
+    """Test a segmented file without a hash is read, authenticated by its segments."""
+    # Setup
+    file_id = UUID('12345678-1234-5678-1234-567812345678')
+    mock_response = Mock()
+    mock_response.read = Mock(return_value=b'encrypted data')
+    mock_response.metadata = {'encrypted': 'true', 'encryption_format': SEGMENTED_FORMAT}
+    mock_minio.get_object = Mock(return_value=mock_response)
+    mock_minio.get_object_tags = Mock(return_value=None)
+
+    async def decrypt_file(file_id, input_file, output_file, encryption_format):
+        output_file.write(b'test data')
+    mock_encryption_service.decrypt_file = AsyncMock(side_effect=decrypt_file)
+
+    # Test
+    file, _ = await storage_service.get_file(file_id)
+
+    # Verify
+    assert file.read() == b'test data'
+    mock_encryption_service.decrypt_file.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_get_encrypted_file_range(storage_service, mock_minio, mock_encryption_service):
+    """Test a range of a segmented file reads only the segments holding it."""
+    # Setup
+    file_id = UUID('12345678-1234-5678-1234-567812345678')
+    segment_size = 1024
+    test_data = os.urandom(10 * segment_size + 100)
+    key = os.urandom(32)
+    cipher = SegmentCipher(key, new_header(segment_size))
+    stored = cipher.header + encrypt_segments(cipher, 0, test_data, True)
+    mock_minio.stat_object = Mock(return_value=Mock(size=len(stored), metadata={
+        'encrypted': 'true',
+        'encryption_format': SEGMENTED_FORMAT,
+        'segment_size': str(segment_size)
+    }))
+    requests = []
+
+    def get_object(bucket, name, offset=0, length=0):
+        requests.append((offset, length))
+        response = Mock()
+        response.read = io.BytesIO(stored[offset:offset + length]).read
+        return response
+    mock_minio.get_object = Mock(side_effect=get_object)
+
+    async def decrypt_range(file_id, header, first_index, segments, last):
+        return decrypt_segments(SegmentCipher(key, header), first_index, segments, last)
+    mock_encryption_service.decrypt_range = AsyncMock(side_effect=decrypt_range)
+
+    # Test: a range within segments 3 to 4, and one running to the end
+    data, total_size, _ = await storage_service.get_file_range(file_id, 3500, 4500)
+    tail, _, _ = await storage_service.get_file_range(file_id, len(test_data) - 50)
+
+    # Verify
+    assert data == test_data[3500:4501]
+    assert tail == test_data[-50:]
+    assert total_size == len(test_data)
+    assert sum(length for _, length in requests) < len(stored) // 2
+
+@pytest.mark.asyncio
+async def test_stream_file_range(storage_service, mock_minio):
+    """Test a range is streamed in chunks from a ranged request."""
+    # Setup
+    file_id = UUID('12345678-1234-5678-1234-567812345678')
+    test_data = os.urandom(3 * STREAM_CHUNK_SIZE)
+    mock_minio.stat_object = Mock(return_value=Mock(size=len(test_data), metadata={}))
+    mock_response = Mock()
+    mock_response.read = io.BytesIO(test_data[100:]).read
+    mock_minio.get_object = Mock(return_value=mock_response)
+
+    # Test
+    chunks, total_size, _ = await storage_service.stream_file_range(file_id, 100)
+    received = [chunk async for chunk in chunks]
+
+    # Verify
+    assert len(received) == 3
+    assert b''.join(received) == test_data[100:]
+    assert total_size == len(test_data)
+    assert mock_minio.get_object.call_args.kwargs == {
+        'offset': 100,
+        'length': len(test_data) - 100
+    }
+    mock_response.release_conn.assert_called_once()
+
 @pytest.mark.asyncio
 async def test_delete_file(storage_service, mock_minio):
     """Test deleting a file."""
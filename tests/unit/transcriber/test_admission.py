@@ -0,0 +1,125 @@
+"""Tests for transcriber admission control."""
+
+import asyncio
+import pytest
+
+from transcriber.src.services.admission import AdmissionController
+
+class _Handler:
+    """Job handler that runs until released."""
+
+    def __init__(self):
+        self.started = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, job_id: str):
+        self.started.append(job_id)
+        await self.release.wait()
+
+@pytest.mark.asyncio
+async def test_queue_limit():
+    """Test jobs beyond running and queued capacity are refused."""
+    handler = _Handler()
+    controller = AdmissionController(handler, max_concurrent_jobs=1, max_queue_depth=1)
+    await controller.start()
+
+    assert controller.submit("job-1") == (True, 0)
+    assert controller.submit("job-2") == (True, 0)
+    await asyncio.sleep(0)
+
+    accepted, retry_after = controller.submit("job-3")
+    assert not accepted
+    assert retry_after >= 1
+    assert handler.started == ["job-1"]
+
+    handler.release.set()
+    await asyncio.sleep(0.01)
+    assert handler.started == ["job-1", "job-2"]
+    await controller.stop()
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_job_skipped():
+    """Test a job cancelled while queued is never run."""
+    handler = _Handler()
+    controller = AdmissionController(handler, max_concurrent_jobs=1, max_queue_depth=2)
+    await controller.start()
+
+    controller.submit("job-1")
+    controller.submit("job-2")
+    controller.submit("job-3")
+    await asyncio.sleep(0)
+
+    assert controller.cancel("job-2") is True
+    assert controller.cancel("job-1") is False
+
+    handler.release.set()
+    await asyncio.sleep(0.01)
+    assert handler.started == ["job-1", "job-3"]
+    await controller.stop()
+
+@pytest.mark.asyncio
+async def test_handler_error_frees_slot():
+    """Test a failing job does not stop later jobs."""
+    started = []
+
+    async def handler(job_id: str):
+        started.append(job_id)
+        raise RuntimeError("Job failed")
+
+    controller = AdmissionController(handler, max_concurrent_jobs=1, max_queue_depth=1)
+    await controller.start()
+
+    controller.submit("job-1")
+    controller.submit("job-2")
+    await asyncio.sleep(0.01)
+
+    assert started == ["job-1", "job-2"]
+    assert controller.capacity()["running"] == 0
+    await controller.stop()
+
+@pytest.mark.asyncio
+async def test_resize():
+    """Test raising concurrency starts queued jobs."""
+    handler = _Handler()
+    controller = AdmissionController(handler, max_concurrent_jobs=1, max_queue_depth=2)
+    await controller.start()
+
+    controller.submit("job-1")
+    controller.submit("job-2")
+    await asyncio.sleep(0)
+    assert handler.started == ["job-1"]
+
+    controller.resize(2)
+    await asyncio.sleep(0.01)
+    assert handler.started == ["job-1", "job-2"]
+
+    handler.release.set()
+    await controller.stop()
+
+@pytest.mark.asyncio
+async def test_duplicate_job_not_queued_twice():
+    """Test submitting a queued or running job again does not run it twice."""
+    handler = _Handler()
+    controller = AdmissionController(handler, max_concurrent_jobs=1, max_queue_depth=2)
+    await controller.start()
+
+    controller.submit("job-1")
+    controller.submit("job-2")
+    await asyncio.sleep(0)
+
+    assert controller.submit("job-1") == (True, 0)
+    assert controller.submit("job-2") == (True, 0)
+    assert controller.job_status("job-1") == "running"
+    assert controller.job_status("job-2") == "queued"
+    assert controller.capacity()["queued"] == 1
+
+    # Submitting a job cancelled while queued restores it
+    controller.cancel("job-2")
+    assert controller.job_status("job-2") is None
+    controller.submit("job-2")
+
+    handler.release.set()
+    await asyncio.sleep(0.01)
+    assert handler.started == ["job-1", "job-2"]
+    assert controller.job_status("job-1") is None
+    await controller.stop()
@@ -0,0 +1,145 @@
+"""Tests for the alignment model cache."""
+
+import asyncio
+import threading
+import pytest
+
+from transcriber.src.services.alignment_cache import AlignmentModelCache
+
+MB = 1024 * 1024
+
+class _Param:
+    """Model parameter of a given size in bytes."""
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def numel(self) -> int:
+        return self.size
+
+    def element_size(self) -> int:
+        return 1
+
+class _Model:
+    """Alignment model of a given size."""
+
+    def __init__(self, language: str, size: int):
+        self.language = language
+        self.size = size
+
+    def parameters(self):
+        return [_Param(self.size)]
+
+class _Loader:
+    """Model loader recording loads, optionally failing or blocking."""
+
+    def __init__(self, sizes: dict = None, failing: set = ()):
+        self.sizes = sizes or {}
+        self.failing = set(failing)
+        self.loads = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, language: str):
+        self.loads.append(language)
+        self.gate.wait(5)
+        if language in self.failing:
+            raise OSError(f"No alignment model for {language}")
+        return _Model(language, self.sizes.get(language, MB)), {"language": language}
+
+def _cache(loader: _Loader, max_models: int = 4, memory_budget_mb: int = 4096) -> AlignmentModelCache:
+    """Cache loading models with the given loader."""
+    cache = AlignmentModelCache("cpu", max_models=max_models, memory_budget_mb=memory_budget_mb)
+    cache._load = loader
+    return cache
+
+@pytest.mark.asyncio
+async def test_hit_does_not_reload():
+    """Test a cached model is returned without loading it again."""
+    loader = _Loader()
+    cache = _cache(loader)
+
+    model, metadata = await cache.get("de")
+
+    assert (await cache.get("de"))[0] is model
+    assert metadata == {"language": "de"}
+    assert loader.loads == ["de"]
+
+@pytest.mark.asyncio
+async def test_evicts_least_recently_used_by_count():
+    """Test the least recently used model goes when there are too many."""
+    loader = _Loader()
+    cache = _cache(loader, max_models=2)
+
+    await cache.get("de")
+    await cache.get("fr")
+    await cache.get("de")
+    await cache.get("it")
+
+    assert list(cache._models) == ["de", "it"]
+    await cache.get("fr")
+    assert loader.loads == ["de", "fr", "it", "fr"]
+
+@pytest.mark.asyncio
+async def test_evicts_by_memory_budget():
+    """Test models are evicted to stay within the memory budget."""
+    loader = _Loader(sizes={"de": 2 * MB, "fr": 2 * MB, "it": 3 * MB})
+    cache = _cache(loader, memory_budget_mb=5)
+
+    await cache.get("de")
+    await cache.get("fr")
+    assert cache.resident_bytes == 4 * MB
+
+    await cache.get("it")
+    assert list(cache._models) == ["fr", "it"]
+    assert cache.resident_bytes == 5 * MB
+
+@pytest.mark.asyncio
+async def test_keeps_model_over_budget():
+    """Test the model just loaded is kept even if it alone exceeds the budget."""
+    cache = _cache(_Loader(sizes={"de": 2 * MB, "en": 8 * MB}), memory_budget_mb=4)
+
+    await cache.get("de")
+    await cache.get("en")
+
+    assert list(cache._models) == ["en"]
+
+@pytest.mark.asyncio
+async def test_preload_tolerates_failed_language():
+    """Test a language that fails to load does not stop the others."""
+    loader = _Loader(failing={"rm"})
+    cache = _cache(loader)
+
+    await cache.preload(["de", " rm", "", "fr "])
+
+    assert loader.loads == ["de", "rm", "fr"]
+    assert list(cache._models) == ["de", "fr"]
+
+@pytest.mark.asyncio
+async def test_same_language_loaded_once():
+    """Test concurrent jobs missing the same model wait for one load."""
+    loader = _Loader()
+    cache = _cache(loader)
+
+    first, second = await asyncio.gather(cache.get("de"), cache.get("de"))
+
+    assert first[0] is second[0]
+    assert loader.loads == ["de"]
+
+@pytest.mark.asyncio
+async def test_load_does_not_block_other_languages():
+    """Test a slow load leaves cached models and other languages available."""
+    loader = _Loader()
+    cache = _cache(loader)
+    await cache.get("fr")
+
+    loader.gate.clear()
+    slow = asyncio.create_task(cache.get("de"))
+    await asyncio.sleep(0.05)
+
+    # The de model is still loading
+    assert (await asyncio.wait_for(cache.get("fr"), 1))[1] == {"language": "fr"}
+    assert not slow.done()
+
+    loader.gate.set()
+    assert (await slow)[1] == {"language": "de"}
@@ -0,0 +1,97 @@
+"""Tests for audio buffers and chunking."""
+
+import hashlib
+import io
+import numpy as np
+import pytest
+
+from transcriber.src.utils.audio import (
+    SAMPLE_RATE,
+    AudioBuffer,
+    duration_seconds,
+    file_sha256,
+    split_chunks
+)
+
+def _chunk(value: float, seconds: float = 1.0) -> np.ndarray:
+    """Chunk of constant samples."""
+    return np.full(int(seconds * SAMPLE_RATE), value, dtype=np.float32)
+
+class TestAudioBuffer:
+    """Test decoding chunks into one growing array."""
+
+    def test_chunks_are_views(self):
+        """Test appended chunks are views of the buffer, not copies."""
+        buffer = AudioBuffer(capacity=3 * SAMPLE_RATE)
+
+        first = buffer.append(_chunk(1.0))
+        second = buffer.append(_chunk(2.0))
+
+        assert np.shares_memory(first, buffer.audio)
+        assert np.shares_memory(second, buffer.audio)
+        assert len(buffer.audio) == 2 * SAMPLE_RATE
+
+    def test_grows_past_capacity(self):
+        """Test appending beyond the estimate keeps all audio in order."""
+        buffer = AudioBuffer(capacity=SAMPLE_RATE)
+
+        for value in range(5):
+            buffer.append(_chunk(float(value)))
+
+        audio = buffer.audio
+        assert len(audio) == 5 * SAMPLE_RATE
+        assert [audio[i * SAMPLE_RATE] for i in range(5)] == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    def test_views_valid_after_growth(self):
+        """Test chunks handed out before the buffer grew keep their samples."""
+        buffer = AudioBuffer(capacity=SAMPLE_RATE)
+        first = buffer.append(_chunk(1.0))
+
+        buffer.append(_chunk(2.0, seconds=3.0))
+
+        assert np.all(first == 1.0)
+        assert len(first) == SAMPLE_RATE
+        assert np.all(buffer.audio[:SAMPLE_RATE] == 1.0)
+
+    def test_single_large_chunk(self):
+        """Test a chunk larger than the geometric growth step fits."""
+        buffer = AudioBuffer()
+
+        view = buffer.append(_chunk(1.0, seconds=10.0))
+
+        assert len(view) == 10 * SAMPLE_RATE
+        assert duration_seconds(buffer.audio) == 10.0
+
+class TestSplitChunks:
+    """Test fixed-length chunking."""
+
+    @pytest.mark.parametrize("seconds,lengths", [
+        (60.0, [30, 30]),
+        (61.5, [30, 30, 1.5]),
+        (10.0, [10]),
+        (0.0, [])
+    ])
+    def test_boundaries(self, seconds, lengths):
+        """Test chunks are full length except the last."""
+        audio = np.arange(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+        chunks = split_chunks(audio, 30)
+
+        assert [duration_seconds(chunk) for chunk in chunks] == lengths
+        if chunks:
+            assert np.array_equal(np.concatenate(chunks), audio)
+
+    def test_no_copies(self):
+        """Test chunks share memory with the audio."""
+        audio = np.zeros(65 * SAMPLE_RATE, dtype=np.float32)
+
+        assert all(np.shares_memory(chunk, audio) for chunk in split_chunks(audio, 30))
+
+def test_file_sha256_rewinds():
+    """Test hashing leaves the file at its start."""
+    data = b"RIFF" + bytes(3 * 1024 * 1024)
+    audio_file = io.BytesIO(data)
+    audio_file.seek(100)
+
+    assert file_sha256(audio_file) == hashlib.sha256(data).hexdigest()
+    assert audio_file.tell() == 0
@@ -0,0 +1,133 @@
+"""Tests for adaptive concurrency and batch size tuning."""
+
+import time
+import pytest
+
+from transcriber.src.services.autotune import BACKOFF_HOLD_INTERVALS, AutoTuner
+from transcriber.src.services.model_router import ProfileSlot
+from transcriber.src.services.profiles import InferenceProfile
+
+MB = 1024 * 1024
+
+def _slot(name: str, max_jobs: int) -> ProfileSlot:
+    """Profile slot with a job limit."""
+    profile = InferenceProfile(name=name, model=name, compute_type="int8", rtf=0.5)
+    return ProfileSlot(profile, model=None, max_jobs=max_jobs)
+
+class _Memory:
+    """Fake memory readings, (available, used) in bytes."""
+
+    def __init__(self, available: int = 8192 * MB, used: int = 1024 * MB):
+        self.available = available
+        self.used = used
+
+    def __call__(self):
+        return self.available, self.used
+
+def _tuner(slots, memory: _Memory, **kwargs) -> AutoTuner:
+    """Autotuner reading fake memory."""
+    kwargs.setdefault("batch_size", 16)
+    kwargs.setdefault("memory_reserve_mb", 1024)
+    kwargs.setdefault("max_batch_seconds", 10.0)
+    tuner = AutoTuner(slots, **kwargs)
+    tuner._memory = memory
+    return tuner
+
+def _interval(tuner: AutoTuner, audio_seconds: float = 0.0, batch_seconds: float = 1.0, batches: int = 4):
+    """Record forward passes over a ten second interval, then adjust."""
+    for _ in range(batches):
+        tuner.observe_batch(audio_seconds / batches, batch_seconds)
+    tuner._last_adjusted = time.monotonic() - 10.0
+    tuner.adjust()
+
+def test_memory_backoff():
+    """Test low memory halves the batch, drops a job and holds off raising."""
+    slot = _slot("large", 4)
+    memory = _Memory(available=512 * MB)
+    tuner = _tuner([slot], memory)
+
+    _interval(tuner, audio_seconds=100.0)
+
+    assert (tuner.batch_size, tuner.max_jobs) == (8, 3)
+
+    # Memory recovered and every slot busy, but raising waits a while
+    memory.available = 8192 * MB
+    slot._active = 3
+    for _ in range(BACKOFF_HOLD_INTERVALS):
+        _interval(tuner, audio_seconds=100.0)
+        assert (tuner.batch_size, tuner.max_jobs) == (8, 3)
+
+    _interval(tuner, audio_seconds=100.0)
+    assert tuner.max_jobs == 4
+
+def test_slow_batches_halve_batch_size():
+    """Test forward passes slower than max_batch_seconds halve the batch."""
+    tuner = _tuner([_slot("large", 2)], _Memory())
+
+    _interval(tuner, audio_seconds=100.0, batch_seconds=12.0)
+
+    assert (tuner.batch_size, tuner.max_jobs) == (8, 2)
+
+def test_step_without_gain_undone():
+    """Test a raised job limit that does not raise throughput is undone."""
+    slot = _slot("large", 2)
+    tuner = _tuner([slot], _Memory())
+    slot._active = 2
+    limits = []
+    tuner.add_listener(limits.append)
+
+    _interval(tuner, audio_seconds=100.0)
+    assert tuner.max_jobs == 3
+
+    _interval(tuner, audio_seconds=101.0)
+    assert tuner.max_jobs == 2
+    assert limits == [3, 2]
+    # The next step waits twice as long
+    assert tuner._hold == BACKOFF_HOLD_INTERVALS
+    assert tuner._probe_hold == 2 * BACKOFF_HOLD_INTERVALS
+
+def test_step_with_gain_kept():
+    """Test a raised batch size that raises throughput is kept."""
+    slot = _slot("large", 2)
+    tuner = _tuner([slot], _Memory())
+
+    # Not every slot busy, so the batch size is tried first
+    _interval(tuner, audio_seconds=100.0, batch_seconds=2.0)
+    assert tuner.batch_size == 32
+
+    _interval(tuner, audio_seconds=150.0, batch_seconds=4.0)
+    assert tuner.batch_size == 32
+    assert tuner._trial is None
+
+    # And the next step follows without waiting
+    _interval(tuner, audio_seconds=150.0, batch_seconds=4.0)
+    assert tuner.batch_size == 64
+
+def test_no_raise_without_memory_for_another_job():
+    """Test nothing is raised when another job would not fit in memory."""
+    slot = _slot("large", 2)
+    memory = _Memory(available=2560 * MB, used=1024 * MB)
+    tuner = _tuner([slot], memory)
+    _interval(tuner, batches=0)
+
+    # Two jobs took 2 GB each; 1.5 GB left above the reserve
+    slot._active = 2
+    memory.used = 5120 * MB
+    _interval(tuner, audio_seconds=100.0)
+
+    assert (tuner.batch_size, tuner.max_jobs) == (16, 2)
+
+@pytest.mark.parametrize("jobs,limits", [
+    (8, [6, 2]),
+    (5, [4, 1]),
+    (2, [1, 1]),
+    (100, [6, 2])
+])
+def test_job_limit_shared_by_profile_weight(jobs, limits):
+    """Test the total job limit is split in proportion to configured limits."""
+    slots = [_slot("large", 3), _slot("small", 1)]
+    tuner = _tuner(slots, _Memory(), max_jobs=8)
+
+    tuner._set_jobs(jobs)
+
+    assert [slot.max_jobs for slot in slots] == limits
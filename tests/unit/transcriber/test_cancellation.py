@@ -0,0 +1,75 @@
+"""Tests for cooperative job cancellation."""
+
+import asyncio
+import pytest
+
+from transcriber.src.services.cancellation import (
+    CancellationRegistry,
+    CancellationToken,
+    JobCancelledError
+)
+
+@pytest.mark.asyncio
+async def test_run_returns_result():
+    """Test awaited work completes normally if not cancelled."""
+    token = CancellationToken("job-1")
+
+    async def work():
+        await asyncio.sleep(0)
+        return 42
+
+    assert await token.run(work()) == 42
+
+@pytest.mark.asyncio
+async def test_run_abandoned_on_cancel():
+    """Test cancelling stops the awaited work and raises."""
+    token = CancellationToken("job-1")
+    stopped = asyncio.Event()
+
+    async def work():
+        try:
+            await asyncio.sleep(60)
+        finally:
+            stopped.set()
+
+    task = asyncio.create_task(token.run(work()))
+    await asyncio.sleep(0)
+    token.cancel("timed out")
+
+    with pytest.raises(JobCancelledError, match="timed out"):
+        await task
+    assert stopped.is_set()
+
+@pytest.mark.asyncio
+async def test_check():
+    """Test check raises only once the job is cancelled."""
+    token = CancellationToken("job-1")
+    token.check()
+
+    token.cancel()
+    with pytest.raises(JobCancelledError) as exc_info:
+        token.check()
+    assert exc_info.value.job_id == "job-1"
+    assert token.cancelled_at is not None
+
+def test_remaining_seconds():
+    """Test unprocessed audio is reported for known durations only."""
+    token = CancellationToken("job-1")
+    assert token.remaining_seconds() == 0.0
+
+    token.duration = 100.0
+    token.processed = 30.0
+    assert token.remaining_seconds() == 70.0
+
+@pytest.mark.asyncio
+async def test_registry():
+    """Test registry cancels jobs in progress only."""
+    registry = CancellationRegistry()
+    token = registry.register("job-1")
+
+    assert registry.cancel("job-2") is False
+    assert registry.cancel("job-1") is True
+    assert token.cancelled
+
+    registry.discard("job-1")
+    assert registry.cancel("job-1") is False
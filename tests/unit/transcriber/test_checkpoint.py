@@ -0,0 +1,71 @@
+"""Tests for the chunk checkpoint store."""
+
+import os
+import time
+import numpy as np
+import pytest
+
+from transcriber.src.services.checkpoint import CheckpointStore
+
+@pytest.fixture
+def store(tmp_path):
+    """Checkpoint store in a temporary directory."""
+    return CheckpointStore(str(tmp_path), ttl_hours=1)
+
+class TestJobCheckpoint:
+    """Test saving and loading chunk results."""
+
+    def test_round_trip(self, store):
+        """Test a saved chunk is loaded back, with numpy values converted."""
+        checkpoint = store.open("job-1", "abc", "chunked-de")
+        result = {"segments": [{"start": np.float32(1.5), "text": "Grüezi"}]}
+
+        checkpoint.save(3, result)
+
+        assert checkpoint.load(3) == {"segments": [{"start": 1.5, "text": "Grüezi"}]}
+        assert checkpoint.load(4) is None
+
+    def test_other_audio_not_reused(self, store):
+        """Test chunks of different audio or settings are not loaded."""
+        store.open("job-1", "abc", "chunked-de").save(0, {"text": "a"})
+
+        assert store.open("job-1", "def", "chunked-de").load(0) is None
+        assert store.open("job-1", "abc", "vad-de").load(0) is None
+
+    def test_unreadable_chunk_ignored(self, store):
+        """Test a corrupt chunk is treated as not completed."""
+        checkpoint = store.open("job-1", "abc", "chunked-de")
+        checkpoint.save(0, {"text": "a"})
+        (checkpoint.path / "000000.json").write_text("{not json", encoding="utf-8")
+
+        assert checkpoint.load(0) is None
+
+class TestCheckpointStore:
+    """Test removal of job checkpoints."""
+
+    def test_discard(self, store, tmp_path):
+        """Test discarding removes only the finished job's checkpoints."""
+        store.open("job-1", "abc", "chunked-de").save(0, {"text": "a"})
+        store.open("job-2", "abc", "chunked-de").save(0, {"text": "b"})
+
+        store.discard("job-1")
+        store.discard("job-3")
+
+        assert not (tmp_path / "job-1").exists()
+        assert store.open("job-2", "abc", "chunked-de").load(0) == {"text": "b"}
+
+    def test_purge_expired(self, store, tmp_path):
+        """Test jobs untouched for longer than the TTL are purged."""
+        store.open("job-1", "abc", "chunked-de").save(0, {"text": "a"})
+        store.open("job-2", "abc", "chunked-de").save(0, {"text": "b"})
+        old = time.time() - 2 * 3600
+        os.utime(tmp_path / "job-1", (old, old))
+
+        store.purge_expired()
+
+        assert not (tmp_path / "job-1").exists()
+        assert (tmp_path / "job-2").exists()
+
+    def test_purge_without_root(self, tmp_path):
+        """Test purging before anything was saved does nothing."""
+        CheckpointStore(str(tmp_path / "missing")).purge_expired()
@@ -0,0 +1,130 @@
+"""Tests for joining diarization turns with transcript segments."""
+
+import numpy as np
+import pytest
+
+from transcriber.src.utils import diarization
+from transcriber.src.utils.diarization import (
+    assign_speakers,
+    speaker_embeddings,
+    speaker_turns
+)
+
+class _Turn:
+    """Time span of a pyannote track."""
+
+    def __init__(self, start: float, end: float):
+        self.start = start
+        self.end = end
+
+class _Annotation:
+    """Minimal pyannote annotation of (start, end, speaker) turns."""
+
+    def __init__(self, turns: list):
+        self.turns = turns
+
+    def itertracks(self, yield_label: bool = False):
+        for i, (start, end, speaker) in enumerate(self.turns):
+            yield _Turn(start, end), i, speaker
+
+    def labels(self):
+        return sorted({speaker for _, _, speaker in self.turns})
+
+@pytest.fixture
+def annotation():
+    """Two speakers taking turns."""
+    return _Annotation([
+        (0.0, 5.0, "SPEAKER_00"),
+        (5.0, 9.0, "SPEAKER_01"),
+        (9.0, 12.0, "SPEAKER_00")
+    ])
+
+def test_speaker_turns_offset(annotation):
+    """Test turns are shifted to file time."""
+    turns = speaker_turns(annotation, offset=100.0)
+
+    assert turns[1] == {"start": 105.0, "end": 109.0, "speaker": "SPEAKER_01"}
+    assert [turn["speaker"] for turn in turns] == ["SPEAKER_00", "SPEAKER_01", "SPEAKER_00"]
+
+def test_segment_gets_most_overlapping_speaker(annotation):
+    """Test a segment spanning a change goes to the speaker it overlaps most."""
+    segments = [{"start": 3.0, "end": 8.0}, {"start": 8.5, "end": 11.0}]
+
+    assign_speakers(segments, annotation)
+
+    assert [segment["speaker"] for segment in segments] == ["SPEAKER_01", "SPEAKER_00"]
+
+def test_words_assigned_individually(annotation):
+    """Test words get their own speakers, whatever their segment's."""
+    segments = [{
+        "start": 4.0,
+        "end": 6.5,
+        "words": [
+            {"word": "a", "start": 4.0, "end": 4.5},
+            {"word": "b", "start": 5.5, "end": 6.5},
+            # Untimed words are left alone
+            {"word": "c"}
+        ]
+    }]
+
+    assign_speakers(segments, annotation)
+
+    words = segments[0]["words"]
+    assert segments[0]["speaker"] == "SPEAKER_01"
+    assert [word.get("speaker") for word in words] == ["SPEAKER_00", "SPEAKER_01", None]
+
+def test_no_overlapping_turn(annotation):
+    """Test items outside every turn are left unlabelled."""
+    segments = [{
+        "start": 20.0,
+        "end": 25.0,
+        "words": [{"word": "a", "start": 20.0, "end": 21.0}]
+    }]
+
+    assign_speakers(segments, annotation)
+
+    assert "speaker" not in segments[0]
+    assert "speaker" not in segments[0]["words"][0]
+
+def test_no_turns():
+    """Test an empty diarization labels nothing."""
+    segments = [{"start": 0.0, "end": 1.0}]
+
+    assign_speakers(segments, _Annotation([]))
+
+    assert "speaker" not in segments[0]
+
+def test_offset(annotation):
+    """Test diarization of a window later in the file is matched in file time."""
+    segments = [{"start": 106.0, "end": 108.0}, {"start": 6.0, "end": 8.0}]
+
+    assign_speakers(segments, annotation, offset=100.0)
+
+    assert segments[0]["speaker"] == "SPEAKER_01"
+    assert "speaker" not in segments[1]
+
+@pytest.mark.parametrize("count", [
+    diarization._JOIN_BLOCK_SIZE - 1,
+    diarization._JOIN_BLOCK_SIZE,
+    2 * diarization._JOIN_BLOCK_SIZE + 5
+])
+def test_block_boundaries(count):
+    """Test results do not depend on how segments fall into join blocks."""
+    # Speakers alternate every second
+    annotation = _Annotation([
+        (float(i), float(i + 1), f"SPEAKER_{i % 2:02d}") for i in range(count)
+    ])
+    segments = [{"start": i + 0.25, "end": i + 0.75} for i in range(count)]
+
+    assign_speakers(segments, annotation)
+
+    assert [segment["speaker"] for segment in segments] == [
+        f"SPEAKER_{i % 2:02d}" for i in range(count)
+    ]
+
+def test_speaker_embeddings(annotation):
+    """Test centroids are mapped to labels and unusable ones left out."""
+    centroids = np.array([[0.5, 0.5], [np.nan, 1.0]])
+
+    assert speaker_embeddings(annotation, centroids) == {"SPEAKER_00": [0.5, 0.5]}
+    assert speaker_embeddings(annotation, np.zeros((2, 2))) == {}
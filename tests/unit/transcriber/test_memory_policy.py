@@ -0,0 +1,101 @@
+"""Tests for the memory release policy."""
+
+import asyncio
+import threading
+import pytest
+
+from transcriber.src.services.memory_policy import (
+    RELEASE_CHUNK,
+    RELEASE_JOB,
+    RELEASE_THRESHOLD,
+    MemoryPolicy
+)
+
+MB = 1024 * 1024
+
+def _policy(mode: str, watermark_mb: int = 0, used: int = 0) -> MemoryPolicy:
+    """Policy recording releases instead of running them."""
+    policy = MemoryPolicy(mode, watermark_mb)
+    policy.releases = 0
+
+    def release():
+        policy.releases += 1
+    policy._release = release
+    policy._memory_used = lambda: used
+    return policy
+
+def test_unknown_mode():
+    """Test an unknown mode is refused."""
+    with pytest.raises(ValueError):
+        MemoryPolicy("always")
+
+@pytest.mark.asyncio
+async def test_chunk_mode():
+    """Test chunk mode releases after every chunk and not after jobs."""
+    policy = _policy(RELEASE_CHUNK)
+
+    await policy.release(RELEASE_CHUNK)
+    await policy.release(RELEASE_CHUNK)
+    await policy.release(RELEASE_JOB)
+
+    assert policy.releases == 2
+
+@pytest.mark.asyncio
+async def test_job_mode():
+    """Test job mode releases only once a job finishes."""
+    policy = _policy(RELEASE_JOB)
+
+    await policy.release(RELEASE_CHUNK)
+    await policy.release(RELEASE_JOB)
+
+    assert policy.releases == 1
+
+@pytest.mark.parametrize("used,releases", [(4095 * MB, 0), (4096 * MB, 2)])
+@pytest.mark.asyncio
+async def test_threshold_mode(used, releases):
+    """Test threshold mode releases after chunks or jobs above the watermark."""
+    policy = _policy(RELEASE_THRESHOLD, watermark_mb=4096, used=used)
+
+    await policy.release(RELEASE_CHUNK)
+    await policy.release(RELEASE_JOB)
+
+    assert policy.releases == releases
+
+@pytest.mark.asyncio
+async def test_release_skipped_while_running():
+    """Test a release requested during another one is skipped."""
+    policy = MemoryPolicy(RELEASE_CHUNK)
+    started, finish = threading.Event(), threading.Event()
+    calls = []
+
+    def release():
+        calls.append(1)
+        started.set()
+        finish.wait(5)
+    policy._release = release
+
+    first = asyncio.create_task(policy.release(RELEASE_CHUNK))
+    await asyncio.to_thread(started.wait, 5)
+    await policy.release(RELEASE_CHUNK)
+    assert len(calls) == 1
+
+    finish.set()
+    await first
+    await policy.release(RELEASE_CHUNK)
+    assert len(calls) == 2
+
+@pytest.mark.asyncio
+async def test_failed_release_not_raised():
+    """Test a failing release is logged and later releases still run."""
+    policy = MemoryPolicy(RELEASE_JOB)
+    calls = []
+
+    def release():
+        calls.append(1)
+        raise RuntimeError("CUDA error")
+    policy._release = release
+
+    await policy.release(RELEASE_JOB)
+    await policy.release(RELEASE_JOB)
+
+    assert len(calls) == 2
@@ -0,0 +1,217 @@
+"""Tests for profile job slots."""
+
+import asyncio
+import pytest
+
+from transcriber.src.services.cancellation import CancellationToken, JobCancelledError
+from transcriber.src.services.model_router import (
+    ModelRouter,
+    ProfileSlot,
+    RoutingRule,
+    parse_latency_sla,
+    parse_routing_rules
+)
+from transcriber.src.services.profiles import InferenceProfile
+
+@pytest.fixture
+def slot():
+    """Profile slot running one job at a time."""
+    profile = InferenceProfile(name="test", model="tiny", compute_type="int8", rtf=0.5)
+    return ProfileSlot(profile, model=None, max_jobs=1)
+
+def _slot(name: str, rtf: float, max_jobs: int = 1) -> ProfileSlot:
+    """Profile slot with the given speed."""
+    profile = InferenceProfile(name=name, model=name, compute_type="int8", rtf=rtf)
+    return ProfileSlot(profile, model=None, max_jobs=max_jobs)
+
+async def _hold(slot: ProfileSlot, release: asyncio.Event, duration: float = 10.0):
+    """Hold a job slot until released."""
+    async with slot.job(duration):
+        await release.wait()
+
+@pytest.mark.asyncio
+async def test_job_limit(slot):
+    """Test jobs beyond the limit wait for a free slot."""
+    release = asyncio.Event()
+    first = asyncio.create_task(_hold(slot, release))
+    second = asyncio.create_task(_hold(slot, asyncio.Event()))
+    await asyncio.sleep(0)
+
+    assert slot.active == 1
+    assert not second.done()
+
+    release.set()
+    await first
+    await asyncio.sleep(0)
+    assert slot.active == 1
+
+    second.cancel()
+    await asyncio.gather(second, return_exceptions=True)
+    assert slot.active == 0
+
+@pytest.mark.asyncio
+async def test_raise_limit_wakes_waiters(slot):
+    """Test raising the limit lets waiting jobs start."""
+    release = asyncio.Event()
+    jobs = [asyncio.create_task(_hold(slot, release)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert slot.active == 1
+
+    slot.set_max_jobs(3)
+    await asyncio.sleep(0)
+    assert slot.active == 3
+
+    release.set()
+    await asyncio.gather(*jobs)
+    assert slot.active == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_while_waiting(slot):
+    """Test a job cancelled while waiting gives up without taking a slot."""
+    release = asyncio.Event()
+    first = asyncio.create_task(_hold(slot, release))
+    await asyncio.sleep(0)
+
+    token = CancellationToken("job-1")
+
+    async def wait():
+        async with slot.job(10.0, token):
+            pass
+
+    waiting = asyncio.create_task(wait())
+    await asyncio.sleep(0)
+    token.cancel()
+
+    with pytest.raises(JobCancelledError):
+        await waiting
+    assert slot.active == 1
+
+    release.set()
+    await first
+    assert slot.active == 0
+
+@pytest.mark.asyncio
+async def test_estimate_includes_backlog(slot):
+    """Test turnaround estimates count audio already routed to the profile."""
+    assert slot.estimate_seconds(60.0) == pytest.approx(30.0)
+
+    release = asyncio.Event()
+    job = asyncio.create_task(_hold(slot, release, duration=100.0))
+    await asyncio.sleep(0)
+    assert slot.estimate_seconds(60.0) == pytest.approx(80.0)
+
+    release.set()
+    await job
+    assert slot.estimate_seconds(60.0) == pytest.approx(30.0)
+
+def test_observe_updates_rtf(slot):
+    """Test measured jobs move the real-time factor."""
+    slot.observe(100.0, 100.0)
+    assert slot.rtf == pytest.approx(0.6)
+
+    slot.observe(0.0, 10.0)
+    assert slot.rtf == pytest.approx(0.6)
+
+def test_rule_matches():
+    """Test rules match on minimum priority and maximum duration."""
+    rule = RoutingRule("small-int8", min_priority=3, max_duration=120.0)
+
+    assert rule.matches(60.0, 3)
+    assert rule.matches(120.0, 3)
+    assert not rule.matches(121.0, 3)
+    assert not rule.matches(60.0, 2)
+    # A duration limit cannot be checked without the duration
+    assert not rule.matches(None, 3)
+    assert RoutingRule("medium-int8").matches(None, 0)
+
+def test_parse_routing_rules():
+    """Test rules are parsed in order with named or numeric priorities."""
+    rules = parse_routing_rules(
+        " small-int8:priority>=urgent:duration<=120 ; medium-int8:duration<=600;large-v3:priority>=2;"
+    )
+
+    assert rules == [
+        RoutingRule("small-int8", 3, 120.0),
+        RoutingRule("medium-int8", 0, 600.0),
+        RoutingRule("large-v3", 2, None)
+    ]
+    assert parse_routing_rules("") == []
+
+@pytest.mark.parametrize("spec", [
+    "small-int8:speed>=2",
+    "small-int8:duration<=long",
+    "small-int8:priority>=high:duration>=60"
+])
+def test_parse_routing_rules_malformed(spec):
+    """Test malformed rules are refused."""
+    with pytest.raises(ValueError):
+        parse_routing_rules(spec)
+
+def test_parse_latency_sla():
+    """Test targets are keyed by priority level."""
+    assert parse_latency_sla("urgent:60, high:300,1:3600,") == {3: 60.0, 2: 300.0, 1: 3600.0}
+    assert parse_latency_sla("") == {}
+
+@pytest.mark.parametrize("spec", ["urgent", "urgent:soon"])
+def test_parse_latency_sla_malformed(spec):
+    """Test targets without a number of seconds are refused."""
+    with pytest.raises(ValueError):
+        parse_latency_sla(spec)
+
+class TestModelRouter:
+    """Test picking a profile per job."""
+
+    @pytest.fixture
+    def slots(self):
+        """Slow, medium and fast profiles, most preferred first."""
+        return [_slot("large", 1.0), _slot("medium", 0.5), _slot("small", 0.1)]
+
+    def test_unknown_profile_refused(self, slots):
+        """Test rules naming a profile that is not loaded are refused."""
+        with pytest.raises(ValueError):
+            ModelRouter(slots, "large", rules=[RoutingRule("tiny")])
+        with pytest.raises(ValueError):
+            ModelRouter(slots, "tiny")
+
+    def test_first_matching_rule_wins(self, slots):
+        """Test rules are tried in order before the default."""
+        router = ModelRouter(slots, "large", rules=[
+            RoutingRule("small", min_priority=3),
+            RoutingRule("medium", max_duration=600.0),
+            RoutingRule("large", max_duration=60.0)
+        ])
+
+        assert router.route(30.0, 3) == (router.slots["small"], "rule")
+        assert router.route(30.0, 1) == (router.slots["medium"], "rule")
+        assert router.route(3600.0, 1) == (router.slots["large"], "default")
+        assert router.uses_duration
+
+    def test_sla_falls_back_to_faster_profile(self, slots):
+        """Test a job that would miss its target goes to the first profile meeting it."""
+        router = ModelRouter(slots, "large", latency_sla={3: 400.0})
+
+        # large: 600 s, medium: 300 s, small: 60 s
+        assert router.route(600.0, 3) == (router.slots["medium"], "latency")
+        # No target for normal priority
+        assert router.route(600.0, 1) == (router.slots["large"], "default")
+        # Target met by the chosen profile
+        assert router.route(300.0, 3) == (router.slots["large"], "default")
+
+    def test_sla_counts_backlog(self, slots):
+        """Test audio already routed to a profile can push a job elsewhere."""
+        router = ModelRouter(slots, "large", latency_sla={3: 400.0})
+        router.slots["medium"]._pending_seconds = 600.0
+
+        assert router.route(600.0, 3) == (router.slots["small"], "latency")
+
+    def test_sla_unreachable_picks_soonest(self, slots):
+        """Test a target no profile meets routes to the profile finishing first."""
+        router = ModelRouter(slots, "large", latency_sla={3: 10.0})
+
+        assert router.route(600.0, 3) == (router.slots["small"], "latency")
+
+    def test_sla_needs_duration(self, slots):
+        """Test jobs of unknown duration keep the profile their rule picked."""
+        router = ModelRouter(slots, "large", latency_sla={3: 10.0})
+
+        assert router.route(None, 3) == (router.slots["large"], "default")
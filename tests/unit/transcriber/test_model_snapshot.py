@@ -0,0 +1,101 @@
+"""Tests for offline model snapshots."""
+
+import hashlib
+import json
+import os
+import pytest
+
+from transcriber.src.services.model_snapshot import (
+    MANIFEST_FILE,
+    SNAPSHOT_FORMAT,
+    ModelSnapshot,
+    SnapshotError,
+    whisper_key
+)
+
+FILES = {
+    "whisper/large-v3/model.bin": b"weights" * 100,
+    "whisper/large-v3/config.json": b"{}",
+    "vad/whisperx-vad-segmentation.bin": b"vad"
+}
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    """Snapshot directory with its files and manifest."""
+    for name, content in FILES.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "version": "large-v3",
+        "models": {
+            whisper_key("large-v3"): {"path": "whisper/large-v3", "source": "Systran/faster-whisper-large-v3"},
+            "vad": {"path": "vad/whisperx-vad-segmentation.bin"}
+        },
+        "files": {
+            name: {"size": len(content), "sha256": hashlib.sha256(content).hexdigest()}
+            for name, content in FILES.items()
+        }
+    }
+    (tmp_path / MANIFEST_FILE).write_text(json.dumps(manifest))
+    return tmp_path
+
+def test_open(snapshot_dir):
+    """Test a complete snapshot opens and resolves model paths."""
+    snapshot = ModelSnapshot.open(str(snapshot_dir), "large-v3", verify=True)
+
+    assert snapshot.model_path(whisper_key("large-v3")) == os.path.join(
+        str(snapshot_dir), "whisper/large-v3"
+    )
+    with pytest.raises(SnapshotError):
+        snapshot.model_path(whisper_key("medium"))
+
+def test_version_mismatch(snapshot_dir):
+    """Test a snapshot built for another model version is refused."""
+    with pytest.raises(SnapshotError, match="expected large-v3-turbo"):
+        ModelSnapshot.open(str(snapshot_dir), "large-v3-turbo")
+
+def test_unreadable_manifest(snapshot_dir, tmp_path_factory):
+    """Test a missing or corrupt manifest is refused."""
+    with pytest.raises(SnapshotError):
+        ModelSnapshot.open(str(tmp_path_factory.mktemp("empty")), "large-v3")
+
+    (snapshot_dir / MANIFEST_FILE).write_text("{")
+    with pytest.raises(SnapshotError):
+        ModelSnapshot.open(str(snapshot_dir), "large-v3")
+
+def test_unsupported_format(snapshot_dir):
+    """Test a manifest of an unknown format is refused."""
+    manifest = json.loads((snapshot_dir / MANIFEST_FILE).read_text())
+    manifest["format"] = SNAPSHOT_FORMAT + 1
+    (snapshot_dir / MANIFEST_FILE).write_text(json.dumps(manifest))
+
+    with pytest.raises(SnapshotError, match="format"):
+        ModelSnapshot.open(str(snapshot_dir), "large-v3")
+
+def test_missing_file(snapshot_dir):
+    """Test a snapshot missing a file is refused."""
+    (snapshot_dir / "whisper/large-v3/config.json").unlink()
+
+    with pytest.raises(SnapshotError, match="missing"):
+        ModelSnapshot.open(str(snapshot_dir), "large-v3")
+
+def test_wrong_size(snapshot_dir):
+    """Test a truncated file is found without hashing."""
+    (snapshot_dir / "whisper/large-v3/model.bin").write_bytes(b"weights")
+
+    with pytest.raises(SnapshotError, match="bytes"):
+        ModelSnapshot.open(str(snapshot_dir), "large-v3")
+
+def test_hash_mismatch(snapshot_dir):
+    """Test a changed file of the same size is only found by a full check."""
+    content = FILES["whisper/large-v3/model.bin"]
+    (snapshot_dir / "whisper/large-v3/model.bin").write_bytes(content[::-1])
+
+    snapshot = ModelSnapshot.open(str(snapshot_dir), "large-v3")
+    with pytest.raises(SnapshotError, match="hash"):
+        snapshot.verify(full=True)
+    with pytest.raises(SnapshotError, match="hash"):
+        ModelSnapshot.open(str(snapshot_dir), "large-v3", verify=True)
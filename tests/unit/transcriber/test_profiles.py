@@ -0,0 +1,42 @@
+"""Tests for inference profiles."""
+
+import pytest
+
+from transcriber.src.services.profiles import PROFILES, get_profile
+
+def test_unknown_profile():
+    """Test an unknown profile is refused, naming the available ones."""
+    with pytest.raises(ValueError, match="large-v3-int8"):
+        get_profile("huge")
+
+def test_defaults():
+    """Test a profile without overrides is the registered one."""
+    assert get_profile("medium-int8") is PROFILES["medium-int8"]
+
+def test_overrides():
+    """Test compute type and threads can be overridden without changing the registry."""
+    profile = get_profile("large-v3", compute_type="int8_float32", cpu_threads=6)
+
+    assert (profile.model, profile.compute_type, profile.threads()) == ("large-v3", "int8_float32", 6)
+    assert PROFILES["large-v3"].compute_type == "float32"
+    # 0 and None keep the profile's own settings
+    assert get_profile("small-int8", compute_type=None, cpu_threads=0) is PROFILES["small-int8"]
+
+@pytest.mark.parametrize("compute_type,cuda_type", [
+    ("int8", "int8_float16"),
+    ("int8_float32", "int8_float16"),
+    ("float32", "float16"),
+    ("float16", "float16")
+])
+def test_compute_type_for_cuda(compute_type, cuda_type):
+    """Test GPUs use the half-precision counterpart of the CPU type."""
+    profile = get_profile("medium", compute_type=compute_type)
+
+    assert profile.compute_type_for("cuda") == cuda_type
+    assert profile.compute_type_for("cpu") == compute_type
+
+def test_threads_default_to_cores(monkeypatch):
+    """Test a profile without a thread count uses every core."""
+    monkeypatch.setattr("os.cpu_count", lambda: 12)
+
+    assert get_profile("large-v3").threads() == 12
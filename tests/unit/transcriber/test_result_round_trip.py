@@ -0,0 +1,92 @@
+"""Tests for the compact result encoding against the backend's decoder."""
+
+import pytest
+
+from backend.src.utils.result_encoding import COMPACT_RESULTS_MEDIA_TYPE, decode_results
+from transcriber.src.utils.result_encoding import encode_results
+
+async def _round_trip(results: dict) -> dict:
+    """Encode like the transcriber and decode like the backend."""
+    body = encode_results(results)
+
+    async def chunks():
+        for i in range(0, len(body), 64):
+            yield body[i:i + 64]
+
+    return await decode_results(chunks(), COMPACT_RESULTS_MEDIA_TYPE, "gzip")
+
+@pytest.mark.asyncio
+async def test_round_trip():
+    """Test a full result decodes to what was encoded."""
+    results = {
+        "language": "de",
+        "speakers": {"SPEAKER_00": {"name": "Speaker 1"}},
+        "segments": [
+            {
+                "start": 0.0,
+                "end": 1.25,
+                "text": "Guten Tag",
+                "speaker": "SPEAKER_00",
+                "words": [
+                    {"word": "Guten", "start": 0.0, "end": 0.5, "score": 0.9},
+                    {"word": "Tag", "start": 0.6, "end": 1.25, "score": 0.8}
+                ]
+            },
+            {"start": 1.5, "end": 3.0, "text": "zusammen", "speaker": "SPEAKER_00", "words": []}
+        ],
+        "text": "Guten Tag zusammen"
+    }
+
+    assert await _round_trip(results) == results
+
+@pytest.mark.asyncio
+async def test_missing_word_timestamps():
+    """Test words the aligner could not time come back without times."""
+    results = {
+        "segments": [{
+            "start": 0.0,
+            "end": 2.0,
+            "text": "Zürich 2024",
+            "words": [{"word": "Zürich", "start": 0.1, "end": 0.7}, {"word": "2024"}]
+        }]
+    }
+
+    decoded = await _round_trip(results)
+
+    assert decoded["segments"][0]["words"] == [
+        {"word": "Zürich", "start": 0.1, "end": 0.7},
+        {"word": "2024"}
+    ]
+
+@pytest.mark.asyncio
+async def test_segments_without_words():
+    """Test segments without a words list stay without one."""
+    results = {
+        "segments": [
+            {"start": 0.0, "end": 1.0, "text": "a", "words": [{"word": "a", "start": 0.0, "end": 1.0}]},
+            {"start": 1.0, "end": 2.0, "text": "b"}
+        ]
+    }
+
+    assert await _round_trip(results) == results
+    assert await _round_trip({"segments": [{"start": 0.0, "end": 1.0, "text": "b"}]}) == {
+        "segments": [{"start": 0.0, "end": 1.0, "text": "b"}]
+    }
+
+@pytest.mark.asyncio
+async def test_text_kept_when_not_joined_segments():
+    """Test a full text that differs from the joined segment texts is kept."""
+    segments = [{"start": 0.0, "end": 1.0, "text": "Hallo"}, {"start": 1.0, "end": 2.0, "text": "Welt"}]
+
+    assert (await _round_trip({"segments": segments, "text": "Hallo, Welt!"}))["text"] == "Hallo, Welt!"
+    assert (await _round_trip({"segments": segments, "text": "Hallo Welt"}))["text"] == "Hallo Welt"
+    assert "text" not in await _round_trip({"segments": segments})
+
+@pytest.mark.asyncio
+async def test_times_rounded_to_milliseconds():
+    """Test times are carried at millisecond precision."""
+    results = {"segments": [{"start": 0.12345, "end": 1.9999, "text": "a"}]}
+
+    segment = (await _round_trip(results))["segments"][0]
+
+    assert (segment["start"], segment["end"]) == (0.123, 2.0)
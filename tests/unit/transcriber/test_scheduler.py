@@ -0,0 +1,112 @@
+"""Tests for the cross-job inference scheduler."""
+
+import asyncio
+import time
+import numpy as np
+import pytest
+
+from transcriber.src.services.scheduler import InferenceScheduler
+from transcriber.src.utils.audio import SAMPLE_RATE
+
+class _FakeModel:
+    """Model decoding each one-second segment to its fill value."""
+
+    def __init__(self, fail_on: int = -1):
+        self.batches = []
+        self.fail_on = fail_on
+
+    def forward(self, language: str, segments: list) -> list:
+        values = [int(segment[0]) for segment in segments]
+        self.batches.append((language, values))
+        if self.fail_on in values:
+            raise RuntimeError("Decoding failed")
+        return [f"{language}:{value}" for value in values]
+
+def _audio(*values: int) -> np.ndarray:
+    """Audio of one-second segments, each filled with its value."""
+    return np.repeat(np.asarray(values, dtype=np.float32), SAMPLE_RATE)
+
+def _regions(audio: np.ndarray) -> list:
+    """Treat every second of audio as a speech region."""
+    return [(float(i), float(i + 1)) for i in range(len(audio) // SAMPLE_RATE)]
+
+@pytest.fixture
+async def make_scheduler():
+    """Create started schedulers on a fake model, stopped afterwards."""
+    schedulers = []
+
+    async def make(model: _FakeModel, batch_size: int, max_delay: float) -> InferenceScheduler:
+        scheduler = InferenceScheduler(None, asyncio.Lock(), batch_size, max_delay)
+        scheduler._detect_speech = _regions
+        scheduler._forward = model.forward
+        await scheduler.start()
+        schedulers.append(scheduler)
+        return scheduler
+
+    yield make
+    for scheduler in schedulers:
+        await scheduler.stop()
+
+@pytest.mark.asyncio
+async def test_batches_across_jobs_by_language(make_scheduler):
+    """Test segments of concurrent jobs share batches of one language."""
+    model = _FakeModel()
+    scheduler = await make_scheduler(model, batch_size=4, max_delay=0.5)
+
+    first, second, third = await asyncio.gather(
+        scheduler.transcribe(_audio(1, 2), "de"),
+        scheduler.transcribe(_audio(3), "fr"),
+        scheduler.transcribe(_audio(4, 5), "de")
+    )
+
+    assert sorted(model.batches) == [("de", [1, 2, 4, 5]), ("fr", [3])]
+    assert [segment["text"] for segment in first["segments"]] == ["de:1", "de:2"]
+    assert second["segments"] == [{"text": "fr:3", "start": 0.0, "end": 1.0}]
+    assert [segment["text"] for segment in third["segments"]] == ["de:4", "de:5"]
+
+@pytest.mark.asyncio
+async def test_partial_batch_flushed_after_delay(make_scheduler):
+    """Test a batch that does not fill runs once max_delay has passed."""
+    model = _FakeModel()
+    scheduler = await make_scheduler(model, batch_size=8, max_delay=0.05)
+
+    start = time.monotonic()
+    result = await scheduler.transcribe(_audio(1, 2), "de")
+    elapsed = time.monotonic() - start
+
+    assert model.batches == [("de", [1, 2])]
+    assert [segment["text"] for segment in result["segments"]] == ["de:1", "de:2"]
+    assert 0.05 <= elapsed < 1.0
+
+@pytest.mark.asyncio
+async def test_failing_segment_fails_only_its_job(make_scheduler):
+    """Test a segment that cannot be decoded does not fail its batch mates."""
+    model = _FakeModel(fail_on=2)
+    scheduler = await make_scheduler(model, batch_size=4, max_delay=0.5)
+
+    good, bad = await asyncio.gather(
+        scheduler.transcribe(_audio(1, 3), "de"),
+        scheduler.transcribe(_audio(2), "de"),
+        return_exceptions=True
+    )
+
+    assert [segment["text"] for segment in good["segments"]] == ["de:1", "de:3"]
+    assert isinstance(bad, RuntimeError)
+    # The shared batch failed, then each segment was decoded alone
+    assert model.batches[0] == ("de", [1, 3, 2])
+    assert sorted(model.batches[1:]) == [("de", [1]), ("de", [2]), ("de", [3])]
+
+@pytest.mark.asyncio
+async def test_cancelled_job_leaves_batch(make_scheduler):
+    """Test segments of a cancelled job are dropped before their batch runs."""
+    model = _FakeModel()
+    scheduler = await make_scheduler(model, batch_size=4, max_delay=0.2)
+
+    cancelled = asyncio.create_task(scheduler.transcribe(_audio(1), "de"))
+    kept = asyncio.create_task(scheduler.transcribe(_audio(2), "de"))
+    await asyncio.sleep(0.05)
+    cancelled.cancel()
+
+    result = await kept
+    assert result["segments"][0]["text"] == "de:2"
+    assert model.batches == [("de", [2])]
@@ -0,0 +1,182 @@
+"""Tests for the streaming download buffer."""
+
+import asyncio
+import hashlib
+import io
+import os
+import pytest
+
+from transcriber.src.utils.download import SpooledDownload
+
+DATA = os.urandom(64 * 1024)
+
+@pytest.mark.asyncio
+async def test_in_order_download():
+    """Test content written in order is readable and hashed."""
+    buffer = SpooledDownload(max_memory=len(DATA) * 2, size=len(DATA))
+
+    async def fill(download):
+        for i in range(0, len(DATA), 1000):
+            download.write_at(i, DATA[i:i + 1000])
+
+    buffer.run(fill)
+    await buffer.wait()
+
+    assert buffer.read() == DATA
+    assert await buffer.content_sha256() == hashlib.sha256(DATA).hexdigest()
+    buffer.close()
+
+@pytest.mark.asyncio
+async def test_read_waits_for_bytes():
+    """Test reads block until the bytes have arrived."""
+    buffer = SpooledDownload(max_memory=len(DATA) * 2, size=len(DATA))
+    written = asyncio.Event()
+
+    async def fill(download):
+        download.write_at(0, DATA[:50])
+        await written.wait()
+        download.write_at(50, DATA[50:])
+
+    buffer.run(fill)
+    read = asyncio.create_task(asyncio.to_thread(buffer.read, 100))
+    await asyncio.sleep(0.05)
+    assert not read.done()
+
+    written.set()
+    assert await read == DATA[:100]
+    await buffer.wait()
+    buffer.close()
+
+@pytest.mark.asyncio
+async def test_spills_to_disk():
+    """Test content larger than the memory limit is kept on disk."""
+    buffer = SpooledDownload(max_memory=1024, size=len(DATA))
+
+    async def fill(download):
+        for i in range(0, len(DATA), 4096):
+            download.write_at(i, DATA[i:i + 4096])
+
+    buffer.run(fill)
+    await buffer.wait()
+
+    buffer.seek(-100, io.SEEK_END)
+    assert buffer.read() == DATA[-100:]
+    buffer.seek(0)
+    assert buffer.read() == DATA
+    assert await buffer.content_sha256() == hashlib.sha256(DATA).hexdigest()
+    buffer.close()
+
+@pytest.mark.asyncio
+async def test_seek_end_waits_for_size():
+    """Test seeking from the end waits for an unknown size."""
+    buffer = SpooledDownload(max_memory=len(DATA) * 2)
+    finish = asyncio.Event()
+
+    async def fill(download):
+        download.write_at(0, DATA[:1000])
+        await finish.wait()
+        download.write_at(1000, DATA[1000:])
+
+    buffer.run(fill)
+    seek = asyncio.create_task(asyncio.to_thread(buffer.seek, 0, io.SEEK_END))
+    await asyncio.sleep(0.05)
+    assert not seek.done()
+
+    finish.set()
+    assert await seek == len(DATA)
+    buffer.close()
+
+@pytest.mark.asyncio
+async def test_incomplete_download():
+    """Test a download ending short of its size fails readers and waiters."""
+    buffer = SpooledDownload(max_memory=len(DATA) * 2, size=len(DATA))
+
+    async def fill(download):
+        download.write_at(0, DATA[:1000])
+
+    buffer.run(fill)
+    with pytest.raises(IOError):
+        await buffer.wait()
+
+    # Bytes that did arrive are still readable
+    assert buffer.read(1000) == DATA[:1000]
+    with pytest.raises(IOError):
+        buffer.read(1)
+    buffer.close()
+
+@pytest.mark.asyncio
+async def test_failed_download():
+    """Test an error from the producer is raised to waiters."""
+    buffer = SpooledDownload(max_memory=len(DATA) * 2)
+
+    async def fill(download):
+        download.write_at(0, DATA[:1000])
+        raise ConnectionError("Connection reset")
+
+    buffer.run(fill)
+    with pytest.raises(IOError, match="Connection reset"):
+        await buffer.wait()
+    buffer.close()
+
+@pytest.mark.asyncio
+async def test_out_of_order_parts():
+    """Test parts arriving in any order are assembled and hashed in order."""
+    buffer = SpooledDownload(max_memory=len(DATA) * 2, size=len(DATA))
+    parts = [(i, DATA[i:i + 10000]) for i in range(0, len(DATA), 10000)]
+
+    async def fill(download):
+        for offset, data in reversed(parts):
+            download.write_at(offset, data)
+
+    buffer.run(fill)
+    await buffer.wait()
+
+    assert buffer.size == len(DATA)
+    assert buffer.read() == DATA
+    assert await buffer.content_sha256() == hashlib.sha256(DATA).hexdigest()
+    buffer.close()
+
+@pytest.mark.asyncio
+async def test_read_waits_for_contiguous_bytes():
+    """Test reads block until the bytes before them have arrived."""
+    buffer = SpooledDownload(max_memory=len(DATA) * 2, size=len(DATA))
+    half = len(DATA) // 2
+    written = asyncio.Event()
+
+    async def fill(download):
+        download.write_at(half, DATA[half:])
+        await written.wait()
+        download.write_at(0, DATA[:half])
+
+    buffer.run(fill)
+    read = asyncio.create_task(asyncio.to_thread(buffer.read, 100))
+    await asyncio.sleep(0.05)
+    # Only the second half has arrived, so the start is not readable yet
+    assert not read.done()
+
+    written.set()
+    assert await read == DATA[:100]
+    await buffer.wait()
+    buffer.close()
+
+@pytest.mark.asyncio
+async def test_out_of_order_spill():
+    """Test parts written past the memory limit spill before padding memory."""
+    buffer = SpooledDownload(max_memory=1024, size=len(DATA))
+    parts = [(i, DATA[i:i + 4096]) for i in range(0, len(DATA), 4096)]
+
+    async def fill(download):
+        # Start with the last part to seek far past the memory limit
+        download.write_at(*parts[-1])
+        for offset, data in parts[:-1]:
+            download.write_at(offset, data)
+
+    buffer.run(fill)
+    await buffer.wait()
+
+    buffer.seek(-100, io.SEEK_END)
+    assert buffer.read() == DATA[-100:]
+    buffer.seek(0)
+    assert buffer.read() == DATA
+    assert await buffer.content_sha256() == hashlib.sha256(DATA).hexdigest()
+    buffer.close()
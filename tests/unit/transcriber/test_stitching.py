@@ -0,0 +1,240 @@
+"""Tests for chunk planning and stitching."""
+
+import pytest
+
+from transcriber.src.utils.stitching import (
+    plan_chunks,
+    reconcile_speakers,
+    stitch_chunks
+)
+
+def _word(index: int, start: float, speaker: str) -> dict:
+    """Make a timed word."""
+    return {"word": f"w{index}", "start": start, "end": start + 0.5, "speaker": speaker}
+
+def _segment(words: list, speaker: str) -> dict:
+    """Make a segment from words."""
+    return {
+        "start": words[0]["start"],
+        "end": words[-1]["end"],
+        "text": " ".join(word["word"] for word in words),
+        "speaker": speaker,
+        "words": words
+    }
+
+class TestPlanChunks:
+    """Test chunk window planning."""
+
+    def test_short_recording(self):
+        """Test recording shorter than a chunk is one window."""
+        assert plan_chunks(20.0, 60.0, 4.0) == [{"start": 0.0, "end": 20.0}]
+
+    def test_windows_cover_recording(self):
+        """Test windows span the recording and neighbours overlap."""
+        windows = plan_chunks(100.0, 30.0, 4.0)
+
+        assert len(windows) == 3
+        assert windows[0]["start"] == 0.0
+        assert windows[-1]["end"] == 100.0
+        for previous, window in zip(windows, windows[1:]):
+            assert previous["end"] - window["start"] == pytest.approx(4.0, abs=0.01)
+
+class TestReconcileSpeakers:
+    """Test speaker matching across chunks."""
+
+    def test_match_by_overlap(self):
+        """Test speakers are matched by how long their turns coincide."""
+        chunks = [
+            {
+                "window": {"start": 0.0, "end": 12.0},
+                "turns": [
+                    {"speaker": "S0", "start": 0.0, "end": 6.0},
+                    {"speaker": "S1", "start": 6.0, "end": 12.0}
+                ]
+            },
+            {
+                # Local labels are assigned in order of appearance, so the
+                # same person has a different label in this chunk
+                "window": {"start": 8.0, "end": 20.0},
+                "turns": [
+                    {"speaker": "S0", "start": 8.0, "end": 14.0},
+                    {"speaker": "S1", "start": 14.0, "end": 20.0}
+                ]
+            }
+        ]
+
+        assert reconcile_speakers(chunks) == [
+            {"S0": "SPEAKER_00", "S1": "SPEAKER_01"},
+            {"S0": "SPEAKER_01", "S1": "SPEAKER_02"}
+        ]
+
+    def test_short_coincidence_not_matched(self):
+        """Test speakers overlapping briefly get new labels."""
+        chunks = [
+            {
+                "window": {"start": 0.0, "end": 12.0},
+                "turns": [{"speaker": "S0", "start": 0.0, "end": 8.5}]
+            },
+            {
+                "window": {"start": 8.0, "end": 20.0},
+                "turns": [{"speaker": "S0", "start": 8.0, "end": 20.0}]
+            }
+        ]
+
+        assert reconcile_speakers(chunks) == [
+            {"S0": "SPEAKER_00"},
+            {"S0": "SPEAKER_01"}
+        ]
+
+    def test_match_across_chunks_by_embedding(self):
+        """Test a speaker silent for a whole chunk keeps their label."""
+        alice, bob, carol = [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]
+        chunks = [
+            {
+                "window": {"start": 0.0, "end": 12.0},
+                "turns": [
+                    {"speaker": "S0", "start": 0.0, "end": 6.0},
+                    {"speaker": "S1", "start": 6.0, "end": 12.0}
+                ],
+                "embeddings": {"S0": alice, "S1": bob}
+            },
+            {
+                "window": {"start": 8.0, "end": 20.0},
+                "turns": [{"speaker": "S0", "start": 8.0, "end": 20.0}],
+                "embeddings": {"S0": bob}
+            },
+            {
+                # Alice is back; nobody she overlaps with in the previous chunk
+                "window": {"start": 16.0, "end": 28.0},
+                "turns": [
+                    {"speaker": "S0", "start": 16.0, "end": 20.0},
+                    {"speaker": "S1", "start": 20.0, "end": 24.0},
+                    {"speaker": "S2", "start": 24.0, "end": 28.0}
+                ],
+                "embeddings": {"S0": bob, "S1": [0.9, 0.1, 0.0], "S2": carol}
+            }
+        ]
+
+        assert reconcile_speakers(chunks) == [
+            {"S0": "SPEAKER_00", "S1": "SPEAKER_01"},
+            {"S0": "SPEAKER_01"},
+            {"S0": "SPEAKER_01", "S1": "SPEAKER_00", "S2": "SPEAKER_02"}
+        ]
+
+    def test_embedding_label_used_once_per_chunk(self):
+        """Test two speakers of a chunk never share a label."""
+        alice = [1.0, 0.0]
+        chunks = [
+            {
+                "window": {"start": 0.0, "end": 12.0},
+                "turns": [{"speaker": "S0", "start": 0.0, "end": 6.0}],
+                "embeddings": {"S0": alice}
+            },
+            {
+                "window": {"start": 8.0, "end": 20.0},
+                "turns": [
+                    {"speaker": "S0", "start": 12.0, "end": 16.0},
+                    {"speaker": "S1", "start": 16.0, "end": 20.0}
+                ],
+                "embeddings": {"S0": [0.8, 0.2], "S1": [0.95, 0.05]}
+            }
+        ]
+
+        assert reconcile_speakers(chunks)[1] == {"S0": "SPEAKER_01", "S1": "SPEAKER_00"}
+
+    def test_speakers_only_in_segments(self):
+        """Test speakers without diarization turns still get labels."""
+        chunks = [{
+            "window": {"start": 0.0, "end": 10.0},
+            "segments": [{"start": 0.0, "end": 1.0, "speaker": "S3", "words": []}]
+        }]
+
+        assert reconcile_speakers(chunks) == [{"S3": "SPEAKER_00"}]
+
+class TestStitchChunks:
+    """Test merging of overlapping chunk results."""
+
+    def _chunks(self):
+        """Two chunks sharing 8-12 s, with a pause around 10 s."""
+        starts = [float(i) for i in range(20)]
+        starts[10] = 10.3
+        first = [_word(i, starts[i], "S0" if i < 6 else "S1") for i in range(12)]
+        second = [_word(i, starts[i], "S0" if i < 14 else "S1") for i in range(8, 20)]
+        return [
+            {
+                "window": {"start": 0.0, "end": 12.0},
+                "turns": [
+                    {"speaker": "S0", "start": 0.0, "end": 6.0},
+                    {"speaker": "S1", "start": 6.0, "end": 12.0}
+                ],
+                "segments": [_segment(first[:6], "S0"), _segment(first[6:], "S1")]
+            },
+            {
+                "window": {"start": 8.0, "end": 20.0},
+                "turns": [
+                    {"speaker": "S0", "start": 8.0, "end": 14.0},
+                    {"speaker": "S1", "start": 14.0, "end": 20.0}
+                ],
+                "segments": [_segment(second[:6], "S0"), _segment(second[6:], "S1")]
+            }
+        ]
+
+    def test_overlap_words_appear_once(self):
+        """Test each word in the overlap is kept from exactly one chunk."""
+        segments = stitch_chunks(self._chunks())
+
+        words = [word["word"] for segment in segments for word in segment["words"]]
+        assert words == [f"w{i}" for i in range(20)]
+
+    def test_cut_at_pause(self):
+        """Test the overlap is cut in the widest pause near its middle."""
+        segments = stitch_chunks(self._chunks())
+
+        # w9 ends at 9.5 and w10 starts at 10.3; the earlier chunk keeps
+        # words up to the pause and the later one the words after it
+        assert segments[1]["text"] == "w6 w7 w8 w9"
+        assert segments[1]["end"] == 9.5
+        assert segments[2]["text"] == "w10 w11 w12 w13"
+        assert segments[2]["start"] == 10.3
+
+    def test_job_wide_speakers(self):
+        """Test segments and words carry reconciled speaker labels."""
+        segments = stitch_chunks(self._chunks())
+
+        assert [segment["speaker"] for segment in segments] == [
+            "SPEAKER_00", "SPEAKER_01", "SPEAKER_01", "SPEAKER_02"
+        ]
+        for segment in segments:
+            assert {word["speaker"] for word in segment["words"]} == {segment["speaker"]}
+
+    def test_untimed_segments(self):
+        """Test segments without word timings are kept whole by midpoint."""
+        chunks = [
+            {
+                "window": {"start": 0.0, "end": 12.0},
+                "segments": [
+                    {"start": 0.0, "end": 8.0, "text": "a"},
+                    {"start": 8.0, "end": 11.0, "text": "b"}
+                ]
+            },
+            {
+                "window": {"start": 8.0, "end": 20.0},
+                "segments": [
+                    {"start": 8.0, "end": 11.0, "text": "b"},
+                    {"start": 11.0, "end": 20.0, "text": "c"}
+                ]
+            }
+        ]
+
+        assert [segment["text"] for segment in stitch_chunks(chunks)] == ["a", "b", "c"]
+
+    def test_single_chunk_unchanged(self):
+        """Test a job with one chunk keeps all its segments."""
+        chunk = self._chunks()[0]
+        chunk["window"] = {"start": 0.0, "end": 12.0}
+
+        segments = stitch_chunks([chunk])
+
+        assert [segment["text"] for segment in segments] == [
+            segment["text"] for segment in chunk["segments"]
+        ]
@@ -0,0 +1,49 @@
+"""Tests for HTTP Range header utilities."""
+
+import pytest
+
+from backend.src.utils.http_range import (
+    RangeNotSatisfiableError,
+    parse_range_header,
+    content_range
+)
+
+class TestParseRangeHeader:
+    """Test Range header parsing."""
+
+    def test_no_header(self):
+        """Test missing header serves whole content."""
+        assert parse_range_header(None, 100) is None
+        assert parse_range_header("", 100) is None
+
+    def test_closed_range(self):
+        """Test range with first and last byte."""
+        assert parse_range_header("bytes=0-9", 100) == (0, 9)
+        assert parse_range_header("bytes=90-199", 100) == (90, 99)
+
+    def test_open_range(self):
+        """Test range to the end of the content."""
+        assert parse_range_header("bytes=40-", 100) == (40, 99)
+
+    def test_suffix_range(self):
+        """Test range of the last bytes."""
+        assert parse_range_header("bytes=-10", 100) == (90, 99)
+        assert parse_range_header("bytes=-500", 100) == (0, 99)
+
+    def test_ignored_ranges(self):
+        """Test unsupported or malformed ranges serve whole content."""
+        assert parse_range_header("items=0-9", 100) is None
+        assert parse_range_header("bytes=0-9,20-29", 100) is None
+        assert parse_range_header("bytes=abc", 100) is None
+        assert parse_range_header("bytes=9-0", 100) is None
+
+    def test_unsatisfiable(self):
+        """Test ranges outside the content."""
+        with pytest.raises(RangeNotSatisfiableError):
+            parse_range_header("bytes=100-", 100)
+        with pytest.raises(RangeNotSatisfiableError):
+            parse_range_header("bytes=-0", 100)
+
+def test_content_range():
+    """Test Content-Range formatting."""
+    assert content_range(0, 9, 100) == "bytes 0-9/100"
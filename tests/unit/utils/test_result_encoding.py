@@ -0,0 +1,89 @@
+"""Tests for transcription result decoding."""
+
+import gzip
+import json
+import pytest
+
+from backend.src.utils.result_encoding import (
+    COMPACT_RESULTS_MEDIA_TYPE,
+    ResultDecodingError,
+    UnsupportedEncodingError,
+    decode_results
+)
+
+async def _chunks(data: bytes, size: int = 7):
+    """Yield data in small chunks like a request stream."""
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+COMPACT = {
+    "version": 1,
+    "language": "de",
+    "speakers": {"S1": {"id": "S1", "name": "Speaker 1"}},
+    "text_from_segments": True,
+    "segments": {
+        "start": [0, 1500],
+        "end": [1250, 3000],
+        "text": ["Guten Tag", "zusammen"],
+        "speaker": ["S1", "S1"],
+        "words": {
+            "word": ["Guten", "Tag", "zusammen"],
+            "start": [0, 600, None],
+            "count": [2, 1]
+        }
+    }
+}
+
+@pytest.mark.asyncio
+async def test_decode_compact():
+    """Test compact results are expanded to the plain layout."""
+    body = gzip.compress(json.dumps(COMPACT).encode())
+    results = await decode_results(_chunks(body), COMPACT_RESULTS_MEDIA_TYPE, "gzip")
+
+    assert results["text"] == "Guten Tag zusammen"
+    assert results["language"] == "de"
+    assert results["segments"][0] == {
+        "start": 0.0,
+        "end": 1.25,
+        "text": "Guten Tag",
+        "speaker": "S1",
+        "words": [{"word": "Guten", "start": 0.0}, {"word": "Tag", "start": 0.6}]
+    }
+    assert results["segments"][1]["words"] == [{"word": "zusammen"}]
+
+@pytest.mark.asyncio
+async def test_decode_plain_json():
+    """Test plain JSON results pass through."""
+    plain = {"text": "Hallo", "segments": [{"start": 0.5, "end": 1.0, "text": "Hallo"}]}
+    results = await decode_results(
+        _chunks(json.dumps(plain).encode()), "application/json; charset=utf-8"
+    )
+    assert results == plain
+
+@pytest.mark.asyncio
+async def test_unsupported_encoding():
+    """Test unknown content types and encodings are refused."""
+    with pytest.raises(UnsupportedEncodingError):
+        await decode_results(_chunks(b"{}"), "application/msgpack")
+    with pytest.raises(UnsupportedEncodingError):
+        await decode_results(_chunks(b"{}"), "application/json", "br")
+
+@pytest.mark.asyncio
+async def test_size_limit():
+    """Test a body expanding past the limit is rejected."""
+    body = gzip.compress(b" " * 10000 + b"{}")
+    with pytest.raises(ResultDecodingError):
+        await decode_results(_chunks(body), "application/json", "gzip", max_size=1000)
+
+@pytest.mark.asyncio
+async def test_malformed_body():
+    """Test truncated and invalid bodies are rejected."""
+    body = gzip.compress(json.dumps(COMPACT).encode())
+    with pytest.raises(ResultDecodingError):
+        await decode_results(_chunks(body[:-10]), COMPACT_RESULTS_MEDIA_TYPE, "gzip")
+    with pytest.raises(ResultDecodingError):
+        await decode_results(_chunks(b"[1, 2]"), "application/json")
+    with pytest.raises(ResultDecodingError):
+        await decode_results(
+            _chunks(json.dumps({"version": 2}).encode()), COMPACT_RESULTS_MEDIA_TYPE
+        )
@@ -0,0 +1,152 @@
+"""Tests for the segmented encryption format."""
+
+import os
+import pytest
+
+from backend.src.utils.segmented_encryption import (
+    HEADER_SIZE,
+    TAG_SIZE,
+    SegmentCipher,
+    SegmentError,
+    content_size,
+    decrypt_segments,
+    encrypt_segments,
+    encrypted_size,
+    new_header,
+    parse_header,
+    segment_count,
+    segment_offset
+)
+
+SEGMENT_SIZE = 1024
+
+def _encrypt(cipher: SegmentCipher, data: bytes) -> bytes:
+    """Encrypt data into header and segments."""
+    count = segment_count(len(data), cipher.segment_size)
+    segments = [
+        cipher.encrypt(
+            i,
+            data[i * cipher.segment_size:(i + 1) * cipher.segment_size],
+            i == count - 1
+        )
+        for i in range(count)
+    ]
+    return cipher.header + b"".join(segments)
+
+@pytest.fixture
+def key():
+    """Create file key."""
+    return os.urandom(32)
+
+@pytest.fixture
+def cipher(key):
+    """Create cipher for a new file."""
+    return SegmentCipher(key, new_header(SEGMENT_SIZE))
+
+class TestHeader:
+    """Test file header."""
+
+    def test_round_trip(self):
+        """Test header records the segment size."""
+        header = new_header(SEGMENT_SIZE)
+        assert len(header) == HEADER_SIZE
+        segment_size, prefix = parse_header(header)
+        assert segment_size == SEGMENT_SIZE
+        assert len(prefix) == 7
+
+    def test_fresh_nonce_prefix(self):
+        """Test every file gets its own nonce prefix."""
+        assert new_header(SEGMENT_SIZE) != new_header(SEGMENT_SIZE)
+
+    def test_invalid_header(self):
+        """Test malformed headers are rejected."""
+        with pytest.raises(SegmentError):
+            parse_header(b"XXXX" + new_header(SEGMENT_SIZE)[4:])
+        with pytest.raises(SegmentError):
+            parse_header(new_header(SEGMENT_SIZE)[:-1])
+
+class TestSizes:
+    """Test size calculations."""
+
+    @pytest.mark.parametrize(
+        "size",
+        [0, 1, SEGMENT_SIZE - 1, SEGMENT_SIZE, SEGMENT_SIZE + 1, 5 * SEGMENT_SIZE]
+    )
+    def test_content_size_inverts_encrypted_size(self, cipher, size):
+        """Test plaintext size is recovered from the encrypted size."""
+        encrypted = _encrypt(cipher, os.urandom(size))
+        assert len(encrypted) == encrypted_size(size, SEGMENT_SIZE)
+        assert content_size(len(encrypted), SEGMENT_SIZE) == size
+
+    def test_segment_offset(self):
+        """Test segments follow the header at fixed offsets."""
+        assert segment_offset(0, SEGMENT_SIZE) == HEADER_SIZE
+        assert segment_offset(3, SEGMENT_SIZE) == HEADER_SIZE + 3 * (SEGMENT_SIZE + TAG_SIZE)
+
+class TestSegmentCipher:
+    """Test sealing and opening segments."""
+
+    def test_segments_decrypt_independently(self, cipher):
+        """Test any segment decrypts on its own."""
+        data = os.urandom(3 * SEGMENT_SIZE + 10)
+        encrypted = _encrypt(cipher, data)
+        start = segment_offset(2, SEGMENT_SIZE)
+        segment = encrypted[start:start + SEGMENT_SIZE + TAG_SIZE]
+        assert cipher.decrypt(2, segment, False) == data[2 * SEGMENT_SIZE:3 * SEGMENT_SIZE]
+
+    def test_reordered_segment_fails(self, cipher):
+        """Test a segment does not open at another index."""
+        segment = cipher.encrypt(0, os.urandom(SEGMENT_SIZE), False)
+        with pytest.raises(SegmentError):
+            cipher.decrypt(1, segment, False)
+
+    def test_truncation_fails(self, cipher):
+        """Test a segment not sealed as last does not open as last."""
+        segment = cipher.encrypt(0, os.urandom(SEGMENT_SIZE), False)
+        with pytest.raises(SegmentError):
+            cipher.decrypt(0, segment, True)
+
+    def test_altered_header_fails(self, key, cipher):
+        """Test segments are bound to the file header."""
+        segment = cipher.encrypt(0, b"data", True)
+        header = bytearray(cipher.header)
+        header[-1] ^= 1
+        other = SegmentCipher(key, bytes(header))
+        with pytest.raises(SegmentError):
+            other.decrypt(0, segment, True)
+
+class TestSegmentBatches:
+    """Test sealing and opening runs of segments."""
+
+    def test_batches_match_single_segments(self, cipher):
+        """Test batches produce the same segments as one at a time."""
+        data = os.urandom(4 * SEGMENT_SIZE + 10)
+        first = encrypt_segments(cipher, 0, data[:2 * SEGMENT_SIZE], False)
+        rest = encrypt_segments(cipher, 2, data[2 * SEGMENT_SIZE:], True)
+        encrypted = cipher.header + first + rest
+        assert len(encrypted) == encrypted_size(len(data), SEGMENT_SIZE)
+        sealed = encrypted[HEADER_SIZE:]
+        split = 2 * (SEGMENT_SIZE + TAG_SIZE)
+        assert decrypt_segments(cipher, 0, sealed[:split], False) == data[:2 * SEGMENT_SIZE]
+        assert decrypt_segments(cipher, 2, sealed[split:], True) == data[2 * SEGMENT_SIZE:]
+
+    def test_empty_last_batch(self, cipher):
+        """Test an empty file is one empty last segment."""
+        sealed = encrypt_segments(cipher, 0, b"", True)
+        assert len(sealed) == TAG_SIZE
+        assert decrypt_segments(cipher, 0, sealed, True) == b""
+
+    def test_batch_at_wrong_index_fails(self, cipher):
+        """Test a run of segments does not open at another index."""
+        sealed = encrypt_segments(cipher, 0, os.urandom(2 * SEGMENT_SIZE), False)
+        with pytest.raises(SegmentError):
+            decrypt_segments(cipher, 1, sealed, False)
+
+    def test_short_segment_not_last_fails(self, cipher):
+        """Test a short trailing segment is refused unless it ends the file."""
+        data = os.urandom(2 * SEGMENT_SIZE + 10)
+        sealed = encrypt_segments(cipher, 0, data, True)
+        with pytest.raises(SegmentError):
+            decrypt_segments(cipher, 0, sealed, False)
+        with pytest.raises(SegmentError):
+            encrypt_segments(cipher, 0, data, False)
@@ -0,0 +1,414 @@
+"""Benchmarks for transcriber service.
+
+Usage:
+    python -m src.benchmark chunking --audio path/to/recording.wav
+    python -m src.benchmark asr --audio path/to/recording.wav
+    python -m src.benchmark results --segments 3000
+    python -m src.benchmark profiles --corpus path/to/corpus
+
+Chunking modes and inference profiles run in fresh processes so the
+reported peak RSS belongs to that mode or profile alone.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import random
+import re
+import resource
+import time
+from typing import Callable, Dict, List, Tuple
+
+# Audio formats picked up from a benchmark corpus
+CORPUS_AUDIO_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.flac', '.ogg')
+
+def _peak_rss_mb() -> float:
+    """Get peak resident set size of the current process in MB."""
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _chunking_worker(mode: str, audio_path: str, chunk_size: int) -> Dict:
+    """Prepare chunks for one file the way a single job would."""
+    import torch
+    import torchaudio
+    from .utils.audio import SAMPLE_RATE, load_waveform, split_chunks
+
+    baseline_rss = _peak_rss_mb()
+    start_time = time.perf_counter()
+
+    with open(audio_path, 'rb') as audio_file:
+        if mode == 'wav':
+            # Previous behaviour: copy into a buffer, re-encode every chunk
+            # as WAV and decode it again before inference
+            buffer = io.BytesIO(audio_file.read())
+            waveform, sample_rate = torchaudio.load(buffer)
+            if sample_rate != SAMPLE_RATE:
+                waveform = torchaudio.transforms.Resample(
+                    orig_freq=sample_rate, new_freq=SAMPLE_RATE
+                )(waveform)
+            chunk_samples = chunk_size * SAMPLE_RATE
+            encoded = []
+            for i in range(0, waveform.size(1), chunk_samples):
+                chunk_buffer = io.BytesIO()
+                torchaudio.save(
+                    chunk_buffer,
+                    waveform[:, i:i + chunk_samples],
+                    SAMPLE_RATE,
+                    format='wav'
+                )
+                encoded.append(chunk_buffer.getvalue())
+            chunks = [
+                torchaudio.load(io.BytesIO(data))[0].mean(dim=0).numpy()
+                for data in encoded
+            ]
+        else:
+            audio = load_waveform(audio_file)
+            chunks = split_chunks(audio, chunk_size)
+            # Touch each chunk the way the models would
+            for chunk in chunks:
+                torch.from_numpy(chunk)
+
+    return {
+        'mode': mode,
+        'chunks': len(chunks),
+        'seconds': round(time.perf_counter() - start_time, 3),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+        'peak_rss_delta_mb': round(_peak_rss_mb() - baseline_rss, 1)
+    }
+
+def benchmark_chunking(args: argparse.Namespace) -> None:
+    """Compare WAV re-encode chunking against in-memory views."""
+    ctx = multiprocessing.get_context('spawn')
+    for mode in ('wav', 'view'):
+        with ctx.Pool(1) as pool:
+            result = pool.apply(
+                _chunking_worker,
+                (mode, args.audio, args.chunk_size)
+            )
+        print(json.dumps(result))
+
+async def _run_asr_benchmark(args: argparse.Namespace) -> None:
+    """Time ASR on one file in each mode with models loaded once."""
+    from .services.provider import TranscriberServiceProvider
+    from .services.transcription import TranscriptionService
+    from .utils.audio import load_waveform, split_chunks, duration_seconds
+
+    settings = TranscriberServiceProvider()._load_settings()
+    settings['chunk_size'] = args.chunk_size
+    service = TranscriptionService(settings)
+    await service.initialize()
+
+    try:
+        with open(args.audio, 'rb') as audio_file:
+            audio = load_waveform(audio_file)
+        chunks = split_chunks(audio, args.chunk_size)
+        audio_seconds = duration_seconds(audio)
+
+        # Warm up alignment model so neither mode pays for loading it
+        await service.align_cache.get(args.language)
+
+        for mode in args.modes:
+            start_time = time.perf_counter()
+            results = await service._run_asr(
+                audio, chunks, 'benchmark', args.language, None, mode
+            )
+            wall_seconds = time.perf_counter() - start_time
+            print(json.dumps({
+                'mode': mode,
+                'audio_seconds': round(audio_seconds, 1),
+                'wall_seconds': round(wall_seconds, 2),
+                'audio_seconds_per_second': round(audio_seconds / wall_seconds, 2),
+                'segments': sum(len(r.get('segments', [])) for r in results)
+            }))
+    finally:
+        await service.cleanup()
+
+def benchmark_asr(args: argparse.Namespace) -> None:
+    """Compare ASR throughput of the chunked and VAD modes."""
+    asyncio.run(_run_asr_benchmark(args))
+
+def _synthetic_result(segments: int, words_per_segment: int) -> Dict:
+    """Build a result shaped like an aligned, diarized transcription."""
+    rng = random.Random(0)
+    vocabulary = [
+        "und", "die", "der", "Sitzung", "Protokoll", "Gemeinderat",
+        "Antrag", "beschlossen", "Abstimmung", "wir", "haben", "heute"
+    ]
+    result_segments = []
+    time_offset = 0.0
+    for _ in range(segments):
+        words = []
+        for _ in range(words_per_segment):
+            start = time_offset + rng.uniform(0.05, 0.2)
+            end = start + rng.uniform(0.15, 0.6)
+            words.append({
+                "word": rng.choice(vocabulary),
+                "start": start,
+                "end": end,
+                "score": rng.random()
+            })
+            time_offset = end
+        result_segments.append({
+            "start": words[0]["start"] if words else time_offset,
+            "end": time_offset,
+            "text": " ".join(word["word"] for word in words),
+            "speaker": f"S{rng.randint(1, 4)}",
+            "confidence": rng.random(),
+            "words": words
+        })
+    return {
+        "text": " ".join(segment["text"] for segment in result_segments),
+        "segments": result_segments,
+        "speakers": {
+            f"S{i}": {"id": f"S{i}", "name": f"Speaker {i}"} for i in range(1, 5)
+        },
+        "language": "de"
+    }
+
+def _timed(func: Callable, repeat: int) -> float:
+    """Get the best wall time of several calls in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+def benchmark_results(args: argparse.Namespace) -> None:
+    """Compare plain JSON and compact result uploads end to end."""
+    from .utils.result_encoding import encode_results, decode_results
+
+    result = _synthetic_result(args.segments, args.words_per_segment)
+    plain = json.dumps(result).encode('utf-8')
+    compact = encode_results(result)
+
+    def store(decoded: Dict, **options) -> bytes:
+        return json.dumps(decoded, ensure_ascii=False, **options).encode('utf-8')
+
+    # Backend side: parse the upload, then serialize it for storage
+    # (previously pretty-printed, now compact)
+    modes = {
+        'json': {
+            'bytes': len(plain),
+            'encode': lambda: json.dumps(result).encode('utf-8'),
+            'decode': lambda: store(json.loads(plain), indent=2)
+        },
+        'compact': {
+            'bytes': len(compact),
+            'encode': lambda: encode_results(result),
+            'decode': lambda: store(decode_results(compact), separators=(',', ':'))
+        }
+    }
+    for mode, steps in modes.items():
+        encode_seconds = _timed(steps['encode'], args.repeat)
+        decode_seconds = _timed(steps['decode'], args.repeat)
+        transfer_seconds = steps['bytes'] * 8 / (args.mbps * 1_000_000)
+        print(json.dumps({
+            'mode': mode,
+            'segments': args.segments,
+            'words': args.segments * args.words_per_segment,
+            'upload_mb': round(steps['bytes'] / (1024 * 1024), 2),
+            'encode_seconds': round(encode_seconds, 3),
+            'transfer_seconds': round(transfer_seconds, 3),
+            'backend_decode_seconds': round(decode_seconds, 3),
+            'total_seconds': round(encode_seconds + transfer_seconds + decode_seconds, 3)
+        }))
+
+def _load_corpus(corpus_dir: str) -> List[Tuple[str, str, str]]:
+    """Find (language, audio path, reference text) entries of a corpus.
+
+    The corpus holds one directory per language code, each with audio
+    files and a reference transcript of the same name ending in .txt.
+    """
+    entries = []
+    for language in sorted(os.listdir(corpus_dir)):
+        language_dir = os.path.join(corpus_dir, language)
+        if not os.path.isdir(language_dir):
+            continue
+        for name in sorted(os.listdir(language_dir)):
+            stem, extension = os.path.splitext(name)
+            reference_path = os.path.join(language_dir, stem + '.txt')
+            if extension.lower() in CORPUS_AUDIO_EXTENSIONS and os.path.exists(reference_path):
+                with open(reference_path, encoding='utf-8') as f:
+                    entries.append((language, os.path.join(language_dir, name), f.read()))
+    if not entries:
+        raise ValueError(f"No audio with reference transcripts found in {corpus_dir}")
+    return entries
+
+def _normalize_words(text: str) -> List[str]:
+    """Lowercase text and split it into words without punctuation."""
+    return re.sub(r"[^\w\s']", ' ', text.lower()).split()
+
+def _word_errors(reference: str, hypothesis: str) -> Tuple[int, int]:
+    """Count word edits between a reference and a hypothesis.
+
+    Returns:
+        Tuple of (substitutions + deletions + insertions, reference words)
+    """
+    ref = _normalize_words(reference)
+    hyp = _normalize_words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            ))
+        previous = current
+    return previous[-1], len(ref)
+
+def _profile_worker(
+    profile_name: str,
+    corpus: List[Tuple[str, str, str]],
+    batch_size: int,
+    cpu_threads: int
+) -> List[Dict]:
+    """Transcribe a corpus with one inference profile, per language stats."""
+    import whisperx
+    from .services.profiles import get_profile
+    from .services.provider import TranscriberServiceProvider
+    from .utils.audio import load_waveform, duration_seconds
+
+    settings = TranscriberServiceProvider()._load_settings()
+    profile = get_profile(profile_name, cpu_threads=cpu_threads)
+
+    start_time = time.perf_counter()
+    model = whisperx.load_model(
+        profile.model,
+        'cpu',
+        compute_type=profile.compute_type_for('cpu'),
+        download_root=settings['cache_dir'],
+        threads=profile.threads()
+    )
+    load_seconds = time.perf_counter() - start_time
+
+    languages: Dict[str, Dict] = {}
+    for language, audio_path, reference in corpus:
+        with open(audio_path, 'rb') as audio_file:
+            audio = load_waveform(audio_file)
+
+        start_time = time.perf_counter()
+        result = model.transcribe(audio, batch_size=batch_size, language=language)
+        wall_seconds = time.perf_counter() - start_time
+
+        hypothesis = ' '.join(segment['text'] for segment in result['segments'])
+        errors, words = _word_errors(reference, hypothesis)
+        stats = languages.setdefault(language, {
+            'files': 0, 'audio_seconds': 0.0, 'wall_seconds': 0.0, 'errors': 0, 'words': 0
+        })
+        stats['files'] += 1
+        stats['audio_seconds'] += duration_seconds(audio)
+        stats['wall_seconds'] += wall_seconds
+        stats['errors'] += errors
+        stats['words'] += words
+
+    return [
+        {
+            'profile': profile.name,
+            'model': profile.model,
+            'compute_type': profile.compute_type,
+            'threads': profile.threads(),
+            'language': language,
+            'files': stats['files'],
+            'audio_seconds': round(stats['audio_seconds'], 1),
+            'rtf': round(stats['wall_seconds'] / stats['audio_seconds'], 3),
+            'wer': round(stats['errors'] / max(1, stats['words']), 4),
+            'load_seconds': round(load_seconds, 1),
+            'peak_rss_mb': round(_peak_rss_mb(), 1)
+        }
+        for language, stats in sorted(languages.items())
+    ]
+
+def benchmark_profiles(args: argparse.Namespace) -> None:
+    """Compare real-time factor, peak RSS and WER of inference profiles."""
+    corpus = _load_corpus(args.corpus)
+    ctx = multiprocessing.get_context('spawn')
+    for profile_name in args.profiles:
+        with ctx.Pool(1) as pool:
+            rows = pool.apply(
+                _profile_worker,
+                (profile_name, corpus, args.batch_size, args.cpu_threads)
+            )
+        for row in rows:
+            print(json.dumps(row))
+
+def main():
+    """Run a benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Transcriber benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    chunking = subparsers.add_parser(
+        'chunking',
+        help="Peak RSS and time of audio chunk preparation per job"
+    )
+    chunking.add_argument('--audio', required=True, help="Audio file to chunk")
+    chunking.add_argument(
+        '--chunk-size', type=int, default=30, help="Chunk size in seconds"
+    )
+    chunking.set_defaults(func=benchmark_chunking)
+
+    asr = subparsers.add_parser(
+        'asr',
+        help="ASR throughput in audio seconds per wall second by mode"
+    )
+    asr.add_argument('--audio', required=True, help="Audio file to transcribe")
+    asr.add_argument('--language', default='de', help="Language code")
+    asr.add_argument(
+        '--modes', nargs='+', default=['chunked', 'vad'], help="ASR modes to compare"
+    )
+    asr.add_argument(
+        '--chunk-size', type=int, default=30, help="Chunk size in seconds"
+    )
+    asr.set_defaults(func=benchmark_asr)
+
+    results = subparsers.add_parser(
+        'results',
+        help="Size and time of result uploads, plain JSON vs compact encoding"
+    )
+    results.add_argument(
+        '--segments', type=int, default=3000, help="Number of segments"
+    )
+    results.add_argument(
+        '--words-per-segment', type=int, default=12, help="Aligned words per segment"
+    )
+    results.add_argument(
+        '--mbps', type=float, default=100.0, help="Link speed for the transfer estimate"
+    )
+    results.add_argument(
+        '--repeat', type=int, default=3, help="Runs per step; the fastest is reported"
+    )
+    results.set_defaults(func=benchmark_results)
+
+    profiles = subparsers.add_parser(
+        'profiles',
+        help="Real-time factor, peak RSS and WER of inference profiles on a corpus"
+    )
+    profiles.add_argument(
+        '--corpus',
+        required=True,
+        help="Directory with one subdirectory per language of audio and .txt references"
+    )
+    profiles.add_argument(
+        '--profiles',
+        nargs='+',
+        default=['large-v3', 'large-v3-int8', 'medium-int8', 'small-int8'],
+        help="Inference profiles to compare"
+    )
+    profiles.add_argument(
+        '--batch-size', type=int, default=16, help="ASR batch size"
+    )
+    profiles.add_argument(
+        '--cpu-threads', type=int, default=0, help="Threads per profile (0: profile default)"
+    )
+    profiles.set_defaults(func=benchmark_profiles)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
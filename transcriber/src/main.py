@@ -3,10 +3,18 @@
 import asyncio
 import logging
 import os
-from fastapi import FastAPI, HTTPException, Response, BackgroundTasks
+import time
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Response
 from prometheus_client import make_asgi_app
 from .services.provider import TranscriberServiceProvider
+from .services.worker import JobWorker
+from .services.admission import AdmissionController
+from .services.cancellation import CancellationRegistry, JobCancelledError
+from .services.model_router import priority_level
 from .utils import setup_metrics
+from .utils.audio import probe_duration
+from .utils.stitching import plan_chunks
 from .utils.logging import log_info, log_error, log_warning
 from .utils.metrics import (
     TRANSCRIPTION_DURATION,
@@ -18,7 +26,10 @@ from .utils.metrics import (
     track_transcription_error,
     track_model_load,
     track_model_inference,
-    track_memory_usage
+    track_memory_usage,
+    track_job_fan_out,
+    track_job_cancellation,
+    track_startup_phase
 )
 
 # Create FastAPI app
@@ -33,6 +44,18 @@ app.mount("/metrics", metrics_app)
 # Global service provider
 service_provider = TranscriberServiceProvider()
 
+# Pull-based job worker, if enabled
+worker = None
+
+# Bounded intake for pushed jobs
+admission = None
+
+# Cancellation tokens of jobs in progress
+cancellations = CancellationRegistry()
+
+# Stage of a split job whose chunks have all completed
+STAGE_REDUCE = "reduce"
+
 # Health check status
 is_healthy = True
 is_ready = False
@@ -51,18 +74,117 @@ async def ready_check():
         raise HTTPException(status_code=503, detail="Service not ready")
     return {"status": "ready"}
 
-@app.post("/jobs/{job_id}/process")
-async def process_job(job_id: str, background_tasks: BackgroundTasks):
-    """Process a job in the background."""
+@app.get("/capacity")
+async def capacity():
+    """Report free job slots so work can be routed to the least-loaded worker."""
     if not is_ready:
         raise HTTPException(status_code=503, detail="Service not ready")
+    return worker.capacity() if worker else admission.capacity()
+
+@app.post("/jobs/{job_id}/process")
+async def process_job(job_id: str):
+    """Queue a job for processing if there is capacity for it."""
+    if not is_ready or not admission:
+        raise HTTPException(status_code=503, detail="Service not ready")
     
-    # Start job processing in the background
-    background_tasks.add_task(process_job_task, job_id)
-    return {"status": "processing", "job_id": job_id}
+    accepted, retry_after = admission.submit(job_id)
+    if not accepted:
+        raise HTTPException(
+            status_code=429,
+            detail="Transcriber at capacity",
+            headers={"Retry-After": str(retry_after)}
+        )
+    # A job submitted again reports where it already is
+    return {"status": admission.job_status(job_id), "job_id": job_id}
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Stop a queued or running job and record it as cancelled in the backend.
+
+    A running job stops at its next chunk or stage boundary and releases
+    its processing slot; results of a cancelled job are not uploaded.
+    Cancelling a job in the backend does not call this endpoint: only
+    pulling workers learn of it, when renewing the job's lease, so with
+    JOB_SOURCE=push jobs must be cancelled here.
+    """
+    if cancellations.cancel(job_id):
+        await service_provider.backend.cancel_job(job_id)
+        return {"status": "cancelling", "job_id": job_id}
+    if admission and admission.cancel(job_id):
+        track_job_cancellation("queued")
+        await service_provider.backend.cancel_job(job_id)
+        return {"status": "cancelled", "job_id": job_id}
+    raise HTTPException(status_code=404, detail=f"Job {job_id} is not in progress")
+
+async def report_job_status(job_id: str, status: str, error: Optional[str] = None):
+    """Record that a job completed or failed in the backend.
+
+    Pulling workers report through the job's lease, which releases it so
+    the job is not queued again; a failed job is retried by the backend
+    until it runs out of retries. Pushed jobs are updated directly.
+    """
+    backend = service_provider.backend
+    if worker:
+        await backend.finish_job(
+            job_id, service_provider.settings['worker_id'], status, error
+        )
+    else:
+        await backend.update_job_status(
+            job_id, status, {"error_message": error} if error else None
+        )
+
+async def fan_out_job(job_id: str, audio_file, duration: Optional[float]) -> bool:
+    """Split a long job into chunk jobs that any worker can pick up.
+
+    Only pulling workers split jobs, since chunk jobs are claimed from the
+    queue. Jobs shorter than fan_out_min_seconds, or that the backend
+    does not let this worker split, are processed here instead.
+
+    Returns:
+        True if the job was split
+    """
+    settings = service_provider.settings
+    if not worker or not settings['fan_out_min_seconds']:
+        return False
+
+    if duration is None:
+        duration = await asyncio.to_thread(probe_duration, audio_file)
+    if duration is None or duration < settings['fan_out_min_seconds']:
+        return False
+
+    chunks = plan_chunks(
+        duration,
+        settings['fan_out_chunk_seconds'],
+        settings['fan_out_overlap_seconds']
+    )
+    if len(chunks) < 2:
+        return False
+
+    child_jobs = await service_provider.backend.fan_out_job(
+        job_id, settings['worker_id'], chunks
+    )
+    if not child_jobs:
+        log_warning(f"Could not split job {job_id}, processing it here")
+        return False
+
+    track_job_fan_out(len(child_jobs))
+    log_info(
+        f"Split job {job_id} into {len(child_jobs)} chunk jobs",
+        duration=round(duration, 1)
+    )
+    return True
 
 async def process_job_task(job_id: str):
-    """Process a transcription job."""
+    """Process a transcription job, or one stage of a split job.
+
+    Chunk jobs transcribe their window of the file and are reported
+    completed through their lease like any claimed job. A split job
+    returns to the queue with stage "reduce" once the backend has
+    recorded all its chunks as completed, and is then finished by
+    merging the chunk results.
+    """
+    audio_file = None
+    cancel_token = cancellations.register(job_id)
     try:
         # Get job details from backend
         job = await service_provider.backend.get_job(job_id)
@@ -73,61 +195,127 @@ async def process_job_task(job_id: str):
         file_id = job['file_id']
         language = job.get('language', 'de')  # Default to German if not specified
         vocabulary = job.get('vocabulary', [])
+        options = job.get('options') or {}
+        asr_mode = options.get('asr_mode')  # Falls back to the configured mode
+        priority = priority_level(job.get('priority'))
+        duration = job.get('duration')  # Probed from the file if unknown
+        metadata = job.get('metadata') or {}
+        chunk = metadata.get('chunk')
         
         log_info(f"Processing job {job_id} for file {file_id}")
 
-        # Update job status to processing
-        await service_provider.backend.update_job_status(
-            job_id, 
-            "processing"
-        )
+        # Claimed jobs are already processing
+        if not worker:
+            await service_provider.backend.update_job_status(job_id, "processing")
 
-        # Download file from storage
-        audio_file = await service_provider.backend.download_file(file_id)
-        
-        # Perform transcription
-        transcription_result = await service_provider.transcription.transcribe(
-            audio_file,
-            job_id=job_id,
-            language=language,
-            vocabulary=vocabulary
-        )
+        if metadata.get('stage') == STAGE_REDUCE:
+            # All chunks are done; merge their results
+            chunk_results = await service_provider.backend.get_chunk_results(job_id)
+            cancel_token.check()
+            transcription_result = await service_provider.transcription.merge_chunks(
+                chunk_results
+            )
+        else:
+            # Download file from storage
+            audio_file = await service_provider.backend.download_file(file_id)
+
+            # Long jobs are left to the chunk jobs
+            if not chunk and await fan_out_job(job_id, audio_file, duration):
+                return
+            
+            # Perform transcription
+            transcription_result = await service_provider.transcription.transcribe(
+                audio_file,
+                job_id=job_id,
+                language=language,
+                vocabulary=vocabulary,
+                asr_mode=asr_mode,
+                priority=priority,
+                duration=duration,
+                window=(chunk['start'], chunk['end']) if chunk else None,
+                cancel_token=cancel_token
+            )
 
-        # Upload results back to storage
-        await service_provider.backend.upload_results(job_id, transcription_result)
+        # Upload results back to storage; a split job's merge needs every
+        # chunk's result, so a job is only completed once it is stored
+        cancel_token.check()
+        if not await service_provider.backend.upload_results(job_id, transcription_result):
+            raise RuntimeError("Failed to upload results")
         
         # Update job status to completed
-        await service_provider.backend.update_job_status(
-            job_id, 
-            "completed"
-        )
+        await report_job_status(job_id, "completed")
         
         log_info(f"Job {job_id} completed successfully")
         
+    except JobCancelledError as e:
+        # Cancels are recorded in the backend by the backend itself or by
+        # cancel_job(); a job whose lease was lost belongs to another worker
+        log_info(f"Job {job_id} stopped: {e.reason}")
+
     except Exception as e:
         log_error(f"Error processing job {job_id}: {str(e)}")
         
         # Update job status to failed
         try:
-            await service_provider.backend.update_job_status(
-                job_id,
-                "failed",
-                {"error_message": str(e)}
-            )
+            await report_job_status(job_id, "failed", str(e))
         except Exception as update_error:
             log_error(f"Failed to update job status for {job_id}: {str(update_error)}")
 
+    finally:
+        # Stops a download still in progress and removes its spool file
+        if audio_file:
+            audio_file.close()
+
+        cancellations.discard(job_id)
+        if cancel_token.cancelled:
+            track_job_cancellation(
+                "running",
+                time.time() - cancel_token.cancelled_at,
+                cancel_token.remaining_seconds()
+            )
+
 async def startup():
     """Initialize services on startup."""
-    global is_ready
+    global is_ready, worker, admission
     
     try:
         # Initialize services
+        start_time = time.time()
         await service_provider.initialize()
         
+        # Claim jobs from the backend queue instead of waiting for pushes
+        settings = service_provider.settings
+        if settings['job_source'] == 'pull':
+            worker = JobWorker(
+                service_provider.backend,
+                process_job_task,
+                worker_id=settings['worker_id'],
+                max_jobs=service_provider.transcription.max_jobs,
+                heartbeat_interval=settings['lease_heartbeat_interval'],
+                claim_wait=settings['claim_wait'],
+                min_free_memory_mb=settings['min_free_memory_mb'],
+                on_cancel=cancellations.cancel
+            )
+            await worker.start()
+        else:
+            admission = AdmissionController(
+                process_job_task,
+                max_concurrent_jobs=service_provider.transcription.max_jobs,
+                max_queue_depth=settings['max_queue_depth'],
+                min_free_memory_mb=settings['min_free_memory_mb']
+            )
+            await admission.start()
+
+        # Follow job limits changed by the autotuner
+        tuner = service_provider.transcription.tuner
+        if tuner:
+            tuner.add_listener(worker.resize if worker else admission.resize)
+        
         # Mark service as ready
         is_ready = True
-        log_info("Transcriber service ready")
+        startup_seconds = time.time() - start_time
+        track_startup_phase("ready", "service", startup_seconds)
+        log_info("Transcriber service ready", startup_seconds=round(startup_seconds, 1))
         
     except Exception as e:
         log_error(f"Failed to initialize transcriber service: {str(e)}")
@@ -142,6 +330,12 @@ async def shutdown():
         is_ready = False
         is_healthy = False
         
+        # Return running jobs to the queue before releasing models
+        if worker:
+            await worker.stop()
+        if admission:
+            await admission.stop()
+        
         # Clean up services
         await service_provider.cleanup()
         log_info("Transcriber service shut down")
@@ -0,0 +1,250 @@
+"""Admission control for transcriber service."""
+
+import asyncio
+import math
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from ..utils.logging import log_info, log_error, log_warning
+from ..utils.metrics import (
+    track_intake_queue_depth,
+    track_intake_wait,
+    track_admission_rejection
+)
+
+# cgroup v2 files, present when running in a container
+CGROUP_MEMORY_MAX = '/sys/fs/cgroup/memory.max'
+CGROUP_MEMORY_CURRENT = '/sys/fs/cgroup/memory.current'
+
+def available_memory_bytes() -> Optional[int]:
+    """Get memory available to this process, honouring container limits.
+
+    Returns:
+        Available bytes, or None if it cannot be determined
+    """
+    try:
+        with open(CGROUP_MEMORY_MAX) as f:
+            limit = f.read().strip()
+        if limit != 'max':
+            with open(CGROUP_MEMORY_CURRENT) as f:
+                return max(0, int(limit) - int(f.read().strip()))
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def process_rss_bytes() -> Optional[int]:
+    """Get the resident memory of this process.
+
+    Returns:
+        Resident bytes, or None if it cannot be determined
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+class AdmissionController:
+    """Bounded intake queue in front of job processing.
+
+    Accepted jobs wait in a queue of at most max_queue_depth and are run
+    by max_concurrent_jobs consumers, so a burst of requests cannot pile
+    up unbounded work (and downloaded audio) in one process. Jobs are
+    refused while the queue is full or available memory is below
+    min_free_memory_mb; callers should retry after the suggested delay,
+    estimated from recent job durations. Queued jobs that are cancelled
+    are skipped when their turn comes. A job is queued at most once:
+    submitting a job that is already queued or running accepts it
+    without running it again.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str], Awaitable[None]],
+        max_concurrent_jobs: int,
+        max_queue_depth: int,
+        min_free_memory_mb: int = 0,
+        default_job_seconds: float = 60.0
+    ):
+        """Initialize admission controller.
+
+        Args:
+            handler: Coroutine function processing a job by ID
+            max_concurrent_jobs: Number of jobs processed at once
+            max_queue_depth: Maximum number of accepted jobs waiting
+            min_free_memory_mb: Refuse jobs below this available memory (0 disables)
+            default_job_seconds: Job duration assumed until one is measured
+        """
+        self.handler = handler
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs)
+        self.max_queue_depth = max(0, max_queue_depth)
+        self.min_free_memory = min_free_memory_mb * 1024 * 1024
+        self._avg_job_seconds = default_job_seconds
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._queued: Set[str] = set()
+        self._cancelled: Set[str] = set()
+        self._active: Set[str] = set()
+        self._running = 0
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self):
+        """Start consumers."""
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._consume())
+                for _ in range(self.max_concurrent_jobs)
+            ]
+            log_info(
+                "Admission control started",
+                max_concurrent_jobs=self.max_concurrent_jobs,
+                max_queue_depth=self.max_queue_depth
+            )
+
+    async def stop(self):
+        """Stop consumers, cancelling running jobs and dropping queued ones."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        while not self._queue.empty():
+            job_id, _ = self._queue.get_nowait()
+            log_warning(f"Dropping queued job {job_id} on shutdown")
+        self._queued.clear()
+        self._cancelled.clear()
+        track_intake_queue_depth(0)
+
+    def resize(self, max_concurrent_jobs: int):
+        """Change how many jobs are processed at once.
+
+        Consumers beyond a lowered limit exit once their job finishes.
+        """
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs)
+        if not self._workers:
+            return
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self.max_concurrent_jobs:
+            self._workers.append(asyncio.create_task(self._consume()))
+
+    def submit(self, job_id: str) -> Tuple[bool, int]:
+        """Queue a job if there is capacity for it.
+
+        A job already queued or running is accepted as is; one cancelled
+        while queued keeps its place in the queue again.
+
+        Returns:
+            Tuple of whether the job was accepted and, if not, the number
+            of seconds after which to retry
+        """
+        if job_id in self._queued or job_id in self._active:
+            if job_id in self._cancelled:
+                self._cancelled.discard(job_id)
+            else:
+                log_info(f"Job {job_id} is already {self.job_status(job_id)}")
+            return True, 0
+
+        # Idle consumers take jobs right away; beyond them jobs need room
+        # in the queue
+        outstanding = self._running + self._queue.qsize()
+        if outstanding >= self.max_concurrent_jobs + self.max_queue_depth:
+            track_admission_rejection('queue_full')
+            return False, self.retry_after()
+
+        if self.min_free_memory:
+            available = available_memory_bytes()
+            if available is not None and available < self.min_free_memory:
+                track_admission_rejection('memory')
+                log_warning(
+                    f"Refusing job {job_id}: {available // (1024 * 1024)} MB available"
+                )
+                return False, self.retry_after()
+
+        self._queue.put_nowait((job_id, time.time()))
+        self._queued.add(job_id)
+        track_intake_queue_depth(self._queue.qsize())
+        return True, 0
+
+    def cancel(self, job_id: str) -> bool:
+        """Drop a job that is still waiting in the queue.
+
+        Returns:
+            False if the job is not queued
+        """
+        if job_id not in self._queued or job_id in self._cancelled:
+            return False
+        self._cancelled.add(job_id)
+        log_info(f"Dropping cancelled job {job_id} from the queue")
+        return True
+
+    def job_status(self, job_id: str) -> Optional[str]:
+        """Get whether a job is "queued" or "running", or None if neither."""
+        if job_id in self._active:
+            return "running"
+        if job_id in self._queued and job_id not in self._cancelled:
+            return "queued"
+        return None
+
+    def retry_after(self) -> int:
+        """Estimate seconds until a job slot frees up."""
+        return max(1, math.ceil(self._avg_job_seconds / self.max_concurrent_jobs))
+
+    def capacity(self) -> Dict:
+        """Report current load for routing work to the least-loaded worker."""
+        queued = self._queue.qsize()
+        free_slots = max(
+            0,
+            self.max_concurrent_jobs + self.max_queue_depth - self._running - queued
+        )
+        available = available_memory_bytes()
+        memory_ok = (
+            not self.min_free_memory
+            or available is None
+            or available >= self.min_free_memory
+        )
+        return {
+            "max_concurrent_jobs": self.max_concurrent_jobs,
+            "max_queue_depth": self.max_queue_depth,
+            "running": self._running,
+            "queued": queued,
+            "free_slots": free_slots if memory_ok else 0,
+            "available_memory_mb": available // (1024 * 1024) if available is not None else None,
+            "retry_after": 0 if free_slots and memory_ok else self.retry_after()
+        }
+
+    async def _consume(self):
+        """Run queued jobs one at a time."""
+        while True:
+            if len(self._workers) > self.max_concurrent_jobs:
+                self._workers.remove(asyncio.current_task())
+                return
+
+            job_id, enqueued_at = await self._queue.get()
+            track_intake_queue_depth(self._queue.qsize())
+            self._queued.discard(job_id)
+            if job_id in self._cancelled:
+                self._cancelled.discard(job_id)
+                continue
+            track_intake_wait(time.time() - enqueued_at)
+
+            self._running += 1
+            self._active.add(job_id)
+            start_time = time.time()
+            try:
+                await self.handler(job_id)
+            except Exception as e:
+                log_error(f"Error processing job {job_id}: {str(e)}")
+            finally:
+                self._running -= 1
+                self._active.discard(job_id)
+                # Smooth over recent jobs for the retry estimate
+                self._avg_job_seconds = (
+                    0.8 * self._avg_job_seconds + 0.2 * (time.time() - start_time)
+                )
@@ -0,0 +1,129 @@
+"""Alignment model cache for transcriber service."""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+from ..utils.logging import log_info, log_error, log_warning
+from ..utils.metrics import (
+    track_alignment_cache_hit,
+    track_alignment_cache_miss,
+    track_alignment_cache_size
+)
+
+def _model_size(model: Any) -> int:
+    """Estimate resident size of a torch model in bytes."""
+    try:
+        return sum(
+            param.numel() * param.element_size()
+            for param in model.parameters()
+        )
+    except Exception:
+        return 0
+
+class AlignmentModelCache:
+    """Bounded LRU cache of whisperx alignment models keyed by language.
+
+    Each language loads under its own lock, so concurrent jobs needing the
+    same missing model load it once, while a load for one language does
+    not hold up jobs whose model is cached or loading for another.
+    """
+
+    def __init__(
+        self,
+        device: str,
+        max_models: int = 4,
+        memory_budget_mb: int = 4096,
+        model_dir: Optional[str] = None
+    ):
+        """Initialize alignment model cache."""
+        self.device = device
+        self.max_models = max(1, max_models)
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.model_dir = model_dir
+        self._models: "OrderedDict[str, Tuple[Any, Dict, int]]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @property
+    def resident_bytes(self) -> int:
+        """Get total estimated size of resident models."""
+        return sum(size for _, _, size in self._models.values())
+
+    async def get(self, language: str) -> Tuple[Any, Dict]:
+        """Get alignment model and metadata for a language, loading on miss."""
+        entry = self._lookup(language)
+        if entry:
+            return entry
+
+        async with self._locks.setdefault(language, asyncio.Lock()):
+            # Another job may have loaded the model while this one waited
+            entry = self._lookup(language)
+            if entry:
+                return entry
+
+            track_alignment_cache_miss(language)
+            model, metadata = await asyncio.to_thread(self._load, language)
+            self._models[language] = (model, metadata, _model_size(model))
+            self._evict()
+            return model, metadata
+
+    def _lookup(self, language: str) -> Optional[Tuple[Any, Dict]]:
+        """Get a cached model and mark it as recently used."""
+        entry = self._models.get(language)
+        if not entry:
+            return None
+        self._models.move_to_end(language)
+        track_alignment_cache_hit(language)
+        return entry[0], entry[1]
+
+    async def preload(self, languages: Iterable[str]):
+        """Load alignment models for languages ahead of the first job."""
+        for language in languages:
+            language = language.strip()
+            if not language:
+                continue
+            try:
+                await self.get(language)
+                log_info(f"Preloaded alignment model for {language}")
+            except Exception as e:
+                log_warning(
+                    f"Failed to preload alignment model for {language}: {str(e)}"
+                )
+
+    def clear(self):
+        """Drop all cached models."""
+        self._models.clear()
+        track_alignment_cache_size(0, 0)
+
+    def _load(self, language: str) -> Tuple[Any, Dict]:
+        """Load an alignment model from disk or the model hub."""
+        try:
+            import whisperx
+
+            return whisperx.load_align_model(
+                language_code=language,
+                device=self.device,
+                model_dir=self.model_dir
+            )
+        except Exception as e:
+            log_error(f"Error loading alignment model for {language}: {str(e)}")
+            raise
+
+    def _evict(self):
+        """Evict least recently used models until within limits."""
+        # Always keep the most recently loaded model, even if it alone
+        # exceeds the memory budget
+        while len(self._models) > 1 and (
+            len(self._models) > self.max_models
+            or self.resident_bytes > self.memory_budget
+        ):
+            language, _ = self._models.popitem(last=False)
+            log_info(f"Evicted alignment model for {language}")
+
+        if self.resident_bytes > self.memory_budget:
+            log_warning(
+                "Alignment model exceeds cache memory budget",
+                resident_bytes=self.resident_bytes,
+                budget_bytes=self.memory_budget
+            )
+
+        track_alignment_cache_size(len(self._models), self.resident_bytes)
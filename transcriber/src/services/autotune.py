@@ -0,0 +1,273 @@
+"""Adaptive concurrency and batch size tuning for transcriber service."""
+
+import asyncio
+import time
+import torch
+from typing import Callable, List, Optional, Tuple
+from .admission import available_memory_bytes, process_rss_bytes
+from .model_router import ProfileSlot
+from ..utils.logging import log_info, log_error, log_warning
+from ..utils.metrics import (
+    track_autotune,
+    track_autotune_decision,
+    track_autotune_observation
+)
+
+# Throughput gain that justifies keeping a raised setting
+MIN_THROUGHPUT_GAIN = 0.05
+
+# Intervals without raising a setting after backing off; doubled after
+# each step undone in a row, up to the maximum
+BACKOFF_HOLD_INTERVALS = 4
+MAX_HOLD_INTERVALS = 64
+
+class AutoTuner:
+    """Adjusts job concurrency and ASR batch size while jobs run.
+
+    Every interval it compares available memory (honouring container
+    limits, or free GPU memory on CUDA) with a reserve and looks at the
+    forward passes run since the previous interval:
+
+    - Below the reserve, it halves the batch size, runs one job fewer and
+      raises nothing for a few intervals, before memory runs out.
+    - Forward passes slower than max_batch_seconds halve the batch size.
+    - Otherwise it raises one setting at a time if memory allows another
+      job: the job limit while every slot is busy, else the batch size.
+      A step that does not improve throughput by the next interval is
+      undone, and the next step waits twice as long as the previous.
+
+    The memory another job needs is estimated from how much memory use
+    grew per running job since no job was running. The job limit is
+    shared out between profiles in proportion to their configured limits.
+    """
+
+    def __init__(
+        self,
+        slots: List[ProfileSlot],
+        batch_size: int,
+        min_jobs: int = 1,
+        max_jobs: int = 8,
+        min_batch_size: int = 4,
+        max_batch_size: int = 64,
+        memory_reserve_mb: int = 1024,
+        max_batch_seconds: float = 10.0,
+        interval: float = 15.0,
+        device: str = 'cpu'
+    ):
+        """Initialize autotuner.
+
+        Args:
+            slots: Loaded profiles whose job limits are tuned
+            batch_size: Initial ASR batch size
+            min_jobs: Lowest total job limit
+            max_jobs: Highest total job limit
+            min_batch_size: Lowest batch size
+            max_batch_size: Highest batch size
+            memory_reserve_mb: Available memory to keep free
+            max_batch_seconds: Slowest acceptable forward pass (0 disables)
+            interval: Seconds between adjustments
+            device: Device models run on
+        """
+        self.slots = slots
+        self.job_bounds = (max(len(slots), min_jobs), max(len(slots), min_jobs, max_jobs))
+        self.batch_bounds = (max(1, min_batch_size), max(1, min_batch_size, max_batch_size))
+        self.memory_reserve = memory_reserve_mb * 1024 * 1024
+        self.max_batch_seconds = max_batch_seconds
+        self.interval = interval
+        self.device = device
+        self._weights = [slot.max_jobs for slot in slots]
+        self._listeners: List[Callable[[int], None]] = []
+        self._batches = 0
+        self._batch_seconds = 0.0
+        self._audio_seconds = 0.0
+        self._last_adjusted = time.monotonic()
+        self._baseline: Optional[int] = None
+        self._job_memory = 0.0
+        self._trial: Optional[Tuple[str, int, float]] = None
+        self._hold = 0
+        self._probe_hold = BACKOFF_HOLD_INTERVALS
+        self._task: Optional[asyncio.Task] = None
+
+        self.jobs = 0
+        self.batch_size = 0
+        self._set_jobs(sum(self._weights))
+        self._set_batch_size(batch_size)
+
+    @property
+    def max_jobs(self) -> int:
+        """Get the number of jobs that can currently be processed at once."""
+        return sum(slot.max_jobs for slot in self.slots)
+
+    def add_listener(self, callback: Callable[[int], None]):
+        """Call back with the new job limit whenever it changes."""
+        self._listeners.append(callback)
+
+    async def start(self):
+        """Start adjusting settings."""
+        if not self._task:
+            _, self._baseline = self._memory()
+            track_autotune(self.max_jobs, self.batch_size)
+            self._task = asyncio.create_task(self._run())
+            log_info(
+                "Autotuner started",
+                max_jobs=self.max_jobs,
+                batch_size=self.batch_size,
+                job_bounds=list(self.job_bounds),
+                batch_bounds=list(self.batch_bounds)
+            )
+
+    async def stop(self):
+        """Stop adjusting settings."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def observe_batch(self, audio_seconds: float, seconds: float):
+        """Record one ASR forward pass."""
+        self._batches += 1
+        self._batch_seconds += seconds
+        self._audio_seconds += audio_seconds
+
+    async def _run(self):
+        """Adjust settings every interval until stopped."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.adjust()
+            except Exception as e:
+                log_error(f"Error adjusting transcription settings: {str(e)}")
+
+    def _memory(self) -> Tuple[Optional[int], Optional[int]]:
+        """Get available and used bytes of the memory models run in."""
+        if self.device.startswith('cuda') and torch.cuda.is_available():
+            free, _ = torch.cuda.mem_get_info()
+            return free, torch.cuda.memory_allocated()
+        return available_memory_bytes(), process_rss_bytes()
+
+    def _set_jobs(self, jobs: int) -> int:
+        """Set the total job limit within bounds.
+
+        Returns:
+            1 if it was raised, -1 if lowered, 0 if unchanged
+        """
+        jobs = min(max(jobs, self.job_bounds[0]), self.job_bounds[1])
+        previous, self.jobs = self.jobs, jobs
+
+        # Share out in proportion to the configured limits, at least one
+        # job per profile, handing leftovers to the largest remainders
+        total = sum(self._weights)
+        shares = [jobs * weight / total for weight in self._weights]
+        limits = [max(1, int(share)) for share in shares]
+        for i in sorted(
+            range(len(shares)), key=lambda i: shares[i] - int(shares[i]), reverse=True
+        ):
+            if sum(limits) >= jobs:
+                break
+            limits[i] += 1
+        for slot, limit in zip(self.slots, limits):
+            slot.set_max_jobs(limit)
+        return (jobs > previous) - (jobs < previous)
+
+    def _set_batch_size(self, batch_size: int) -> int:
+        """Set the batch size within bounds.
+
+        Returns:
+            1 if it was raised, -1 if lowered, 0 if unchanged
+        """
+        batch_size = min(max(batch_size, self.batch_bounds[0]), self.batch_bounds[1])
+        previous, self.batch_size = self.batch_size, batch_size
+        for slot in self.slots:
+            if slot.scheduler:
+                slot.scheduler.batch_size = batch_size
+        return (batch_size > previous) - (batch_size < previous)
+
+    def adjust(self):
+        """Adjust settings from what was measured since the last call."""
+        now = time.monotonic()
+        elapsed = max(now - self._last_adjusted, 1e-6)
+        self._last_adjusted = now
+        batches, audio_seconds = self._batches, self._audio_seconds
+        latency = self._batch_seconds / batches if batches else None
+        throughput = audio_seconds / elapsed
+        self._batches, self._batch_seconds, self._audio_seconds = 0, 0.0, 0.0
+
+        available, used = self._memory()
+        active = sum(slot.active for slot in self.slots)
+        if used is not None:
+            if active == 0 or self._baseline is None:
+                self._baseline = used
+            else:
+                # Decaying peak, so short spikes are remembered a while
+                self._job_memory = max(
+                    0.9 * self._job_memory,
+                    (used - self._baseline) / active
+                )
+        headroom = available - self.memory_reserve if available is not None else None
+        track_autotune_observation(latency, headroom)
+
+        jobs_step, batch_step, reason = 0, 0, None
+        if headroom is not None and headroom < 0:
+            reason = 'memory'
+            batch_step = self._set_batch_size(self.batch_size // 2)
+            jobs_step = self._set_jobs(self.jobs - 1)
+            self._trial, self._hold = None, BACKOFF_HOLD_INTERVALS
+        elif (
+            latency is not None
+            and self.max_batch_seconds
+            and latency > self.max_batch_seconds
+        ):
+            reason = 'latency'
+            batch_step = self._set_batch_size(self.batch_size // 2)
+            self._trial = None
+        elif self._trial:
+            # Keep the last step only if it paid off
+            setting, previous, before = self._trial
+            if batches:
+                self._trial = None
+                if throughput < before * (1 + MIN_THROUGHPUT_GAIN):
+                    reason = 'throughput'
+                    self._hold = self._probe_hold
+                    self._probe_hold = min(2 * self._probe_hold, MAX_HOLD_INTERVALS)
+                    if setting == 'max_jobs':
+                        jobs_step = self._set_jobs(previous)
+                    else:
+                        batch_step = self._set_batch_size(previous)
+                else:
+                    self._probe_hold = BACKOFF_HOLD_INTERVALS
+        elif self._hold:
+            self._hold -= 1
+        elif batches and (headroom is None or headroom > self._job_memory):
+            if active >= self.max_jobs and self.jobs < self.job_bounds[1]:
+                reason = 'saturated'
+                self._trial = ('max_jobs', self.jobs, throughput)
+                jobs_step = self._set_jobs(self.jobs + 1)
+            elif self.batch_size < self.batch_bounds[1] and (
+                not self.max_batch_seconds or latency * 2 <= self.max_batch_seconds
+            ):
+                reason = 'throughput'
+                self._trial = ('batch_size', self.batch_size, throughput)
+                batch_step = self._set_batch_size(self.batch_size * 2)
+
+        track_autotune_decision('max_jobs', jobs_step, reason)
+        track_autotune_decision('batch_size', batch_step, reason)
+        if not (jobs_step or batch_step):
+            return
+
+        track_autotune(self.max_jobs, self.batch_size)
+        log = log_warning if reason == 'memory' else log_info
+        log(
+            "Adjusted transcription settings",
+            reason=reason,
+            max_jobs=self.max_jobs,
+            batch_size=self.batch_size,
+            batch_latency=round(latency, 2) if latency is not None else None,
+            throughput=round(throughput, 2),
+            headroom_mb=headroom // (1024 * 1024) if headroom is not None else None
+        )
+        if jobs_step:
+            for callback in self._listeners:
+                callback(self.max_jobs)
@@ -1,18 +1,50 @@
 """Backend client for transcriber service."""
 
-import io
+import asyncio
 import json
 import httpx
-from typing import Dict, Optional, BinaryIO
+from typing import Dict, List, Optional, BinaryIO
+from ..utils.download import SpooledDownload
+from ..utils.result_encoding import COMPACT_RESULTS_MEDIA_TYPE, encode_results
 from ..utils.logging import log_info, log_error, log_warning
 
+# Size of chunks read from download responses
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Header carrying this service's credential
+SERVICE_TOKEN_HEADER = "X-Service-Token"
+
+# Outcomes of a lease renewal
+LEASE_RENEWED = "renewed"
+LEASE_LOST = "lost"
+LEASE_CANCELLED = "cancelled"
+
 class BackendClient:
     """Client for interacting with the backend API."""
 
-    def __init__(self, base_url: str):
-        """Initialize backend client."""
+    def __init__(
+        self,
+        base_url: str,
+        download_buffer_mb: int = 64,
+        download_part_mb: int = 16,
+        download_parallelism: int = 4,
+        download_retries: int = 5,
+        compact_results: bool = True,
+        service_token: str = ""
+    ):
+        """Initialize backend client.
+
+        service_token is sent with every request so the backend lets this
+        service read the files it transcribes.
+        """
         self.base_url = base_url.rstrip('/')
-        self.client = httpx.AsyncClient(base_url=self.base_url, timeout=300.0)
+        self.download_buffer = download_buffer_mb * 1024 * 1024
+        self.download_part = max(1, download_part_mb) * 1024 * 1024
+        self.download_parallelism = max(1, download_parallelism)
+        self.download_retries = max(0, download_retries)
+        self.compact_results = compact_results
+        headers = {SERVICE_TOKEN_HEADER: service_token} if service_token else None
+        self.client = httpx.AsyncClient(base_url=self.base_url, timeout=300.0, headers=headers)
 
     async def close(self):
         """Close the client."""
@@ -28,6 +60,140 @@ class BackendClient:
             log_error(f"Error getting job {job_id}: {str(e)}")
             return None
 
+    async def claim_jobs(
+        self,
+        worker_id: str,
+        limit: int = 1,
+        wait: float = 30.0
+    ) -> Optional[List[Dict]]:
+        """Claim pending jobs, long-polling up to wait seconds.
+
+        Returns:
+            Claimed jobs (empty if none became available), or None on error
+        """
+        try:
+            response = await self.client.post(
+                "/api/v1/jobs/claim",
+                json={"worker_id": worker_id, "limit": limit, "wait": wait},
+                timeout=wait + 30.0
+            )
+            response.raise_for_status()
+            return response.json().get("data", [])
+        except Exception as e:
+            log_error(f"Error claiming jobs: {str(e)}")
+            return None
+
+    async def renew_lease(self, job_id: str, worker_id: str) -> str:
+        """Renew this worker's lease on a job.
+
+        Returns:
+            LEASE_CANCELLED if the job was cancelled, LEASE_LOST if the
+            lease was lost, LEASE_RENEWED otherwise
+        """
+        try:
+            response = await self.client.post(
+                f"/api/v1/jobs/{job_id}/lease",
+                json={"worker_id": worker_id}
+            )
+            if response.status_code == 410:
+                return LEASE_CANCELLED
+            if response.status_code == 409:
+                return LEASE_LOST
+            response.raise_for_status()
+            return LEASE_RENEWED
+        except Exception as e:
+            # The lease may still be valid; the next heartbeat retries
+            log_warning(f"Error renewing lease on job {job_id}: {str(e)}")
+            return LEASE_RENEWED
+
+    async def finish_job(
+        self,
+        job_id: str,
+        worker_id: str,
+        status: str,
+        error: Optional[str] = None
+    ) -> bool:
+        """Report a job this worker holds as completed or failed.
+
+        Also releases the lease; a failed job is retried by the backend
+        until it runs out of retries.
+
+        Returns:
+            False if the outcome was not recorded, e.g. the lease was lost
+        """
+        try:
+            data = {"worker_id": worker_id, "status": status}
+            if error:
+                data["error"] = error[:2000]
+
+            response = await self.client.post(
+                f"/api/v1/jobs/{job_id}/complete",
+                json=data
+            )
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            log_error(f"Error reporting job {job_id} {status}: {str(e)}")
+            return False
+
+    async def cancel_job(self, job_id: str) -> bool:
+        """Record in the backend that a job was cancelled here.
+
+        Chunk jobs of a split job are cancelled with it.
+        """
+        try:
+            response = await self.client.post(f"/api/v1/jobs/{job_id}/cancel")
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            log_error(f"Error cancelling job {job_id} in backend: {str(e)}")
+            return False
+
+    async def release_lease(self, job_id: str, worker_id: str) -> bool:
+        """Release this worker's lease on a job."""
+        try:
+            response = await self.client.delete(
+                f"/api/v1/jobs/{job_id}/lease",
+                params={"worker_id": worker_id}
+            )
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            log_error(f"Error releasing lease on job {job_id}: {str(e)}")
+            return False
+
+    async def fan_out_job(
+        self,
+        job_id: str,
+        worker_id: str,
+        chunks: List[Dict[str, float]]
+    ) -> Optional[List[str]]:
+        """Split a job this worker holds into chunk jobs.
+
+        Returns:
+            Chunk job IDs in order, or None if the job was not split
+        """
+        try:
+            response = await self.client.post(
+                f"/api/v1/jobs/{job_id}/chunks",
+                json={"worker_id": worker_id, "chunks": chunks}
+            )
+            response.raise_for_status()
+            return response.json()["data"]["child_jobs"]
+        except Exception as e:
+            log_error(f"Error splitting job {job_id} into chunks: {str(e)}")
+            return None
+
+    async def get_chunk_results(self, job_id: str) -> List[Dict]:
+        """Get the results of a split job's chunk jobs in order.
+
+        Raises:
+            httpx.HTTPError: If the results cannot be fetched
+        """
+        response = await self.client.get(f"/api/v1/jobs/{job_id}/chunks/results")
+        response.raise_for_status()
+        return [chunk["results"] for chunk in response.json()["data"]]
+
     async def update_job_status(
         self,
         job_id: str,
@@ -50,28 +216,198 @@ class BackendClient:
             log_error(f"Error updating job {job_id} status: {str(e)}")
             return False
 
-    async def download_file(self, file_id: str) -> Optional[BinaryIO]:
-        """Download file from backend storage."""
+    async def download_file(self, file_id: str) -> BinaryIO:
+        """Download file from backend storage.
+
+        Returns as soon as the response starts; the body keeps streaming
+        into a spooled buffer that holds at most download_buffer bytes in
+        memory, and reads block until the requested bytes have arrived.
+        Files the backend serves as cheap byte ranges are fetched as
+        download_part sized ranges, download_parallelism at a time. An
+        interrupted range is resumed from its last received byte, up to
+        download_retries times.
+
+        Raises:
+            httpx.HTTPError: If the download cannot be started
+        """
+        url = f"/api/v1/files/{file_id}/download"
         try:
-            response = await self.client.get(
-                f"/api/v1/files/{file_id}/download",
-                follow_redirects=True
-            )
-            response.raise_for_status()
-            
-            # Convert response content to file-like object
-            return io.BytesIO(response.content)
+            # A plain GET: the backend streams whole files, whereas a range
+            # request, even "bytes=0-", would be read into memory there
+            request = self.client.build_request("GET", url)
+            response = await self.client.send(request, stream=True, follow_redirects=True)
+            if response.status_code not in (200, 206):
+                await response.aclose()
+                response.raise_for_status()
         except Exception as e:
             log_error(f"Error downloading file {file_id}: {str(e)}")
-            return None
+            raise
 
-    async def upload_results(self, job_id: str, results: Dict) -> bool:
-        """Upload transcription results to backend."""
+        total = self._total_size(response)
+        download = SpooledDownload(self.download_buffer, size=total)
+
+        async def fill(download: SpooledDownload):
+            await self._fill_download(url, response, download, total)
+
+        download.run(fill)
+        return download
+
+    async def _fill_download(
+        self,
+        url: str,
+        response: httpx.Response,
+        download: SpooledDownload,
+        total: Optional[int]
+    ):
+        """Write a file into a download buffer, in parallel ranges if possible."""
+        etag = response.headers.get("ETag")
+        parallel = (
+            response.headers.get("Accept-Ranges") == "bytes"
+            and total is not None
+            and total > self.download_part
+            and self.download_parallelism > 1
+        )
+        if not parallel:
+            await self._fetch_range(url, download, 0, total, etag, response)
+            return
+
+        # The first part comes from the response already open, which is
+        # closed once it has been read; each remaining part is its own
+        # request
+        semaphore = asyncio.Semaphore(self.download_parallelism - 1)
+
+        async def fetch_part(start: int):
+            async with semaphore:
+                end = min(start + self.download_part, total)
+                await self._fetch_range(url, download, start, end, etag)
+
+        tasks = [
+            asyncio.create_task(fetch_part(start))
+            for start in range(self.download_part, total, self.download_part)
+        ]
         try:
-            response = await self.client.post(
-                f"/api/v1/jobs/{job_id}/results",
-                json=results
+            await self._fetch_range(
+                url, download, 0, self.download_part, etag, response
             )
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch_range(
+        self,
+        url: str,
+        download: SpooledDownload,
+        start: int,
+        end: Optional[int],
+        etag: Optional[str],
+        response: Optional[httpx.Response] = None
+    ):
+        """Write bytes start to end (exclusive, None for all) into a buffer.
+
+        Transfer errors, server errors and short bodies are retried with
+        backoff, resuming from the last byte written. A response that is
+        not the requested range (the file changed or ranges are not
+        supported) fails the download.
+        """
+        offset = start
+        attempt = 0
+        while end is None or offset < end:
+            try:
+                if response is None:
+                    response = await self._send_range(url, offset, end, etag)
+                    if response.status_code != 206 and not (
+                        offset == 0 and response.status_code == 200
+                    ):
+                        response.raise_for_status()
+                        raise IOError(
+                            f"Expected partial content at byte {offset}, "
+                            f"got status {response.status_code}"
+                        )
+
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    if end is not None:
+                        chunk = chunk[:end - offset]
+                    download.write_at(offset, chunk)
+                    offset += len(chunk)
+                    if end is not None and offset >= end:
+                        break
+
+                if end is None:
+                    return
+                if offset < end:
+                    raise EOFError(f"Response ended at byte {offset} of {end}")
+            except (httpx.TransportError, httpx.HTTPStatusError, EOFError) as e:
+                retryable = not isinstance(e, httpx.HTTPStatusError) or (
+                    e.response.status_code >= 500 or e.response.status_code == 429
+                )
+                attempt += 1
+                if not retryable or attempt > self.download_retries:
+                    raise
+                log_warning(
+                    f"Download of {url} interrupted at byte {offset}, retrying: {str(e)}",
+                    attempt=attempt
+                )
+                await asyncio.sleep(min(30.0, 0.5 * 2 ** attempt))
+            finally:
+                if response is not None:
+                    await response.aclose()
+                    response = None
+
+    async def _send_range(
+        self,
+        url: str,
+        start: int,
+        end: Optional[int],
+        etag: Optional[str]
+    ) -> httpx.Response:
+        """Request bytes start to end (exclusive, None for all) of a file."""
+        headers = {"Range": f"bytes={start}-{end - 1 if end is not None else ''}"}
+        if etag:
+            # Serve the whole file instead if it changed since the first part
+            headers["If-Range"] = etag
+        request = self.client.build_request("GET", url, headers=headers)
+        return await self.client.send(request, stream=True, follow_redirects=True)
+
+    @staticmethod
+    def _total_size(response: httpx.Response) -> Optional[int]:
+        """Get the full file size from a ranged or whole-file response."""
+        content_range = response.headers.get("Content-Range")
+        if content_range and '/' in content_range:
+            total = content_range.rsplit('/', 1)[1]
+            if total.isdigit():
+                return int(total)
+        content_length = response.headers.get("Content-Length")
+        if response.status_code == 200 and content_length:
+            return int(content_length)
+        return None
+
+    async def upload_results(self, job_id: str, results: Dict) -> bool:
+        """Upload transcription results to backend.
+
+        Results are sent in the compact encoding unless the backend has
+        refused it (415), in which case this and later uploads use JSON.
+        """
+        try:
+            url = f"/api/v1/jobs/{job_id}/results"
+            if self.compact_results:
+                body = await asyncio.to_thread(encode_results, results)
+                response = await self.client.post(
+                    url,
+                    content=body,
+                    headers={
+                        "Content-Type": COMPACT_RESULTS_MEDIA_TYPE,
+                        "Content-Encoding": "gzip"
+                    }
+                )
+                if response.status_code != 415:
+                    response.raise_for_status()
+                    return True
+                log_warning("Backend does not accept compact results, sending JSON")
+                self.compact_results = False
+
+            response = await self.client.post(url, json=results)
             response.raise_for_status()
             return True
         except Exception as e:
@@ -0,0 +1,118 @@
+"""Cooperative job cancellation for transcriber service."""
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Dict, Optional
+
+class JobCancelledError(Exception):
+    """Raised inside a job's processing once the job has been cancelled."""
+
+    def __init__(self, job_id: str, reason: Optional[str] = None):
+        super().__init__(f"Job {job_id} {reason or 'cancelled'}")
+        self.job_id = job_id
+        self.reason = reason
+
+class CancellationToken:
+    """Cancellation flag of one job, checked between units of work.
+
+    Processing calls check() between chunks and pipeline stages, so a
+    cancelled job stops at the next boundary and releases its slot,
+    model and audio. The flag can be checked from worker threads; waits
+    on the event loop are abandoned as soon as the job is cancelled.
+    duration and processed, in audio seconds, are kept up to date by the
+    processing so the work saved by cancelling can be reported.
+    """
+
+    def __init__(self, job_id: str):
+        """Initialize cancellation token.
+
+        Args:
+            job_id: ID of the job the token belongs to
+        """
+        self.job_id = job_id
+        self.reason: Optional[str] = None
+        self.cancelled_at: Optional[float] = None
+        self.duration: Optional[float] = None
+        self.processed = 0.0
+        self._flag = threading.Event()
+        self._event = asyncio.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._flag.is_set()
+
+    def cancel(self, reason: str = "cancelled"):
+        """Cancel the job. Must be called on the event loop."""
+        if self._flag.is_set():
+            return
+        self.reason = reason
+        self.cancelled_at = time.time()
+        self._flag.set()
+        self._event.set()
+
+    def check(self):
+        """Stop processing if the job was cancelled.
+
+        Raises:
+            JobCancelledError: If the job was cancelled
+        """
+        if self._flag.is_set():
+            raise JobCancelledError(self.job_id, self.reason)
+
+    def remaining_seconds(self) -> float:
+        """Get the audio seconds left unprocessed, 0 if unknown."""
+        if not self.duration:
+            return 0.0
+        return max(0.0, self.duration - self.processed)
+
+    async def run(self, awaitable: Awaitable) -> Any:
+        """Await something unless the job is cancelled first.
+
+        Raises:
+            JobCancelledError: If the job is cancelled before it completes
+        """
+        task = asyncio.ensure_future(awaitable)
+        waiter = asyncio.ensure_future(self._event.wait())
+        try:
+            await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            self.check()
+        return task.result()
+
+class CancellationRegistry:
+    """Cancellation tokens of the jobs in progress, by job ID."""
+
+    def __init__(self):
+        """Initialize cancellation registry."""
+        self._tokens: Dict[str, CancellationToken] = {}
+
+    def register(self, job_id: str) -> CancellationToken:
+        """Create the token of a job starting processing."""
+        token = CancellationToken(job_id)
+        self._tokens[job_id] = token
+        return token
+
+    def discard(self, job_id: str):
+        """Forget the token of a job that finished processing."""
+        self._tokens.pop(job_id, None)
+
+    def cancel(self, job_id: str, reason: str = "cancelled") -> bool:
+        """Cancel a job in progress.
+
+        Returns:
+            False if the job is not in progress here
+        """
+        token = self._tokens.get(job_id)
+        if not token:
+            return False
+        token.cancel(reason)
+        return True
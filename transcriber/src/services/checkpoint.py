@@ -0,0 +1,105 @@
+"""Chunk checkpoint store for transcriber service."""
+
+import json
+import os
+import shutil
+import time
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Optional
+from ..utils.logging import log_info, log_error, log_warning
+from ..utils.metrics import track_checkpoint_chunk
+
+def _to_json(value: Any) -> Any:
+    """Convert numpy values left in model output to JSON types."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class JobCheckpoint:
+    """Per-chunk results of one job for one audio file and configuration."""
+
+    def __init__(self, path: Path):
+        """Initialize job checkpoint."""
+        self.path = path
+
+    def load(self, index: int) -> Optional[Dict]:
+        """Get the stored result of a chunk, if it was completed before."""
+        chunk_path = self._chunk_path(index)
+        try:
+            with open(chunk_path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            track_checkpoint_chunk('resumed')
+            return result
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # A corrupt checkpoint is recomputed rather than failing the job
+            log_warning(f"Ignoring unreadable checkpoint {chunk_path}: {str(e)}")
+            return None
+
+    def save(self, index: int, result: Dict):
+        """Persist the result of a chunk as soon as it is produced."""
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            chunk_path = self._chunk_path(index)
+            temp_path = chunk_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, default=_to_json)
+            # Atomic rename so readers never see a partial chunk
+            os.replace(temp_path, chunk_path)
+            track_checkpoint_chunk('saved')
+        except Exception as e:
+            # Checkpoints only speed up retries; never fail the job on them
+            log_warning(f"Failed to save checkpoint for chunk {index}: {str(e)}")
+
+    def _chunk_path(self, index: int) -> Path:
+        return self.path / f"{index:06d}.json"
+
+class CheckpointStore:
+    """Spill directory of per-chunk results so retried jobs can resume.
+
+    Layout is <root>/<job_id>/<audio_hash>-<variant>/<chunk>.json, so a
+    retry only reuses chunks computed from the same audio content with
+    the same chunking, mode and language. Put the root on a volume shared
+    by all replicas to let a different worker resume the job.
+
+    Chunk results are stored unencrypted, so checkpointing is off unless
+    a root is configured, and the root needs the same access control and
+    disk encryption as the backend's storage.
+    """
+
+    def __init__(self, root: str, ttl_hours: float = 48):
+        """Initialize checkpoint store."""
+        self.root = Path(root)
+        self.ttl_seconds = ttl_hours * 3600
+
+    def open(self, job_id: str, audio_hash: str, variant: str) -> JobCheckpoint:
+        """Get the checkpoint for a job's audio and configuration."""
+        return JobCheckpoint(self.root / job_id / f"{audio_hash}-{variant}")
+
+    def discard(self, job_id: str):
+        """Remove all checkpoints of a finished job."""
+        try:
+            shutil.rmtree(self.root / job_id, ignore_errors=True)
+        except Exception as e:
+            log_error(f"Error discarding checkpoints for job {job_id}: {str(e)}")
+
+    def purge_expired(self):
+        """Remove checkpoints of jobs that were never retried."""
+        if not self.root.exists():
+            return
+
+        cutoff = time.time() - self.ttl_seconds
+        purged = 0
+        for job_path in self.root.iterdir():
+            try:
+                if job_path.stat().st_mtime < cutoff:
+                    shutil.rmtree(job_path, ignore_errors=True)
+                    purged += 1
+            except FileNotFoundError:
+                continue
+        if purged:
+            log_info(f"Purged checkpoints of {purged} expired jobs")
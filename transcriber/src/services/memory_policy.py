@@ -0,0 +1,87 @@
+"""Memory release policy for transcriber service."""
+
+import asyncio
+import gc
+import time
+import torch
+from .admission import process_rss_bytes
+from ..utils.logging import log_error
+from ..utils.metrics import track_memory_release, track_memory_usage
+
+# When memory is released
+RELEASE_CHUNK = "chunk"  # After every chunk's inference
+RELEASE_JOB = "job"  # After every job
+RELEASE_THRESHOLD = "threshold"  # After a chunk or job, once usage passes a watermark
+RELEASE_MODES = (RELEASE_CHUNK, RELEASE_JOB, RELEASE_THRESHOLD)
+
+class MemoryPolicy:
+    """Decides when to force garbage collection and clear the CUDA cache.
+
+    A full collection with large tensor graphs alive takes tens to
+    hundreds of milliseconds, so by default memory is released once per
+    job rather than after every chunk. Releasing runs in a worker thread
+    after model locks have been given back, so other jobs keep running
+    inference, and a release requested while one is already running is
+    skipped.
+    """
+
+    def __init__(self, mode: str = RELEASE_JOB, watermark_mb: int = 0):
+        """Initialize memory policy.
+
+        Args:
+            mode: RELEASE_CHUNK, RELEASE_JOB or RELEASE_THRESHOLD
+            watermark_mb: Memory use, resident memory or CUDA memory held
+                by the caching allocator, above which RELEASE_THRESHOLD
+                releases memory
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in RELEASE_MODES:
+            raise ValueError(f"Unknown memory release mode: {mode}")
+        self.mode = mode
+        self.watermark = watermark_mb * 1024 * 1024
+        self._releasing = False
+
+    def _memory_used(self) -> int:
+        """Get the memory use compared against the watermark."""
+        if torch.cuda.is_available():
+            return torch.cuda.memory_reserved()
+        return process_rss_bytes() or 0
+
+    def _should_release(self, trigger: str) -> bool:
+        if self.mode == RELEASE_THRESHOLD:
+            return self._memory_used() >= self.watermark
+        return trigger == self.mode
+
+    async def release(self, trigger: str):
+        """Release memory if the policy asks for it at this point.
+
+        Args:
+            trigger: RELEASE_CHUNK after a chunk, RELEASE_JOB after a job
+        """
+        if self._releasing or not self._should_release(trigger):
+            return
+
+        self._releasing = True
+        try:
+            start_time = time.time()
+            await asyncio.to_thread(self._release)
+            track_memory_release(
+                RELEASE_THRESHOLD if self.mode == RELEASE_THRESHOLD else trigger,
+                time.time() - start_time
+            )
+        except Exception as e:
+            log_error(f"Error releasing memory: {str(e)}")
+        finally:
+            self._releasing = False
+
+    def _release(self):
+        """Collect garbage and return cached CUDA blocks."""
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+            track_memory_usage(torch.cuda.memory_allocated(), "cuda")
+        rss = process_rss_bytes()
+        if rss is not None:
+            track_memory_usage(rss, "system")
@@ -0,0 +1,284 @@
+"""Duration and priority aware model routing for transcriber service."""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+from .cancellation import CancellationToken
+from .profiles import InferenceProfile
+from ..utils.logging import log_info
+from ..utils.metrics import (
+    track_model_route,
+    track_profile_jobs,
+    track_profile_rtf
+)
+
+# Job priorities as defined by the backend
+PRIORITIES = {'low': 0, 'normal': 1, 'high': 2, 'urgent': 3}
+DEFAULT_PRIORITY = PRIORITIES['normal']
+
+def priority_level(value: Union[int, str, None]) -> int:
+    """Get the numeric level of a job priority given as number or name."""
+    if value is None:
+        return DEFAULT_PRIORITY
+    if isinstance(value, str) and not value.isdigit():
+        return PRIORITIES.get(value.lower(), DEFAULT_PRIORITY)
+    return int(value)
+
+class ProfileSlot:
+    """A loaded model profile with its own job limit and speed estimate.
+
+    Jobs routed to the profile run at most max_jobs at a time, a limit
+    that can be changed while jobs run. The real-time factor (processing
+    seconds per audio second) starts at the profile's estimate and
+    follows measured jobs, and together with the audio already routed
+    here gives each job's expected turnaround.
+    """
+
+    def __init__(self, profile: InferenceProfile, model: Any, max_jobs: int):
+        """Initialize profile slot.
+
+        Args:
+            profile: Inference profile
+            model: Loaded whisperx ASR pipeline
+            max_jobs: Maximum number of jobs using the profile at once
+        """
+        self.profile = profile
+        self.model = model
+        self.max_jobs = max(1, max_jobs)
+        self.lock = asyncio.Lock()
+        self.scheduler = None
+        self.rtf = profile.rtf
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._pending_seconds = 0.0
+        self._active = 0
+
+    @property
+    def name(self) -> str:
+        return self.profile.name
+
+    @property
+    def active(self) -> int:
+        """Get the number of jobs holding a slot."""
+        return self._active
+
+    def set_max_jobs(self, max_jobs: int):
+        """Change the job limit; running jobs beyond a lowered limit finish."""
+        self.max_jobs = max(1, max_jobs)
+        self._wake()
+
+    def _wake(self):
+        """Wake as many waiting jobs as there are free slots."""
+        free = self.max_jobs - self._active
+        for waiter in self._waiters:
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def _acquire(self):
+        """Wait for a free job slot and take it."""
+        while self._active >= self.max_jobs:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass a wake-up this job can no longer use on
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+            finally:
+                self._waiters.remove(waiter)
+        self._active += 1
+        track_profile_jobs(self.name, self._active)
+
+    def _release(self):
+        """Give back a job slot."""
+        self._active -= 1
+        track_profile_jobs(self.name, self._active)
+        self._wake()
+
+    def estimate_seconds(self, duration: float) -> float:
+        """Estimate the turnaround of a new job of the given audio duration."""
+        backlog = self._pending_seconds / self.max_jobs
+        return (backlog + duration) * self.rtf
+
+    @asynccontextmanager
+    async def job(
+        self,
+        duration: Optional[float],
+        cancel_token: Optional[CancellationToken] = None
+    ):
+        """Hold one of the profile's job slots, waiting for a free one.
+
+        Raises:
+            JobCancelledError: If the job is cancelled while waiting
+        """
+        duration = duration or 0.0
+        self._pending_seconds += duration
+        try:
+            if cancel_token:
+                await cancel_token.run(self._acquire())
+            else:
+                await self._acquire()
+            try:
+                if cancel_token:
+                    cancel_token.check()
+                yield
+            finally:
+                self._release()
+        finally:
+            self._pending_seconds -= duration
+
+    def observe(self, audio_seconds: float, wall_seconds: float):
+        """Update the real-time factor from a finished job."""
+        if audio_seconds <= 0:
+            return
+        self.rtf = 0.8 * self.rtf + 0.2 * (wall_seconds / audio_seconds)
+        track_profile_rtf(self.name, self.rtf)
+
+@dataclass(frozen=True)
+class RoutingRule:
+    """Route jobs of at least a priority and at most a duration to a profile."""
+    profile: str
+    min_priority: int = 0
+    max_duration: Optional[float] = None
+
+    def matches(self, duration: Optional[float], priority: int) -> bool:
+        if priority < self.min_priority:
+            return False
+        if self.max_duration is not None:
+            return duration is not None and duration <= self.max_duration
+        return True
+
+def parse_profile_limits(spec: str, default_jobs: int) -> Dict[str, int]:
+    """Parse "profile[:max_jobs],..." into profile job limits, in order."""
+    limits: Dict[str, int] = {}
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, jobs = item.partition(':')
+        limits[name.strip()] = int(jobs) if jobs else default_jobs
+    return limits
+
+def parse_routing_rules(spec: str) -> List[RoutingRule]:
+    """Parse routing rules.
+
+    Rules are separated by ";", each a profile followed by conditions,
+    e.g. "small-int8:priority>=urgent:duration<=120;medium-int8:duration<=600".
+
+    Raises:
+        ValueError: If a rule is malformed
+    """
+    rules = []
+    for item in spec.split(';'):
+        item = item.strip()
+        if not item:
+            continue
+        profile, *conditions = [part.strip() for part in item.split(':')]
+        min_priority, max_duration = 0, None
+        for condition in conditions:
+            if condition.startswith('priority>='):
+                min_priority = priority_level(condition[len('priority>='):])
+            elif condition.startswith('duration<='):
+                max_duration = float(condition[len('duration<='):])
+            else:
+                raise ValueError(f"Unknown routing condition: {condition}")
+        rules.append(RoutingRule(profile, min_priority, max_duration))
+    return rules
+
+def parse_latency_sla(spec: str) -> Dict[int, float]:
+    """Parse "priority:seconds,..." into turnaround targets per priority."""
+    targets = {}
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        priority, _, seconds = item.partition(':')
+        targets[priority_level(priority.strip())] = float(seconds)
+    return targets
+
+class ModelRouter:
+    """Picks the loaded model profile that serves each job.
+
+    The first rule matching a job's duration and priority names its
+    profile, otherwise the default profile is used. If the job's priority
+    has a latency target that the chosen profile is not expected to meet,
+    given its speed and the audio already routed to it, the job goes to
+    the first profile (in configured order) that is expected to meet it,
+    or else the one expected to finish soonest.
+    """
+
+    def __init__(
+        self,
+        slots: List[ProfileSlot],
+        default_profile: str,
+        rules: Optional[List[RoutingRule]] = None,
+        latency_sla: Optional[Dict[int, float]] = None
+    ):
+        """Initialize model router.
+
+        Args:
+            slots: Loaded profiles, most preferred first
+            default_profile: Profile for jobs no rule matches
+            rules: Routing rules, first match wins
+            latency_sla: Turnaround target in seconds per priority level
+
+        Raises:
+            ValueError: If a rule or the default names a profile not loaded
+        """
+        self.slots = {slot.name: slot for slot in slots}
+        self.rules = rules or []
+        self.latency_sla = latency_sla or {}
+        for name in [default_profile] + [rule.profile for rule in self.rules]:
+            if name not in self.slots:
+                raise ValueError(f"Routing uses profile {name}, which is not loaded")
+        self.default = self.slots[default_profile]
+
+    @property
+    def uses_duration(self) -> bool:
+        """Check whether routing depends on the audio duration."""
+        return bool(self.latency_sla) or any(
+            rule.max_duration is not None for rule in self.rules
+        )
+
+    def route(
+        self,
+        duration: Optional[float],
+        priority: int
+    ) -> Tuple[ProfileSlot, str]:
+        """Pick the profile for a job.
+
+        Args:
+            duration: Audio duration in seconds, if known
+            priority: Job priority level
+
+        Returns:
+            Tuple of the profile slot and the reason it was picked
+        """
+        slot, reason = self.default, 'default'
+        for rule in self.rules:
+            if rule.matches(duration, priority):
+                slot, reason = self.slots[rule.profile], 'rule'
+                break
+
+        target = self.latency_sla.get(priority)
+        if target is not None and duration is not None and slot.estimate_seconds(duration) > target:
+            candidates = [s for s in self.slots.values() if s.estimate_seconds(duration) <= target]
+            fallback = candidates[0] if candidates else min(
+                self.slots.values(), key=lambda s: s.estimate_seconds(duration)
+            )
+            if fallback is not slot:
+                log_info(
+                    f"Routing job to {fallback.name} instead of {slot.name} to meet latency target",
+                    target_seconds=target,
+                    estimated_seconds=round(slot.estimate_seconds(duration), 1)
+                )
+                slot, reason = fallback, 'latency'
+
+        track_model_route(slot.name, reason)
+        return slot, reason
@@ -0,0 +1,277 @@
+"""Offline model snapshots for transcriber service."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+from ..utils.logging import log_info
+
+MANIFEST_FILE = "manifest.json"
+SNAPSHOT_FORMAT = 1
+
+# Model entries besides the Whisper model of each profile
+VAD = "vad"
+DIARIZATION = "diarization"
+
+# Diarization pipeline parameters naming models of their own
+DIARIZATION_COMPONENTS = ("segmentation", "embedding")
+
+# Files faster-whisper needs to load a model
+WHISPER_FILES = [
+    "config.json",
+    "preprocessor_config.json",
+    "model.bin",
+    "tokenizer.json",
+    "vocabulary.*"
+]
+
+def whisper_key(model: str) -> str:
+    """Get the manifest entry of a Whisper model."""
+    return f"whisper/{model}"
+
+class SnapshotError(Exception):
+    """Raised when a model snapshot is unreadable, incomplete or not the pinned version."""
+
+def _sha256(path: str) -> str:
+    """Hash a file without reading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(8 * 1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ModelSnapshot:
+    """Local copy of every model the service loads, pinned by a manifest.
+
+    The snapshot directory holds the faster-whisper model of each
+    profile, the VAD segmentation model and the diarization pipeline
+    with the models it is built from, so nothing is fetched from the
+    Hugging Face hub at startup. manifest.json records the model version
+    the snapshot was built for, where and at which revision each model
+    was fetched, and the size and SHA-256 of every file.
+    """
+
+    def __init__(self, path: str, manifest: Dict):
+        """Initialize model snapshot.
+
+        Args:
+            path: Snapshot directory
+            manifest: Parsed manifest
+        """
+        self.path = path
+        self.manifest = manifest
+
+    @classmethod
+    def open(cls, path: str, version: str, verify: bool = False) -> 'ModelSnapshot':
+        """Open a snapshot and check it is complete.
+
+        Args:
+            path: Snapshot directory
+            version: Model version the snapshot must have been built for
+            verify: Check file hashes as well as sizes
+
+        Raises:
+            SnapshotError: If the manifest cannot be read, pins another
+                version, or a file is missing or differs
+        """
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Cannot read snapshot manifest {manifest_path}: {str(e)}")
+
+        if manifest.get("format") != SNAPSHOT_FORMAT:
+            raise SnapshotError(f"Unsupported snapshot format: {manifest.get('format')}")
+        if manifest.get("version") != version:
+            raise SnapshotError(
+                f"Snapshot {path} was built for model version "
+                f"{manifest.get('version')}, expected {version}"
+            )
+
+        snapshot = cls(path, manifest)
+        snapshot.verify(full=verify)
+        return snapshot
+
+    def verify(self, full: bool = False):
+        """Check every file in the manifest is present and unchanged.
+
+        Args:
+            full: Compare hashes as well as sizes
+
+        Raises:
+            SnapshotError: If a file is missing or differs
+        """
+        for name, expected in self.manifest["files"].items():
+            file_path = os.path.join(self.path, name)
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                raise SnapshotError(f"Snapshot file missing: {name}")
+            if size != expected["size"]:
+                raise SnapshotError(
+                    f"Snapshot file {name} has {size} bytes, expected {expected['size']}"
+                )
+            if full and _sha256(file_path) != expected["sha256"]:
+                raise SnapshotError(f"Snapshot file {name} does not match its hash")
+
+    def model_path(self, key: str) -> str:
+        """Get the local path of a model.
+
+        Raises:
+            SnapshotError: If the snapshot does not contain the model
+        """
+        entry = self.manifest["models"].get(key)
+        if not entry:
+            raise SnapshotError(f"Snapshot {self.path} does not contain {key}")
+        return os.path.join(self.path, entry["path"])
+
+    def diarization_config(self) -> str:
+        """Get a diarization pipeline config that loads the local models.
+
+        Paths in the config are read relative to the working directory, so
+        a copy pointing at wherever the snapshot is mounted is written to a
+        temporary directory.
+
+        Returns:
+            Path of the config file
+        """
+        import yaml
+
+        with open(self.model_path(DIARIZATION)) as f:
+            config = yaml.safe_load(f)
+        components = self.manifest["models"][DIARIZATION].get("components", {})
+        for name, path in components.items():
+            config["pipeline"]["params"][name] = os.path.join(self.path, path)
+
+        config_path = os.path.join(
+            tempfile.mkdtemp(prefix="transcriber-diarization-"), "config.yaml"
+        )
+        with open(config_path, 'w') as f:
+            yaml.safe_dump(config, f)
+        return config_path
+
+def _parse_repo(value: str) -> Tuple[str, Optional[str]]:
+    """Split "org/name@revision" into repository and revision."""
+    repo_id, _, revision = value.partition('@')
+    return repo_id, revision or None
+
+def _download(
+    repo_id: str,
+    revision: Optional[str],
+    local_dir: str,
+    token: Optional[str],
+    allow_patterns: Optional[List[str]] = None
+) -> str:
+    """Download a hub repository at a fixed commit.
+
+    Returns:
+        Commit the files were downloaded at
+    """
+    from huggingface_hub import HfApi, snapshot_download
+
+    commit = HfApi().model_info(repo_id, revision=revision, token=token).sha
+    snapshot_download(
+        repo_id,
+        revision=commit,
+        local_dir=local_dir,
+        local_dir_use_symlinks=False,
+        allow_patterns=allow_patterns,
+        token=token
+    )
+    return commit
+
+def create_snapshot(
+    path: str,
+    version: str,
+    whisper_models: List[str],
+    diarization_model: str,
+    token: Optional[str] = None
+) -> Dict:
+    """Download models into a snapshot directory and write its manifest.
+
+    Args:
+        path: Snapshot directory
+        version: Model version to pin the snapshot to
+        whisper_models: Whisper models of the profiles to include
+        diarization_model: Diarization pipeline repository
+        token: Hugging Face token for gated models
+
+    Returns:
+        Manifest
+    """
+    import yaml
+    import whisperx.vad
+
+    os.makedirs(path, exist_ok=True)
+    models = {}
+
+    for model in whisper_models:
+        repo_id = model if '/' in model else f"Systran/faster-whisper-{model}"
+        local = os.path.join("whisper", model)
+        revision = _download(
+            repo_id, None, os.path.join(path, local), token, WHISPER_FILES
+        )
+        models[whisper_key(model)] = {"path": local, "source": repo_id, "revision": revision}
+        log_info(f"Added Whisper model {model} to snapshot", revision=revision)
+
+    # Downloaded and checked against its published hash by whisperx
+    local = os.path.join(VAD, "whisperx-vad-segmentation.bin")
+    os.makedirs(os.path.join(path, VAD), exist_ok=True)
+    whisperx.vad.load_vad_model("cpu", model_fp=os.path.join(path, local))
+    models[VAD] = {"path": local, "source": whisperx.vad.VAD_SEGMENTATION_URL}
+
+    # The pipeline config names its segmentation and embedding models by
+    # repository; they are stored next to it and swapped in when loading
+    repo_id, revision = _parse_repo(diarization_model)
+    revision = _download(repo_id, revision, os.path.join(path, DIARIZATION), token)
+    with open(os.path.join(path, DIARIZATION, "config.yaml")) as f:
+        params = yaml.safe_load(f)["pipeline"]["params"]
+    components = {}
+    for name in DIARIZATION_COMPONENTS:
+        value = params.get(name)
+        if not isinstance(value, str) or '/' not in value:
+            continue
+        component_repo, component_revision = _parse_repo(value)
+        # The repository name stays in the path, since pyannote picks the
+        # embedding implementation by it
+        local = os.path.join(DIARIZATION, component_repo.replace('/', '--'))
+        _download(component_repo, component_revision, os.path.join(path, local), token)
+        checkpoint = os.path.join(local, "pytorch_model.bin")
+        components[name] = checkpoint if os.path.isfile(os.path.join(path, checkpoint)) else local
+    models[DIARIZATION] = {
+        "path": os.path.join(DIARIZATION, "config.yaml"),
+        "source": repo_id,
+        "revision": revision,
+        "components": components
+    }
+    log_info(f"Added diarization pipeline {repo_id} to snapshot", revision=revision)
+
+    files = {}
+    for root, dirs, names in os.walk(path):
+        # Download bookkeeping of huggingface_hub
+        dirs[:] = [d for d in dirs if d != '.cache']
+        for name in names:
+            file_path = os.path.join(root, name)
+            relative = os.path.relpath(file_path, path)
+            if relative == MANIFEST_FILE:
+                continue
+            files[relative] = {
+                "size": os.path.getsize(file_path),
+                "sha256": _sha256(file_path)
+            }
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "version": version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "models": models,
+        "files": files
+    }
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    with open(manifest_path + ".tmp", 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return manifest
@@ -0,0 +1,65 @@
+"""Inference profiles for transcriber service."""
+
+import os
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+@dataclass(frozen=True)
+class InferenceProfile:
+    """Whisper model and the precision and threads it runs with.
+
+    compute_type is the CTranslate2 type used on CPU; on GPU the
+    half-precision counterpart is used instead. cpu_threads of 0 uses one
+    thread per available core. rtf is a starting estimate of processing
+    seconds per audio second, refined from measured jobs when routing.
+    """
+    name: str
+    model: str
+    compute_type: str
+    cpu_threads: int = 0
+    rtf: float = 1.0
+
+    def compute_type_for(self, device: str) -> str:
+        """Get the compute type to load the model with on a device."""
+        if device == "cuda":
+            return "int8_float16" if self.compute_type.startswith("int8") else "float16"
+        return self.compute_type
+
+    def threads(self) -> int:
+        """Get the number of CPU threads used for inference."""
+        return self.cpu_threads or os.cpu_count() or 4
+
+# Int8 weights roughly halve memory and speed up CPU inference at a small
+# accuracy cost; smaller models trade more accuracy for speed
+PROFILES: Dict[str, InferenceProfile] = {
+    profile.name: profile for profile in (
+        InferenceProfile("large-v3", "large-v3", "float32", rtf=1.0),
+        InferenceProfile("large-v3-int8", "large-v3", "int8", rtf=0.5),
+        InferenceProfile("medium", "medium", "float32", rtf=0.5),
+        InferenceProfile("medium-int8", "medium", "int8", rtf=0.25),
+        InferenceProfile("small-int8", "small", "int8", rtf=0.1),
+    )
+}
+
+DEFAULT_PROFILE = "large-v3"
+
+def get_profile(
+    name: str,
+    compute_type: Optional[str] = None,
+    cpu_threads: Optional[int] = None
+) -> InferenceProfile:
+    """Get an inference profile by name, with optional overrides.
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if name not in PROFILES:
+        raise ValueError(
+            f"Unknown inference profile: {name} (available: {', '.join(PROFILES)})"
+        )
+    profile = PROFILES[name]
+    if compute_type:
+        profile = replace(profile, compute_type=compute_type)
+    if cpu_threads:
+        profile = replace(profile, cpu_threads=cpu_threads)
+    return profile
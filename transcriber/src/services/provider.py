@@ -1,6 +1,7 @@
 """Service provider for transcriber service."""
 
 import os
+import socket
 from typing import Dict, Optional
 from .transcription import TranscriptionService
 from .backend import BackendClient
@@ -27,7 +28,15 @@ class TranscriberServiceProvider:
             log_info("Settings loaded")
 
             # Initialize backend client
-            self.backend = BackendClient(self.settings['backend_url'])
+            self.backend = BackendClient(
+                self.settings['backend_url'],
+                download_buffer_mb=self.settings['download_buffer_mb'],
+                download_part_mb=self.settings['download_part_mb'],
+                download_parallelism=self.settings['download_parallelism'],
+                download_retries=self.settings['download_retries'],
+                compact_results=self.settings['compact_results'],
+                service_token=self.settings['service_token']
+            )
             log_info("Backend client initialized")
 
             # Initialize transcription service
@@ -66,12 +75,64 @@ class TranscriberServiceProvider:
             'device': os.getenv('DEVICE', 'cpu'),
             'batch_size': int(os.getenv('BATCH_SIZE', '32')),
             'backend_url': os.getenv('BACKEND_API_URL', 'http://backend:8080/api/v1'),
+            'service_token': os.getenv('TRANSCRIBER_SERVICE_TOKEN', ''),
             'model_path': os.getenv('MODEL_PATH', '/models'),
+            'model_snapshot_dir': os.getenv('MODEL_SNAPSHOT_DIR', ''),  # empty: fetch from the hub
+            'verify_model_snapshot': os.getenv('VERIFY_MODEL_SNAPSHOT', 'false').lower() == 'true',
+            'warm_up': os.getenv('WARM_UP', 'true').lower() == 'true',
+            'download_buffer_mb': int(os.getenv('DOWNLOAD_BUFFER_MB', '64')),
+            'download_part_mb': int(os.getenv('DOWNLOAD_PART_MB', '16')),
+            'download_parallelism': int(os.getenv('DOWNLOAD_PARALLELISM', '4')),
+            'download_retries': int(os.getenv('DOWNLOAD_RETRIES', '5')),
+            'compact_results': os.getenv('COMPACT_RESULTS', 'true').lower() == 'true',
             'cache_dir': os.getenv('CACHE_DIR', '/cache'),
             'max_concurrent_jobs': int(os.getenv('MAX_CONCURRENT_JOBS', '2')),
+            'max_queue_depth': int(os.getenv('MAX_QUEUE_DEPTH', '4')),
+            'autotune': os.getenv('AUTOTUNE', 'false').lower() == 'true',
+            'autotune_min_jobs': int(os.getenv('AUTOTUNE_MIN_JOBS', '1')),
+            'autotune_max_jobs': int(os.getenv('AUTOTUNE_MAX_JOBS', '8')),
+            'autotune_min_batch_size': int(os.getenv('AUTOTUNE_MIN_BATCH_SIZE', '4')),
+            'autotune_max_batch_size': int(os.getenv('AUTOTUNE_MAX_BATCH_SIZE', '64')),
+            'autotune_memory_reserve_mb': int(os.getenv('AUTOTUNE_MEMORY_RESERVE_MB', '1024')),
+            'autotune_max_batch_seconds': float(os.getenv('AUTOTUNE_MAX_BATCH_SECONDS', '10')),  # 0 disables
+            'autotune_interval': float(os.getenv('AUTOTUNE_INTERVAL', '15')),
+            'min_free_memory_mb': int(os.getenv('MIN_FREE_MEMORY_MB', '2048')),
+            'job_source': os.getenv('JOB_SOURCE', 'push'),  # push or pull
+            'worker_id': os.getenv('WORKER_ID', socket.gethostname()),
+            'lease_heartbeat_interval': float(os.getenv('LEASE_HEARTBEAT_INTERVAL', '10')),
+            'claim_wait': float(os.getenv('CLAIM_WAIT', '30')),
+            'fan_out_min_seconds': float(os.getenv('FAN_OUT_MIN_SECONDS', '0')),  # 0 disables
+            'fan_out_chunk_seconds': float(os.getenv('FAN_OUT_CHUNK_SECONDS', '600')),
+            'fan_out_overlap_seconds': float(os.getenv('FAN_OUT_OVERLAP_SECONDS', '30')),
             'chunk_size': int(os.getenv('CHUNK_SIZE', '30')),  # seconds
+            'asr_mode': os.getenv('ASR_MODE', 'chunked'),  # chunked or vad
+            'pipeline_depth': int(os.getenv('PIPELINE_DEPTH', '2')),
+            'memory_release': os.getenv('MEMORY_RELEASE', 'job'),  # chunk, job or threshold
+            'memory_release_watermark_mb': int(os.getenv('MEMORY_RELEASE_WATERMARK_MB', '8192')),
+            'vad_onset': float(os.getenv('VAD_ONSET', '0.500')),
+            'vad_offset': float(os.getenv('VAD_OFFSET', '0.363')),
+            'inference_scheduler': os.getenv('INFERENCE_SCHEDULER', 'false').lower() == 'true',
+            'max_batch_delay_ms': float(os.getenv('MAX_BATCH_DELAY_MS', '50')),
+            'checkpoint_dir': os.getenv('CHECKPOINT_DIR', ''),  # unencrypted; empty disables
+            'checkpoint_ttl_hours': float(os.getenv('CHECKPOINT_TTL_HOURS', '48')),
+            'result_cache_dir': os.getenv('RESULT_CACHE_DIR', ''),  # unencrypted; empty disables
+            'result_cache_max_entries': int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '1000')),
+            'result_cache_max_mb': int(os.getenv('RESULT_CACHE_MAX_MB', '1024')),
+            'result_cache_ttl_hours': float(os.getenv('RESULT_CACHE_TTL_HOURS', '168')),
+            'model_version': os.getenv('MODEL_VERSION', 'large-v3'),
+            'inference_profile': os.getenv('INFERENCE_PROFILE', 'large-v3'),
+            'compute_type': os.getenv('COMPUTE_TYPE'),  # overrides the profile
+            'cpu_threads': int(os.getenv('CPU_THREADS', '0')),  # 0: profile default
+            'inference_profiles': os.getenv('INFERENCE_PROFILES', ''),  # profile[:max_jobs],...
+            'routing_rules': os.getenv('ROUTING_RULES', ''),
+            'latency_sla': os.getenv('LATENCY_SLA', ''),  # priority:seconds,...
             'max_retries': int(os.getenv('MAX_RETRIES', '3')),
             'retry_delay': float(os.getenv('RETRY_DELAY', '1.0')),
+            'align_cache_size': int(os.getenv('ALIGN_CACHE_SIZE', '4')),
+            'align_cache_memory_mb': int(os.getenv('ALIGN_CACHE_MEMORY_MB', '4096')),
+            'preload_align_languages': [
+                lang for lang in os.getenv('PRELOAD_ALIGN_LANGUAGES', '').split(',') if lang
+            ],
             'supported_languages': os.getenv('SUPPORTED_LANGUAGES', 'de,en,fr,it').split(','),
             'default_language': os.getenv('DEFAULT_LANGUAGE', 'de')
         }
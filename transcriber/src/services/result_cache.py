@@ -0,0 +1,133 @@
+"""Content-addressed transcription result cache for transcriber service."""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from ..utils.logging import log_info, log_warning
+from ..utils.metrics import track_result_cache_lookup, track_result_cache_size
+
+def cache_key(
+    audio_hash: str,
+    language: str,
+    vocabulary: Optional[List[str]],
+    model_version: str,
+    variant: str = ""
+) -> str:
+    """Build the cache key for a transcription request.
+
+    Args:
+        audio_hash: SHA-256 of the audio file content
+        language: Language code
+        vocabulary: Custom vocabulary terms, in the order they are applied
+        model_version: Version of the models producing the result
+        variant: Other settings that change the result, such as ASR mode
+    """
+    vocabulary_hash = hashlib.sha256(
+        json.dumps(vocabulary or [], ensure_ascii=False).encode('utf-8')
+    ).hexdigest()
+    return hashlib.sha256(
+        f"{audio_hash}:{language}:{vocabulary_hash}:{model_version}:{variant}".encode('utf-8')
+    ).hexdigest()
+
+class ResultCache:
+    """Directory of finished transcriptions keyed by content and settings.
+
+    Entries expire after ttl_hours; beyond max_entries or max_bytes the
+    least recently used entries are evicted. Reads refresh an entry's
+    modification time, which serves as its last use.
+
+    The directory is meant to be on a volume shared by all replicas
+    rather than in the backend's object storage: a hit then costs one
+    local read instead of a round trip through the backend API, and the
+    last-use update LRU eviction needs is a cheap utime, where stored
+    objects would have to be copied on every read.
+
+    Entries are stored unencrypted: anyone who can read the directory
+    can read the transcripts. The cache is therefore off unless a
+    directory is configured, and that directory needs the same access
+    control and disk encryption as the backend's storage.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        max_entries: int = 1000,
+        max_bytes: int = 1024 * 1024 * 1024,
+        ttl_hours: float = 24 * 7
+    ):
+        """Initialize result cache."""
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_hours * 3600
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Get a cached result, if present and not expired."""
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                track_result_cache_lookup(False)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            os.utime(path)  # Mark as recently used
+            track_result_cache_lookup(True)
+            return result
+        except FileNotFoundError:
+            track_result_cache_lookup(False)
+            return None
+        except Exception as e:
+            log_warning(f"Ignoring unreadable cached result {key}: {str(e)}")
+            track_result_cache_lookup(False)
+            return None
+
+    def put(self, key: str, result: Dict):
+        """Store a result and evict entries beyond the limits."""
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            temp_path = path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+            self.evict()
+        except Exception as e:
+            # The cache is an optimization; never fail the job on it
+            log_warning(f"Failed to cache result {key}: {str(e)}")
+
+    def evict(self):
+        """Remove expired entries, then least recently used ones over limits."""
+        now = time.time()
+        entries = []
+        for path in self.root.glob('*.json'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        # Oldest use first
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        evicted = 0
+        while entries and (
+            len(entries) > self.max_entries or total_bytes > self.max_bytes
+        ):
+            _, size, path = entries.pop(0)
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            evicted += 1
+
+        if evicted:
+            log_info(f"Evicted {evicted} cached results")
+        track_result_cache_size(len(entries), total_bytes)
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
@@ -0,0 +1,262 @@
+"""Cross-job inference scheduler for transcriber service."""
+
+import asyncio
+import time
+import numpy as np
+import torch
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from ..utils.audio import SAMPLE_RATE
+from ..utils.logging import log_info, log_error
+from ..utils.metrics import (
+    track_scheduler_batch,
+    track_scheduler_queue_depth
+)
+
+# Whisper processes at most 30 seconds of audio per input
+MAX_SEGMENT_SECONDS = 30
+
+@dataclass
+class _Request:
+    """Speech segment waiting for a forward pass."""
+    audio: np.ndarray
+    language: str
+    future: asyncio.Future
+    enqueued_at: float
+
+class InferenceScheduler:
+    """Batches speech segments from all in-flight jobs into shared forward passes.
+
+    Jobs submit speech regions through transcribe(); a single loop groups
+    pending regions of the same language into batches of up to batch_size,
+    waiting at most max_delay for a batch to fill, and resolves each
+    region's future with its text. If a batch fails, its segments are
+    retried one at a time, so a segment the model cannot decode fails
+    only its own job.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        model_lock: asyncio.Lock,
+        batch_size: int,
+        max_delay: float,
+        observer: Optional[Callable[[float, float], None]] = None
+    ):
+        """Initialize inference scheduler.
+
+        Args:
+            model: Loaded whisperx ASR pipeline
+            model_lock: Lock serializing access to the model
+            batch_size: Maximum segments per forward pass
+            max_delay: Maximum time in seconds to wait for a batch to fill
+            observer: Called with the audio seconds and duration of each
+                forward pass
+        """
+        self.model = model
+        self.model_lock = model_lock
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max_delay
+        self.observer = observer
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._backlog: Deque[_Request] = deque()
+        self._vad_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the batching loop."""
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+            log_info(
+                "Inference scheduler started",
+                batch_size=self.batch_size,
+                max_delay=self.max_delay
+            )
+
+    async def stop(self):
+        """Stop the batching loop and fail pending requests."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while not self._queue.empty():
+            self._backlog.append(self._queue.get_nowait())
+        for request in self._backlog:
+            if not request.future.done():
+                request.future.set_exception(RuntimeError("Inference scheduler stopped"))
+        self._backlog.clear()
+        track_scheduler_queue_depth(0)
+
+    async def transcribe(self, audio: np.ndarray, language: str) -> Dict:
+        """Transcribe audio through the shared batching loop.
+
+        Returns:
+            Result in the same shape as the whisperx pipeline's transcribe()
+        """
+        async with self._vad_lock:
+            regions = await asyncio.to_thread(self._detect_speech, audio)
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        for start, end in regions:
+            future = loop.create_future()
+            self._queue.put_nowait(_Request(
+                audio=audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)],
+                language=language,
+                future=future,
+                enqueued_at=loop.time()
+            ))
+            futures.append(future)
+        track_scheduler_queue_depth(self._queue.qsize() + len(self._backlog))
+
+        try:
+            texts = await asyncio.gather(*futures)
+        except BaseException:
+            # Drop this job's remaining segments from the queue
+            for future in futures:
+                future.cancel()
+            raise
+
+        return {
+            "segments": [
+                {"text": text, "start": round(start, 3), "end": round(end, 3)}
+                for (start, end), text in zip(regions, texts)
+            ],
+            "language": language
+        }
+
+    async def _run(self):
+        """Collect and run batches until cancelled."""
+        while True:
+            batch = await self._collect_batch()
+            if batch:
+                await self._run_batch(batch)
+
+    async def _collect_batch(self) -> List[_Request]:
+        """Wait for the next batch of same-language requests."""
+        if not self._backlog:
+            self._backlog.append(await self._queue.get())
+
+        loop = asyncio.get_running_loop()
+        language = self._backlog[0].language
+        deadline = loop.time() + self.max_delay
+
+        while sum(1 for r in self._backlog if r.language == language) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                self._backlog.append(
+                    await asyncio.wait_for(self._queue.get(), timeout)
+                )
+            except asyncio.TimeoutError:
+                break
+
+        # Requests for other languages stay queued in arrival order
+        batch, remaining = [], deque()
+        for request in self._backlog:
+            if request.future.done():
+                continue  # Job was cancelled or already failed
+            if request.language == language and len(batch) < self.batch_size:
+                batch.append(request)
+            else:
+                remaining.append(request)
+        self._backlog = remaining
+        track_scheduler_queue_depth(self._queue.qsize() + len(self._backlog))
+        return batch
+
+    async def _run_batch(self, batch: List[_Request]):
+        """Run one forward pass and route results to each request."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        oldest_wait = max(now - r.enqueued_at for r in batch)
+
+        try:
+            async with self.model_lock:
+                start_time = time.time()
+                texts = await asyncio.to_thread(
+                    self._forward,
+                    batch[0].language,
+                    [r.audio for r in batch]
+                )
+                duration = time.time() - start_time
+                track_scheduler_batch(len(batch), oldest_wait, duration)
+                if self.observer:
+                    self.observer(
+                        sum(len(r.audio) for r in batch) / SAMPLE_RATE, duration
+                    )
+
+            for request, text in zip(batch, texts):
+                if not request.future.done():
+                    request.future.set_result(text)
+
+        except Exception as e:
+            if len(batch) > 1:
+                # Decode the segments one by one, so only a segment that
+                # fails on its own fails its job
+                log_error(f"Error running inference batch, retrying segments singly: {str(e)}")
+                for request in batch:
+                    if not request.future.done():
+                        await self._run_batch([request])
+                return
+            log_error(f"Error running inference batch: {str(e)}")
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+
+    def _detect_speech(self, audio: np.ndarray) -> List[Tuple[float, float]]:
+        """Split audio into speech regions of at most 30 seconds."""
+        from whisperx.vad import merge_chunks
+
+        vad_segments = self.model.vad_model({
+            "waveform": torch.from_numpy(audio).unsqueeze(0),
+            "sample_rate": SAMPLE_RATE
+        })
+        regions = merge_chunks(
+            vad_segments,
+            MAX_SEGMENT_SECONDS,
+            onset=self.model._vad_params["vad_onset"],
+            offset=self.model._vad_params["vad_offset"]
+        )
+        return [(region["start"], region["end"]) for region in regions]
+
+    def _forward(self, language: str, segments: List[np.ndarray]) -> List[str]:
+        """Decode a batch of speech segments in one forward pass."""
+        return decode_segments(self.model, language, segments)
+
+def decode_segments(model: Any, language: str, segments: List[np.ndarray]) -> List[str]:
+    """Decode speech segments in one forward pass of a whisperx pipeline.
+
+    Unlike the pipeline's transcribe(), the segments are decoded as given,
+    without voice activity detection.
+    """
+    import faster_whisper
+
+    # The pipeline decodes with a single tokenizer, which fixes the
+    # language for the whole batch
+    tokenizer = model.tokenizer
+    if tokenizer is None or tokenizer.language_code != language:
+        model.tokenizer = faster_whisper.tokenizer.Tokenizer(
+            model.model.hf_tokenizer,
+            model.model.model.is_multilingual,
+            task="transcribe",
+            language=language
+        )
+
+    texts = []
+    outputs = model(
+        ({"inputs": segment} for segment in segments),
+        batch_size=len(segments),
+        num_workers=0
+    )
+    for output in outputs:
+        text = output["text"]
+        if isinstance(text, list):
+            text = text[0]
+        texts.append(text)
+    return texts
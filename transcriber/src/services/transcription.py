@@ -2,14 +2,43 @@
 
 import gc
 import os
-import io
 import asyncio
 import logging
+import time
+import numpy as np
 import torch
-import torchaudio
-from typing import Dict, Optional, List, BinaryIO, Tuple
-from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, List, BinaryIO, Tuple
+from contextlib import asynccontextmanager, nullcontext
 from ..utils.logging import log_info, log_error, log_warning
+from ..utils.audio import (
+    SAMPLE_RATE,
+    AudioBuffer,
+    load_waveform,
+    split_chunks,
+    stream_chunks,
+    duration_seconds,
+    file_sha256,
+    probe_duration
+)
+from ..utils.diarization import assign_speakers, speaker_embeddings, speaker_turns
+from ..utils.stitching import stitch_chunks
+from .alignment_cache import AlignmentModelCache
+from .autotune import AutoTuner
+from .memory_policy import MemoryPolicy, RELEASE_CHUNK, RELEASE_JOB
+from .scheduler import InferenceScheduler, decode_segments
+from .model_snapshot import ModelSnapshot, VAD, whisper_key
+from .checkpoint import CheckpointStore, JobCheckpoint
+from .cancellation import CancellationToken, JobCancelledError
+from .result_cache import ResultCache, cache_key
+from .profiles import DEFAULT_PROFILE, InferenceProfile, get_profile
+from .model_router import (
+    ModelRouter,
+    ProfileSlot,
+    DEFAULT_PRIORITY,
+    parse_profile_limits,
+    parse_routing_rules,
+    parse_latency_sla
+)
 from ..utils.metrics import (
     TRANSCRIPTION_DURATION,
     TRANSCRIPTION_ERRORS,
@@ -20,9 +49,50 @@ from ..utils.metrics import (
     track_transcription_error,
     track_model_load,
     track_model_inference,
-    track_memory_usage
+    track_audio_preparation,
+    track_diarization,
+    track_asr_throughput,
+    track_pipeline_queue_depth,
+    track_chunk_merge,
+    track_startup_phase
 )
 
+# ASR modes
+ASR_MODE_CHUNKED = "chunked"  # Fixed-size chunks, one model call per chunk
+ASR_MODE_VAD = "vad"  # Whole file, speech regions found by VAD and batched together
+
+# Length of the synthetic audio models are warmed up with
+WARM_UP_SECONDS = 5
+
+def _warm_up_audio() -> np.ndarray:
+    """Get quiet noise to warm models up with."""
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(WARM_UP_SECONDS * SAMPLE_RATE) * 0.01).astype(np.float32)
+
+class _StageQueue(asyncio.Queue):
+    """Bounded queue feeding a pipeline stage that reports its depth."""
+
+    def __init__(self, stage: str, maxsize: int):
+        """Initialize stage queue."""
+        super().__init__(maxsize=maxsize)
+        self.stage = stage
+
+    def _put(self, item):
+        super()._put(item)
+        if item is not None:
+            track_pipeline_queue_depth(self.stage, 1)
+
+    def _get(self):
+        item = super()._get()
+        if item is not None:
+            track_pipeline_queue_depth(self.stage, -1)
+        return item
+
+    def drain(self):
+        """Discard queued items left behind by a failed pipeline."""
+        while not self.empty():
+            self.get_nowait()
+
 class TranscriptionService:
     """Service for handling audio transcription."""
 
@@ -30,11 +100,16 @@ class TranscriptionService:
         """Initialize transcription service."""
         self.settings = settings
         self.initialized = False
-        self.model = None
+        self.router = None
+        self.diarize_model = None
+        self.align_cache = None
+        self.checkpoints = None
+        self.result_cache = None
+        self.tuner = None
+        self.memory_policy = None
+        self.snapshot = None
         self.model_lock = asyncio.Lock()
-        self.processing_semaphore = asyncio.Semaphore(
-            int(settings.get('max_concurrent_jobs', 2))
-        )
+        self.diarize_lock = asyncio.Lock()
 
     async def initialize(self):
         """Initialize the service."""
@@ -50,20 +125,131 @@ class TranscriptionService:
             self.chunk_size = int(self.settings.get('chunk_size', 30))  # seconds
             self.max_retries = int(self.settings.get('max_retries', 3))
             self.retry_delay = float(self.settings.get('retry_delay', 1.0))
+            self.asr_mode = self.settings.get('asr_mode', ASR_MODE_CHUNKED)
+            self.pipeline_depth = int(self.settings.get('pipeline_depth', 2))
+            self.model_version = self.settings.get('model_version', 'large-v3')
+            self.memory_policy = MemoryPolicy(
+                self.settings.get('memory_release', RELEASE_JOB),
+                watermark_mb=int(self.settings.get('memory_release_watermark_mb', 8192))
+            )
+
+            # Profiles to load and how many jobs each may run at once; the
+            # default profile alone unless several are configured
+            max_concurrent_jobs = int(self.settings.get('max_concurrent_jobs', 2))
+            default_profile = self.settings.get('inference_profile', DEFAULT_PROFILE)
+            profile_limits = parse_profile_limits(
+                self.settings.get('inference_profiles') or default_profile,
+                max_concurrent_jobs
+            )
+            profile_limits.setdefault(default_profile, max_concurrent_jobs)
+            profiles = [
+                get_profile(
+                    name,
+                    compute_type=self.settings.get('compute_type'),
+                    cpu_threads=int(self.settings.get('cpu_threads', 0))
+                )
+                for name in profile_limits
+            ]
 
             if not self.model_path:
                 raise ValueError("Model path not configured")
 
-            # Load model
-            start_time = logging.time()
+            # Pin models to a local snapshot instead of the hub if configured
+            snapshot_dir = self.settings.get('model_snapshot_dir')
+            if snapshot_dir:
+                self.snapshot = await asyncio.to_thread(
+                    ModelSnapshot.open,
+                    snapshot_dir,
+                    self.model_version,
+                    bool(self.settings.get('verify_model_snapshot', False))
+                )
+                log_info(f"Loading models from snapshot {snapshot_dir}")
+
+            # Load models in parallel
+            start_time = time.time()
             async with self._model_context():
-                self.model = await self._load_model()
+                models, self.diarize_model = await asyncio.gather(
+                    asyncio.gather(*(self._load_model(profile) for profile in profiles)),
+                    self._load_diarization_model()
+                )
+            slots = [
+                ProfileSlot(profile, model, profile_limits[profile.name])
+                for profile, model in zip(profiles, models)
+            ]
+            self.router = ModelRouter(
+                slots,
+                default_profile,
+                rules=parse_routing_rules(self.settings.get('routing_rules') or ''),
+                latency_sla=parse_latency_sla(self.settings.get('latency_sla') or '')
+            )
             
             # Track model load time
-            duration = logging.time() - start_time
+            duration = time.time() - start_time
             MODEL_LOAD_TIME.observe(duration)
             track_model_load(duration)
 
+            # Alignment models are loaded per language on first use
+            self.align_cache = AlignmentModelCache(
+                device=self.device,
+                max_models=int(self.settings.get('align_cache_size', 4)),
+                memory_budget_mb=int(self.settings.get('align_cache_memory_mb', 4096)),
+                model_dir=self.cache_dir
+            )
+            await self.align_cache.preload(
+                self.settings.get('preload_align_languages', [])
+            )
+
+            # Persist chunk results so retried jobs can resume
+            checkpoint_dir = self.settings.get('checkpoint_dir')
+            if checkpoint_dir:
+                self.checkpoints = CheckpointStore(
+                    checkpoint_dir,
+                    ttl_hours=float(self.settings.get('checkpoint_ttl_hours', 48))
+                )
+                await asyncio.to_thread(self.checkpoints.purge_expired)
+
+            # Reuse results of identical audio transcribed with the same settings
+            result_cache_dir = self.settings.get('result_cache_dir')
+            if result_cache_dir:
+                self.result_cache = ResultCache(
+                    result_cache_dir,
+                    max_entries=int(self.settings.get('result_cache_max_entries', 1000)),
+                    max_bytes=int(self.settings.get('result_cache_max_mb', 1024)) * 1024 * 1024,
+                    ttl_hours=float(self.settings.get('result_cache_ttl_hours', 168))
+                )
+                await asyncio.to_thread(self.result_cache.evict)
+
+            # Adapt job concurrency and batch size to this machine if enabled
+            if self.settings.get('autotune', False):
+                self.tuner = AutoTuner(
+                    list(self.router.slots.values()),
+                    batch_size=self.batch_size,
+                    min_jobs=int(self.settings.get('autotune_min_jobs', 1)),
+                    max_jobs=int(self.settings.get('autotune_max_jobs', 8)),
+                    min_batch_size=int(self.settings.get('autotune_min_batch_size', 4)),
+                    max_batch_size=int(self.settings.get('autotune_max_batch_size', 64)),
+                    memory_reserve_mb=int(self.settings.get('autotune_memory_reserve_mb', 1024)),
+                    max_batch_seconds=float(self.settings.get('autotune_max_batch_seconds', 10)),
+                    interval=float(self.settings.get('autotune_interval', 15)),
+                    device=self.device
+                )
+
+            # Share forward passes across concurrent jobs of the same
+            # profile if enabled
+            if self.settings.get('inference_scheduler', False):
+                for slot in self.router.slots.values():
+                    slot.scheduler = InferenceScheduler(
+                        model=slot.model,
+                        model_lock=slot.lock,
+                        batch_size=self.tuner.batch_size if self.tuner else self.batch_size,
+                        max_delay=float(self.settings.get('max_batch_delay_ms', 50)) / 1000,
+                        observer=self.tuner.observe_batch if self.tuner else None
+                    )
+                    await slot.scheduler.start()
+
+            if self.tuner:
+                await self.tuner.start()
+
             self.initialized = True
             log_info("Transcription service initialized")
 
@@ -74,9 +260,18 @@ class TranscriptionService:
     async def cleanup(self):
         """Clean up the service."""
         try:
-            if self.model:
+            if self.tuner:
+                await self.tuner.stop()
+                self.tuner = None
+            if self.router:
+                for slot in self.router.slots.values():
+                    if slot.scheduler:
+                        await slot.scheduler.stop()
+                        slot.scheduler = None
                 async with self._model_context():
                     await self._unload_model()
+            if self.align_cache:
+                self.align_cache.clear()
             self.initialized = False
             log_info("Transcription service cleaned up")
 
@@ -84,134 +279,523 @@ class TranscriptionService:
             log_error(f"Error during transcription service cleanup: {str(e)}")
             raise
 
+    @property
+    def max_jobs(self) -> int:
+        """Get the number of jobs that can be processed at once."""
+        return sum(slot.max_jobs for slot in self.router.slots.values())
+
     @asynccontextmanager
-    async def _model_context(self):
-        """Context manager for model operations with memory management."""
+    async def _model_context(self, lock: Optional[asyncio.Lock] = None):
+        """Context manager for model operations with memory management.
+
+        Memory is released as the memory policy asks only once the lock
+        has been given back, so concurrent jobs are not held up by it.
+
+        Args:
+            lock: Lock of the model used; defaults to the lock guarding
+                model loading and unloading
+        """
         try:
-            async with self.model_lock:
-                # Track memory before
-                memory_before = torch.cuda.memory_allocated() if torch.cuda.is_available() else 0
-                MEMORY_USAGE.set(memory_before)
-                track_memory_usage(memory_before)
-                
+            async with lock or self.model_lock:
                 yield
-                
-                # Clear CUDA cache
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
-                
-                # Force garbage collection
-                gc.collect()
-                
-                # Track memory after
-                memory_after = torch.cuda.memory_allocated() if torch.cuda.is_available() else 0
-                MEMORY_USAGE.set(memory_after)
-                track_memory_usage(memory_after)
         except Exception as e:
             log_error(f"Error in model context: {str(e)}")
             raise
+        await self.memory_policy.release(RELEASE_CHUNK)
+
+    def _inference_context(self, slot: ProfileSlot):
+        """Get context for running inference on one chunk.
+
+        With the scheduler enabled, it takes the model lock per batch
+        instead, so concurrent jobs can share forward passes.
+        """
+        if slot.scheduler:
+            return nullcontext()
+        return self._model_context(slot.lock)
 
     async def transcribe(
         self,
         audio_file: BinaryIO,
         job_id: str,
         language: str = 'de',
-        vocabulary: Optional[List[str]] = None
+        vocabulary: Optional[List[str]] = None,
+        asr_mode: Optional[str] = None,
+        priority: int = DEFAULT_PRIORITY,
+        duration: Optional[float] = None,
+        window: Optional[Tuple[float, float]] = None,
+        cancel_token: Optional[CancellationToken] = None
     ) -> Dict:
-        """Transcribe an audio file."""
-        start_time = logging.time()
+        """Transcribe an audio file, or one chunk window of it.
+
+        Args:
+            audio_file: Audio file object
+            job_id: Job ID
+            language: Language code
+            vocabulary: Custom vocabulary terms
+            asr_mode: ASR_MODE_CHUNKED or ASR_MODE_VAD; defaults to the
+                configured mode
+            priority: Job priority level, used to pick the model profile
+            duration: Audio duration in seconds if known; probed from the
+                file when routing depends on it
+            window: Start and end seconds of the chunk to transcribe, for
+                chunk jobs of a split job. The chunk result keeps file
+                times, words, chunk-local speaker labels and the
+                diarization turns, for merging with merge_chunks().
+            cancel_token: Checked between chunks and stages; once the job
+                is cancelled, processing stops and releases its slot
+
+        Raises:
+            JobCancelledError: If the job is cancelled
+        """
+        start_time = time.time()
+        asr_mode = asr_mode or self.asr_mode
+        processed = False
         try:
-            # Acquire processing semaphore
-            async with self.processing_semaphore:
-                log_info(f"Starting transcription for job {job_id}")
+            if asr_mode not in (ASR_MODE_CHUNKED, ASR_MODE_VAD):
+                raise ValueError(f"Unknown ASR mode: {asr_mode}")
+
+            # Pick the model profile serving this job
+            if window:
+                duration = window[1] - window[0]
+            elif duration is None and self.router.uses_duration:
+                duration = await asyncio.to_thread(probe_duration, audio_file)
+            slot, _ = self.router.route(duration, priority)
+
+            # Settings besides language and vocabulary that change results
+            variant = (
+                f"{asr_mode}-{self.chunk_size}s-"
+                f"{slot.profile.model}-{slot.profile.compute_type}"
+            )
+            if window:
+                variant += f"-window-{window[0]}-{window[1]}"
+
+            audio_hash = None
+            if self.checkpoints or self.result_cache:
+                if hasattr(audio_file, 'content_sha256'):
+                    # Streaming downloads hash bytes as they arrive
+                    audio_hash = await audio_file.content_sha256()
+                else:
+                    audio_hash = await asyncio.to_thread(file_sha256, audio_file)
+
+            # Identical audio transcribed before with the same settings is
+            # returned without waiting for a processing slot
+            result_key = None
+            if self.result_cache:
+                result_key = cache_key(
+                    audio_hash, language, vocabulary, self.model_version, variant
+                )
+                cached = await asyncio.to_thread(self.result_cache.get, result_key)
+                if cached is not None:
+                    log_info(f"Returning cached transcription for job {job_id}")
+                    return cached
+
+            # Wait for a job slot of the chosen profile
+            async with slot.job(duration, cancel_token):
+                processed = True
+                log_info(
+                    f"Starting transcription for job {job_id}",
+                    profile=slot.name,
+                    priority=priority,
+                    duration=duration
+                )
+                processing_start = time.time()
+                offset = window[0] if window else 0.0
+                if cancel_token:
+                    cancel_token.duration = duration
+
+                # Chunks already completed by an earlier attempt are
+                # skipped if the audio and configuration are unchanged
+                checkpoint = None
+                if self.checkpoints:
+                    checkpoint = self.checkpoints.open(
+                        job_id, audio_hash, f"{variant}-{language}"
+                    )
+
+                # Diarize the whole file alongside ASR so speaker labels
+                # are consistent across chunks; it starts once decoding
+                # has finished
+                audio_ready = asyncio.get_running_loop().create_future()
+                diarize_task = asyncio.create_task(
+                    self._run_diarization(
+                        audio_ready, cancel_token, embeddings=window is not None
+                    )
+                )
+
+                try:
+                    if asr_mode == ASR_MODE_CHUNKED:
+                        results = await self._run_pipeline(
+                            audio_file, job_id, language, vocabulary,
+                            audio_ready, slot, checkpoint, window, cancel_token
+                        )
+                    else:
+                        audio, chunks = await self._prepare_audio_chunks(
+                            audio_file, window
+                        )
+                        audio_ready.set_result(audio)
+                        results = await self._run_asr(
+                            audio, chunks, job_id, language, vocabulary,
+                            asr_mode, checkpoint, slot, offset, cancel_token
+                        )
+                    annotation, embeddings = await diarize_task
+                    if cancel_token:
+                        cancel_token.check()
+                finally:
+                    if not diarize_task.done():
+                        diarize_task.cancel()
+
+                # Refine the profile's speed estimate used for routing
+                slot.observe(
+                    duration_seconds(audio_ready.result()),
+                    time.time() - processing_start
+                )
 
-                # Prepare audio in chunks
-                chunks = await self._prepare_audio_chunks(audio_file)
-                
-                # Process chunks with retries
-                results = []
-                for i, chunk in enumerate(chunks):
-                    for attempt in range(self.max_retries):
-                        try:
-                            # Run inference on chunk
-                            async with self._model_context():
-                                inference_start = logging.time()
-                                chunk_result = await self._run_inference(
-                                    chunk,
-                                    language,
-                                    vocabulary
-                                )
-                                
-                                # Track inference time
-                                inference_duration = logging.time() - inference_start
-                                MODEL_INFERENCE_TIME.observe(inference_duration)
-                                track_model_inference(inference_duration)
-                                
-                                results.append(chunk_result)
-                                break
-                        except Exception as e:
-                            if attempt == self.max_retries - 1:
-                                raise
-                            log_warning(
-                                f"Retry {attempt + 1} for chunk {i} of job {job_id}: {str(e)}"
-                            )
-                            await asyncio.sleep(self.retry_delay * (attempt + 1))
-                
                 # Combine results
                 final_result = await self._combine_results(results)
+
+                # Join ASR segments against diarization turns
+                final_result["segments"] = assign_speakers(
+                    final_result["segments"], annotation, offset
+                )
                 
-                # Post-process
-                final_result = await self._post_process(final_result)
+                if window:
+                    # Speakers are reconciled across chunks when merging
+                    final_result = {
+                        "language": final_result["language"],
+                        "window": {"start": window[0], "end": window[1]},
+                        "segments": final_result["segments"],
+                        "turns": speaker_turns(annotation, offset),
+                        "embeddings": embeddings
+                    }
+                else:
+                    # Post-process
+                    final_result = await self._post_process(final_result)
+
+                if self.result_cache:
+                    await asyncio.to_thread(
+                        self.result_cache.put, result_key, final_result
+                    )
+                if self.checkpoints:
+                    await asyncio.to_thread(self.checkpoints.discard, job_id)
                 
                 # Track total duration
-                duration = logging.time() - start_time
+                duration = time.time() - start_time
                 TRANSCRIPTION_DURATION.observe(duration)
                 track_transcription(duration)
                 
                 log_info(f"Completed transcription for job {job_id} in {duration:.2f}s")
                 return final_result
 
+        except JobCancelledError:
+            log_info(f"Stopped transcription of cancelled job {job_id}")
+            raise
         except Exception as e:
             TRANSCRIPTION_ERRORS.inc()
             track_transcription_error()
             log_error(f"Error transcribing job {job_id}: {str(e)}")
             raise
+        finally:
+            # Free what the job left behind once its slot is given back
+            if processed:
+                await self.memory_policy.release(RELEASE_JOB)
+
+    async def _run_pipeline(
+        self,
+        audio_file: BinaryIO,
+        job_id: str,
+        language: str,
+        vocabulary: Optional[List[str]],
+        audio_ready: asyncio.Future,
+        slot: ProfileSlot,
+        checkpoint: Optional[JobCheckpoint] = None,
+        window: Optional[Tuple[float, float]] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> List[Dict]:
+        """Run chunked ASR as a decode / infer / post-process pipeline.
+
+        Each stage runs in its own task, so decoding of the next chunk and
+        post-processing of the previous one overlap with inference on the
+        current chunk. Queues between stages hold at most pipeline_depth
+        chunks.
+
+        Args:
+            audio_file: Audio file object
+            job_id: Job ID
+            language: Language code
+            vocabulary: Custom vocabulary terms
+            audio_ready: Resolved with the full waveform once decoding ends
+            slot: Model profile running inference
+            checkpoint: Optional checkpoint of completed chunks
+            window: Optional start and end seconds of the audio to decode
+            cancel_token: Optional token checked by every stage per chunk
+
+        Returns:
+            Post-processed chunk results in order
+        """
+        start_time = time.time()
+        offset, end = window if window else (0.0, None)
+        decoded = _StageQueue('infer', self.pipeline_depth)
+        inferred = _StageQueue('post_process', self.pipeline_depth)
+        results: List[Dict] = []
+
+        async def decode():
+            estimated_samples, chunks = await asyncio.to_thread(
+                stream_chunks, audio_file, self.chunk_size, offset, end
+            )
+            buffer = AudioBuffer(estimated_samples)
+            if cancel_token and not cancel_token.duration and estimated_samples:
+                cancel_token.duration = estimated_samples / SAMPLE_RATE
+            while True:
+                if cancel_token:
+                    cancel_token.check()
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                await decoded.put(buffer.append(chunk))
+            await decoded.put(None)
+            track_audio_preparation(time.time() - start_time)
+            audio_ready.set_result(buffer.audio)
+
+        async def infer():
+            index = 0
+            while (chunk := await decoded.get()) is not None:
+                if cancel_token:
+                    cancel_token.check()
+                result = await self._infer_chunk(
+                    chunk, index, job_id, language, slot, checkpoint
+                )
+                await inferred.put((index, result))
+                index += 1
+            await inferred.put(None)
+
+        async def post_process():
+            while (item := await inferred.get()) is not None:
+                index, result = item
+                results.append(await asyncio.to_thread(
+                    self._finalize_chunk,
+                    result,
+                    offset + index * self.chunk_size,
+                    vocabulary
+                ))
+                if cancel_token:
+                    cancel_token.processed = (index + 1) * self.chunk_size
+
+        stages = [
+            asyncio.create_task(stage())
+            for stage in (decode, infer, post_process)
+        ]
+        try:
+            await asyncio.gather(*stages)
+        except BaseException:
+            for stage in stages:
+                stage.cancel()
+            raise
+        finally:
+            decoded.drain()
+            inferred.drain()
+
+        track_asr_throughput(
+            ASR_MODE_CHUNKED,
+            duration_seconds(audio_ready.result()),
+            time.time() - start_time
+        )
+        log_info(f"Pipeline processed {len(results)} chunks for job {job_id}")
+        return results
+
+    async def _run_asr(
+        self,
+        audio: np.ndarray,
+        chunks: List[np.ndarray],
+        job_id: str,
+        language: str,
+        vocabulary: Optional[List[str]],
+        asr_mode: str,
+        checkpoint: Optional[JobCheckpoint] = None,
+        slot: Optional[ProfileSlot] = None,
+        offset: float = 0.0,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> List[Dict]:
+        """Run ASR on already decoded audio in the requested mode.
+
+        Uses the default model profile unless a slot is given. offset is
+        the file time at which the audio starts. cancel_token is checked
+        before each model call.
+
+        Returns:
+            Post-processed results in order
+        """
+        start_time = time.time()
+        slot = slot or self.router.default
+
+        if asr_mode == ASR_MODE_VAD:
+            # whisperx runs VAD over whatever it is given and batches the
+            # speech regions, so handing it the whole file fills batches
+            # and skips non-speech time
+            segments, offsets = [audio], [offset]
+        elif asr_mode == ASR_MODE_CHUNKED:
+            segments = chunks
+            offsets = [offset + i * self.chunk_size for i in range(len(chunks))]
+        else:
+            raise ValueError(f"Unknown ASR mode: {asr_mode}")
+
+        if cancel_token and not cancel_token.duration:
+            cancel_token.duration = duration_seconds(audio)
+
+        results = []
+        for i, (segment, segment_offset) in enumerate(zip(segments, offsets)):
+            if cancel_token:
+                cancel_token.check()
+            result = await self._infer_chunk(
+                segment, i, job_id, language, slot, checkpoint
+            )
+            results.append(self._finalize_chunk(result, segment_offset, vocabulary))
+            if cancel_token:
+                cancel_token.processed = segment_offset - offset + duration_seconds(segment)
+
+        track_asr_throughput(
+            asr_mode,
+            duration_seconds(audio),
+            time.time() - start_time
+        )
+        return results
+
+    async def _infer_chunk(
+        self,
+        chunk: np.ndarray,
+        index: int,
+        job_id: str,
+        language: str,
+        slot: ProfileSlot,
+        checkpoint: Optional[JobCheckpoint] = None
+    ) -> Dict:
+        """Run ASR and alignment on one chunk with retries.
+
+        With a checkpoint, a chunk completed by an earlier attempt is
+        returned without inference, and new results are persisted as soon
+        as they are produced.
+        """
+        if checkpoint:
+            stored = await asyncio.to_thread(checkpoint.load, index)
+            if stored is not None:
+                return stored
+
+        for attempt in range(self.max_retries):
+            try:
+                # Run inference on chunk
+                async with self._inference_context(slot):
+                    inference_start = time.time()
+                    chunk_result = await self._run_inference(chunk, language, slot)
+                    
+                    # Track inference time
+                    inference_duration = time.time() - inference_start
+                    MODEL_INFERENCE_TIME.observe(inference_duration)
+                    track_model_inference(inference_duration)
+
+                if checkpoint:
+                    await asyncio.to_thread(checkpoint.save, index, chunk_result)
+                return chunk_result
+            except Exception as e:
+                if attempt == self.max_retries - 1:
+                    raise
+                log_warning(
+                    f"Retry {attempt + 1} for chunk {index} of job {job_id}: {str(e)}"
+                )
+                await asyncio.sleep(self.retry_delay * (attempt + 1))
+
+    async def _load_model(self, profile: InferenceProfile) -> Any:
+        """Load the Whisper model of an inference profile and warm it up.
 
-    async def _load_model(self) -> Tuple:
-        """Load the transcription model."""
+        Runs in a worker thread so models load in parallel; from the model
+        snapshot if one is configured.
+        """
         try:
             import whisperx
-            from pyannote.audio import Pipeline
-            
-            # Determine compute type based on device
-            compute_type = "float16" if self.device == "cuda" else "float32"
-            
-            # Load the Whisper model
-            model = whisperx.load_model(
-                "large-v3",  # Using Whisper v3 large model
+
+            start_time = time.time()
+            compute_type = profile.compute_type_for(self.device)
+            model = await asyncio.to_thread(
+                whisperx.load_model,
+                self.snapshot.model_path(whisper_key(profile.model)) if self.snapshot else profile.model,
                 self.device,
                 compute_type=compute_type,
-                download_root=self.cache_dir
+                download_root=self.cache_dir,
+                threads=profile.threads(),
+                vad_model_fp=self.snapshot.model_path(VAD) if self.snapshot else None,
+                vad_options={
+                    "vad_onset": float(self.settings.get('vad_onset', 0.500)),
+                    "vad_offset": float(self.settings.get('vad_offset', 0.363))
+                }
             )
-            
-            # Load the diarization model
-            diarize_model = Pipeline.from_pretrained(
-                "pyannote/speaker-diarization",
-                use_auth_token=os.environ.get("HF_AUTH_TOKEN")
-            ).to(torch.device(self.device))
-            
-            log_info(f"Models loaded successfully on {self.device}")
-            return (model, diarize_model)
+            track_startup_phase("load", profile.name, time.time() - start_time)
+
+            log_info(
+                f"Model loaded successfully on {self.device}",
+                profile=profile.name,
+                model=profile.model,
+                compute_type=compute_type,
+                threads=profile.threads()
+            )
+
+            if self.settings.get('warm_up', True):
+                start_time = time.time()
+                await asyncio.to_thread(self._warm_up_model, model)
+                track_startup_phase("warm_up", profile.name, time.time() - start_time)
+            return model
+        except Exception as e:
+            log_error(f"Error loading model for profile {profile.name}: {str(e)}")
+            raise
+
+    async def _load_diarization_model(self) -> Any:
+        """Load the speaker diarization model and warm it up."""
+        try:
+            from pyannote.audio import Pipeline
+
+            def load():
+                config = (
+                    self.snapshot.diarization_config() if self.snapshot
+                    else "pyannote/speaker-diarization"
+                )
+                return Pipeline.from_pretrained(
+                    config,
+                    use_auth_token=os.environ.get("HF_AUTH_TOKEN")
+                ).to(torch.device(self.device))
+
+            start_time = time.time()
+            diarize_model = await asyncio.to_thread(load)
+            track_startup_phase("load", "diarization", time.time() - start_time)
+            log_info(f"Diarization model loaded successfully on {self.device}")
+
+            if self.settings.get('warm_up', True):
+                start_time = time.time()
+                await asyncio.to_thread(diarize_model, {
+                    "waveform": torch.from_numpy(_warm_up_audio()).unsqueeze(0),
+                    "sample_rate": SAMPLE_RATE
+                })
+                track_startup_phase("warm_up", "diarization", time.time() - start_time)
+            return diarize_model
         except Exception as e:
-            log_error(f"Error loading model: {str(e)}")
+            log_error(f"Error loading diarization model: {str(e)}")
             raise
 
+    def _warm_up_model(self, model: Any):
+        """Run VAD and one forward pass of an ASR model on synthetic audio.
+
+        The first inference allocates buffers and initializes kernels;
+        doing it at startup keeps that cost off the first job.
+        """
+        audio = _warm_up_audio()
+        model.vad_model({
+            "waveform": torch.from_numpy(audio).unsqueeze(0),
+            "sample_rate": SAMPLE_RATE
+        })
+        decode_segments(model, self.settings.get('default_language', 'de'), [audio])
+
     async def _unload_model(self):
-        """Unload the transcription model."""
+        """Unload the transcription models."""
         try:
-            if self.model:
+            if self.router or self.diarize_model:
                 # Explicitly delete model references
-                self.model = None
+                self.router = None
+                self.diarize_model = None
                 
                 # Force garbage collection
                 gc.collect()
@@ -223,119 +807,191 @@ class TranscriptionService:
             log_error(f"Error unloading model: {str(e)}")
             raise
 
-    async def _prepare_audio_chunks(self, audio_file: BinaryIO) -> List[bytes]:
-        """Prepare audio in chunks for processing."""
+    async def _prepare_audio_chunks(
+        self,
+        audio_file: BinaryIO,
+        window: Optional[Tuple[float, float]] = None
+    ) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """Prepare audio in chunks for processing.
+
+        The file is decoded and resampled once; the returned chunks are
+        float32 views into that single array and are passed to the models
+        as-is, without re-encoding. With a window, only the audio between
+        its start and end seconds is kept.
+
+        Returns:
+            Tuple of the full audio array and its chunk views
+        """
         try:
-            # Read file into memory buffer
-            buffer = io.BytesIO(audio_file.read())
-            audio_file.seek(0)
-            
-            # Load audio
-            waveform, sample_rate = torchaudio.load(buffer)
-            
-            # Apply audio filtering (similar to the example's lowpass/highpass)
-            # This is optional but can improve transcription quality
-            if hasattr(torchaudio.transforms, 'Resample'):
-                # Ensure consistent sample rate (16kHz is standard for Whisper)
-                if sample_rate != 16000:
-                    resampler = torchaudio.transforms.Resample(
-                        orig_freq=sample_rate, new_freq=16000
-                    )
-                    waveform = resampler(waveform)
-                    sample_rate = 16000
-            
-            # Calculate chunk size in samples
-            chunk_samples = self.chunk_size * sample_rate
-            
-            # Split into chunks
-            chunks = []
-            for i in range(0, waveform.size(1), chunk_samples):
-                chunk = waveform[:, i:i + chunk_samples]
-                chunk_buffer = io.BytesIO()
-                torchaudio.save(chunk_buffer, chunk, sample_rate, format='wav')
-                chunks.append(chunk_buffer.getvalue())
-            
+            start_time = time.time()
+
+            audio = load_waveform(audio_file)
+            if hasattr(audio_file, 'seek'):
+                audio_file.seek(0)
+            if window:
+                # Copy so the rest of the file's audio can be freed
+                audio = audio[
+                    int(window[0] * SAMPLE_RATE):int(window[1] * SAMPLE_RATE)
+                ].copy()
+
+            chunks = split_chunks(audio, self.chunk_size)
+
+            track_audio_preparation(time.time() - start_time)
             log_info(f"Audio split into {len(chunks)} chunks")
-            return chunks
+            return audio, chunks
         except Exception as e:
             log_error(f"Error preparing audio chunks: {str(e)}")
             raise
 
     async def _run_inference(
         self,
-        audio_data: bytes,
+        audio: np.ndarray,
         language: str,
-        vocabulary: Optional[List[str]] = None
+        slot: ProfileSlot
     ) -> Dict:
-        """Run model inference."""
+        """Run model inference on a 16kHz mono float32 audio array."""
         try:
             import whisperx
-            import io
-            import numpy as np
-            
-            # Convert bytes to audio array
-            audio_buffer = io.BytesIO(audio_data)
-            audio = whisperx.load_audio(audio_buffer)
-            
-            # Unpack models
-            whisper_model, diarize_model = self.model
             
-            # Run ASR with Whisper
-            result = whisper_model.transcribe(
-                audio, 
-                batch_size=self.batch_size,
-                language=language
-            )
+            # Run ASR with Whisper, batched with other jobs if scheduled;
+            # in a worker thread so jobs on other profiles keep running
+            if slot.scheduler:
+                result = await slot.scheduler.transcribe(audio, language)
+            else:
+                inference_start = time.time()
+                result = await asyncio.to_thread(
+                    slot.model.transcribe,
+                    audio, 
+                    batch_size=self.tuner.batch_size if self.tuner else self.batch_size,
+                    language=language
+                )
+                if self.tuner:
+                    self.tuner.observe_batch(
+                        duration_seconds(audio), time.time() - inference_start
+                    )
             
-            # Align whisper output
-            align_model, metadata = whisperx.load_align_model(
-                language_code=language,
-                device=self.device
-            )
-            result = whisperx.align(
+            # Align whisper output using the cached model for this language;
+            # in a worker thread too, as aligning a whole file in VAD mode
+            # can take minutes
+            align_model, metadata = await self.align_cache.get(language)
+            result = await asyncio.to_thread(
+                whisperx.align,
                 result["segments"],
                 align_model,
                 metadata,
                 audio,
                 device=self.device
             )
-            
-            # Run diarization
-            diarize_segments = diarize_model(audio)
-            
-            # Assign speaker labels
-            result = whisperx.assign_speakers(
-                result["segments"],
-                diarize_segments
-            )
-            
-            # Apply vocabulary if provided
-            if vocabulary and len(vocabulary) > 0:
-                for segment in result["segments"]:
-                    text = segment["text"]
-                    for term in vocabulary:
-                        # Simple case-insensitive replacement
-                        # In a production system, this would use more sophisticated NLP
-                        text = text.replace(term.lower(), term)
-                        text = text.replace(term.upper(), term)
-                        text = text.replace(term.capitalize(), term)
-                    segment["text"] = text
+            result["language"] = language
             
             return result
         except Exception as e:
             log_error(f"Error running inference: {str(e)}")
             raise
 
+    async def _run_diarization(
+        self,
+        audio_ready: asyncio.Future,
+        cancel_token: Optional[CancellationToken] = None,
+        embeddings: bool = False
+    ) -> Tuple[Any, Optional[Dict[str, List[float]]]]:
+        """Run speaker diarization once over the whole file.
+
+        Waits until the full waveform has been decoded, then runs in a
+        worker thread so it overlaps with ASR on the event loop; the
+        diarization lock keeps concurrent jobs from sharing the pipeline
+        at the same time. The pipeline checks cancel_token after each of
+        its steps.
+
+        Returns:
+            Tuple of the annotation and, if embeddings is set, each
+            speaker's embedding centroid, used to match speakers across
+            the chunks of a split job
+        """
+        try:
+            audio = await audio_ready
+            diarize_model = self.diarize_model
+
+            def hook(*args, **kwargs):
+                # Called by pyannote as the pipeline progresses
+                if cancel_token:
+                    cancel_token.check()
+
+            # Zero-copy tensor view of the full waveform
+            waveform = {
+                "waveform": torch.from_numpy(audio).unsqueeze(0),
+                "sample_rate": SAMPLE_RATE
+            }
+
+            if cancel_token:
+                await cancel_token.run(self.diarize_lock.acquire())
+            else:
+                await self.diarize_lock.acquire()
+            try:
+                hook()
+                start_time = time.time()
+                if embeddings:
+                    annotation, centroids = await asyncio.to_thread(
+                        diarize_model, waveform, hook=hook, return_embeddings=True
+                    )
+                else:
+                    annotation = await asyncio.to_thread(diarize_model, waveform, hook=hook)
+                track_diarization(time.time() - start_time)
+            finally:
+                self.diarize_lock.release()
+
+            if not embeddings:
+                return annotation, None
+            return annotation, speaker_embeddings(annotation, centroids)
+        except JobCancelledError:
+            raise
+        except Exception as e:
+            log_error(f"Error running diarization: {str(e)}")
+            raise
+
+    def _finalize_chunk(
+        self,
+        result: Dict,
+        offset: float,
+        vocabulary: Optional[List[str]] = None
+    ) -> Dict:
+        """Shift chunk timestamps to file time and apply vocabulary.
+
+        Args:
+            result: Chunk result with chunk-relative timestamps
+            offset: Start time of the chunk in seconds
+            vocabulary: Custom vocabulary terms
+        """
+        for segment in result.get("segments", []):
+            # Adjust timestamps
+            segment["start"] += offset
+            segment["end"] += offset
+            for word in segment.get("words", []):
+                if "start" in word:
+                    word["start"] += offset
+                if "end" in word:
+                    word["end"] += offset
+
+            # Apply vocabulary if provided
+            if vocabulary:
+                text = segment["text"]
+                for term in vocabulary:
+                    # Simple case-insensitive replacement
+                    # In a production system, this would use more sophisticated NLP
+                    text = text.replace(term.lower(), term)
+                    text = text.replace(term.upper(), term)
+                    text = text.replace(term.capitalize(), term)
+                segment["text"] = text
+
+        return result
+
     async def _combine_results(self, results: List[Dict]) -> Dict:
-        """Combine chunk results."""
+        """Combine post-processed chunk results."""
         try:
             # Initialize combined result
             combined_segments = []
             combined_text = ""
             
-            # Track time offset for each chunk
-            time_offset = 0.0
-            
             for result in results:
                 # Skip empty results
                 if not result or "segments" not in result:
@@ -343,10 +999,6 @@ class TranscriptionService:
                     
                 # Process segments
                 for segment in result.get("segments", []):
-                    # Adjust timestamps
-                    segment["start"] += time_offset
-                    segment["end"] += time_offset
-                    
                     # Add to combined segments
                     combined_segments.append(segment)
                     
@@ -354,10 +1006,6 @@ class TranscriptionService:
                     if combined_text:
                         combined_text += " "
                     combined_text += segment.get("text", "")
-                
-                # Update time offset for next chunk
-                if combined_segments:
-                    time_offset = combined_segments[-1]["end"]
             
             # Format the final result
             return {
@@ -369,6 +1017,37 @@ class TranscriptionService:
             log_error(f"Error combining results: {str(e)}")
             raise
 
+    async def merge_chunks(self, chunks: List[Dict]) -> Dict:
+        """Merge the results of a split job's chunk jobs.
+
+        Overlapping chunks are stitched at a pause in their overlap and
+        speaker labels are reconciled across chunks before the merged
+        result is post-processed like a whole-file result.
+
+        Args:
+            chunks: Chunk results in order, as returned by transcribe()
+                with a window
+        """
+        try:
+            start_time = time.time()
+            segments = await asyncio.to_thread(stitch_chunks, chunks)
+            result = await self._combine_results([{
+                "segments": segments,
+                "language": chunks[0].get("language") if chunks else None
+            }])
+            result = await self._post_process(result)
+
+            track_chunk_merge(time.time() - start_time)
+            log_info(
+                f"Merged {len(chunks)} chunks",
+                segments=len(result["segments"]),
+                speakers=len(result["speakers"])
+            )
+            return result
+        except Exception as e:
+            log_error(f"Error merging chunk results: {str(e)}")
+            raise
+
     async def _post_process(self, result: Dict) -> Dict:
         """Post-process transcription result."""
         try:
@@ -0,0 +1,172 @@
+"""Pull-based job worker for transcriber service."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional
+from .admission import available_memory_bytes
+from .backend import BackendClient, LEASE_CANCELLED, LEASE_LOST
+from ..utils.logging import log_info, log_error, log_warning
+
+class JobWorker:
+    """Claims jobs from the backend queue and keeps their leases alive.
+
+    Up to max_jobs jobs run at once; free slots are filled by long-polling
+    the backend, which answers as soon as a job is queued. While a job
+    runs its lease is renewed every heartbeat_interval seconds. If the
+    backend reports the job cancelled, on_cancel is called so processing
+    stops at its next check. If it reports the lease lost, the job has
+    been requeued for another worker and processing here is cancelled
+    outright. No jobs are claimed while available memory is below
+    min_free_memory_mb.
+
+    The handler reports each job's outcome with BackendClient.finish_job,
+    which releases the lease. The lease is released in any case once the
+    handler returns; a job released without an outcome, e.g. on
+    shutdown, is queued again.
+    """
+
+    def __init__(
+        self,
+        backend: BackendClient,
+        handler: Callable[[str], Awaitable[None]],
+        worker_id: str,
+        max_jobs: int,
+        heartbeat_interval: float = 30.0,
+        claim_wait: float = 30.0,
+        retry_delay: float = 5.0,
+        min_free_memory_mb: int = 0,
+        on_cancel: Optional[Callable[[str, str], bool]] = None
+    ):
+        """Initialize job worker.
+
+        Args:
+            backend: Backend client
+            handler: Coroutine function processing a job by ID
+            worker_id: ID identifying this worker's leases
+            max_jobs: Maximum number of jobs processed at once
+            heartbeat_interval: Seconds between lease renewals
+            claim_wait: Seconds each claim request waits for a job
+            retry_delay: Seconds to wait after a failed claim
+            min_free_memory_mb: Claim no jobs below this available memory (0 disables)
+            on_cancel: Called with a job ID and reason to stop processing
+                a job cooperatively
+        """
+        self.backend = backend
+        self.handler = handler
+        self.worker_id = worker_id
+        self.max_jobs = max(1, max_jobs)
+        self.heartbeat_interval = heartbeat_interval
+        self.claim_wait = claim_wait
+        self.retry_delay = retry_delay
+        self.min_free_memory = min_free_memory_mb * 1024 * 1024
+        self.on_cancel = on_cancel
+        self._jobs: Dict[str, asyncio.Task] = {}
+        self._slot_free = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start claiming jobs."""
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+            log_info(
+                f"Job worker {self.worker_id} started",
+                max_jobs=self.max_jobs
+            )
+
+    async def stop(self):
+        """Stop claiming jobs and return running jobs to the queue."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # Cancelled jobs release their leases so they are requeued at once
+        jobs = list(self._jobs.values())
+        for task in jobs:
+            task.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
+
+    def resize(self, max_jobs: int):
+        """Change how many jobs are processed at once."""
+        self.max_jobs = max(1, max_jobs)
+        self._slot_free.set()
+
+    def capacity(self) -> Dict:
+        """Report current load."""
+        available = available_memory_bytes()
+        return {
+            "max_concurrent_jobs": self.max_jobs,
+            "max_queue_depth": 0,
+            "running": len(self._jobs),
+            "queued": 0,
+            "free_slots": self.max_jobs - len(self._jobs) if self._has_memory() else 0,
+            "available_memory_mb": available // (1024 * 1024) if available is not None else None
+        }
+
+    def _has_memory(self) -> bool:
+        """Check whether there is enough memory to take on another job."""
+        if not self.min_free_memory:
+            return True
+        available = available_memory_bytes()
+        return available is None or available >= self.min_free_memory
+
+    async def _run(self):
+        """Claim jobs whenever a slot is free."""
+        while True:
+            free_slots = self.max_jobs - len(self._jobs)
+            if free_slots <= 0:
+                self._slot_free.clear()
+                await self._slot_free.wait()
+                continue
+
+            if not self._has_memory():
+                await asyncio.sleep(self.retry_delay)
+                continue
+
+            jobs = await self.backend.claim_jobs(
+                self.worker_id, limit=free_slots, wait=self.claim_wait
+            )
+            if jobs is None:
+                await asyncio.sleep(self.retry_delay)
+                continue
+
+            for job in jobs:
+                job_id = str(job['id'])
+                self._jobs[job_id] = asyncio.create_task(self._process(job_id))
+
+    async def _process(self, job_id: str):
+        """Process a claimed job while renewing its lease."""
+        heartbeat = asyncio.create_task(
+            self._heartbeat(job_id, asyncio.current_task())
+        )
+        try:
+            await self.handler(job_id)
+        except asyncio.CancelledError:
+            log_warning(f"Processing of job {job_id} cancelled")
+        except Exception as e:
+            log_error(f"Error processing job {job_id}: {str(e)}")
+        finally:
+            heartbeat.cancel()
+            await self.backend.release_lease(job_id, self.worker_id)
+            self._jobs.pop(job_id, None)
+            self._slot_free.set()
+
+    async def _heartbeat(self, job_id: str, job_task: asyncio.Task):
+        """Renew a job's lease until processing ends, is cancelled or the lease is lost."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            lease = await self.backend.renew_lease(job_id, self.worker_id)
+            if lease == LEASE_CANCELLED:
+                log_info(f"Job {job_id} was cancelled, stopping processing")
+                if not (self.on_cancel and self.on_cancel(job_id, "cancelled")):
+                    job_task.cancel()
+                return
+            if lease == LEASE_LOST:
+                log_warning(f"Lost lease on job {job_id}, stopping processing")
+                if self.on_cancel:
+                    # Also stops work running in threads at its next check
+                    self.on_cancel(job_id, "lease lost")
+                job_task.cancel()
+                return
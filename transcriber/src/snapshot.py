@@ -0,0 +1,91 @@
+"""Model snapshots for offline startup of transcriber service.
+
+Usage:
+    python -m src.snapshot create --output /models/snapshot --profiles large-v3 small-int8
+    python -m src.snapshot verify --snapshot /models/snapshot
+
+Point MODEL_SNAPSHOT_DIR at the created directory to load all models from
+it without contacting the Hugging Face hub.
+"""
+
+import argparse
+import json
+import os
+import sys
+from .services.model_snapshot import ModelSnapshot, SnapshotError, create_snapshot
+from .services.profiles import get_profile
+
+def snapshot_create(args: argparse.Namespace) -> None:
+    """Download the models of the given profiles into a snapshot."""
+    models = list(dict.fromkeys(get_profile(name).model for name in args.profiles))
+    manifest = create_snapshot(
+        args.output,
+        args.version,
+        models,
+        args.diarization,
+        token=os.environ.get("HF_AUTH_TOKEN")
+    )
+    print(json.dumps({
+        "snapshot": args.output,
+        "version": manifest["version"],
+        "models": sorted(manifest["models"]),
+        "files": len(manifest["files"]),
+        "bytes": sum(f["size"] for f in manifest["files"].values())
+    }))
+
+def snapshot_verify(args: argparse.Namespace) -> None:
+    """Check every file of a snapshot against its manifest hash."""
+    try:
+        snapshot = ModelSnapshot.open(args.snapshot, args.version, verify=True)
+    except SnapshotError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps({
+        "snapshot": args.snapshot,
+        "version": snapshot.manifest["version"],
+        "files": len(snapshot.manifest["files"]),
+        "status": "ok"
+    }))
+
+def main():
+    """Manage model snapshots from the command line."""
+    parser = argparse.ArgumentParser(description="Transcriber model snapshots")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    create = subparsers.add_parser(
+        'create',
+        help="Download models into a snapshot pinned to a model version"
+    )
+    create.add_argument('--output', required=True, help="Snapshot directory")
+    create.add_argument(
+        '--profiles', nargs='+', default=['large-v3'], help="Inference profiles to include"
+    )
+    create.add_argument(
+        '--version',
+        default=os.getenv('MODEL_VERSION', 'large-v3'),
+        help="Model version to pin; must match MODEL_VERSION when loading"
+    )
+    create.add_argument(
+        '--diarization',
+        default='pyannote/speaker-diarization',
+        help="Diarization pipeline repository, optionally with @revision"
+    )
+    create.set_defaults(func=snapshot_create)
+
+    verify = subparsers.add_parser(
+        'verify',
+        help="Check a snapshot's files against the hashes in its manifest"
+    )
+    verify.add_argument('--snapshot', required=True, help="Snapshot directory")
+    verify.add_argument(
+        '--version',
+        default=os.getenv('MODEL_VERSION', 'large-v3'),
+        help="Model version the snapshot must be pinned to"
+    )
+    verify.set_defaults(func=snapshot_verify)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
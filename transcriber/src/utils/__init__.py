@@ -9,11 +9,13 @@ from .metrics import (
     track_model_load,
     track_model_inference,
     track_memory_usage,
+    track_audio_preparation,
     TRANSCRIPTION_DURATION,
     TRANSCRIPTION_ERRORS,
     MODEL_LOAD_TIME,
     MODEL_INFERENCE_TIME,
-    MEMORY_USAGE
+    MEMORY_USAGE,
+    AUDIO_PREPARATION_TIME
 )
 
 def setup_metrics(port: int = 8000):
@@ -35,10 +37,12 @@ __all__ = [
     'track_model_load',
     'track_model_inference',
     'track_memory_usage',
+    'track_audio_preparation',
     'TRANSCRIPTION_DURATION',
     'TRANSCRIPTION_ERRORS',
     'MODEL_LOAD_TIME',
     'MODEL_INFERENCE_TIME',
     'MEMORY_USAGE',
+    'AUDIO_PREPARATION_TIME',
     'setup_metrics'
 ]
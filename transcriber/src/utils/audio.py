@@ -0,0 +1,160 @@
+"""Audio utilities for transcriber service."""
+
+import hashlib
+import numpy as np
+import torchaudio
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+# Whisper models expect 16kHz mono float32 audio
+SAMPLE_RATE = 16000
+
+# Block size for hashing audio files
+HASH_BLOCK_SIZE = 1024 * 1024
+
+def file_sha256(audio_file: BinaryIO) -> str:
+    """Get SHA-256 of a file's content, leaving it positioned at the start."""
+    digest = hashlib.sha256()
+    audio_file.seek(0)
+    while True:
+        block = audio_file.read(HASH_BLOCK_SIZE)
+        if not block:
+            break
+        digest.update(block)
+    audio_file.seek(0)
+    return digest.hexdigest()
+
+def load_waveform(audio_file: BinaryIO) -> np.ndarray:
+    """Decode an audio file into a single 16kHz mono float32 array.
+
+    This is the only full copy of the audio kept for a job; chunks and
+    model inputs are views into it.
+    """
+    waveform, sample_rate = torchaudio.load(audio_file)
+
+    # Downmix to mono, matching what whisperx.load_audio does via ffmpeg
+    if waveform.size(0) > 1:
+        waveform = waveform.mean(dim=0, keepdim=True)
+
+    if sample_rate != SAMPLE_RATE:
+        waveform = torchaudio.functional.resample(
+            waveform, orig_freq=sample_rate, new_freq=SAMPLE_RATE
+        )
+
+    # Tensor.numpy() shares memory with the tensor, so this does not copy
+    return np.ascontiguousarray(waveform[0].numpy(), dtype=np.float32)
+
+def stream_chunks(
+    audio_file: BinaryIO,
+    chunk_seconds: int,
+    start: float = 0.0,
+    end: Optional[float] = None
+) -> Tuple[int, Iterator[np.ndarray]]:
+    """Decode audio incrementally into 16kHz mono float32 chunks.
+
+    ffmpeg resamples and downmixes while decoding, so each chunk is ready
+    for the models as soon as it is yielded. With start or end, only the
+    audio between them is decoded.
+
+    Returns:
+        Tuple of the estimated total number of samples (0 if unknown) and
+        an iterator over decoded chunks
+    """
+    from torchaudio.io import StreamReader
+
+    reader = StreamReader(audio_file)
+    info = reader.get_src_stream_info(reader.default_audio_stream)
+    estimated_samples = 0
+    if info.num_frames and info.sample_rate:
+        estimated_samples = int(info.num_frames * SAMPLE_RATE / info.sample_rate)
+
+    reader.add_audio_stream(
+        frames_per_chunk=int(chunk_seconds * SAMPLE_RATE),
+        filter_desc=(
+            f"aresample={SAMPLE_RATE},"
+            "aformat=sample_fmts=flt:channel_layouts=mono"
+        )
+    )
+
+    if start > 0:
+        reader.seek(start)
+        estimated_samples = max(0, estimated_samples - int(start * SAMPLE_RATE))
+    remaining = None
+    if end is not None:
+        remaining = int((end - start) * SAMPLE_RATE)
+        estimated_samples = min(estimated_samples, remaining) if estimated_samples else remaining
+
+    def chunks() -> Iterator[np.ndarray]:
+        left = remaining
+        for (chunk,) in reader.stream():
+            samples = chunk[:, 0].numpy()
+            if left is not None:
+                samples = samples[:left]
+                left -= len(samples)
+            if len(samples):
+                yield samples
+            if left is not None and left <= 0:
+                return
+
+    return estimated_samples, chunks()
+
+def probe_duration(audio_file: BinaryIO) -> Optional[float]:
+    """Read the duration of an audio file from its header.
+
+    Returns:
+        Duration in seconds, or None if the container does not state it
+    """
+    from torchaudio.io import StreamReader
+
+    position = audio_file.tell()
+    try:
+        reader = StreamReader(audio_file)
+        info = reader.get_src_stream_info(reader.default_audio_stream)
+        if info.num_frames and info.sample_rate:
+            return info.num_frames / info.sample_rate
+        return None
+    except Exception:
+        return None
+    finally:
+        audio_file.seek(position)
+
+class AudioBuffer:
+    """Growable float32 buffer that streamed chunks are decoded into.
+
+    Chunks handed out by append() are views into the buffer, so the whole
+    file is still held as a single array once decoding finishes.
+    """
+
+    def __init__(self, capacity: int = 0):
+        """Initialize audio buffer with an estimated capacity in samples."""
+        self._data = np.empty(max(capacity, SAMPLE_RATE), dtype=np.float32)
+        self._size = 0
+
+    def append(self, chunk: np.ndarray) -> np.ndarray:
+        """Copy a chunk into the buffer and return a view of it."""
+        start, end = self._size, self._size + len(chunk)
+        if end > len(self._data):
+            # Grow geometrically; views of earlier chunks keep the old
+            # buffer alive until they are released
+            grown = np.empty(max(end, int(len(self._data) * 1.5)), dtype=np.float32)
+            grown[:start] = self._data[:start]
+            self._data = grown
+        self._data[start:end] = chunk
+        self._size = end
+        return self._data[start:end]
+
+    @property
+    def audio(self) -> np.ndarray:
+        """Get all audio decoded so far."""
+        return self._data[:self._size]
+
+def split_chunks(audio: np.ndarray, chunk_seconds: int) -> List[np.ndarray]:
+    """Split audio into fixed-length chunks without copying samples."""
+    chunk_samples = int(chunk_seconds * SAMPLE_RATE)
+    return [
+        audio[i:i + chunk_samples]
+        for i in range(0, len(audio), chunk_samples)
+    ]
+
+def duration_seconds(audio: np.ndarray) -> float:
+    """Get duration of 16kHz audio in seconds."""
+    return len(audio) / SAMPLE_RATE
@@ -0,0 +1,125 @@
+"""Speaker diarization utilities for transcriber service."""
+
+import numpy as np
+from typing import Any, Dict, List, Tuple
+
+# Number of segments joined against all turns at once; bounds the size of
+# the overlap matrix on long recordings
+_JOIN_BLOCK_SIZE = 1024
+
+def annotation_to_turns(
+    annotation: Any,
+    offset: float = 0.0
+) -> Tuple[Tuple[np.ndarray, np.ndarray, np.ndarray], List[str]]:
+    """Convert a pyannote annotation into turn arrays.
+
+    Args:
+        annotation: Diarization of audio starting offset seconds into the file
+        offset: Seconds added to turn times
+
+    Returns:
+        Tuple of (starts, ends, label indices) arrays and the label names
+    """
+    starts, ends, labels = [], [], []
+    for turn, _, speaker in annotation.itertracks(yield_label=True):
+        starts.append(turn.start + offset)
+        ends.append(turn.end + offset)
+        labels.append(speaker)
+
+    speakers = sorted(set(labels))
+    index = {speaker: i for i, speaker in enumerate(speakers)}
+    return (
+        np.asarray(starts, dtype=np.float64),
+        np.asarray(ends, dtype=np.float64),
+        np.asarray([index[label] for label in labels], dtype=np.int64)
+    ), speakers
+
+def _best_speakers(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    turns: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    num_speakers: int
+) -> np.ndarray:
+    """Get index of the speaker overlapping each interval most, or -1."""
+    turn_starts, turn_ends, turn_labels = turns
+    best = np.full(len(starts), -1, dtype=np.int64)
+    if len(turn_starts) == 0 or len(starts) == 0:
+        return best
+
+    # One-hot matrix mapping turns to speakers, so per-speaker overlap is
+    # a single matrix product
+    one_hot = np.zeros((len(turn_starts), num_speakers), dtype=np.float64)
+    one_hot[np.arange(len(turn_starts)), turn_labels] = 1.0
+
+    for i in range(0, len(starts), _JOIN_BLOCK_SIZE):
+        block_starts = starts[i:i + _JOIN_BLOCK_SIZE, None]
+        block_ends = ends[i:i + _JOIN_BLOCK_SIZE, None]
+        overlap = np.clip(
+            np.minimum(block_ends, turn_ends) - np.maximum(block_starts, turn_starts),
+            0.0,
+            None
+        )
+        per_speaker = overlap @ one_hot
+        block_best = per_speaker.argmax(axis=1)
+        block_best[per_speaker.max(axis=1) <= 0.0] = -1
+        best[i:i + _JOIN_BLOCK_SIZE] = block_best
+
+    return best
+
+def _intervals(items: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Get start and end arrays for timed items."""
+    return (
+        np.asarray([item.get("start", 0.0) for item in items], dtype=np.float64),
+        np.asarray([item.get("end", 0.0) for item in items], dtype=np.float64)
+    )
+
+def speaker_turns(annotation: Any, offset: float = 0.0) -> List[Dict]:
+    """Get the turns of a pyannote annotation as timed speaker items."""
+    (starts, ends, labels), speakers = annotation_to_turns(annotation, offset)
+    return [
+        {"start": float(start), "end": float(end), "speaker": speakers[label]}
+        for start, end, label in zip(starts, ends, labels)
+    ]
+
+def speaker_embeddings(annotation: Any, centroids: np.ndarray) -> Dict[str, List[float]]:
+    """Map speaker labels to the embedding centroids the pipeline returned.
+
+    Centroids are ordered like annotation.labels(); speakers without a
+    usable centroid, e.g. too little speech to embed, are left out.
+    """
+    embeddings = {}
+    for speaker, centroid in zip(annotation.labels(), np.asarray(centroids, dtype=np.float64)):
+        if np.all(np.isfinite(centroid)) and np.any(centroid):
+            embeddings[speaker] = centroid.tolist()
+    return embeddings
+
+def assign_speakers(
+    segments: List[Dict],
+    annotation: Any,
+    offset: float = 0.0
+) -> List[Dict]:
+    """Label segments and their words with whole-file speaker IDs.
+
+    Each segment or word gets the speaker whose turns overlap it the most.
+    Items without any overlapping turn are left unlabelled. offset is the
+    file time at which the diarized audio starts.
+    """
+    turns, speakers = annotation_to_turns(annotation, offset)
+
+    starts, ends = _intervals(segments)
+    for segment, best in zip(segments, _best_speakers(starts, ends, turns, len(speakers))):
+        if best >= 0:
+            segment["speaker"] = speakers[best]
+
+    # Words are joined in one pass across all segments
+    words = [
+        word for segment in segments
+        for word in segment.get("words", [])
+        if "start" in word and "end" in word
+    ]
+    starts, ends = _intervals(words)
+    for word, best in zip(words, _best_speakers(starts, ends, turns, len(speakers))):
+        if best >= 0:
+            word["speaker"] = speakers[best]
+
+    return segments
@@ -0,0 +1,183 @@
+"""Streaming download buffer for transcriber service."""
+
+import asyncio
+import hashlib
+import io
+import tempfile
+import threading
+from typing import Awaitable, Callable, Dict, Optional
+
+# Size of blocks read when hashing content that arrived out of order
+HASH_BLOCK_SIZE = 1024 * 1024
+
+class SpooledDownload(io.RawIOBase):
+    """File that is readable while it is still being downloaded.
+
+    Bytes are written by an async producer, possibly as several ranges
+    fetched in parallel, and kept in memory up to max_memory bytes, after
+    which the file rolls over to disk, so memory use is bounded regardless
+    of the file size. Readers (decoders running in worker threads) block
+    until the bytes they ask for have arrived, which lets decoding start
+    while the transfer is in progress. The SHA-256 of the content is
+    computed as in-order bytes arrive and finished once the download ends.
+    """
+
+    def __init__(self, max_memory: int, size: Optional[int] = None):
+        """Initialize download buffer.
+
+        Args:
+            max_memory: Bytes kept in memory before spilling to disk
+            size: Expected total size, if known from Content-Length
+        """
+        super().__init__()
+        self.size = size
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory)
+        self._cond = threading.Condition()
+        self._max_memory = max_memory
+        self._written = 0
+        self._pending: Dict[int, int] = {}
+        self._hashed = 0
+        self._position = 0
+        self._complete = False
+        self._error: Optional[BaseException] = None
+        self._digest = hashlib.sha256()
+        self._done = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def run(self, fill: Callable[['SpooledDownload'], Awaitable[None]]):
+        """Start filling the buffer.
+
+        Args:
+            fill: Coroutine function writing the content with write_at
+        """
+        self._task = asyncio.create_task(self._run(fill))
+
+    async def wait(self):
+        """Wait for the download to finish, raising its error if it failed."""
+        await self._done.wait()
+        if self._error:
+            raise IOError(f"Download failed: {self._error}") from self._error
+
+    async def content_sha256(self) -> str:
+        """Get SHA-256 of the complete content."""
+        await self.wait()
+        if self._hashed < self._written:
+            # Bytes that arrived out of order were not hashed on arrival
+            await asyncio.to_thread(self._hash_remaining)
+        return self._digest.hexdigest()
+
+    def write_at(self, offset: int, data: bytes):
+        """Store downloaded bytes and wake readers waiting for them.
+
+        Parts may arrive in any order; readers only see the contiguous
+        prefix received so far.
+        """
+        if not data:
+            return
+        end = offset + len(data)
+        with self._cond:
+            if end > self._max_memory:
+                # Seeking far ahead would otherwise pad the in-memory
+                # buffer before it spills
+                self._file.rollover()
+            self._file.seek(offset)
+            self._file.write(data)
+
+            if offset == self._hashed:
+                self._digest.update(data)
+                self._hashed = end
+
+            if offset <= self._written:
+                self._written = max(self._written, end)
+            else:
+                self._pending[offset] = max(self._pending.get(offset, 0), end)
+            # Absorb parts that are now contiguous with the prefix
+            for start in sorted(self._pending):
+                if start > self._written:
+                    break
+                self._written = max(self._written, self._pending.pop(start))
+            self._cond.notify_all()
+
+    async def _run(self, fill: Callable[['SpooledDownload'], Awaitable[None]]):
+        """Run the fill coroutine and mark the download finished."""
+        try:
+            await fill(self)
+            if self._pending or (self.size is not None and self._written < self.size):
+                raise EOFError(
+                    f"Download incomplete: {self._written} of {self.size} bytes"
+                )
+        except BaseException as e:
+            self._error = e
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        finally:
+            with self._cond:
+                if self._error is None:
+                    self.size = self._written
+                self._complete = True
+                self._cond.notify_all()
+            self._done.set()
+
+    def _hash_remaining(self):
+        """Hash the content the live digest skipped."""
+        with self._cond:
+            self._file.seek(self._hashed)
+            while True:
+                block = self._file.read(HASH_BLOCK_SIZE)
+                if not block:
+                    break
+                self._digest.update(block)
+                self._hashed += len(block)
+
+    def _wait_for(self, end: Optional[int]):
+        """Block until bytes up to end have arrived or the download ended."""
+        with self._cond:
+            while not self._complete and (end is None or self._written < end):
+                self._cond.wait()
+            if self._error and (end is None or self._written < end):
+                raise IOError(f"Download failed: {self._error}")
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Read into buffer, blocking until the bytes have arrived."""
+        size = len(buffer)
+        self._wait_for(self._position + size)
+        with self._cond:
+            self._file.seek(self._position)
+            data = self._file.read(size)
+        count = len(data)
+        buffer[:count] = data
+        self._position += count
+        return count
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Seek, waiting for the total size if seeking relative to the end."""
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        elif whence == io.SEEK_END:
+            if self.size is None:
+                self._wait_for(None)
+            self._position = (self.size if self.size is not None else self._written) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        return self._position
+
+    def close(self):
+        """Stop the download and remove the buffer."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+        with self._cond:
+            self._complete = True
+            self._cond.notify_all()
+            self._file.close()
+        super().close()
@@ -1,5 +1,6 @@
 """Metrics for transcriber service."""
 
+from typing import Optional
 from prometheus_client import Counter, Histogram, Gauge
 
 # Transcription metrics
@@ -27,6 +28,200 @@ MODEL_INFERENCE_TIME = Histogram(
     buckets=[1, 5, 10, 30, 60, 120]  # 1s to 2m buckets
 )
 
+AUDIO_PREPARATION_TIME = Histogram(
+    "transcribo_audio_preparation_duration_seconds",
+    "Time spent decoding, resampling and chunking audio",
+    buckets=[0.1, 0.5, 1, 5, 10, 30, 60]  # 100ms to 1m buckets
+)
+
+ASR_THROUGHPUT = Histogram(
+    "transcribo_asr_throughput_ratio",
+    "Audio seconds transcribed per wall-clock second",
+    ["mode"],
+    buckets=[0.5, 1, 2, 5, 10, 20, 50, 100]
+)
+
+RESULT_CACHE_LOOKUPS = Counter(
+    "transcribo_result_cache_lookups_total",
+    "Transcription result cache lookups",
+    ["outcome"]  # hit or miss
+)
+
+RESULT_CACHE_ENTRIES = Gauge(
+    "transcribo_result_cache_entries",
+    "Transcription results in cache"
+)
+
+RESULT_CACHE_BYTES = Gauge(
+    "transcribo_result_cache_bytes",
+    "Size of cached transcription results"
+)
+
+CHECKPOINT_CHUNKS = Counter(
+    "transcribo_checkpoint_chunks_total",
+    "Chunk results saved to or resumed from checkpoints",
+    ["outcome"]  # saved or resumed
+)
+
+PIPELINE_QUEUE_DEPTH = Gauge(
+    "transcribo_pipeline_queue_depth",
+    "Chunks waiting for a pipeline stage across all jobs",
+    ["stage"]
+)
+
+SCHEDULER_BATCH_SIZE = Histogram(
+    "transcribo_scheduler_batch_size",
+    "Speech segments per shared forward pass",
+    buckets=[1, 2, 4, 8, 16, 32, 64]
+)
+
+SCHEDULER_BATCH_WAIT = Histogram(
+    "transcribo_scheduler_batch_wait_seconds",
+    "Time the oldest segment in a batch waited before its forward pass",
+    buckets=[0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30]
+)
+
+SCHEDULER_BATCH_DURATION = Histogram(
+    "transcribo_scheduler_batch_duration_seconds",
+    "Time spent on one shared forward pass",
+    buckets=[0.1, 0.5, 1, 5, 10, 30, 60]
+)
+
+SCHEDULER_QUEUE_DEPTH = Gauge(
+    "transcribo_scheduler_queue_depth",
+    "Speech segments waiting for a forward pass"
+)
+
+INTAKE_QUEUE_DEPTH = Gauge(
+    "transcribo_intake_queue_depth",
+    "Accepted jobs waiting for a processing slot"
+)
+
+INTAKE_QUEUE_WAIT = Histogram(
+    "transcribo_intake_queue_wait_seconds",
+    "Time accepted jobs wait for a processing slot",
+    buckets=[0.1, 1, 5, 15, 30, 60, 120, 300, 600, 1800]
+)
+
+ADMISSION_REJECTIONS = Counter(
+    "transcribo_admission_rejections_total",
+    "Jobs refused by admission control",
+    ["reason"]  # queue_full or memory
+)
+
+DIARIZATION_TIME = Histogram(
+    "transcribo_diarization_duration_seconds",
+    "Time spent on whole-file speaker diarization",
+    buckets=[1, 5, 10, 30, 60, 120, 300, 600]  # 1s to 10m buckets
+)
+
+ALIGNMENT_CACHE_HITS = Counter(
+    "transcribo_alignment_cache_hits_total",
+    "Alignment model cache hits",
+    ["language"]
+)
+
+ALIGNMENT_CACHE_MISSES = Counter(
+    "transcribo_alignment_cache_misses_total",
+    "Alignment model cache misses",
+    ["language"]
+)
+
+ALIGNMENT_CACHE_MODELS = Gauge(
+    "transcribo_alignment_cache_models",
+    "Alignment models resident in cache"
+)
+
+ALIGNMENT_CACHE_BYTES = Gauge(
+    "transcribo_alignment_cache_bytes",
+    "Estimated memory used by cached alignment models"
+)
+
+MODEL_ROUTES = Counter(
+    "transcribo_model_routes_total",
+    "Jobs routed to each inference profile",
+    ["profile", "reason"]  # reason: default, rule or latency
+)
+
+PROFILE_ACTIVE_JOBS = Gauge(
+    "transcribo_profile_active_jobs",
+    "Jobs currently processed by each inference profile",
+    ["profile"]
+)
+
+PROFILE_REAL_TIME_FACTOR = Gauge(
+    "transcribo_profile_real_time_factor",
+    "Smoothed processing seconds per audio second of each inference profile",
+    ["profile"]
+)
+
+JOB_FAN_OUT_CHUNKS = Histogram(
+    "transcribo_job_fan_out_chunks",
+    "Number of chunk jobs long jobs were split into",
+    buckets=[2, 4, 8, 16, 32, 64]
+)
+
+CHUNK_MERGE_TIME = Histogram(
+    "transcribo_chunk_merge_duration_seconds",
+    "Time spent stitching chunk results of split jobs",
+    buckets=[0.1, 0.5, 1, 5, 10, 30]  # 100ms to 30s buckets
+)
+
+JOB_CANCELLATIONS = Counter(
+    "transcribo_job_cancellations_total",
+    "Jobs cancelled while queued or running",
+    ["stage"]  # queued or running
+)
+
+CANCELLATION_LATENCY = Histogram(
+    "transcribo_cancellation_latency_seconds",
+    "Time from a cancel signal until the job released its resources",
+    buckets=[0.1, 0.5, 1, 2, 5, 10, 30]
+)
+
+CANCELLED_AUDIO_SECONDS = Counter(
+    "transcribo_cancelled_audio_seconds_total",
+    "Audio seconds left unprocessed because their job was cancelled"
+)
+
+AUTOTUNE_MAX_JOBS = Gauge(
+    "transcribo_autotune_max_jobs",
+    "Jobs processed at once as currently set by the autotuner"
+)
+
+AUTOTUNE_BATCH_SIZE = Gauge(
+    "transcribo_autotune_batch_size",
+    "ASR batch size as currently set by the autotuner"
+)
+
+AUTOTUNE_LAST_ADJUSTMENT = Gauge(
+    "transcribo_autotune_last_adjustment",
+    "Latest autotuner decision per setting: 1 raised, -1 lowered, 0 held",
+    ["setting"]  # max_jobs or batch_size
+)
+
+AUTOTUNE_ADJUSTMENTS = Counter(
+    "transcribo_autotune_adjustments_total",
+    "Changes made by the autotuner",
+    ["setting", "direction", "reason"]  # reason: memory, latency, throughput or saturated
+)
+
+AUTOTUNE_BATCH_LATENCY = Gauge(
+    "transcribo_autotune_batch_latency_seconds",
+    "Mean ASR forward pass time over the last autotuning interval"
+)
+
+AUTOTUNE_MEMORY_HEADROOM = Gauge(
+    "transcribo_autotune_memory_headroom_bytes",
+    "Available memory above the autotuner's reserve"
+)
+
+STARTUP_TIME = Gauge(
+    "transcribo_startup_duration_seconds",
+    "Time spent on each startup phase of each model",
+    ["phase", "model"]  # phase: load, warm_up or ready (model "service")
+)
+
 # Resource metrics
 MEMORY_USAGE = Gauge(
     "transcribo_memory_bytes",
@@ -34,6 +229,13 @@ MEMORY_USAGE = Gauge(
     ["type"]  # cuda or system
 )
 
+MEMORY_RELEASE_TIME = Histogram(
+    "transcribo_memory_release_duration_seconds",
+    "Time spent in forced garbage collection and CUDA cache clearing",
+    ["trigger"],  # chunk, job or threshold
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2]
+)
+
 # Utility functions for tracking metrics
 def track_transcription(duration: float):
     """Track transcription duration."""
@@ -51,6 +253,128 @@ def track_model_inference(duration: float):
     """Track model inference time."""
     MODEL_INFERENCE_TIME.observe(duration)
 
+def track_audio_preparation(duration: float):
+    """Track audio preparation time."""
+    AUDIO_PREPARATION_TIME.observe(duration)
+
+def track_asr_throughput(mode: str, audio_seconds: float, wall_seconds: float):
+    """Track ASR throughput in audio seconds per wall second."""
+    if wall_seconds > 0:
+        ASR_THROUGHPUT.labels(mode=mode).observe(audio_seconds / wall_seconds)
+
+def track_result_cache_lookup(hit: bool):
+    """Track a result cache lookup."""
+    RESULT_CACHE_LOOKUPS.labels(outcome='hit' if hit else 'miss').inc()
+
+def track_result_cache_size(entries: int, bytes_used: int):
+    """Track size of the result cache."""
+    RESULT_CACHE_ENTRIES.set(entries)
+    RESULT_CACHE_BYTES.set(bytes_used)
+
+def track_checkpoint_chunk(outcome: str):
+    """Track a chunk result saved to or resumed from a checkpoint."""
+    CHECKPOINT_CHUNKS.labels(outcome=outcome).inc()
+
+def track_pipeline_queue_depth(stage: str, delta: int):
+    """Track chunks entering (+1) or leaving (-1) a pipeline stage queue."""
+    PIPELINE_QUEUE_DEPTH.labels(stage=stage).inc(delta)
+
+def track_scheduler_batch(size: int, wait: float, duration: float):
+    """Track one shared forward pass."""
+    SCHEDULER_BATCH_SIZE.observe(size)
+    SCHEDULER_BATCH_WAIT.observe(wait)
+    SCHEDULER_BATCH_DURATION.observe(duration)
+
+def track_scheduler_queue_depth(depth: int):
+    """Track segments waiting for a forward pass."""
+    SCHEDULER_QUEUE_DEPTH.set(depth)
+
+def track_intake_queue_depth(depth: int):
+    """Track jobs waiting for a processing slot."""
+    INTAKE_QUEUE_DEPTH.set(depth)
+
+def track_intake_wait(duration: float):
+    """Track time a job waited for a processing slot."""
+    INTAKE_QUEUE_WAIT.observe(duration)
+
+def track_admission_rejection(reason: str):
+    """Track a job refused by admission control."""
+    ADMISSION_REJECTIONS.labels(reason=reason).inc()
+
+def track_diarization(duration: float):
+    """Track diarization time."""
+    DIARIZATION_TIME.observe(duration)
+
+def track_alignment_cache_hit(language: str):
+    """Track alignment model cache hit."""
+    ALIGNMENT_CACHE_HITS.labels(language=language).inc()
+
+def track_alignment_cache_miss(language: str):
+    """Track alignment model cache miss."""
+    ALIGNMENT_CACHE_MISSES.labels(language=language).inc()
+
+def track_alignment_cache_size(models: int, bytes_used: int):
+    """Track resident alignment models."""
+    ALIGNMENT_CACHE_MODELS.set(models)
+    ALIGNMENT_CACHE_BYTES.set(bytes_used)
+
+def track_model_route(profile: str, reason: str):
+    """Track the inference profile a job was routed to."""
+    MODEL_ROUTES.labels(profile=profile, reason=reason).inc()
+
+def track_profile_jobs(profile: str, active: int):
+    """Track jobs running on an inference profile."""
+    PROFILE_ACTIVE_JOBS.labels(profile=profile).set(active)
+
+def track_profile_rtf(profile: str, rtf: float):
+    """Track the measured real-time factor of an inference profile."""
+    PROFILE_REAL_TIME_FACTOR.labels(profile=profile).set(rtf)
+
+def track_job_fan_out(chunks: int):
+    """Track a job split into chunk jobs."""
+    JOB_FAN_OUT_CHUNKS.observe(chunks)
+
+def track_chunk_merge(duration: float):
+    """Track merging the chunk results of a split job."""
+    CHUNK_MERGE_TIME.observe(duration)
+
+def track_job_cancellation(stage: str, latency: float = 0.0, reclaimed_seconds: float = 0.0):
+    """Track a cancelled job and the audio it no longer processes."""
+    JOB_CANCELLATIONS.labels(stage=stage).inc()
+    if stage == "running":
+        CANCELLATION_LATENCY.observe(latency)
+    CANCELLED_AUDIO_SECONDS.inc(reclaimed_seconds)
+
+def track_autotune(max_jobs: int, batch_size: int):
+    """Track the settings chosen by the autotuner."""
+    AUTOTUNE_MAX_JOBS.set(max_jobs)
+    AUTOTUNE_BATCH_SIZE.set(batch_size)
+
+def track_autotune_decision(setting: str, direction: int, reason: Optional[str] = None):
+    """Track an autotuner decision for one setting."""
+    AUTOTUNE_LAST_ADJUSTMENT.labels(setting=setting).set(direction)
+    if direction:
+        AUTOTUNE_ADJUSTMENTS.labels(
+            setting=setting,
+            direction="up" if direction > 0 else "down",
+            reason=reason
+        ).inc()
+
+def track_autotune_observation(batch_latency: Optional[float], headroom: Optional[int]):
+    """Track what the autotuner measured over an interval."""
+    if batch_latency is not None:
+        AUTOTUNE_BATCH_LATENCY.set(batch_latency)
+    if headroom is not None:
+        AUTOTUNE_MEMORY_HEADROOM.set(headroom)
+
 def track_memory_usage(bytes_used: int, memory_type: str = "system"):
     """Track memory usage."""
     MEMORY_USAGE.labels(type=memory_type).set(bytes_used)
+
+def track_memory_release(trigger: str, duration: float):
+    """Track time spent releasing memory."""
+    MEMORY_RELEASE_TIME.labels(trigger=trigger).observe(duration)
+
+def track_startup_phase(phase: str, model: str, duration: float):
+    """Track a startup phase."""
+    STARTUP_TIME.labels(phase=phase, model=model).set(duration)
@@ -0,0 +1,267 @@
+"""Chunk planning and stitching for jobs split across workers.
+
+A long job is split into overlapping time windows that are transcribed
+and diarized as separate chunk jobs. Merging cuts each overlap once, at
+the widest pause between words near its middle, keeping words before the
+cut from the earlier chunk and words after it from the later one, so
+sentences spanning a boundary appear exactly once. Speaker labels are
+local to each chunk; they are matched across neighbouring chunks by how
+much their turns coincide in the shared overlap, and against every
+earlier chunk by speaker embedding.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+# Speakers whose turns coincide for less than this many seconds in an
+# overlap are not considered the same person
+MIN_SPEAKER_MATCH_SECONDS = 1.0
+
+# Speakers whose embeddings are less similar than this (cosine) to every
+# label seen earlier in the job are not considered one of them
+MIN_SPEAKER_SIMILARITY = 0.6
+
+def plan_chunks(
+    duration: float,
+    chunk_seconds: float,
+    overlap_seconds: float
+) -> List[Dict[str, float]]:
+    """Split a recording into overlapping chunk windows of similar length.
+
+    Args:
+        duration: Audio duration in seconds
+        chunk_seconds: Target chunk length, excluding overlap
+        overlap_seconds: Audio shared by neighbouring chunks
+
+    Returns:
+        Windows in order, each with start and end seconds
+    """
+    count = max(1, round(duration / chunk_seconds))
+    size = duration / count
+    margin = overlap_seconds / 2
+    return [
+        {
+            "start": round(max(0.0, i * size - margin), 3),
+            "end": round(min(duration, (i + 1) * size + margin), 3)
+        }
+        for i in range(count)
+    ]
+
+def _words(segments: List[Dict]) -> List[Dict]:
+    """Get all words with timings, in order."""
+    return [
+        word for segment in segments
+        for word in segment.get("words", [])
+        if "start" in word and "end" in word
+    ]
+
+def _find_cut(segments: List[Dict], start: float, end: float) -> float:
+    """Pick where to cut an overlap between two chunks.
+
+    Uses the middle of the widest pause between words in the central half
+    of the overlap, away from the window edges where words may be cut
+    off, or the middle of the overlap if it has no pause.
+    """
+    middle = (start + end) / 2
+    lower = start + (end - start) / 4
+    upper = end - (end - start) / 4
+
+    words = [w for w in _words(segments) if w["end"] >= lower and w["start"] <= upper]
+    best_gap, cut = 0.0, middle
+    for previous, word in zip(words, words[1:]):
+        gap_start = max(previous["end"], lower)
+        gap_end = min(word["start"], upper)
+        if gap_end - gap_start > best_gap:
+            best_gap, cut = gap_end - gap_start, (gap_start + gap_end) / 2
+    return cut
+
+def _midpoint(item: Dict) -> float:
+    return (item.get("start", 0.0) + item.get("end", 0.0)) / 2
+
+def _trim_segment(
+    segment: Dict,
+    lower: float,
+    upper: float
+) -> Optional[Dict]:
+    """Keep the part of a segment between two cuts.
+
+    Segments with word timings keep the words whose midpoint lies between
+    the cuts, and untimed words go with the word before them; segments
+    without word timings are kept whole if their own midpoint does.
+    """
+    start, end = segment.get("start", 0.0), segment.get("end", 0.0)
+    if lower <= start and end < upper:
+        return segment
+
+    words = segment.get("words", [])
+    if not any("start" in word and "end" in word for word in words):
+        return segment if lower <= _midpoint(segment) < upper else None
+
+    kept, keep = [], lower <= start < upper
+    for word in words:
+        if "start" in word and "end" in word:
+            keep = lower <= _midpoint(word) < upper
+        if keep:
+            kept.append(word)
+
+    timed = [word for word in kept if "start" in word and "end" in word]
+    if not timed:
+        return None
+    if len(kept) == len(words):
+        return segment
+
+    trimmed = dict(segment)
+    trimmed["words"] = kept
+    trimmed["start"] = timed[0]["start"]
+    trimmed["end"] = timed[-1]["end"]
+    trimmed["text"] = " ".join(word.get("word", "").strip() for word in kept)
+    return trimmed
+
+def _speaker_overlap(
+    turns_a: List[Dict],
+    turns_b: List[Dict],
+    start: float,
+    end: float
+) -> Dict[Tuple[str, str], float]:
+    """Sum how long each pair of speakers talk at the same time in a window."""
+    overlap: Dict[Tuple[str, str], float] = {}
+    turns_a = [t for t in turns_a if t["end"] > start and t["start"] < end]
+    turns_b = [t for t in turns_b if t["end"] > start and t["start"] < end]
+    for a in turns_a:
+        for b in turns_b:
+            seconds = min(a["end"], b["end"], end) - max(a["start"], b["start"], start)
+            if seconds > 0:
+                key = (a["speaker"], b["speaker"])
+                overlap[key] = overlap.get(key, 0.0) + seconds
+    return overlap
+
+def _unit(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length."""
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else vector
+
+def _similarity(a: List[float], b: List[float]) -> float:
+    """Cosine similarity of two vectors."""
+    return sum(x * y for x, y in zip(_unit(a), _unit(b)))
+
+def reconcile_speakers(chunks: List[Dict]) -> List[Dict[str, str]]:
+    """Map each chunk's speaker labels to labels shared by the whole job.
+
+    Job-wide labels are kept in one table with an embedding centroid per
+    label. A speaker in a chunk first takes the label of the previous
+    chunk's speaker whose turns coincide with theirs the most in the
+    overlap between the two chunks, pairing the largest overlaps first.
+    Speakers still unmatched, such as someone silent for a whole chunk,
+    are compared by embedding with every label seen so far and take the
+    most similar one not already used in the chunk. Speakers without a
+    match get a new label.
+
+    Args:
+        chunks: Chunk results in order, each with window, turns and
+            optionally speaker embeddings
+
+    Returns:
+        Label mapping for each chunk
+    """
+    mappings: List[Dict[str, str]] = []
+    centroids: Dict[str, List[float]] = {}
+    labels = 0
+    for i, chunk in enumerate(chunks):
+        mapping: Dict[str, str] = {}
+        taken = set()
+        if i > 0:
+            previous, previous_mapping = chunks[i - 1], mappings[i - 1]
+            overlap = _speaker_overlap(
+                previous.get("turns", []),
+                chunk.get("turns", []),
+                chunk["window"]["start"],
+                previous["window"]["end"]
+            )
+            for (before, after), seconds in sorted(
+                overlap.items(), key=lambda item: item[1], reverse=True
+            ):
+                if seconds < MIN_SPEAKER_MATCH_SECONDS:
+                    break
+                label = previous_mapping.get(before)
+                if label and after not in mapping and label not in taken:
+                    mapping[after] = label
+                    taken.add(label)
+
+        local = {turn["speaker"] for turn in chunk.get("turns", [])}
+        for segment in chunk.get("segments", []):
+            local.update(
+                item["speaker"] for item in [segment, *segment.get("words", [])]
+                if "speaker" in item
+            )
+
+        embeddings = chunk.get("embeddings") or {}
+        candidates = sorted(
+            (
+                (_similarity(embeddings[speaker], centroid), speaker, label)
+                for speaker in local - set(mapping) if speaker in embeddings
+                for label, centroid in centroids.items()
+            ),
+            reverse=True
+        )
+        for similarity, speaker, label in candidates:
+            if similarity < MIN_SPEAKER_SIMILARITY:
+                break
+            if speaker not in mapping and label not in taken:
+                mapping[speaker] = label
+                taken.add(label)
+
+        for speaker in sorted(local - set(mapping)):
+            mapping[speaker] = f"SPEAKER_{labels:02d}"
+            labels += 1
+
+        # Centroids average the speaker's embeddings over all chunks
+        for speaker, label in mapping.items():
+            if speaker in embeddings:
+                vector = _unit(embeddings[speaker])
+                centroid = centroids.get(label)
+                centroids[label] = (
+                    vector if centroid is None
+                    else [x + y for x, y in zip(centroid, vector)]
+                )
+        mappings.append(mapping)
+    return mappings
+
+def stitch_chunks(chunks: List[Dict]) -> List[Dict]:
+    """Merge the segments of overlapping chunk results.
+
+    Args:
+        chunks: Chunk results in order, each with window, turns and
+            segments timed in file seconds and labelled with the chunk's
+            own speakers
+
+    Returns:
+        Segments of the whole recording with job-wide speaker labels
+    """
+    cuts = [-math.inf]
+    for previous, chunk in zip(chunks, chunks[1:]):
+        cuts.append(_find_cut(
+            previous.get("segments", []),
+            chunk["window"]["start"],
+            previous["window"]["end"]
+        ))
+    cuts.append(math.inf)
+
+    segments = []
+    for chunk, mapping, lower, upper in zip(
+        chunks, reconcile_speakers(chunks), cuts, cuts[1:]
+    ):
+        for segment in chunk.get("segments", []):
+            segment = _trim_segment(segment, lower, upper)
+            if segment is None:
+                continue
+            segment = dict(segment)
+            if "speaker" in segment:
+                segment["speaker"] = mapping[segment["speaker"]]
+            if "words" in segment:
+                segment["words"] = [
+                    dict(word, speaker=mapping[word["speaker"]])
+                    if "speaker" in word else word
+                    for word in segment["words"]
+                ]
+            segments.append(segment)
+    return segments